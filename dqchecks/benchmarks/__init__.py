@@ -0,0 +1,23 @@
+"""
+Benchmarks of the dqchecks checks on synthetic Ofwat-style workbooks
+
+dqchecks.benchmarks.synthetic generates templates and company submissions of
+a configurable size, with the discrepancies each rule reports;
+dqchecks.benchmarks.runner times the panacea rules, process_fout_sheets and
+the qa pipeline on them across size tiers and keeps a JSON history of runs.
+
+    python -m dqchecks.benchmarks --tiers small medium --repeat 3 --history benchmarks.json
+"""
+from dqchecks.benchmarks.runner import (
+    SIZE_TIERS,
+    append_history,
+    compare_with_previous,
+    load_history,
+    run_benchmarks,
+)
+from dqchecks.benchmarks.synthetic import (
+    SyntheticSpec,
+    generate_company,
+    generate_template,
+    synthetic_packages,
+)
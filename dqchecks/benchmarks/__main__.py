@@ -0,0 +1,52 @@
+"""
+Run the benchmarks from the command line:
+
+    python -m dqchecks.benchmarks --tiers small medium --repeat 3 \
+        --history benchmarks.json --label "grid hashing" --fail-on-regression
+"""
+import argparse
+import logging
+import sys
+
+from dqchecks.benchmarks.runner import (
+    SIZE_TIERS,
+    append_history,
+    compare_with_previous,
+    load_history,
+    run_benchmarks,
+)
+
+
+def main(argv=None) -> int:
+    """Run the tiers asked for, print the results and, given a history, the comparison."""
+    parser = argparse.ArgumentParser(prog="python -m dqchecks.benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiers", nargs="+", default=["small"], choices=sorted(SIZE_TIERS))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--history", help="JSON file the run is appended to")
+    parser.add_argument("--label", help="Label of the run in the history")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Best_Seconds ratio to the previous run counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    # The checks log every discrepancy they find
+    logging.disable(logging.INFO)
+    results = run_benchmarks(args.tiers, args.repeat)
+    print(results.to_string(index=False))
+    if not args.history:
+        return 0
+
+    append_history(args.history, results, args.label)
+    comparison = compare_with_previous(load_history(args.history), args.threshold)
+    print()
+    print(comparison.to_string(index=False))
+    regressed = comparison[comparison["Regression"]]
+    if len(regressed):
+        print(f"\n{len(regressed)} benchmarks regressed by more than {args.threshold}x.")
+        return 1 if args.fail_on_regression else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Timings of the panacea rules, process_fout_sheets and the qa pipeline over
+synthetic workbooks of several sizes, with a JSON history of runs
+
+    results = run_benchmarks(["small", "medium"], repeat=3)
+    run = append_history("benchmarks.json", results, label="after grid hashing")
+    compare_with_previous(load_history("benchmarks.json"))
+
+Each repeat loads the workbooks afresh (not timed, apart from the
+load_workbooks benchmark). The rule walks read the cells already stored and
+add none, but get_used_area's probes (Rules 1 and 2) and process_fout_sheets'
+iter_rows go through Worksheet.cell, which stores an empty cell for every
+blank one it reads; reusing one load would let those cells into later walks.
+Best_Seconds, the fastest repeat, is what runs are compared on.
+"""
+import datetime
+import json
+import os
+import platform
+import random
+import time
+from io import BytesIO
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import openpyxl
+import pandas as pd
+from openpyxl import load_workbook
+
+from dqchecks import panacea, qa
+from dqchecks.preflight import WorkbookManifest
+from dqchecks.benchmarks.synthetic import (
+    COMPANY_NAME,
+    SyntheticSpec,
+    synthetic_packages,
+)
+from dqchecks.transforms import FoutProcessConfig, ProcessingContext, process_fout_sheets
+
+SIZE_TIERS: Dict[str, SyntheticSpec] = {
+    "small": SyntheticSpec(),
+    "medium": SyntheticSpec(flat_sheets=6, rows_per_sheet=500, observation_periods=10,
+                            calc_sheets=2, calc_rows=1000, calc_columns=20),
+    "large": SyntheticSpec(flat_sheets=12, rows_per_sheet=2000, observation_periods=15,
+                           calc_sheets=4, calc_rows=5000, calc_columns=30),
+}
+
+FOUT_PATTERNS = ["^fOut_", "^F_Outputs"]
+OBSERVATION_PATTERNS = [r"^\s*2[0-9]{3}-[1-9][0-9]\s*$"]
+SUBMISSION_PERIOD = "2025Q1"
+QA_RUN_DATETIME = "2025-01-01T00:00:00"
+RESULT_COLUMNS = ["Tier", "Benchmark", "Repeat", "Best_Seconds", "Mean_Seconds", "Rows"]
+
+
+class LoadedWorkbooks(NamedTuple):
+    """The synthetic pair, loaded with and without data_only."""
+    template: openpyxl.Workbook
+    template_values: openpyxl.Workbook
+    company: openpyxl.Workbook
+    company_values: openpyxl.Workbook
+
+
+def load_workbooks(template: bytes, company: bytes) -> LoadedWorkbooks:
+    """Load both packages in both modes, as the README does."""
+    return LoadedWorkbooks(
+        load_workbook(BytesIO(template), data_only=False),
+        load_workbook(BytesIO(template), data_only=True),
+        load_workbook(BytesIO(company), data_only=False),
+        load_workbook(BytesIO(company), data_only=True),
+    )
+
+
+def processing_context() -> ProcessingContext:
+    """The ProcessingContext the synthetic submission is processed with."""
+    return ProcessingContext(
+        org_cd="SYN",
+        submission_period_cd=SUBMISSION_PERIOD,
+        process_cd="BENCHMARK",
+        process_stage_cd="BENCHMARK",
+        filename="synthetic.xlsx",
+        Batch_Id="benchmark",
+        file_hash_md5="synthetic",
+        template_version="1.0",
+        last_modified=datetime.datetime(2025, 1, 1),
+        status="Benchmark",
+    )
+
+
+def fout_config() -> FoutProcessConfig:
+    """The FoutProcessConfig matching the synthetic flat tables."""
+    return FoutProcessConfig(observation_patterns=OBSERVATION_PATTERNS, fout_patterns=FOUT_PATTERNS)
+
+
+def semantic_frame(flat_df: pd.DataFrame, change_rate: float = 0.02, seed: int = 0) -> pd.DataFrame:
+    """
+    A QD semantic load of a process_fout_sheets frame (with the QD key
+    columns): semantic column names, an Insert_Date, some measure values
+    changed and some rows loaded twice or not at all, so the qa pipeline has
+    differences to report.
+    """
+    rng = random.Random(seed)
+    sem = flat_df.rename(columns={
+        "Measure_Cd": "Legacy_Measure_Reference",
+        "Measure_Desc": "Measure_Name",
+        "Measure_Unit": "Unit",
+    }).copy()
+    sem["Insert_Date"] = "2025-01-01"
+    changed = [rng.random() < change_rate for _ in range(len(sem))]
+    sem.loc[changed, "Measure_Value"] = "0"
+    dropped = [rng.random() < change_rate for _ in range(len(sem))]
+    reloaded = sem[[rng.random() < change_rate for _ in range(len(sem))]].assign(
+        Insert_Date="2025-02-01")
+    return pd.concat([sem[[not drop for drop in dropped]], reloaded], ignore_index=True)
+
+
+def run_qa_pipeline(flat_df: pd.DataFrame, sem_df: pd.DataFrame) -> pd.DataFrame:
+    """The four qa steps on the QD profile; returns the diff frame."""
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(flat_df, sem_df, SUBMISSION_PERIOD)
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    qa_diff_df = qa.build_qa_diff(flat_for_qa, sem_for_qa, *keys, "benchmark", QA_RUN_DATETIME)
+    qa.build_qa_summaries(
+        flat_for_qa, sem_for_qa, keys[2], qa_diff_df, "benchmark", QA_RUN_DATETIME)
+    return qa_diff_df
+
+
+def _streamed_formula_errors(company: bytes) -> pd.DataFrame:
+    """Rule 2 streamed from the company package's sheet XML, without loading it."""
+    with WorkbookManifest(company) as manifest:
+        return panacea.find_formula_errors(manifest)
+
+
+def _benchmarks(flat_df: pd.DataFrame, sem_df: pd.DataFrame, company: bytes) -> Dict[str, Callable]:
+    """Benchmark name -> function of the loaded workbooks, returning its output."""
+    fout_pattern = "|".join(FOUT_PATTERNS)
+    return {
+        "Rule 1: find_formula_differences":
+            lambda wbs: panacea.find_formula_differences(wbs.template, wbs.company),
+        "Rule 2: find_formula_errors":
+            lambda wbs: panacea.find_formula_errors(wbs.company_values),
+        "Rule 2: find_formula_errors (streamed)":
+            lambda wbs: _streamed_formula_errors(company),
+        "Rule 3: find_missing_sheets":
+            lambda wbs: panacea.find_missing_sheets(wbs.template_values, wbs.company_values),
+        "Rule 4: find_shape_differences":
+            lambda wbs: panacea.find_shape_differences(wbs.template, wbs.company),
+        "Rules 5/6: find_pk_errors":
+            lambda wbs: panacea.find_pk_errors(wbs.company_values, fout_pattern, "Reference"),
+        "Rules 7/8: check_value_in_cell":
+            lambda wbs: panacea.create_dataframe_from_company_selection_check(
+                panacea.check_value_in_cell(
+                    wbs.company_values, "SelectCompany", COMPANY_NAME, "B4")),
+        "process_fout_sheets":
+            lambda wbs: process_fout_sheets(
+                wbs.company_values, processing_context(), fout_config()),
+        "qa_pipeline":
+            lambda wbs: run_qa_pipeline(flat_df, sem_df),
+    }
+
+
+def _timed(func: Callable, *args):
+    start = time.perf_counter()
+    value = func(*args)
+    return value, time.perf_counter() - start
+
+
+def run_tier(tier: str, spec: SyntheticSpec, repeat: int = 1) -> pd.DataFrame:
+    """
+    Time every benchmark on the synthetic pair of spec.
+
+    Returns:
+        pd.DataFrame: One row per benchmark (RESULT_COLUMNS), Rows being the
+        length of its output.
+    """
+    template, company = synthetic_packages(spec)
+    flat_df = process_fout_sheets(
+        load_workbook(BytesIO(company), data_only=True), processing_context(), fout_config())
+    # Key columns the flat tables have no column for
+    flat_df = flat_df.assign(**{
+        column: "" for column in qa.KEY_COLS if column not in flat_df and column != "Measure_Key"})
+    sem_df = semantic_frame(flat_df, seed=spec.seed)
+    benchmarks = _benchmarks(flat_df, sem_df, company)
+
+    seconds: Dict[str, List[float]] = {"load_workbooks": []}
+    seconds.update({name: [] for name in benchmarks})
+    rows: Dict[str, int] = {"load_workbooks": 4}
+    for _ in range(repeat):
+        workbooks, elapsed = _timed(load_workbooks, template, company)
+        seconds["load_workbooks"].append(elapsed)
+        for name, benchmark in benchmarks.items():
+            output, elapsed = _timed(benchmark, workbooks)
+            seconds[name].append(elapsed)
+            rows[name] = len(output)
+
+    return pd.DataFrame([
+        [tier, name, repeat, min(times), sum(times) / len(times), rows[name]]
+        for name, times in seconds.items()
+    ], columns=RESULT_COLUMNS)
+
+
+def run_benchmarks(tiers: Iterable[str] = ("small",), repeat: int = 1,
+                   size_tiers: Optional[Dict[str, SyntheticSpec]] = None) -> pd.DataFrame:
+    """
+    Time every benchmark on each tier.
+
+    Args:
+        tiers (Iterable[str]): Names of the tiers to run, from size_tiers.
+        repeat (int): Runs of each benchmark per tier.
+        size_tiers (dict, optional): Tier name -> SyntheticSpec; SIZE_TIERS by default.
+
+    Returns:
+        pd.DataFrame: The results of every tier (RESULT_COLUMNS).
+
+    Raises:
+        ValueError: If a tier is unknown or repeat is below 1.
+    """
+    size_tiers = SIZE_TIERS if size_tiers is None else size_tiers
+    tiers = list(tiers)
+    unknown = [tier for tier in tiers if tier not in size_tiers]
+    if unknown:
+        raise ValueError(f"Unknown tiers {unknown}; available: {sorted(size_tiers)}")
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1.")
+    return pd.concat([run_tier(tier, size_tiers[tier], repeat) for tier in tiers],
+                     ignore_index=True)
+
+
+def load_history(path: str) -> List[dict]:
+    """The runs recorded at path, oldest first; empty if there is no file yet."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def append_history(path: str, results: pd.DataFrame, label: Optional[str] = None) -> dict:
+    """
+    Record a run of results at the end of the JSON history at path.
+
+    Returns:
+        dict: The run recorded, with when and where it ran.
+    """
+    run = {
+        "run_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "label": label,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "openpyxl": openpyxl.__version__,
+        "results": results[RESULT_COLUMNS].to_dict("records"),
+    }
+    history = load_history(path)
+    history.append(run)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    return run
+
+
+def compare_with_previous(history: List[dict], threshold: float = 1.25) -> pd.DataFrame:
+    """
+    The last run of history against the run before it.
+
+    Args:
+        history (list[dict]): Runs, as load_history returns them.
+        threshold (float): Ratio of Best_Seconds above which a benchmark has regressed.
+
+    Returns:
+        pd.DataFrame: Tier, Benchmark, Best_Seconds, Previous_Seconds, Ratio and
+        Regression for each benchmark of the last run (Previous_Seconds NaN for
+        benchmarks the previous run did not have).
+    """
+    columns = ["Tier", "Benchmark", "Best_Seconds", "Previous_Seconds", "Ratio", "Regression"]
+    if not history:
+        return pd.DataFrame(columns=columns)
+    latest = pd.DataFrame(history[-1]["results"], columns=RESULT_COLUMNS)
+    previous = pd.DataFrame(history[-2]["results"] if len(history) > 1 else [],
+                            columns=RESULT_COLUMNS)
+    merged = latest.merge(
+        previous[["Tier", "Benchmark", "Best_Seconds"]].rename(
+            columns={"Best_Seconds": "Previous_Seconds"}),
+        on=["Tier", "Benchmark"], how="left")
+    merged["Ratio"] = merged["Best_Seconds"] / merged["Previous_Seconds"]
+    merged["Regression"] = merged["Ratio"] > threshold
+    return merged[columns]
@@ -0,0 +1,193 @@
+"""
+Synthetic Ofwat-style templates and company submissions
+
+A template holds:
+
+- flat tables (fOut_ and F_Outputs sheets): a blank row 1, the Acronym /
+  Reference / Item description / Unit / Model headers and one column per
+  observation period on row 2, a blank row 3, then one row per boncode;
+- calculation sheets filled down with formulas over the flat tables;
+- a SelectCompany sheet with the company name in B4, and guidance sheets.
+
+The company submission is the template with values filled in, plus the
+injected discrepancies each rule looks for: changed formulas (Rule 1), error
+values (Rule 2), deleted guidance sheets (Rule 3), rows inserted in a flat table
+(Rule 4) and repeated and blank boncodes (Rules 5/6).
+
+    spec = SyntheticSpec(flat_sheets=4, rows_per_sheet=500)
+    template_bytes, company_bytes = synthetic_packages(spec)
+"""
+import random
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Tuple
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+FLAT_HEADERS = ["Acronym", "Reference", "Item description", "Unit", "Model"]
+COMPANY_NAME = "Synthetic Water"
+COMPANY_ACRONYM = "SYN"
+UNITS = ["nr", "%", "£m", "Ml/d", "km"]
+ERROR_VALUES = ["#DIV/0!", "#REF!", "#VALUE!", "#N/A", "#NAME?"]
+
+
+@dataclass
+class SyntheticSpec:  # pylint: disable=too-many-instance-attributes
+    """
+    Size and discrepancies of a synthetic template / company pair.
+
+    Attributes:
+        flat_sheets (int): Number of flat tables; they alternate between fOut_
+            and F_Outputs names.
+        rows_per_sheet (int): Boncode rows in each flat table.
+        observation_periods (int): Observation period columns, e.g. 2020-21.
+        calc_sheets (int): Number of calculation sheets.
+        calc_rows (int): Formula rows in each calculation sheet.
+        calc_columns (int): Formula columns in each calculation sheet.
+        error_rate (float): Share of formula cells the company changes, and of
+            value cells it turns into Excel errors.
+        shifted_rows (int): Blank rows the company inserts in the first flat table.
+        duplicate_references (int): Boncodes the company repeats, and blanks,
+            in each flat table.
+        missing_sheets (int): Guidance sheets of the template, which the
+            company deletes.
+        first_year (int): First observation year.
+        seed (int): Seed of the random generator, so a spec always gives the
+            same workbooks.
+    """
+    flat_sheets: int = 2
+    rows_per_sheet: int = 50
+    observation_periods: int = 5
+    calc_sheets: int = 1
+    calc_rows: int = 100
+    calc_columns: int = 10
+    error_rate: float = 0.01
+    shifted_rows: int = 1
+    duplicate_references: int = 2
+    missing_sheets: int = 1
+    first_year: int = 2020
+    seed: int = 0
+
+    def flat_sheet_names(self) -> list[str]:
+        """Names of the flat tables."""
+        return [
+            f"fOut_{i // 2 + 1}" if i % 2 == 0 else f"F_Outputs {i // 2 + 1}"
+            for i in range(self.flat_sheets)
+        ]
+
+    def calc_sheet_names(self) -> list[str]:
+        """Names of the calculation sheets."""
+        return [f"Calc_{i + 1}" for i in range(self.calc_sheets)]
+
+    def guidance_sheet_names(self) -> list[str]:
+        """Names of the guidance sheets."""
+        return [f"Guidance_{i + 1}" for i in range(self.missing_sheets)]
+
+    def periods(self) -> list[str]:
+        """Observation period headers, e.g. ["2020-21", "2021-22"]."""
+        return [
+            f"{year}-{(year + 1) % 100:02d}"
+            for year in range(self.first_year, self.first_year + self.observation_periods)
+        ]
+
+
+def _write_flat_sheet(wb: Workbook, name: str, spec: SyntheticSpec, sheet_index: int) -> None:
+    sheet = wb.create_sheet(name)
+    width = len(FLAT_HEADERS) + spec.observation_periods
+    sheet.append([None] * width)
+    sheet.append(FLAT_HEADERS + spec.periods())
+    sheet.append([None] * width)
+    for row in range(spec.rows_per_sheet):
+        sheet.append([
+            COMPANY_ACRONYM,
+            f"BON{sheet_index:02d}{row:05d}",
+            f"Synthetic measure {sheet_index}.{row}",
+            UNITS[row % len(UNITS)],
+            f"Model {row % 3 + 1}",
+        ])
+
+
+def _write_calc_sheet(wb: Workbook, name: str, spec: SyntheticSpec, flat_names: list[str]) -> None:
+    """Formulas filled down and right, over a flat table and the previous column."""
+    sheet = wb.create_sheet(name)
+    source = flat_names[0] if flat_names else None
+    first_period = get_column_letter(len(FLAT_HEADERS) + 1)
+    for row in range(1, spec.calc_rows + 1):
+        cells = [row]
+        for column in range(2, spec.calc_columns + 1):
+            previous = get_column_letter(column - 1)
+            if column == 2 and source is not None:
+                cells.append(f"='{source}'!{first_period}{row + 3}*{previous}{row}")
+            else:
+                cells.append(f"=SUM({previous}{row},$A{row})/{column}")
+        sheet.append(cells)
+
+
+def generate_template(spec: SyntheticSpec) -> Workbook:
+    """The synthetic template workbook for spec."""
+    wb = Workbook()
+    wb.active.title = "SelectCompany"
+    wb["SelectCompany"]["A4"] = "Company"
+    wb["SelectCompany"]["B4"] = "Select company"
+    flat_names = spec.flat_sheet_names()
+    for index, name in enumerate(flat_names):
+        _write_flat_sheet(wb, name, spec, index)
+    for name in spec.calc_sheet_names():
+        _write_calc_sheet(wb, name, spec, flat_names)
+    for name in spec.guidance_sheet_names():
+        wb.create_sheet(name)["A1"] = "Guidance"
+    return wb
+
+
+def generate_company(spec: SyntheticSpec) -> Workbook:
+    """
+    The synthetic company submission for spec: the template filled in, with
+    the discrepancies the spec asks for.
+    """
+    rng = random.Random(spec.seed)
+    wb = generate_template(spec)
+    wb["SelectCompany"]["B4"] = COMPANY_NAME
+
+    for name in spec.flat_sheet_names():
+        sheet = wb[name]
+        first_row, first_column = 4, len(FLAT_HEADERS) + 1
+        for row in range(first_row, first_row + spec.rows_per_sheet):
+            for column in range(first_column, first_column + spec.observation_periods):
+                if rng.random() < spec.error_rate:
+                    sheet.cell(row=row, column=column, value=rng.choice(ERROR_VALUES))
+                else:
+                    sheet.cell(row=row, column=column, value=round(rng.uniform(0, 1000), 3))
+        rows = list(range(first_row, first_row + spec.rows_per_sheet))
+        for _ in range(min(spec.duplicate_references, len(rows) // 2)):
+            row, other = rng.sample(rows, 2)
+            sheet.cell(row=row, column=2).value = sheet.cell(row=other, column=2).value
+            sheet.cell(row=rng.choice(rows), column=2).value = None
+
+    for name in spec.calc_sheet_names():
+        sheet = wb[name]
+        for row in range(1, spec.calc_rows + 1):
+            for column in range(2, spec.calc_columns + 1):
+                if rng.random() < spec.error_rate:
+                    cell = sheet.cell(row=row, column=column)
+                    cell.value = cell.value.replace("/", "*", 1) if "/" in cell.value \
+                        else f"{cell.value}+1"
+
+    flat_names = spec.flat_sheet_names()
+    if flat_names and spec.shifted_rows:
+        wb[flat_names[0]].insert_rows(4 + spec.rows_per_sheet // 2, spec.shifted_rows)
+    for name in spec.guidance_sheet_names():
+        del wb[name]
+    return wb
+
+
+def workbook_bytes(wb: Workbook) -> bytes:
+    """The .xlsx package of a workbook."""
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def synthetic_packages(spec: SyntheticSpec) -> Tuple[bytes, bytes]:
+    """(template, company) .xlsx packages for spec."""
+    return workbook_bytes(generate_template(spec)), workbook_bytes(generate_company(spec))
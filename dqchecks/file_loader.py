@@ -1,3 +1,4 @@
+# pylint: disable=C0302
 """
 file_loader.py
 
@@ -6,6 +7,14 @@ This module provides the `FileLoader` class for loading data files
 filtering based on metadata embedded in file names, validation of
 expected file counts, MD5 checksum calculation, and logging of file metadata.
 
+Directory listings are held in a `DirectoryIndex` shared by all loaders, so
+the same lakehouse tree is only walked once per batch; a directory is listed
+again only when its modification time changes. Filenames are parsed once into
+`FilenameMetadata` records, and a `FilenameIndex` over them answers the
+organisation and key=value filters without rescanning the file list. MD5
+hashes are kept in a `HashCache` keyed by (path, size, mtime_ns), which can be
+saved to a JSON file so unchanged files are not read again by the next batch.
+
 Typical directory structure:
 - /Files/templates
 - /Files/data collections
@@ -15,15 +24,22 @@ Files are filtered by values such as organisation_cd, process_cd, submission_per
 """
 
 import os
-import glob
+import bisect
 import datetime
+import functools
 import logging
 import hashlib
+import json
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from collections.abc import Iterable
 
 TEMPLATE_KEYS = {"submission_period_cd", "process_cd"}
 BRONZE_KEYS = {"submission_period_cd", "process_cd", "status", "process_stage_cd"}
+FILENAME_KEYS = tuple(sorted(TEMPLATE_KEYS | BRONZE_KEYS))
+HASH_CHUNK_SIZE = 1024 * 1024
 
 @dataclass(frozen=True)
 class FileMetadata:
@@ -45,6 +61,412 @@ class FileMetadata:
     template_version: str | None = None
     template_path: str | None = None
 
+@dataclass(frozen=True)
+class FileLoadError:
+    """
+    Why FileLoader.run_batch could not load a file for one organisation.
+
+    Attributes:
+        organisation_cd (str): Organisation the error is for.
+        error_type (str): Name of the exception run() would raise, e.g. "ValueError".
+        message (str): The exception message.
+        files (tuple[str, ...]): The files that were found for the failed check.
+    """
+    organisation_cd: str
+    error_type: str
+    message: str
+    files: tuple[str, ...] = ()
+
+class _SelectionError(Exception):
+    """A file selection failure, with the exception type run() raises for it."""
+    def __init__(self, error_type, message, files=()):
+        super().__init__(message)
+        self.error_type = error_type
+        self.files = tuple(files)
+
+    def to_exception(self):
+        """The FileNotFoundError or ValueError that run() raises."""
+        return self.error_type(str(self))
+
+@dataclass(frozen=True)
+class IndexedFile:
+    """
+    A file seen while walking a directory, with the stat values the loader needs.
+
+    Attributes:
+        path (str): Full path to the file.
+        size (int): Size in bytes.
+        mtime (float): Last modified time, seconds since the epoch.
+    """
+    path: str
+    size: int
+    mtime: float
+
+@dataclass(frozen=True)
+class _DirectoryListing:
+    """One directory's files (keyed by path) and subdirectories, as of its mtime_ns."""
+    mtime_ns: int
+    files: dict[str, IndexedFile]
+    subdirs: tuple[str, ...]
+
+class DirectoryIndex:
+    """
+    Cache of recursive directory listings, built with os.scandir.
+
+    Each directory's listing is kept with the directory's st_mtime_ns and is
+    read again only when that changes (a file added, removed or renamed in
+    it). Files rewritten in place do not change their directory's mtime, so
+    their size and mtime are as of the last listing; call invalidate() to
+    force a fresh walk.
+
+    Like glob's "**" pattern, hidden entries (names starting with ".") are
+    skipped and symlinked directories are followed.
+    """
+
+    def __init__(self):
+        self._listings: dict[str, _DirectoryListing] = {}
+        self._lock = threading.Lock()
+
+    def files(self, base_path: str) -> list[IndexedFile]:
+        """
+        Lists every file under base_path, re-reading only changed directories.
+
+        Args:
+            base_path (str): Directory to walk. A missing directory has no files.
+
+        Returns:
+            list[IndexedFile]: Files in walk order (not sorted).
+        """
+        found = []
+        pending = [base_path]
+        while pending:
+            directory = pending.pop()
+            listing = self._listing(directory)
+            if listing is not None:
+                found.extend(listing.files.values())
+                pending.extend(reversed(listing.subdirs))
+        return found
+
+    def lookup(self, path: str) -> IndexedFile | None:
+        """
+        Returns the indexed entry for path, if its directory has been walked.
+
+        Args:
+            path (str): File path, as returned by files().
+
+        Returns:
+            IndexedFile | None: The entry, or None if path is not in the index.
+        """
+        with self._lock:
+            listing = self._listings.get(os.path.dirname(path))
+        if listing is None:
+            return None
+        return listing.files.get(path)
+
+    def invalidate(self, base_path: str | None = None):
+        """
+        Drops cached listings so they are read again on the next walk.
+
+        Args:
+            base_path (str | None): Only drop base_path and directories below it.
+                Drops everything if None.
+        """
+        with self._lock:
+            if base_path is None:
+                self._listings.clear()
+                return
+            prefix = os.path.join(base_path, "")
+            for directory in [d for d in self._listings if d == base_path or d.startswith(prefix)]:
+                del self._listings[directory]
+
+    def _listing(self, directory: str) -> _DirectoryListing | None:
+        """Cached listing for directory, re-read with os.scandir if its mtime moved."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._listings.pop(directory, None)
+            return None
+
+        with self._lock:
+            listing = self._listings.get(directory)
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            return listing
+
+        files, subdirs = {}, []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir():
+                            subdirs.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[entry.path] = IndexedFile(entry.path, stat.st_size, stat.st_mtime)
+                    except OSError:
+                        # Vanished or unreadable while listing; glob skips these as well
+                        continue
+        except OSError:
+            return None
+
+        listing = _DirectoryListing(mtime_ns, files, tuple(sorted(subdirs)))
+        with self._lock:
+            self._listings[directory] = listing
+        return listing
+
+# Shared by every FileLoader that is not given its own index
+DIRECTORY_INDEX = DirectoryIndex()
+
+@dataclass(frozen=True)
+class FilenameMetadata:
+    """
+    Filter fields parsed from a file path.
+
+    Attributes:
+        path (str): Full path to the file.
+        name (str): Lowercased file name.
+        values (dict[str, tuple[str, ...]]): For each key in FILENAME_KEYS, the lowercased
+            text after every "key=" in the path, up to the end of that path component.
+    """
+    path: str
+    name: str
+    values: dict[str, tuple[str, ...]]
+
+    @classmethod
+    def parse(cls, path: str, keys: Iterable[str] = FILENAME_KEYS) -> "FilenameMetadata":
+        """
+        Parses one path.
+
+        Args:
+            path (str): Path to parse.
+            keys (Iterable[str]): Lowercase keys to collect values for.
+
+        Returns:
+            FilenameMetadata: The parsed record.
+        """
+        path_lower = path.lower()
+        name = os.path.basename(path_lower)
+        values = {}
+        for key in keys:
+            found = []
+            start = path_lower.find(f"{key}=")
+            while start != -1:
+                tail = path_lower[start + len(key) + 1:]
+                found.append(_split_path_component(tail))
+                start = path_lower.find(f"{key}=", start + 1)
+            values[key] = tuple(found)
+        return cls(path, name, values)
+
+def _split_path_component(text: str) -> str:
+    """text up to its first path separator."""
+    for sep in ("/", os.sep):
+        text = text.split(sep, 1)[0]
+    return text
+
+def _has_path_separator(text: str) -> bool:
+    """True if text holds a path separator (and so cannot lie within one path component)."""
+    return "/" in text or os.sep in text
+
+class FilenameIndex:
+    """
+    Inverted index over FilenameMetadata for a list of files.
+
+    A filter "key=value" matches a file when "key=value" appears in its
+    lowercased path (FileLoader.match_all_conditions). That holds exactly when
+    one of the file's values for key starts with value, so each key keeps its
+    values sorted and a filter is a bisect range; filter combinations are set
+    intersections of file positions. Organisation prefixes use the same
+    lookup over sorted file names.
+
+    Positions refer to the files list the index was built from, and results
+    are returned in that order.
+    """
+
+    def __init__(self, files: Iterable[str], keys: Iterable[str] = FILENAME_KEYS):
+        self.files = list(files)
+        self.keys = tuple(keys)
+        self.records = [FilenameMetadata.parse(f, self.keys) for f in self.files]
+        self._names = sorted((r.name, pos) for pos, r in enumerate(self.records))
+        self._values = {
+            key: sorted(
+                (value, pos)
+                for pos, record in enumerate(self.records)
+                for value in record.values[key]
+            )
+            for key in self.keys
+        }
+
+    @staticmethod
+    def _prefixed(entries, prefix):
+        """Positions of (text, pos) entries whose text starts with prefix."""
+        start = bisect.bisect_left(entries, (prefix,))
+        positions = set()
+        for text, pos in entries[start:]:
+            if not text.startswith(prefix):
+                break
+            positions.add(pos)
+        return positions
+
+    def all_positions(self) -> set[int]:
+        """Every position in the index."""
+        return set(range(len(self.files)))
+
+    def with_name_prefix(self, prefix: str) -> set[int]:
+        """Positions of files whose lowercased name starts with prefix."""
+        return self._prefixed(self._names, prefix.lower())
+
+    def with_name_containing(self, text: str) -> set[int]:
+        """Positions of files whose lowercased name contains text."""
+        text = text.lower()
+        return {pos for pos, record in enumerate(self.records) if text in record.name}
+
+    def matching(self, conditions: dict) -> set[int]:
+        """
+        Positions of files matching every key=value condition.
+
+        Args:
+            conditions (dict): Filter key-value pairs, compared case-insensitively.
+
+        Returns:
+            set[int]: Matching positions.
+        """
+        positions = self.all_positions()
+        for key, value in conditions.items():
+            key, value = key.lower(), value.lower()
+            if key in self._values and not _has_path_separator(value):
+                positions &= self._prefixed(self._values[key], value)
+            else:
+                needle = f"{key}={value}"
+                positions &= {pos for pos in positions if needle in self.files[pos].lower()}
+            if not positions:
+                break
+        return positions
+
+    def paths(self, positions: Iterable[int]) -> list[str]:
+        """The files at positions, in index order."""
+        return [self.files[pos] for pos in sorted(positions)]
+
+@functools.lru_cache(maxsize=16)
+def _filename_index(files: tuple[str, ...]) -> FilenameIndex:
+    """FilenameIndex for a file list, reused while the same list is filtered again."""
+    return FilenameIndex(files)
+
+class HashCache:
+    """
+    File hashes keyed by (path, size, mtime_ns).
+
+    An entry is only returned while the file's size and st_mtime_ns are the
+    ones it was hashed at. With a cache_path the entries are loaded from, and
+    saved back to, a JSON file, so they survive between batches; without one
+    they last for the process.
+
+    Attributes:
+        cache_path (str | None): JSON file backing the cache.
+    """
+
+    def __init__(self, cache_path: str | None = None):
+        self.cache_path = cache_path
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning("Could not read hash cache %s: %s", cache_path, e)
+
+    def get(self, path: str, size: int, mtime_ns: int, algorithm: str) -> str | None:
+        """
+        Cached hash of path, if it was taken at this size and mtime_ns.
+
+        Args:
+            path (str): File path.
+            size (int): Current size in bytes.
+            mtime_ns (int): Current st_mtime_ns.
+            algorithm (str): "md5" or "crc32".
+
+        Returns:
+            str | None: The hex digest, or None if not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None or entry["size"] != size or entry["mtime_ns"] != mtime_ns:
+            return None
+        return entry.get(algorithm)
+
+    def put(self, path: str, size: int, mtime_ns: int, hashes: dict[str, str]):
+        """
+        Records hashes of path taken at size and mtime_ns.
+
+        Hashes already cached for the same size and mtime_ns are kept.
+
+        Args:
+            path (str): File path.
+            size (int): Size in bytes when hashed.
+            mtime_ns (int): st_mtime_ns when hashed.
+            hashes (dict[str, str]): Hex digests by algorithm.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry["size"] != size or entry["mtime_ns"] != mtime_ns:
+                entry = {"size": size, "mtime_ns": mtime_ns}
+            self._entries[path] = {**entry, **hashes}
+            self._dirty = True
+
+    def save(self):
+        """Writes the cache to cache_path (atomically), if it has one and anything changed."""
+        with self._lock:
+            if not self.cache_path or not self._dirty:
+                return
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+
+# Shared by every FileLoader that is not given its own cache
+HASH_CACHE = HashCache()
+
+def _hash_file(filepath: str, chunk_size: int, algorithms: Iterable[str]) -> dict[str, str]:
+    """
+    Hashes a file in one read pass.
+
+    Reads go into one reused buffer of chunk_size bytes; hashlib and zlib release
+    the GIL on buffers this size, so several files can be hashed in threads.
+
+    Args:
+        filepath (str): File to read.
+        chunk_size (int): Read buffer size in bytes.
+        algorithms (Iterable[str]): Any of "md5" and "crc32".
+
+    Returns:
+        dict[str, str]: Hex digests by algorithm.
+    """
+    algorithms = set(algorithms)
+    md5 = hashlib.md5() if "md5" in algorithms else None
+    crc32 = 0
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(filepath, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            chunk = view[:read]
+            if md5 is not None:
+                md5.update(chunk)
+            if "crc32" in algorithms:
+                crc32 = zlib.crc32(chunk, crc32)
+    hashes = {}
+    if md5 is not None:
+        hashes["md5"] = md5.hexdigest()
+    if "crc32" in algorithms:
+        hashes["crc32"] = f"{crc32:08x}"
+    return hashes
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -72,6 +494,9 @@ class FileLoader:
                  one_company_one_template: bool = False,
                  strict: bool = True,
                  file_extensions: Iterable[str] = (".xlsx", ".xlsm",),
+                 directory_index: DirectoryIndex | None = None,
+                 hash_cache: HashCache | None = None,
+                 fast_hash: bool = False,
                  **filters: str):
         # pylint: disable=C0301
         """
@@ -83,12 +508,21 @@ class FileLoader:
             one_company_one_template (bool): If True, restrict template filtering to organisation_cd.
             strict (bool): If True, expects exactly one matching file or raises error.
             file_extensions (Iterable[str]): File extensions to search for, e.g. (".xlsx", ".xlsm").
+            directory_index (DirectoryIndex | None): Index used to list files. Defaults to the
+                module-level DIRECTORY_INDEX shared by all loaders.
+            hash_cache (HashCache | None): Cache of file hashes. Defaults to the module-level
+                HASH_CACHE; pass HashCache(cache_path) to keep hashes between runs.
+            fast_hash (bool): If True, also take a CRC32 of each file read for its MD5, so
+                calculate_crc32 can answer from the cache.
             filters (dict): Filtering parameters like organisation_cd, process_cd, etc.
         """
         self.source_data_path = source_data_path
         self.load_template = load_template
         self.one_company_one_template = one_company_one_template
         self.strict = strict
+        self.directory_index = directory_index if directory_index is not None else DIRECTORY_INDEX
+        self.hash_cache = hash_cache if hash_cache is not None else HASH_CACHE
+        self.fast_hash = fast_hash
         self.file_extensions = tuple(
             dict.fromkeys(
                 ext.lower().strip() if ext.startswith(".") else f".{ext.lower().strip()}"
@@ -127,6 +561,8 @@ class FileLoader:
         """
         Logs size and modification time for a list of files.
 
+        Files already in the directory index are not stat-ed again.
+
         Args:
             file_list (list[str]): List of file paths.
             label (str): Description label for logging.
@@ -134,9 +570,9 @@ class FileLoader:
         logging.info("%s (%d files):", label, len(file_list))
         for f in file_list:
             try:
-                stat = os.stat(f)
-                size_mb = stat.st_size / (1024 * 1024)
-                last_modified = datetime.datetime.fromtimestamp(stat.st_mtime)
+                size, mtime = self._file_stats(f)
+                size_mb = size / (1024 * 1024)
+                last_modified = datetime.datetime.fromtimestamp(mtime)
                 # pylint: disable=C0301
                 logging.info("- %s | Size: %.2f MB | Last Modified: %s", os.path.basename(f), size_mb, last_modified)
             # pylint: disable=W0718
@@ -147,6 +583,9 @@ class FileLoader:
         """
         Finds all files matching the configured extensions recursively under the base path.
 
+        Listings come from the loader's directory index, so only directories changed
+        since the last walk are read again.
+
         Args:
             base_path (str): Directory to search in.
             extensions (Iterable[str] | None): Extensions to match. Defaults to the loader's configured
@@ -155,12 +594,11 @@ class FileLoader:
         Returns:
             list[str]: List of matching file paths.
         """
-        extensions = tuple(extensions or self.file_extensions)
-        matches = []
-        for extension in extensions:
-            search_path = os.path.join(base_path, "**", f"*{extension}")
-            matches.extend(glob.glob(search_path, recursive=True))
-        return sorted(set(matches))
+        extensions = tuple(os.path.normcase(ext) for ext in (extensions or self.file_extensions))
+        return sorted({
+            f.path for f in self.directory_index.files(base_path)
+            if os.path.normcase(os.path.basename(f.path)).endswith(extensions)
+        })
 
     def filter_files_by_org(self, files, restrict_to_org=False):
         """
@@ -174,7 +612,8 @@ class FileLoader:
             list[str]: Filtered list of file paths.
         """
         if restrict_to_org and self.organisation_cd:
-            return [f for f in files if self.organisation_cd in os.path.basename(f).lower()]
+            index = _filename_index(tuple(files))
+            return index.paths(index.with_name_containing(self.organisation_cd))
         return files
 
     def filter_files_by_prefix(self, files):
@@ -188,9 +627,8 @@ class FileLoader:
             list[str]: Filtered list or all files if no organisation_cd set.
         """
         if self.organisation_cd:
-            return [
-                f for f in files
-                    if os.path.basename(f).lower().startswith(self.organisation_cd)]
+            index = _filename_index(tuple(files))
+            return index.paths(index.with_name_prefix(self.organisation_cd))
         return files
 
     def filter_files_by_conditions(self, files, conditions):
@@ -206,9 +644,57 @@ class FileLoader:
         """
         if not conditions:
             return files
-        return [f for f in files if self.match_all_conditions(f, conditions)]
+        index = _filename_index(tuple(files))
+        return index.paths(index.matching(conditions))
 
-    def validate_file_count(self, files, expected_count, file_type):
+    def match_files_by_organisation(self, organisation_cds):
+        """
+        Resolves matching template and bronze files for several organisations at once.
+
+        Both directories are walked and indexed once, and the process/period/status
+        filters are resolved once; each organisation then only adds its own
+        name filter (as in run(): a name prefix for bronze files and, with
+        one_company_one_template, a name substring for templates).
+
+        Args:
+            organisation_cds (Iterable[str]): Organisation codes, compared case-insensitively.
+
+        Returns:
+            dict[str, tuple[list[str], list[str]]]: Per normalised organisation code,
+                the matched template files and matched bronze files.
+        """
+        template_index, bronze_index = self._file_indexes()
+        template_matches = template_index.matching(self._template_conditions())
+        bronze_matches = bronze_index.matching(self._bronze_conditions())
+
+        matched = {}
+        for organisation_cd in organisation_cds:
+            organisation_cd = organisation_cd.lower().strip()
+            templates = template_matches
+            if self.one_company_one_template and organisation_cd:
+                templates = templates & template_index.with_name_containing(organisation_cd)
+            bronze = bronze_matches
+            if organisation_cd:
+                bronze = bronze & bronze_index.with_name_prefix(organisation_cd)
+            matched[organisation_cd] = (template_index.paths(templates), bronze_index.paths(bronze))
+        return matched
+
+    def _file_indexes(self):
+        """FilenameIndex over all template files and over all bronze files."""
+        template_base = os.path.join(self.source_data_path, "Files", "templates")
+        data_base = os.path.join(self.source_data_path, "Files", "data collections")
+        return (
+            _filename_index(tuple(self.find_files(template_base))),
+            _filename_index(tuple(self.find_files(data_base))),
+        )
+
+    def _template_conditions(self):
+        return {k: v for k, v in self.filters.items() if k in TEMPLATE_KEYS}
+
+    def _bronze_conditions(self):
+        return {k: v for k, v in self.filters.items() if k in BRONZE_KEYS}
+
+    def validate_file_count(self, files, expected_count, file_type, organisation_cd=None):
         """
         Validates the number of files found against the expected count.
 
@@ -216,38 +702,96 @@ class FileLoader:
             files (list[str]): List of file paths.
             expected_count (int): Number of files expected.
             file_type (str): Type of file (e.g., "template", "bronze").
+            organisation_cd (str | None): Organisation named in the error. Defaults to the
+                loader's organisation_cd.
 
         Raises:
             ValueError: If number of files is not equal to expected.
         """
+        if organisation_cd is None:
+            organisation_cd = self.organisation_cd
         if len(files) != expected_count:
             raise ValueError(
                 f"âŒ Expected exactly {expected_count} {file_type} file(s)"
                 # pylint: disable=C0301
-                f"{f' for [{self.organisation_cd}]' if self.organisation_cd else ''}, found {len(files)}.\n"
+                f"{f' for [{organisation_cd}]' if organisation_cd else ''}, found {len(files)}.\n"
                 f"Files found:\n" + "\n".join(files)
             )
 
-    def calculate_md5(self, filepath, chunk_size=8192):
+    def calculate_md5(self, filepath, chunk_size=HASH_CHUNK_SIZE):
         """
         Calculates the MD5 checksum of a file.
 
+        The hash is served from the loader's hash cache while the file's size and
+        mtime are unchanged.
+
         Args:
             filepath (str): Path to the file.
-            chunk_size (int): Size of each chunk read (default 8192 bytes).
+            chunk_size (int): Size of each chunk read (default 1 MB).
 
         Returns:
             str | None: MD5 hash, or None if an error occurred.
         """
-        hash_md5 = hashlib.md5()
+        md5_hash = self._cached_hash(filepath, "md5", chunk_size)
+        self.hash_cache.save()
+        return md5_hash
+
+    def calculate_md5s(self, filepaths, max_workers=None, chunk_size=HASH_CHUNK_SIZE):
+        """
+        Calculates the MD5 checksums of many files, reading them concurrently.
+
+        Args:
+            filepaths (Iterable[str]): Paths to the files.
+            max_workers (int | None): Threads to hash with. Defaults to
+                ThreadPoolExecutor's own default.
+            chunk_size (int): Size of each chunk read (default 1 MB).
+
+        Returns:
+            dict[str, str | None]: MD5 hash per path (None where an error occurred),
+                in the order given.
+        """
+        filepaths = list(dict.fromkeys(filepaths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            hashes = list(executor.map(
+                lambda filepath: self._cached_hash(filepath, "md5", chunk_size), filepaths))
+        self.hash_cache.save()
+        return dict(zip(filepaths, hashes))
+
+    def calculate_crc32(self, filepath, chunk_size=HASH_CHUNK_SIZE):
+        """
+        Calculates a CRC32 of a file: a cheap, non-cryptographic check for changed content.
+
+        Args:
+            filepath (str): Path to the file.
+            chunk_size (int): Size of each chunk read (default 1 MB).
+
+        Returns:
+            str | None: CRC32 as 8 hex digits, or None if an error occurred.
+        """
+        crc32 = self._cached_hash(filepath, "crc32", chunk_size)
+        self.hash_cache.save()
+        return crc32
+
+    def _cached_hash(self, filepath, algorithm, chunk_size):
+        """
+        One hash of filepath, from the hash cache or by reading the file.
+
+        The file is stat-ed here rather than taken from the directory index, so a
+        file rewritten in place is never matched to its old hash.
+        """
         try:
-            with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(chunk_size), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            stat = os.stat(filepath)
+            cached = self.hash_cache.get(filepath, stat.st_size, stat.st_mtime_ns, algorithm)
+            if cached is not None:
+                return cached
+            algorithms = {algorithm, "md5", "crc32"} if self.fast_hash else {algorithm}
+            hashes = _hash_file(filepath, chunk_size, algorithms)
+            self.hash_cache.put(filepath, stat.st_size, stat.st_mtime_ns, hashes)
+            return hashes[algorithm]
         # pylint: disable=W0718
         except Exception as e:
-            logging.warning("Could not calculate MD5 for %s: %s", filepath, e)
+            label = "MD5" if algorithm == "md5" else algorithm.upper()
+            logging.warning("Could not calculate %s for %s: %s", label, filepath, e)
             return None
 
     def load_file_info(self, filepath):
@@ -259,6 +803,9 @@ class FileLoader:
 
         Returns:
             tuple: (filename, last_modified datetime, md5_hash)
+
+        The file is stat-ed here rather than taken from the directory index: a file
+        rewritten in place leaves its directory's mtime, and so the index, unchanged.
         """
         filename = os.path.basename(filepath)
         stat = os.stat(filepath)
@@ -266,6 +813,14 @@ class FileLoader:
         md5_hash = self.calculate_md5(filepath)
         return filename, last_modified, md5_hash
 
+    def _file_stats(self, filepath):
+        """(size, mtime) for filepath, from the directory index when it has the file."""
+        indexed = self.directory_index.lookup(filepath)
+        if indexed is not None:
+            return indexed.size, indexed.mtime
+        stat = os.stat(filepath)
+        return stat.st_size, stat.st_mtime
+
     def run(self) -> FileMetadata:
         """
         Main method to load the matching file (template or bronze),
@@ -278,32 +833,17 @@ class FileLoader:
             FileNotFoundError: If no matching file found.
             ValueError: If strict mode and unexpected file count found.
         """
-        restrict_template_to_org = self.one_company_one_template
-
-        # Define template and data paths
-        template_base = os.path.join(self.source_data_path, "Files", "templates")
-        data_base = os.path.join(self.source_data_path, "Files", "data collections")
-
-        # Find all matching files
-        all_templates = self.find_files(template_base)
-        all_templates = self.filter_files_by_org(
-            all_templates,
-            restrict_to_org=restrict_template_to_org)
-
-        all_bronze = self.find_files(data_base)
-        all_bronze = self.filter_files_by_prefix(all_bronze)
-
-        # Filter files by supplied conditions
-        template_conditions = {k: v for k, v in self.filters.items() if k in TEMPLATE_KEYS}
-        bronze_conditions = {k: v for k, v in self.filters.items() if k in BRONZE_KEYS}
+        template_conditions = self._template_conditions()
+        bronze_conditions = self._bronze_conditions()
 
         if not template_conditions:
             logging.warning("âš ï¸ No filters applied to template file search.")
         if not bronze_conditions:
             logging.warning("âš ï¸ No filters applied to bronze file search.")
 
-        matched_templates = self.filter_files_by_conditions(all_templates, template_conditions)
-        matched_bronze = self.filter_files_by_conditions(all_bronze, bronze_conditions)
+        # Find all matching files, filtered by organisation and supplied conditions
+        matched_templates, matched_bronze = self.match_files_by_organisation(
+            [self.organisation_cd])[self.organisation_cd]
 
         if len(matched_templates) > 1 and not self.strict:
             logging.warning("Multiple matching templates found; using the first one.")
@@ -312,39 +852,18 @@ class FileLoader:
         self.log_file_stats(matched_templates, "Matched Template Files")
         self.log_file_stats(matched_bronze, "Matched Bronze Files")
 
-        # Raise early if nothing found
-        if self.load_template:
-            if not matched_templates:
-                raise FileNotFoundError("No matching template files found.")
-        else:
-            if not matched_bronze:
-                raise FileNotFoundError("No matching bronze files found.")
-
-        # Enforce strict count
-        if self.strict:
-            self.validate_file_count(matched_templates, 1, "template")
-            if not self.load_template:
-                self.validate_file_count(matched_bronze, 1, "bronze")
+        try:
+            chosen_file, template_version = self._select_file(
+                matched_templates, matched_bronze, self.organisation_cd)
+        except _SelectionError as e:
+            raise e.to_exception() from None
 
-        # Final file selection and metadata
+        filename, last_modified, md5_hash = self.load_file_info(chosen_file)
         if self.load_template:
-            chosen_file = matched_templates[0]
-            filename, last_modified, md5_hash = self.load_file_info(chosen_file)
             template_version = filename
-        else:
-            chosen_file = matched_bronze[0]
-            filename, last_modified, md5_hash = self.load_file_info(chosen_file)
-            if matched_templates:
-                template_version = os.path.basename(matched_templates[0])
-            else:
-                raise FileNotFoundError("No matching template files found for the bronze file.")
 
         # Log final selection
-        logging.info("\nLoaded file: %s", chosen_file)
-        logging.info("Template Version: %s", template_version)
-        logging.info("Last Modified: %s", last_modified)
-        logging.info("MD5 Hash: %s", md5_hash if md5_hash else "Unavailable")
-
+        self._log_selection(chosen_file, template_version, last_modified, md5_hash)
 
         return FileMetadata(
             path=chosen_file,
@@ -354,3 +873,120 @@ class FileLoader:
             template_version=template_version,
             template_path = matched_templates[0],
         )
+
+    def run_batch(self, organisations) -> dict[str, FileMetadata | FileLoadError]:
+        # pylint: disable=R0914
+        """
+        Loads the matching file for each of several organisations, as run() would for each.
+
+        The directories are walked and filtered once, matched files are logged once,
+        and each chosen file is hashed once (templates shared by several organisations
+        included), with the hashes taken concurrently. The loader's own organisation_cd
+        is not used.
+
+        Args:
+            organisations (Iterable[str]): Organisation codes, compared case-insensitively.
+
+        Returns:
+            dict[str, FileMetadata | FileLoadError]: Per normalised organisation code, the
+                file metadata, or the error run() would have raised for it.
+        """
+        matched = self.match_files_by_organisation(organisations)
+
+        all_templates = sorted({f for templates, _bronze in matched.values() for f in templates})
+        all_bronze = sorted({f for _templates, bronze in matched.values() for f in bronze})
+        self.log_file_stats(all_templates, "Matched Template Files")
+        self.log_file_stats(all_bronze, "Matched Bronze Files")
+
+        selections = {}
+        for organisation_cd, (matched_templates, matched_bronze) in matched.items():
+            if len(matched_templates) > 1 and not self.strict:
+                logging.warning(
+                    "Multiple matching templates found for [%s]; using the first one.",
+                    organisation_cd)
+            try:
+                selections[organisation_cd] = self._select_file(
+                    matched_templates, matched_bronze, organisation_cd)
+            except _SelectionError as e:
+                logging.warning("âŒ [%s] %s", organisation_cd, e)
+                selections[organisation_cd] = FileLoadError(
+                    organisation_cd=organisation_cd,
+                    error_type=e.error_type.__name__,
+                    message=str(e),
+                    files=e.files,
+                )
+
+        chosen_files = [
+            selection[0] for selection in selections.values()
+            if not isinstance(selection, FileLoadError)
+        ]
+        md5_hashes = self.calculate_md5s(chosen_files)
+
+        results = {}
+        for organisation_cd, selection in selections.items():
+            if isinstance(selection, FileLoadError):
+                results[organisation_cd] = selection
+                continue
+            chosen_file, template_version = selection
+            filename = os.path.basename(chosen_file)
+            last_modified = datetime.datetime.fromtimestamp(os.stat(chosen_file).st_mtime)
+            md5_hash = md5_hashes[chosen_file]
+            if self.load_template:
+                template_version = filename
+
+            self._log_selection(chosen_file, template_version, last_modified, md5_hash)
+            results[organisation_cd] = FileMetadata(
+                path=chosen_file,
+                filename=filename,
+                last_modified=last_modified,
+                md5_hash=md5_hash,
+                template_version=template_version,
+                template_path=matched[organisation_cd][0][0],
+            )
+        return results
+
+    def _select_file(self, matched_templates, matched_bronze, organisation_cd):
+        """
+        Applies run()'s checks to one organisation's matched files.
+
+        Returns:
+            tuple[str, str | None]: The chosen file, and the template version for a bronze
+                file (None when loading templates).
+
+        Raises:
+            _SelectionError: Carrying the FileNotFoundError or ValueError run() raises.
+        """
+        # Raise early if nothing found
+        if self.load_template:
+            if not matched_templates:
+                raise _SelectionError(FileNotFoundError, "No matching template files found.")
+        else:
+            if not matched_bronze:
+                raise _SelectionError(FileNotFoundError, "No matching bronze files found.")
+
+        # Enforce strict count
+        if self.strict:
+            checks = [(matched_templates, "template")]
+            if not self.load_template:
+                checks.append((matched_bronze, "bronze"))
+            for files, file_type in checks:
+                try:
+                    self.validate_file_count(files, 1, file_type, organisation_cd)
+                except ValueError as e:
+                    raise _SelectionError(ValueError, str(e), files) from None
+
+        # Final file selection
+        if self.load_template:
+            return matched_templates[0], None
+        if not matched_templates:
+            raise _SelectionError(
+                FileNotFoundError, "No matching template files found for the bronze file.")
+        return matched_bronze[0], os.path.basename(matched_templates[0])
+
+    @staticmethod
+    def _log_selection(chosen_file, template_version, last_modified, md5_hash):
+        """Logs the chosen file and its metadata."""
+        logging.info("\nLoaded file: %s", chosen_file)
+        logging.info("Template Version: %s", template_version)
+        logging.info("Last Modified: %s", last_modified)
+        logging.info("MD5 Hash: %s", md5_hash if md5_hash else "Unavailable")
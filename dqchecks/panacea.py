@@ -6,16 +6,25 @@ Function used to do initial validation of the Excel files
 """
 import uuid
 import re
-from typing import Dict, Any, List, NamedTuple
+import hashlib
+import zipfile
+from contextlib import ExitStack
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, Any, List, NamedTuple, Optional
 from io import BytesIO
 import logging
 from collections import namedtuple
 from openpyxl import (Workbook, load_workbook)
 from openpyxl.worksheet.worksheet import Worksheet
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import get_column_letter, column_index_from_string
 from openpyxl.worksheet.formula import ArrayFormula
+import numpy as np
 import pandas as pd
 from dqchecks.utils import create_validation_event_row_dataframe
+from dqchecks.preflight import ManifestSheet, WorkbookManifest
+from dqchecks.rule_engine import RuleEngine, SheetRule, SheetVisit
+from dqchecks.telemetry import emitted, telemetry_step
 
 # Configure logging for the function
 logging.basicConfig(
@@ -40,6 +49,9 @@ def validate_tabs_between_spreadsheets(spreadsheet1: Workbook, spreadsheet2: Wor
         it will return False and provide
     details on which sheets are missing from each spreadsheet.
 
+    Either workbook may be a dqchecks.preflight.WorkbookManifest, which reads the sheet
+    names from workbook.xml without loading the workbook.
+
     Args:
         spreadsheet1 (openpyxl.workbook.workbook.Workbook): The first workbook object to compare.
         spreadsheet2 (openpyxl.workbook.workbook.Workbook): The second workbook object to compare.
@@ -57,7 +69,8 @@ def validate_tabs_between_spreadsheets(spreadsheet1: Workbook, spreadsheet2: Wor
         Exception: For any unexpected errors during execution.
     """
     # Validate input types
-    if not isinstance(spreadsheet1, Workbook) or not isinstance(spreadsheet2, Workbook):
+    workbook_types = (Workbook, WorkbookManifest)
+    if not isinstance(spreadsheet1, workbook_types) or not isinstance(spreadsheet2, workbook_types):
         raise ValueError("Both arguments must be valid openpyxl workbook objects.")
 
     # List of substrings to exclude
@@ -355,31 +368,24 @@ def check_sheet_structure(sheet1: Worksheet, sheet2: Worksheet, header_row_numbe
         - The function compares the maximum number of rows and columns
         (`max_row` and `max_column`) of the sheets.
     """
-    errors = {}
-
     # Validate input types
     if not isinstance(sheet1, Worksheet) or not isinstance(sheet2, Worksheet):
         raise ValueError("Both inputs must be valid openpyxl worksheet objects.")
 
-    # Check if both sheets are empty (either one row or one column)
-    if sheet1.max_row == sheet1.max_column == sheet2.max_row == sheet2.max_column == 1:
-        # Both sheets are empty, so do nothing
-        pass
-    else:
-        # Add error for sheet1 if it's empty (either 1 row or 1 column)
-        if sheet1.max_row == 1 or sheet1.max_column == 1:
-            errors.setdefault("Empty Sheet", []).append(f"Template sheet '{sheet1.title}' is empty")
+    # Get used area for both sheets
+    return _sheet_structure(sheet1, sheet2, header_row_number,
+                            _validated_used_area(sheet1), _validated_used_area(sheet2))
 
-        # Add error for sheet2 if it's empty (either 1 row or 1 column)
-        if sheet2.max_row == 1 or sheet2.max_column == 1:
-            errors.setdefault("Empty Sheet", []).append(f"Company sheet '{sheet2.title}' is empty")
+def _validated_used_area(sheet: Worksheet) -> UsedArea:
+    shape = get_used_area(sheet)
+    shape.validate()
+    return shape
 
-    # Get used area for both sheets
-    shape1 = get_used_area(sheet1)
-    shape1.validate()
+def _sheet_structure(sheet1: Worksheet, sheet2: Worksheet, header_row_number: int,
+                     shape1: UsedArea, shape2: UsedArea) -> dict:
+    """check_sheet_structure, given both sheets' used areas."""
+    errors = _empty_sheet_errors(sheet1, sheet2)
     rows1, cols1 = shape1.last_used_row, shape1.last_used_column
-    shape2 = get_used_area(sheet2)
-    shape2.validate()
     rows2, cols2 = shape2.last_used_row, shape2.last_used_column
 
     # Check if the number of rows and columns are the same
@@ -406,6 +412,32 @@ def check_sheet_structure(sheet1: Worksheet, sheet2: Worksheet, header_row_numbe
                 [f"Column {i}: Template: [{h1}] != [{h2}] :Company" for i, h1, h2 in diff_headers]
             )
 
+    return _sheet_structure_result(sheet1, sheet2, errors)
+
+def _empty_sheet_errors(sheet1: Worksheet, sheet2: Worksheet) -> dict:
+    """
+    "Empty Sheet" errors of check_sheet_structure: a sheet with a single row
+    or column is empty, unless both sheets are a single cell.
+    """
+    errors = {}
+
+    # Check if both sheets are empty (either one row or one column)
+    if sheet1.max_row == sheet1.max_column == sheet2.max_row == sheet2.max_column == 1:
+        # Both sheets are empty, so do nothing
+        return errors
+
+    # Add error for sheet1 if it's empty (either 1 row or 1 column)
+    if sheet1.max_row == 1 or sheet1.max_column == 1:
+        errors.setdefault("Empty Sheet", []).append(f"Template sheet '{sheet1.title}' is empty")
+
+    # Add error for sheet2 if it's empty (either 1 row or 1 column)
+    if sheet2.max_row == 1 or sheet2.max_column == 1:
+        errors.setdefault("Empty Sheet", []).append(f"Company sheet '{sheet2.title}' is empty")
+
+    return errors
+
+def _sheet_structure_result(sheet1: Worksheet, sheet2: Worksheet, errors: dict) -> dict:
+    """check_sheet_structure's result for the accumulated errors."""
     # If there are errors, return "Error" status with accumulated errors
     if errors:
         return {
@@ -435,21 +467,228 @@ def extract_formula_text(cell):
     return None
 
 
-def compare_formulas(sheet1, sheet2):
+# String literals and quoted sheet names (kept as they are), or an A1 cell reference
+_FORMULA_TOKEN = re.compile(
+    r'"(?:[^"]|"")*"|\'(?:[^\']|\'\')*\''
+    r'|(?<![\w.$])(\$?)([A-Za-z]{1,3})(\$?)([0-9]+)(?![\w(!])'
+)
+_MAX_ROW, _MAX_COLUMN = 1048576, 16384
+
+@lru_cache(maxsize=65536)
+def _split_formula(formula: str) -> tuple:
+    """
+    A formula as text pieces and (column absolute, column, row absolute, row)
+    references, memoised on the formula string.
+    """
+    parts, position = [], 0
+    for match in _FORMULA_TOKEN.finditer(formula):
+        if match.group(2) is None:
+            continue
+        column = column_index_from_string(match.group(2).upper())
+        row = int(match.group(4))
+        if column > _MAX_COLUMN or not 0 < row <= _MAX_ROW:  # a name, not a cell
+            continue
+        parts.append(formula[position:match.start()])
+        parts.append((bool(match.group(1)), column, bool(match.group(3)), row))
+        position = match.end()
+    parts.append(formula[position:])
+    return tuple(parts)
+
+def to_relative_r1c1(formula: str, row: int, column: int) -> str:
+    """
+    A formula with its A1 cell references in relative R1C1 notation, as seen
+    from the cell at (row, column): the same formula filled down or across
+    reads the same in every cell.
+
+    Example:
+        >>> to_relative_r1c1("=A10*$B$2", 10, 4)
+        '=RC[-3]*R2C2'
+    """
+    pieces = []
+    for part in _split_formula(formula):
+        if isinstance(part, str):
+            pieces.append(part)
+            continue
+        column_absolute, ref_column, row_absolute, ref_row = part
+        pieces.append(_r1c1_axis("R", row_absolute, ref_row, row))
+        pieces.append(_r1c1_axis("C", column_absolute, ref_column, column))
+    return "".join(pieces)
+
+def _r1c1_axis(letter: str, absolute: bool, index: int, origin: int) -> str:
+    if absolute:
+        return f"{letter}{index}"
+    return letter if index == origin else f"{letter}[{index - origin}]"
+
+# Formula grids are hashed in tiles of this many rows by columns
+FORMULA_BLOCK_ROWS = 64
+FORMULA_BLOCK_COLUMNS = 16
+
+class FormulaGrid(NamedTuple):
+    """
+    Block hashes of the formulas in a worksheet's used area.
+
+    Formulas are hashed (with their cell positions) per tile of
+    FORMULA_BLOCK_ROWS x FORMULA_BLOCK_COLUMNS cells; each row block and
+    column block hashes its tiles in turn. Two sheets have the same formulas
+    in a tile, band or sheet when the hashes agree, so compare_formulas only
+    descends into tiles whose hashes differ. Non-formula values are not
+    hashed: they only matter next to a formula on the other sheet.
+
+    Attributes:
+        used_area (UsedArea): The sheet's used area; cells outside it are ignored.
+        tiles (dict): (row block, column block) -> digest, for tiles holding formulas.
+        row_blocks (dict): Row block -> digest of its tiles.
+        column_blocks (dict): Column block -> digest of its tiles.
+    """
+    used_area: UsedArea
+    tiles: Dict[tuple, bytes]
+    row_blocks: Dict[int, bytes]
+    column_blocks: Dict[int, bytes]
+
+def _sheet_cell(sheet: Worksheet, row: int, column: int):
+    """The cell at (row, column) if the sheet holds one, without creating it."""
+    return sheet._cells.get((row, column))  # pylint: disable=W0212
+
+class _FormulaTiles:
+    """Formulas of a sheet's used area, gathered cell by cell into tiles."""
+
+    def __init__(self, used_area: UsedArea):
+        self.used_area = used_area
+        self.formulas: Dict[tuple, list] = {}
+
+    def add(self, row: int, column: int, cell) -> None:
+        """Record the cell's formula, if any; the caller keeps to the used area."""
+        # Formulas are typed "f" (a lone "=" stays a string), so skip the rest cheaply
+        if cell.data_type not in ("f", "s"):
+            return
+        text = extract_formula_text(cell)
+        if text:
+            tile = ((row - 1) // FORMULA_BLOCK_ROWS, (column - 1) // FORMULA_BLOCK_COLUMNS)
+            # "row:column:formula" strings sort into a canonical order per tile
+            self.formulas.setdefault(tile, []).append(f"{row}:{column}:{text}")
+
+    def grid(self) -> FormulaGrid:
+        """The FormulaGrid of the gathered formulas."""
+        tiles = {
+            tile: hashlib.blake2b("\0".join(sorted(formulas)).encode(), digest_size=16).digest()
+            for tile, formulas in self.formulas.items()
+        }
+        return FormulaGrid(
+            used_area=self.used_area,
+            tiles=tiles,
+            row_blocks=_block_hashes(tiles, 0),
+            column_blocks=_block_hashes(tiles, 1),
+        )
+
+def build_formula_grid(sheet: Worksheet, used_area: Optional[UsedArea] = None) -> FormulaGrid:
+    """
+    Summarise a worksheet's formulas as block hashes (see FormulaGrid).
+
+    Only the cells the sheet holds are visited, once each.
+
+    Args:
+        sheet (Worksheet): The worksheet to summarise.
+        used_area (UsedArea, optional): The sheet's used area, if already known.
+
+    Returns:
+        FormulaGrid: The sheet's block hashes.
+    """
+    if not isinstance(sheet, Worksheet):
+        raise ValueError("The provided input is not a valid openpyxl Worksheet object.")
+
+    tiles = _FormulaTiles(used_area if used_area is not None else _validated_used_area(sheet))
+    last_row, last_column = tiles.used_area.last_used_row, tiles.used_area.last_used_column
+    for (row, column), cell in sheet._cells.items():  # pylint: disable=W0212
+        if row <= last_row and column <= last_column:
+            tiles.add(row, column, cell)
+    return tiles.grid()
+
+def _block_hashes(tiles: dict, axis: int) -> Dict[int, bytes]:
+    """Digest per row block (axis 0) or column block (axis 1) of the tiles in it."""
+    hashes = {}
+    for tile, digest in sorted(tiles.items(), key=lambda item: (item[0][axis], item[0])):
+        hashes.setdefault(tile[axis], hashlib.blake2b(digest_size=16)).update(
+            tile[1 - axis].to_bytes(4, "big") + digest)
+    return {block: digest.digest() for block, digest in hashes.items()}
+
+def _differing_blocks(blocks1: dict, blocks2: dict) -> List[int]:
+    return sorted(b for b in blocks1.keys() | blocks2.keys() if blocks1.get(b) != blocks2.get(b))
+
+def _differing_tiles(grid1: FormulaGrid, grid2: FormulaGrid) -> List[tuple]:
+    """Tiles whose formulas differ, found through the differing row and column blocks."""
+    column_blocks = _differing_blocks(grid1.column_blocks, grid2.column_blocks)
+    return [
+        (row_block, column_block)
+        for row_block in _differing_blocks(grid1.row_blocks, grid2.row_blocks)
+        for column_block in column_blocks
+        if grid1.tiles.get((row_block, column_block)) != grid2.tiles.get((row_block, column_block))
+    ]
+
+class TemplateProfile:  # pylint: disable=R0903
+    """
+    Summaries of a template workbook, computed once per sheet and reused for
+    every company workbook compared against it.
+
+    Build it after any changes to the template (e.g. clean_formula_spaces_in_workbook)
+    and pass it to find_formula_differences(template_profile=...).
+
+    Attributes:
+        workbook (Workbook): The profiled template.
+    """
+
+    def __init__(self, workbook: Workbook):
+        if not isinstance(workbook, Workbook):
+            raise TypeError("The template must be an instance of openpyxl Workbook.")
+        self.workbook = workbook
+        self._formula_grids: Dict[str, FormulaGrid] = {}
+
+    def formula_grid(self, sheet_name: str) -> FormulaGrid:
+        """The FormulaGrid of a template sheet, built on first use."""
+        if sheet_name not in self._formula_grids:
+            self._formula_grids[sheet_name] = build_formula_grid(self.workbook[sheet_name])
+        return self._formula_grids[sheet_name]
+
+def compare_formulas(sheet1, sheet2, template_grid: Optional[FormulaGrid] = None,
+                     collapse_ranges: bool = False):
     """
     Compares the formulas between two openpyxl worksheet objects.
 
+    Both sheets are summarised as block hashes (see FormulaGrid) and only the
+    tiles whose hashes differ are compared cell by cell, so a large sheet with
+    a few edited formulas costs one pass over the company sheet plus work in
+    proportion to the edits.
+
+    With collapse_ranges, neighbouring cells with the same discrepancy once
+    their formulas are read in relative R1C1 notation (see to_relative_r1c1),
+    e.g. a whole filled-down column shifted by an inserted row, are reported
+    as one range such as "D10:D4000", described in R1C1. Lone cells are
+    reported as written.
+
+    Args:
+        sheet1 (Worksheet): The template sheet.
+        sheet2 (Worksheet): The company sheet.
+        template_grid (FormulaGrid, optional): sheet1's grid, e.g. from a
+            TemplateProfile; built here if not given.
+        collapse_ranges (bool, optional): Report ranges of cells. Defaults to False.
+
     Returns:
         dict: A dictionary with status, description, and any differences.
     """
     if not isinstance(sheet1, Worksheet) or not isinstance(sheet2, Worksheet):
         raise ValueError("Both inputs must be valid openpyxl worksheet objects.")
 
-    shape1 = get_used_area(sheet1)
-    shape1.validate()
-    shape2 = get_used_area(sheet2)
-    shape2.validate()
+    grid1 = template_grid if template_grid is not None else build_formula_grid(sheet1)
+    shape2 = _validated_used_area(sheet2)
+
+    mismatch = _dimension_mismatch(sheet1, sheet2, grid1.used_area, shape2)
+    if mismatch:
+        return mismatch
+    return _formula_comparison(
+        sheet1, sheet2, grid1, build_formula_grid(sheet2, shape2), collapse_ranges)
 
+def _dimension_mismatch(sheet1: Worksheet, sheet2: Worksheet,
+                        shape1: UsedArea, shape2: UsedArea) -> Optional[dict]:
+    """compare_formulas' result for sheets with different used areas, or None."""
     if (shape1.last_used_row, shape1.last_used_column) != \
        (shape2.last_used_row, shape2.last_used_column):
         return {
@@ -462,30 +701,16 @@ def compare_formulas(sheet1, sheet2):
             ),
             "errors": {}
         }
+    return None
 
-    differing_cells = {}
-
-    for row in range(1, shape1.last_used_row + 1):
-        for col in range(1, shape1.last_used_column + 1):
-            c1 = sheet1.cell(row=row, column=col)
-            c2 = sheet2.cell(row=row, column=col)
-
-            f1 = extract_formula_text(c1)
-            f2 = extract_formula_text(c2)
+def _formula_comparison(sheet1: Worksheet, sheet2: Worksheet, grid1: FormulaGrid,
+                        grid2: FormulaGrid, collapse_ranges: bool) -> dict:
+    """compare_formulas' result for sheets of the same used area, from their grids."""
+    differences = []
+    for tile in _differing_tiles(grid1, grid2):
+        differences.extend(_tile_differences(sheet1, sheet2, tile, grid1.used_area))
 
-            # Compare only if one or both have formulas
-            if f1 and f2 and f1 != f2:
-                differing_cells.setdefault(f"{get_column_letter(col)}{row}", []).append(
-                    f"Template: {sheet1.title}!{get_column_letter(col)}{row} ({f1}) "
-                    f"!= {sheet2.title}!{get_column_letter(col)}{row} ({f2}) :Company"
-                )
-            elif bool(f1) != bool(f2):  # one is a formula, the other is not
-                val1 = f"Formula: {f1}" if f1 else f"Value: {c1.value}"
-                val2 = f"Formula: {f2}" if f2 else f"Value: {c2.value}"
-                differing_cells.setdefault(f"{get_column_letter(col)}{row}", []).append(
-                    f"Template: {sheet1.title}!{get_column_letter(col)}{row} ({val1}) "
-                    f"!= {sheet2.title}!{get_column_letter(col)}{row} ({val2}) :Company"
-                )
+    differing_cells = _differing_cells(differences, sheet1.title, sheet2.title, collapse_ranges)
 
     if differing_cells:
         return {
@@ -500,12 +725,109 @@ def compare_formulas(sheet1, sheet2):
         "errors": {}
     }
 
+def _tile_differences(sheet1: Worksheet, sheet2: Worksheet, tile: tuple, used_area: UsedArea):
+    """(row, column, f1, f2, v1, v2) of each differing cell of a tile, within the used area."""
+    row_block, column_block = tile
+    rows = range(row_block * FORMULA_BLOCK_ROWS + 1,
+                 min((row_block + 1) * FORMULA_BLOCK_ROWS, used_area.last_used_row) + 1)
+    columns = range(column_block * FORMULA_BLOCK_COLUMNS + 1,
+                    min((column_block + 1) * FORMULA_BLOCK_COLUMNS, used_area.last_used_column) + 1)
+    for row in rows:
+        for col in columns:
+            difference = _formula_difference(sheet1, sheet2, row, col)
+            if difference:
+                yield (row, col) + difference
+
+def _formula_difference(sheet1: Worksheet, sheet2: Worksheet, row: int, col: int):
+    """(f1, f2, v1, v2) of a cell whose formulas differ (f is None for a plain value), or None."""
+    c1 = _sheet_cell(sheet1, row, col)
+    c2 = _sheet_cell(sheet2, row, col)
+
+    f1 = extract_formula_text(c1) if c1 is not None else None
+    f2 = extract_formula_text(c2) if c2 is not None else None
+
+    # Compare only if one or both have formulas
+    if (f1 and f2 and f1 != f2) or bool(f1) != bool(f2):
+        return (f1, f2,
+                c1.value if c1 is not None else None,
+                c2.value if c2 is not None else None)
+    return None
+
+def _difference_sides(f1, f2, v1, v2, formula_text=str) -> tuple:
+    """
+    How each side of a formula difference is described; formula_text renders
+    a formula (as written, or in relative R1C1 for ranges).
+    """
+    if f1 and f2:
+        return formula_text(f1), formula_text(f2)
+    # one is a formula, the other is not
+    return (f"Formula: {formula_text(f1)}" if f1 else f"Value: {v1}",
+            f"Formula: {formula_text(f2)}" if f2 else f"Value: {v2}")
+
+def _differing_cells(differences: list, title1: str, title2: str, collapse_ranges: bool) -> dict:
+    """compare_formulas' errors: descriptions keyed by cell (or range), in sheet order."""
+    differing_cells = {}
+    if collapse_ranges:
+        for first_row, first_col, last_row, last_col, sides, first in \
+                _collapse_differences(differences):
+            ref = f"{get_column_letter(first_col)}{first_row}"
+            if (first_row, first_col) == (last_row, last_col):
+                # A lone cell is reported as written
+                sides = _difference_sides(*first[2:])
+            else:
+                ref += f":{get_column_letter(last_col)}{last_row}"
+            differing_cells[ref] = [
+                f"Template: {title1}!{ref} ({sides[0]}) != {title2}!{ref} ({sides[1]}) :Company"]
+    else:
+        for difference in sorted(differences, key=lambda d: (d[0], d[1])):
+            ref = f"{get_column_letter(difference[1])}{difference[0]}"
+            sides = _difference_sides(*difference[2:])
+            differing_cells[ref] = [
+                f"Template: {title1}!{ref} ({sides[0]}) != {title2}!{ref} ({sides[1]}) :Company"]
+    return differing_cells
+
+def _collapse_differences(differences: list) -> list:
+    """
+    Merge differing cells into ranges: runs of rows in a column with the same
+    discrepancy in relative R1C1 form (the same formula filled down), then
+    side-by-side runs over the same rows.
+
+    Returns:
+        list: (first row, first column, last row, last column, sides, first
+        difference) per range, in sheet order.
+    """
+    # Vertical runs, column by column
+    runs = []
+    for difference in sorted(differences, key=lambda d: (d[1], d[0])):
+        row, col = difference[:2]
+        sides = _difference_sides(
+            *difference[2:], lambda f, r=row, c=col: to_relative_r1c1(f, r, c))
+        if runs and runs[-1][1] == col and runs[-1][2] == row - 1 and runs[-1][3] == sides:
+            runs[-1][2] = row
+        else:
+            runs.append([row, col, row, sides, difference])
+
+    # Runs in adjacent columns over the same rows become one block
+    blocks, open_blocks = [], {}
+    for first_row, col, last_row, sides, first in runs:
+        key = (first_row, last_row, sides)
+        block = open_blocks.get(key)
+        if block is not None and block[3] == col - 1:
+            block[3] = col
+        else:
+            block = [first_row, col, last_row, col, sides, first]
+            open_blocks[key] = block
+            blocks.append(block)
+    return sorted((tuple(block) for block in blocks), key=lambda b: (b[0], b[1]))
+
 def check_formula_errors(sheet):
     """
     Checks for formula errors in a given openpyxl worksheet.
     
     Arguments:
         sheet (openpyxl.worksheet.worksheet.Worksheet): The worksheet to check for formula errors.
+            May also be a sheet of a dqchecks.preflight.WorkbookManifest, whose
+            error cells are streamed from the sheet XML.
     
     Returns:
         dict: A dictionary with status, description, and any found errors in the format:
@@ -523,39 +845,80 @@ def check_formula_errors(sheet):
         print(result)
     """
     # Validate input types
+    if isinstance(sheet, ManifestSheet):
+        errors = {}
+        for coordinate, error in sheet.iter_errors():
+            errors.setdefault(error, []).append(coordinate)
+        return _formula_error_result(errors)
     if not isinstance(sheet, Worksheet):
         raise ValueError("Input must be valid openpyxl worksheet object.")
 
-    error_details = {}
+    rule = FormulaErrorRule()
+    RuleEngine([rule]).run(sheet.parent, sheet_names=[sheet.title])
+    return rule.sheet_results[sheet.title]
 
-    shape = get_used_area(sheet)
-    shape.validate()
+def _company_used_area(visit: SheetVisit) -> UsedArea:
+    """The company sheet's used area, computed once per sheet for all rules."""
+    return visit.cached("company_used_area", lambda: _validated_used_area(visit.company_sheet))
 
-    # Iterate over all cells in the sheet
-    for n_col, row in enumerate(sheet.iter_rows()):
-        if n_col > shape.last_used_row:
-            break
-        for cell in row[:shape.last_used_column]:
-            # Check if the cell contains an error (identified by an 'e')
-            if cell.data_type == 'e':
-                # If the formula's output is one of the known error strings
-                if isinstance(cell.value, str):
-                    cell_name = f"{get_column_letter(cell.column)}{cell.row}"
-                    # Group errors by type
-                    if cell.value not in error_details:
-                        error_details[cell.value] = []
-                    error_details[cell.value].append(cell_name)
-
-    # If no errors were found, return the status as "Ok"
-    if not error_details:
-        return {"status": "Ok", "description": "No errors found", "errors": {}}
+def _template_used_area(visit: SheetVisit) -> UsedArea:
+    """The template sheet's used area, computed once per sheet for all rules."""
+    return visit.cached("template_used_area", lambda: _validated_used_area(visit.template_sheet))
 
-    # If errors were found, return the status as "Error" with the grouped error details
-    return {
-        "status": "Error",
-        "description": "Found errors",
-        "errors": error_details
-    }
+class FormulaErrorRule(SheetRule):
+    """
+    Rule 2: cells holding formula errors (#DIV/0!, #REF!, ...), grouped by error.
+
+    Attributes:
+        sheet_results (dict): Sheet name -> check_formula_errors result.
+    """
+    rule_cd = "Rule 2: Formula Error Check"
+
+    def __init__(self):
+        self.sheet_results: Dict[str, dict] = {}
+        self._errors: Dict[str, list] = {}
+
+    def start(self):
+        self.sheet_results = {}
+
+    def start_sheet(self, visit):
+        if not isinstance(visit.company_sheet, Worksheet):
+            raise ValueError("Input must be valid openpyxl worksheet object.")
+        self._errors = {}
+        shape = _company_used_area(visit)
+        # Rows up to one past the used area, as check_formula_errors always has
+        return shape.last_used_row + 1, shape.last_used_column
+
+    def visit_cell(self, visit, row, column, cell):
+        # Check if the cell contains an error (identified by an 'e')
+        # whose output is one of the known error strings
+        if cell.data_type == 'e' and isinstance(cell.value, str):
+            self._errors.setdefault(cell.value, []).append(f"{get_column_letter(column)}{row}")
+
+    def end_sheet(self, visit):
+        self.sheet_results[visit.sheet_name] = _formula_error_result(self._errors)
+
+    def result(self) -> pd.DataFrame:
+        """The errors of every sheet, as find_formula_errors returns them."""
+        return _formula_errors_dataframe(self.sheet_results)
+
+def _formula_error_result(errors: Dict[str, list]) -> dict:
+    """The check_formula_errors result of a sheet's cells grouped by error."""
+    if not errors:
+        return {"status": "Ok", "description": "No errors found", "errors": {}}
+    return {"status": "Error", "description": "Found errors", "errors": errors}
+
+def _formula_errors_dataframe(sheet_results: Dict[str, dict]) -> pd.DataFrame:
+    """The find_formula_errors frame of sheet name -> check_formula_errors result."""
+    return pd.concat([
+        create_dataframe_formula_errors(result, FormulaErrorSheetContext(
+            Rule_Cd=FormulaErrorRule.rule_cd,
+            Sheet_Cd=sheet_name,
+            Error_Category="Formula Error",
+            Error_Severity_Cd="hard",  # Placeholder for error severity
+        ))
+        for sheet_name, result in sheet_results.items()
+    ], ignore_index=True)
 
 class MissingSheetContext(NamedTuple):
     """
@@ -750,6 +1113,8 @@ def find_missing_sheets(wb_template: Workbook, wb_company: Workbook):
     """
     Finds missing sheets between two provided openpyxl workbooks and returns a DataFrame 
     representing the missing sheets based on the comparison of the workbooks.
+
+    Either workbook may be a dqchecks.preflight.WorkbookManifest (sheet names only).
     
     Args:
         wb_template (openpyxl.workbook): The template workbook.
@@ -763,14 +1128,12 @@ def find_missing_sheets(wb_template: Workbook, wb_company: Workbook):
     """
 
     # Input validation for 'wb_template' and 'wb_company'
-    if not isinstance(wb_template, Workbook):
+    if not isinstance(wb_template, (Workbook, WorkbookManifest)):
         raise ValueError("The 'wb_template' argument must be a valid openpyxl Workbook.")
 
-    if not isinstance(wb_company, Workbook):
+    if not isinstance(wb_company, (Workbook, WorkbookManifest)):
         raise ValueError("The 'wb_company' argument must be a valid openpyxl Workbook.")
 
-    a = validate_tabs_between_spreadsheets(wb_template, wb_company)
-
     # Create the context for missing sheets
     missing_sheet_context = MissingSheetContext(
         Rule_Cd="Rule 3: Missing Sheets",
@@ -778,8 +1141,12 @@ def find_missing_sheets(wb_template: Workbook, wb_company: Workbook):
         Error_Severity_Cd="hard",
     )
 
-    # Generate the DataFrame for missing sheets
-    missing_sheets_df = create_dataframe_missing_sheets(a, missing_sheet_context)
+    with telemetry_step("panacea", missing_sheet_context.Rule_Cd) as counters:
+        a = validate_tabs_between_spreadsheets(wb_template, wb_company)
+
+        # Generate the DataFrame for missing sheets
+        missing_sheets_df = create_dataframe_missing_sheets(a, missing_sheet_context)
+        counters.rows = len(missing_sheets_df)
 
     return missing_sheets_df
 
@@ -892,13 +1259,21 @@ def create_dataframe_formula_errors(input_data: dict, context: FormulaErrorSheet
 
     return df
 
-def find_formula_errors(wb: Workbook):
+def find_formula_errors(wb: Workbook, max_workers: Optional[int] = None):
     """
     Finds formula errors across all sheets in an Excel workbook
         and returns a consolidated DataFrame.
 
     Args:
         wb (Workbook): The openpyxl Workbook object representing the Excel file.
+            May also be a dqchecks.preflight.WorkbookManifest of the package:
+            the error-typed cells are then streamed from each sheet's XML, in
+            parallel across sheets, without loading the workbook. The result
+            is the same as for the workbook loaded with data_only=True, except
+            that every error cell is found, also on sparse sheets whose used
+            area (get_used_area) stops short of it.
+        max_workers (int, optional): Threads scanning sheet parts when wb is a
+            WorkbookManifest; None for ThreadPoolExecutor's own default.
 
     Returns:
         pd.DataFrame: A DataFrame containing the formula errors from all sheets in the workbook.
@@ -915,39 +1290,23 @@ def find_formula_errors(wb: Workbook):
     all sheets.
     """
 
+    if isinstance(wb, WorkbookManifest):
+        errors = {name: {} for name in wb.sheetnames}
+        for sheet_name, coordinate, error in wb.formula_errors(max_workers=max_workers):
+            errors[sheet_name].setdefault(error, []).append(coordinate)
+        sheet_results = {name: _formula_error_result(e) for name, e in errors.items()}
+        return emitted(
+            "panacea", FormulaErrorRule.rule_cd, _formula_errors_dataframe(sheet_results))
+
     # Input validation for the 'wb' argument (must be a valid openpyxl Workbook)
     if not isinstance(wb, Workbook):
         raise ValueError("The 'wb' argument must be a valid openpyxl Workbook.")
 
-    # Initialize an empty list to store DataFrames for each sheet's formula errors
-    all_formula_error_dfs = []
-
-    # Loop through each sheet in the workbook
-    for sheetname in wb.sheetnames:
-        # Run formula checks for the current sheet and store the results
-        formula_errors = check_formula_errors(wb[sheetname])
-
-        # Create a context object for the current sheet with formula error details
-        formula_error_sheet_context = FormulaErrorSheetContext(
-            Rule_Cd="Rule 2: Formula Error Check",
-            Sheet_Cd=sheetname,
-            Error_Category="Formula Error",
-            Error_Severity_Cd="hard",  # Placeholder for error severity
-        )
-
-        # Create a DataFrame for the current sheet's formula errors using the helper function
-        sheet_error_df = create_dataframe_formula_errors(
-            formula_errors,
-            formula_error_sheet_context)
+    # Run formula checks for every sheet in one walk and combine their DataFrames
+    rule = FormulaErrorRule()
+    RuleEngine([rule]).run(wb)
+    return emitted("panacea", rule.rule_cd, rule.result())
 
-        # Append the DataFrame for the current sheet to the list
-        all_formula_error_dfs.append(sheet_error_df)
-
-    # Concatenate all the DataFrames in the list into one large DataFrame
-    final_formula_error_df = pd.concat(all_formula_error_dfs, ignore_index=True)
-
-    # Return the final concatenated DataFrame containing all formula errors from all sheets
-    return final_formula_error_df
 
 # Define namedtuple for context
 StructureDiscrepancyContext = namedtuple(
@@ -1046,7 +1405,78 @@ def create_dataframe_structure_discrepancies(
     # Return the resulting DataFrame
     return df
 
-def find_shape_differences(wb_template: Workbook, wb_company: Workbook) -> pd.DataFrame:
+class SheetSkipCounter:  # pylint: disable=R0903
+    """
+    Sheets find_formula_differences / find_shape_differences compared, and
+    those they skipped because the company sheet is identical to the template's.
+
+    Pass one as skip_counter=...; it accumulates across calls.
+
+    Attributes:
+        compared (int): Common sheets seen.
+        skipped (int): Sheets answered without a cell-by-cell scan.
+        skipped_sheets (list[str]): Names of the skipped sheets.
+    """
+
+    def __init__(self):
+        self.compared = 0
+        self.skipped = 0
+        self.skipped_sheets: List[str] = []
+
+    def add(self, sheet_name: str, skipped: bool) -> None:
+        """Count one compared sheet."""
+        self.compared += 1
+        if skipped:
+            self.skipped += 1
+            self.skipped_sheets.append(sheet_name)
+
+def identical_sheets(template_source, company_source, sheet_names) -> set:
+    """
+    Common sheets whose parts are identical in the template and company packages
+    (see WorkbookManifest.identical_sheets); empty when a source is missing or
+    cannot be read, so the checks fall back to the full comparison.
+
+    Args:
+        template_source: Template package (path, file-like object or WorkbookManifest), or None.
+        company_source: Company package (path, file-like object or WorkbookManifest), or None.
+        sheet_names (Iterable[str]): Sheets to consider.
+
+    Returns:
+        set: Names of the sheets whose parts are identical in both packages.
+    """
+    if template_source is None or company_source is None:
+        return set()
+    try:
+        with ExitStack() as stack:
+            manifests = [
+                source if isinstance(source, WorkbookManifest)
+                else stack.enter_context(WorkbookManifest(source))
+                for source in (template_source, company_source)
+            ]
+            return manifests[0].identical_sheets(manifests[1], sheet_names)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        logger.warning("Could not compare sheet parts, comparing every sheet: %s", e)
+        return set()
+
+def _same_header_row(sheet1: Worksheet, sheet2: Worksheet, header_row_number: int) -> bool:
+    """
+    Whether the header rows hold equal values over the whole sheet width. Identical
+    sheet parts can still load different header values if the packages' number
+    formats differ (a date-formatted number), so skipped fOut_ sheets check them.
+    """
+    if header_row_number <= 0:
+        return True
+    return sheet1.max_column == sheet2.max_column and all(
+        sheet1.cell(row=header_row_number, column=c).value
+        == sheet2.cell(row=header_row_number, column=c).value
+        for c in range(1, sheet1.max_column + 1))
+
+def find_shape_differences(
+        wb_template: Workbook,
+        wb_company: Workbook,
+        template_source=None,
+        company_source=None,
+        skip_counter: Optional[SheetSkipCounter] = None) -> pd.DataFrame:
     """
     Compares the sheet structures between two workbooks (template and company)
     and identifies discrepancies.
@@ -1055,10 +1485,20 @@ def find_shape_differences(wb_template: Workbook, wb_company: Workbook) -> pd.Da
     the structures, and returns a DataFrame that highlights the discrepancies 
     found in the structures.
 
+    Given the packages the workbooks were loaded from, sheets identical in both
+    (see WorkbookManifest.identical_sheets) skip the used-area scan; only the
+    "Empty Sheet" checks, which need no scan, run for them. The result is the same.
+
     :param wb_template: The template workbook to compare against.
     :type wb_template: openpyxl.Workbook
     :param wb_company: The company workbook to compare.
     :type wb_company: openpyxl.Workbook
+    :param template_source: Optional path, bytes, file object or WorkbookManifest
+        of the template package.
+    :param company_source: Optional path, bytes, file object or WorkbookManifest
+        of the company package.
+    :param skip_counter: Optional SheetSkipCounter to count skipped sheets into.
+    :type skip_counter: SheetSkipCounter
 
     :return: A DataFrame containing the structure discrepancies found 
         between the two workbooks.
@@ -1070,53 +1510,98 @@ def find_shape_differences(wb_template: Workbook, wb_company: Workbook) -> pd.Da
         `openpyxl.Workbook`.
     :raises KeyError: If a sheet does not exist in one of the workbooks.
     """
-
     # Input validation
     if not isinstance(wb_template, Workbook) or not isinstance(wb_company, Workbook):
         raise TypeError("Both inputs must be instances of openpyxl Workbook.")
 
-    # Initialize an empty list to store individual DataFrames for discrepancies
-    all_shape_error_dfs: List[pd.DataFrame] = []
-
-    # Loop through each sheet in both workbooks and find common sheet names
+    # Find common sheet names; the rule checks each of them
     common_sheetnames = set(wb_template.sheetnames).intersection(set(wb_company.sheetnames))
 
     if not common_sheetnames:
         logger.warning("No common sheets found between the template and company workbooks.")
 
-    for sheetname in common_sheetnames:
-        # Create the context for the current sheet
-        context = StructureDiscrepancyContext(
-            Rule_Cd="Rule 4: Structural Discrepancy",
-            Sheet_Cd=sheetname,  # Specify the sheet name with the issue
-            Error_Category="Structure Discrepancy",
-            Error_Severity_Cd="hard"
-        )
+    rule = ShapeRule(identical_sheets(template_source, company_source, common_sheetnames),
+                     skip_counter)
+    RuleEngine([rule]).run(wb_company, wb_template)
+    return emitted("panacea", rule.rule_cd, rule.result())
 
-        # only fOut_ sheets have somewhat consistent headers on row 2
-        header_row_number = 2 if sheetname.startswith("fOut_") else 0
+class ShapeRule(SheetRule):
+    """
+    Rule 4: structure discrepancies (used area, fOut_ headers) between each
+    company sheet and the template sheet of the same name.
 
-        # Check for structure discrepancies in the current sheet
-        discrepancies = check_sheet_structure(
-            wb_template[sheetname],
-            wb_company[sheetname],
-            header_row_number)
+    Args:
+        identical (Iterable[str], optional): Sheets known to be identical in both
+            packages (see WorkbookManifest.identical_sheets), which skip the scan.
+        skip_counter (SheetSkipCounter, optional): Counter for skipped sheets.
+    """
+    rule_cd = "Rule 4: Structural Discrepancy"
 
-        # If discrepancies are found, create a DataFrame
-        df = create_dataframe_structure_discrepancies(discrepancies, context)
-        all_shape_error_dfs.append(df)
+    def __init__(self, identical=(), skip_counter: Optional[SheetSkipCounter] = None):
+        self.identical = frozenset(identical)
+        self.skip_counter = skip_counter
+        self._dfs: List[pd.DataFrame] = []
+        self._compared = self._skipped = 0
 
-    # If no discrepancies were found, return an empty DataFrame
-    if not all_shape_error_dfs:
-        logger.info("No structure discrepancies were found in any sheet.")
-        return pd.DataFrame()  # Return an empty DataFrame if no discrepancies
+    def start(self):
+        self._dfs = []
+        self._compared = self._skipped = 0
 
-    # Concatenate all DataFrames in the list to create one big DataFrame
-    final_shape_error_df = pd.concat(all_shape_error_dfs, ignore_index=True)
+    def start_sheet(self, visit):
+        if visit.template_sheet is None:
+            return None
+        sheet1, sheet2 = visit.template_sheet, visit.company_sheet
 
-    # Return the final DataFrame containing all the discrepancies
-    logger.info("Found %s structure discrepancies across sheets.", len(final_shape_error_df))
-    return final_shape_error_df
+        # only fOut_ sheets have somewhat consistent headers on row 2
+        header_row_number = 2 if visit.sheet_name.startswith("fOut_") else 0
+
+        skip = visit.sheet_name in self.identical and \
+            _same_header_row(sheet1, sheet2, header_row_number)
+        self._compared += 1
+        if self.skip_counter is not None:
+            self.skip_counter.add(visit.sheet_name, skip)
+
+        if skip:
+            # Same cells in both: used areas and headers match
+            self._skipped += 1
+            discrepancies = _sheet_structure_result(
+                sheet1, sheet2, _empty_sheet_errors(sheet1, sheet2))
+        else:
+            if not isinstance(sheet1, Worksheet) or not isinstance(sheet2, Worksheet):
+                raise ValueError("Both inputs must be valid openpyxl worksheet objects.")
+            # Check for structure discrepancies in the current sheet
+            discrepancies = _sheet_structure(
+                sheet1, sheet2, header_row_number,
+                _template_used_area(visit), _company_used_area(visit))
+
+        # If discrepancies are found, create a DataFrame
+        self._dfs.append(create_dataframe_structure_discrepancies(
+            discrepancies,
+            StructureDiscrepancyContext(
+                Rule_Cd=self.rule_cd,
+                Sheet_Cd=visit.sheet_name,  # Specify the sheet name with the issue
+                Error_Category="Structure Discrepancy",
+                Error_Severity_Cd="hard"
+            )))
+        return None
+
+    def result(self) -> pd.DataFrame:
+        """The discrepancies of every sheet, as find_shape_differences returns them."""
+        if self._skipped:
+            logger.info("Skipped %s of %s sheets identical to the template.",
+                        self._skipped, self._compared)
+
+        # If no discrepancies were found, return an empty DataFrame
+        if not self._dfs:
+            logger.info("No structure discrepancies were found in any sheet.")
+            return pd.DataFrame()  # Return an empty DataFrame if no discrepancies
+
+        # Concatenate all DataFrames in the list to create one big DataFrame
+        final_shape_error_df = pd.concat(self._dfs, ignore_index=True)
+
+        # Return the final DataFrame containing all the discrepancies
+        logger.info("Found %s structure discrepancies across sheets.", len(final_shape_error_df))
+        return final_shape_error_df
 
 # Define namedtuple for context
 FormulaDifferencesContext = namedtuple(
@@ -1199,7 +1684,14 @@ def create_dataframe_formula_differences(
     # Return the resulting DataFrame
     return df
 
-def find_formula_differences(wb_template: Workbook, wb_company: Workbook) -> pd.DataFrame:
+def find_formula_differences(
+        wb_template: Workbook,
+        wb_company: Workbook,
+        template_source=None,
+        company_source=None,
+        skip_counter: Optional[SheetSkipCounter] = None,
+        template_profile: Optional[TemplateProfile] = None,
+        collapse_ranges: bool = True) -> pd.DataFrame:
     """
     Compares the formulas between two workbooks (template and company) and identifies discrepancies.
 
@@ -1208,10 +1700,27 @@ def find_formula_differences(wb_template: Workbook, wb_company: Workbook) -> pd.
     all formula differences (if any), including the sheet name, error category, and severity, and 
     concatenates these into a single DataFrame.
 
+    Given the packages the workbooks were loaded from, sheets identical in both
+    (see WorkbookManifest.identical_sheets) have no formula differences and are
+    not compared cell by cell.
+
     :param wb_template: The template workbook to compare against.
     :type wb_template: openpyxl.Workbook
     :param wb_company: The company workbook to compare.
     :type wb_company: openpyxl.Workbook
+    :param template_source: Optional path, bytes, file object or WorkbookManifest
+        of the template package.
+    :param company_source: Optional path, bytes, file object or WorkbookManifest
+        of the company package.
+    :param skip_counter: Optional SheetSkipCounter to count skipped sheets into.
+    :type skip_counter: SheetSkipCounter
+    :param template_profile: Optional TemplateProfile of wb_template, to reuse its
+        formula block hashes across company workbooks.
+    :type template_profile: TemplateProfile
+    :param collapse_ranges: Report neighbouring cells with the same discrepancy in
+        relative R1C1 form as one range event, e.g. Cell_Cd "D10:D4000"
+        (see compare_formulas). Defaults to True.
+    :type collapse_ranges: bool
 
     :return: A DataFrame containing all the formula differences found between the two workbooks. 
              Each row represents a formula discrepancy with details such as sheet name, 
@@ -1222,40 +1731,110 @@ def find_formula_differences(wb_template: Workbook, wb_company: Workbook) -> pd.
     :raises ValueError: If either of the workbooks does not contain any sheets.
     :raises Exception: If an error occurs during the formula comparison process.
     """
+    # pylint: disable=R0913,R0917
     # Input validation
     if not isinstance(wb_template, Workbook) or not isinstance(wb_company, Workbook):
         raise TypeError("Both inputs must be instances of openpyxl Workbook.")
 
-    # Initialize an empty list to store individual DataFrames
-    all_formula_difference_dfs = []
+    if template_profile is None:
+        template_profile = TemplateProfile(wb_template)
+    elif template_profile.workbook is not wb_template:
+        raise ValueError("template_profile must be a profile of wb_template.")
 
-    # Loop through each sheet in both workbooks and find common sheet names
+    # Find common sheet names; the rule compares the formulas of each of them
     common_sheetnames = set(wb_template.sheetnames).intersection(set(wb_company.sheetnames))
+    identical = identical_sheets(template_source, company_source, common_sheetnames)
 
-    # Loop through each common sheet to compare formulas
-    for sheetcd in common_sheetnames:
-        # Create the context for the current sheet
-        context = FormulaDifferencesContext(
-            Rule_Cd="Rule 1: Formula Difference",
-            Sheet_Cd=sheetcd,  # Specify the sheet name with the issue
-            Error_Category="Formula Difference",
-            Error_Severity_Cd="hard"
-        )
+    rule = FormulaDifferenceRule(template_profile, identical, skip_counter, collapse_ranges)
+    RuleEngine([rule]).run(wb_company, wb_template)
+    return emitted("panacea", rule.rule_cd, rule.result())
 
-        # Compare formulas between the template and company workbooks for the current sheet
-        a = compare_formulas(wb_template[sheetcd], wb_company[sheetcd])
+class FormulaDifferenceRule(SheetRule):  # pylint: disable=R0902
+    """
+    Rule 1: formula differences between each company sheet and the template
+    sheet of the same name (see compare_formulas). The company sheet's formula
+    grid is gathered during the walk; the template's comes from the profile.
 
+    Args:
+        template_profile (TemplateProfile): Profile of the template workbook.
+        identical (Iterable[str], optional): Sheets known to be identical in both
+            packages, reported without comparing.
+        skip_counter (SheetSkipCounter, optional): Counter for skipped sheets.
+        collapse_ranges (bool, optional): Report ranges of cells. Defaults to True.
+    """
+    rule_cd = "Rule 1: Formula Difference"
+
+    def __init__(self, template_profile: TemplateProfile, identical=(),
+                 skip_counter: Optional[SheetSkipCounter] = None, collapse_ranges: bool = True):
+        self.template_profile = template_profile
+        self.identical = frozenset(identical)
+        self.skip_counter = skip_counter
+        self.collapse_ranges = collapse_ranges
+        self._dfs: List[pd.DataFrame] = []
+        self._compared = self._skipped = 0
+        self._grid1: Optional[FormulaGrid] = None
+        self._tiles: Optional[_FormulaTiles] = None
+
+    def start(self):
+        self._dfs = []
+        self._compared = self._skipped = 0
+
+    def start_sheet(self, visit):
+        self._tiles = None
+        if visit.template_sheet is None:
+            return None
+        skip = visit.sheet_name in self.identical
+        self._compared += 1
+        self._skipped += skip
+        if self.skip_counter is not None:
+            self.skip_counter.add(visit.sheet_name, skip)
+        if skip:
+            self._add(visit, {"status": "Ok", "description": "All formulas are equivalent",
+                              "errors": {}})
+            return None
+
+        sheet1, sheet2 = visit.template_sheet, visit.company_sheet
+        if not isinstance(sheet1, Worksheet) or not isinstance(sheet2, Worksheet):
+            raise ValueError("Both inputs must be valid openpyxl worksheet objects.")
+        self._grid1 = self.template_profile.formula_grid(visit.sheet_name)
+        visit.cached("template_used_area", lambda: self._grid1.used_area)
+        shape2 = _company_used_area(visit)
+
+        mismatch = _dimension_mismatch(sheet1, sheet2, self._grid1.used_area, shape2)
+        if mismatch:
+            self._add(visit, mismatch)
+            return None
+        self._tiles = _FormulaTiles(shape2)
+        return shape2.last_used_row, shape2.last_used_column
+
+    def visit_cell(self, visit, row, column, cell):
+        self._tiles.add(row, column, cell)
+
+    def end_sheet(self, visit):
+        if self._tiles is not None:
+            self._add(visit, _formula_comparison(
+                visit.template_sheet, visit.company_sheet, self._grid1, self._tiles.grid(),
+                self.collapse_ranges))
+
+    def _add(self, visit: SheetVisit, comparison: dict) -> None:
         # Generate the DataFrame for the current sheet's formula differences
-        df = create_dataframe_formula_differences(a, context)
-
-        # Append the DataFrame for this sheet to the list
-        all_formula_difference_dfs.append(df)
-
-    # Concatenate all DataFrames in the list to create one big DataFrame
-    final_formula_difference_df = pd.concat(all_formula_difference_dfs, ignore_index=True)
-
-    # Return the final DataFrame containing all the formula differences
-    return final_formula_difference_df
+        self._dfs.append(create_dataframe_formula_differences(
+            comparison,
+            FormulaDifferencesContext(
+                Rule_Cd=self.rule_cd,
+                Sheet_Cd=visit.sheet_name,  # Specify the sheet name with the issue
+                Error_Category="Formula Difference",
+                Error_Severity_Cd="hard"
+            )))
+
+    def result(self) -> pd.DataFrame:
+        """The differences of every sheet, as find_formula_differences returns them."""
+        if self._skipped:
+            logger.info("Skipped %s of %s sheets identical to the template.",
+                        self._skipped, self._compared)
+
+        # Concatenate all DataFrames in the list to create one big DataFrame
+        return pd.concat(self._dfs, ignore_index=True)
 
 def check_value_in_cell(
         workbook: Workbook,
@@ -1270,6 +1849,9 @@ def check_value_in_cell(
     It handles cases where the sheet is missing or the value does not match
     the expected value in the specified cell.
 
+    The workbook may be a dqchecks.preflight.WorkbookManifest, which streams the
+    sheet part only up to the cell's row and reads values as data_only=True.
+
     Args:
         workbook (openpyxl.Workbook): The workbook to check, which contains multiple sheets.
         sheet_name (str): The name of the sheet within the workbook where the cell will be checked.
@@ -1325,7 +1907,7 @@ def check_value_in_cell(
     """
 
     # Input validation
-    if not isinstance(workbook, Workbook):
+    if not isinstance(workbook, (Workbook, WorkbookManifest)):
         raise ValueError("The 'workbook' argument must be a valid openpyxl Workbook object.")
 
     if not isinstance(sheet_name, str) or not sheet_name:
@@ -1353,10 +1935,12 @@ def check_value_in_cell(
     sheet = workbook[sheet_name]
 
     # Check if the provided cell name is valid
-    try:
-        cell_value = sheet[cell_name].value
-    except Exception as e:
-        raise ValueError(f"Invalid cell name '{cell_name}' in sheet '{sheet_name}'.") from e
+    with telemetry_step("panacea", "check_value_in_cell", sheet_name) as counters:
+        try:
+            cell_value = sheet[cell_name].value
+        except Exception as e:
+            raise ValueError(f"Invalid cell name '{cell_name}' in sheet '{sheet_name}'.") from e
+        counters.cells = 1
 
     # Compare the value of the cell with the provided value
     errors = []
@@ -1518,7 +2102,9 @@ def check_for_nulls_and_duplicates(
     
     Args:
         worksheet (openpyxl.worksheet.worksheet.Worksheet): The worksheet to check.
-        column_index (int): The index of the column to check for null and duplicate values.
+        column_index (int | list[int]): The index of the column to check for null and duplicate values, or the
+            indexes of the columns of a composite key (a row is null if any of them is; duplicates are keyed by
+            the tuple of their values).
         skip_rows (int): The number of rows to skip at the beginning.
         skip_row_after_header (int): The row to skip immediately after the header.
         working_area (dict): Output from get_used_area function for given sheet.
@@ -1528,36 +2114,59 @@ def check_for_nulls_and_duplicates(
             - A list of rows where null values were found.
             - A dictionary where keys are duplicate values and values are lists of rows containing those duplicates.
     """
-    null_rows = []
-    duplicate_rows = {}
-    seen_values = {}
+    column_indexes = [column_index] if isinstance(column_index, int) else list(column_index)
+    keys = _key_columns(
+        worksheet, range(skip_rows + 2, working_area.last_used_row + 1), column_indexes)
+    null_rows, duplicate_rows = _nulls_and_duplicates(keys, skip_row_after_header)
+    if isinstance(column_index, int):
+        duplicate_rows = {value[0]: rows for value, rows in duplicate_rows.items()}
+    return null_rows, duplicate_rows
 
-    # Iterate through all rows in the identified column (skip the first `skip_rows` rows)
-    for row in range(skip_rows + 2, working_area.last_used_row + 1):
-        cell_value = worksheet.cell(row=row, column=column_index).value
+def _key_columns(worksheet: Worksheet, rows: range, column_indexes: List[int]) -> pd.DataFrame:
+    """
+    Values of the key columns over rows, one frame column per key column and
+    indexed by row, read from the sheet's cell map (empty cells are not created).
+    """
+    cells = worksheet._cells  # pylint: disable=W0212
+    return pd.DataFrame({
+        position: [cell.value if cell is not None else None
+                   for cell in map(cells.get, zip(rows, repeat(column)))]
+        for position, column in enumerate(column_indexes)
+    }, index=rows, columns=range(len(column_indexes)), dtype=object)
 
-        # If the cell is None (null value), record the row
-        if cell_value is None:
-            if row == skip_row_after_header:
-                continue
-            null_rows.append(row)
+def _nulls_and_duplicates(keys: pd.DataFrame, skip_row_after_header):
+    """
+    check_for_nulls_and_duplicates over a _key_columns frame. Duplicates are
+    keyed by the tuple of key values of their second row (where the repeat is
+    found), in the order those rows appear, each with its rows in order.
+    """
+    row_numbers = keys.index.to_numpy()
+    # Number each distinct key (nulls are numbered -1 by factorize)
+    codes = np.zeros(len(keys), dtype=np.int64)
+    null_mask = np.zeros(len(keys), dtype=bool)
+    for column in keys.columns:
+        column_codes, uniques = pd.factorize(keys[column].to_numpy())
+        null_mask |= column_codes < 0
+        codes = pd.factorize(codes * (len(uniques) + 1) + column_codes)[0]
+    null_rows = row_numbers[null_mask & (row_numbers != skip_row_after_header)].tolist()
 
-        # Check for duplicate values
-        elif cell_value in seen_values:
-            if cell_value in duplicate_rows:
-                duplicate_rows[cell_value].append(row)
-            else:
-                duplicate_rows[cell_value] = [seen_values[cell_value], row]
-        else:
-            seen_values[cell_value] = row
+    present = np.flatnonzero(~null_mask)
+    duplicated = present[np.bincount(codes[present])[codes[present]] > 1]
+    if not duplicated.size:
+        return null_rows, {}
 
-    return null_rows, duplicate_rows
+    # Positions of each duplicated key, in row order, ordered by their second row
+    by_code = duplicated[np.argsort(codes[duplicated], kind="stable")]
+    groups = np.split(by_code, np.flatnonzero(np.diff(codes[by_code])) + 1)
+    groups.sort(key=lambda group: group[1])
+    values = keys.to_numpy()
+    return null_rows, {tuple(values[group[1]]): row_numbers[group].tolist() for group in groups}
 
 
 def check_pk_for_nulls_and_duplicates(
         workbook: Workbook,
         sheet_name_pattern: str,
-        header_column_name: str,
+        header_column_name,
         skip_rows: int = 0,
         skip_row_after_header: int = 3) -> Dict[str, any]:
     # pylint: disable=C0301
@@ -1570,8 +2179,10 @@ def check_pk_for_nulls_and_duplicates(
         workbook (openpyxl.Workbook): The workbook to check, containing multiple sheets.
         sheet_name_pattern (str): A regular expression pattern to filter sheet names. Only sheets whose names match
                                   this pattern will be checked.
-        header_column_name (str): The name of the header in the second row that indicates the column to check for nulls
-                                  and duplicates.
+        header_column_name (str | list[str]): The name of the header in the second row that indicates the column to check
+                                  for nulls and duplicates, or the names of the columns of a composite key (e.g.
+                                  ["Reference", "Model"]): a row is null if any key column is, and duplicates are keyed
+                                  by the tuple of the key values.
         skip_rows (int, optional): The number of rows to skip at the beginning of each sheet before checking the data.
                                     Default is 0 (no rows skipped).
         skip_row_after_header (int, optional): The row after the header that should be skipped when checking for null values.
@@ -1593,58 +2204,83 @@ def check_pk_for_nulls_and_duplicates(
         print(result)
         # Returns a dictionary with 'status', 'description', 'errors' (nulls and duplicates), and 'meta'.
     """
-    checks = {}
+    rule = PrimaryKeyRule(sheet_name_pattern, header_column_name, skip_rows, skip_row_after_header)
+    RuleEngine([rule]).run(workbook)
+    return rule.result()
 
-    # Compare sheet names between the workbooks
-    status = "Ok"
+class PrimaryKeyRule(SheetRule):
+    """
+    Rules 5/6: null and duplicate values in the key column (found by its header
+    in row 2) of sheets whose names match sheet_name_pattern, or in the columns
+    of a composite key. A per-sheet rule: it reads the header row and the key
+    columns in one slice each, reusing the used area shared with other rules.
 
-    # Compile the regex pattern for matching sheet names
-    pattern = re.compile(sheet_name_pattern)
+    Args: as check_pk_for_nulls_and_duplicates.
+    """
+    rule_cd = "Rules 5/6: Boncode Repetition / Missing Boncode Check"
+
+    def __init__(self, sheet_name_pattern: str, header_column_name,
+                 skip_rows: int = 0, skip_row_after_header: int = 3):
+        # Compile the regex pattern for matching sheet names
+        self.pattern = re.compile(sheet_name_pattern)
+        self.header_column_name = header_column_name
+        self.key_columns = [header_column_name] if isinstance(header_column_name, str) \
+            else list(header_column_name)
+        self.skip_rows = skip_rows
+        self.skip_row_after_header = skip_row_after_header
+        self.checks: Dict[str, dict] = {}
+
+    def start(self):
+        self.checks = {}
 
-    for sheet in workbook.sheetnames:
+    def start_sheet(self, visit):
         # Check if the sheet name matches the given regex pattern
-        if not pattern.match(sheet):
-            continue  # Skip sheets that do not match the regex
-
-        working_area = get_used_area(workbook[sheet])
-        working_area.validate()
-        worksheet = workbook[sheet]
-        null_rows = []
-        duplicate_rows = {}
-
-        # Find the column index based on the header in the 2nd row
-        column_index = None
-        for col in range(1, working_area.last_used_column + 1):
-            if worksheet.cell(row=2, column=col).value == header_column_name:
-                column_index = col
-                break
-
-        if column_index is None:
-            continue  # Skip if the column with the specified header is not found
-
-        # Iterate through all rows in the identified column (skip the first `skip_rows` rows)
+        if not self.pattern.match(visit.sheet_name):
+            return None  # Skip sheets that do not match the regex
+
+        working_area = _company_used_area(visit)
+        worksheet = visit.company_sheet
+
+        # Find the column indexes based on the headers in the 2nd row
+        headers = [getattr(_sheet_cell(worksheet, 2, column), "value", None)
+                   for column in range(1, working_area.last_used_column + 1)]
+        if not all(name in headers for name in self.key_columns):
+            return None  # Skip if a column with the specified header is not found
+        column_indexes = [headers.index(name) + 1 for name in self.key_columns]
+
+        # Iterate through all rows in the identified columns (skip the first `skip_rows` rows)
         null_rows, duplicate_rows = check_for_nulls_and_duplicates(
-            worksheet, column_index, skip_rows, skip_row_after_header, working_area
+            worksheet,
+            column_indexes[0] if isinstance(self.header_column_name, str) else column_indexes,
+            self.skip_rows, self.skip_row_after_header, working_area
         )
 
         # Store results in the checks dictionary
         if null_rows or duplicate_rows:
-            status = "Error"
-            checks[sheet] = {"null_rows": null_rows, "duplicate_rows": duplicate_rows}
+            self.checks[visit.sheet_name] = {
+                "null_rows": null_rows, "duplicate_rows": duplicate_rows}
+        return None
 
-    return {
-        "status": status,
-        "description": "No issues with keys." if status == "Ok" else "Issues in primary keys.",
-        "errors": checks,
-        "meta": {
-            "header_column_name": header_column_name
+    def result(self) -> Dict[str, Any]:
+        """The check_pk_for_nulls_and_duplicates result for every sheet."""
+        status = "Error" if self.checks else "Ok"
+        return {
+            "status": status,
+            "description": "No issues with keys." if status == "Ok" else "Issues in primary keys.",
+            "errors": self.checks,
+            "meta": {
+                "header_column_name": self.header_column_name
+            }
         }
-    }
+
+def _key_label(key) -> str:
+    """A key (or key column name) as written in Error_Desc; composite keys comma-separated."""
+    return ", ".join(map(str, key)) if isinstance(key, (tuple, list)) else str(key)
 
 def find_pk_errors(
         workbook: Workbook,
         sheet_name_pattern: str,
-        header_column_name: str,
+        header_column_name,
         skip_rows: int = 0,
         skip_row_after_header: int = 3) -> pd.DataFrame:
     # pylint: disable=C0301
@@ -1658,8 +2294,9 @@ def find_pk_errors(
         workbook (openpyxl.Workbook): The workbook to check, containing multiple sheets.
         sheet_name_pattern (str): A regular expression pattern to filter the sheet names to be checked.
                                   Only sheets whose names match this pattern will be included in the check.
-        header_column_name (str): The name of the header in the second row that identifies the column to check for nulls
-                                  and duplicates.
+        header_column_name (str | list[str]): The name of the header in the second row that identifies the column to
+                                  check for nulls and duplicates, or the names of the columns of a composite key; their
+                                  names and values are then listed comma-separated in Error_Desc.
         skip_rows (int, optional): The number of rows to skip at the beginning of each sheet before starting to check the data.
                                    Default is 0 (no rows skipped).
         skip_row_after_header (int, optional): The row after the header that should be skipped when checking for null values.
@@ -1689,40 +2326,31 @@ def find_pk_errors(
     # Get the error data by calling the check_pk_for_nulls_and_duplicates function
     error_data = check_pk_for_nulls_and_duplicates(workbook, sheet_name_pattern, header_column_name, skip_rows, skip_row_after_header)
 
-    # Initialize an empty list to hold the rows for the DataFrame
-    rows = []
     error_data = error_data.get("errors", {})
+    header_label = _key_label(header_column_name)
 
-    # Now handle null rows (missing values) for each sheet
+    # One event per sheet with missing values, then one per duplicate value
+    events = []
     for sheet_name, sheet_errors in error_data.items():
-        # Handling null rows (missing values)
         if sheet_errors.get('null_rows', []):
             null_rows_str = ', '.join(map(str, sheet_errors['null_rows']))
-            rows.append({
-                'Event_Id': uuid.uuid4().hex,
-                'Sheet_Cd': sheet_name,
-                'Rule_Cd': "Rule 6: Missing Boncode Check",
-                'Error_Category': "Missing Values",
-                'Error_Severity_Cd': "?",
-                "Error_Desc": f"Rows {null_rows_str} have missing values in [{header_column_name}]."
-            })
-
-        # Handling duplicate rows
-        for duplicate_value, rows_with_duplicate in sheet_errors.get('duplicate_rows', {}).items():
-            rows_with_duplicate_str = ', '.join(map(str, rows_with_duplicate))
-            rows.append({
-                'Event_Id': uuid.uuid4().hex,
-                'Sheet_Cd': sheet_name,
-                'Rule_Cd': "Rule 5: Boncode Repetition",
-                'Error_Category': "Duplicate Value",
-                'Error_Severity_Cd': "?",
-                "Error_Desc": f"Duplicate [{header_column_name}] value '{duplicate_value}' found in rows {rows_with_duplicate_str}."
-            })
-
-    # Create the DataFrame from the list of rows
-    df = pd.DataFrame(rows)
+            events.append((
+                sheet_name, "Rule 6: Missing Boncode Check", "Missing Values",
+                f"Rows {null_rows_str} have missing values in [{header_label}]."))
+        events.extend(
+            (sheet_name, "Rule 5: Boncode Repetition", "Duplicate Value",
+             f"Duplicate [{header_label}] value '{_key_label(duplicate_value)}' found in rows "
+             f"{', '.join(map(str, rows_with_duplicate))}.")
+            for duplicate_value, rows_with_duplicate in sheet_errors.get('duplicate_rows', {}).items())
+
+    if not events:
+        df = pd.DataFrame()
+    else:
+        df = pd.DataFrame(events, columns=['Sheet_Cd', 'Rule_Cd', 'Error_Category', 'Error_Desc'])
+        df.insert(0, 'Event_Id', [uuid.uuid4().hex for _ in events])
+        df.insert(4, 'Error_Severity_Cd', "?")
 
-    return df
+    return emitted("panacea", PrimaryKeyRule.rule_cd, df)
 
 def create_nulls_in_measure_validation_event(
     df: pd.DataFrame,
@@ -2077,23 +2705,41 @@ def clean_formula_spaces_in_workbook(wb):
     # Load a new workbook from the virtual file to avoid modifying the original
     wb_copy = load_workbook(virtual_wb)
 
-    for ws in wb_copy.worksheets:
-        used_area = get_used_area(ws)
-
-        # Compute bounds
-        min_row = used_area.empty_rows + 1
-        min_col = used_area.empty_columns + 1
-        max_row = used_area.last_used_row
-        max_col = used_area.last_used_column
-
-        for row in ws.iter_rows(min_row=min_row, max_row=max_row,
-                                min_col=min_col, max_col=max_col):
-            for cell in row:
-                if cell.data_type == 'f' and isinstance(cell.value, str):
-                    if cell.value.startswith("= "):
-                        original = cell.value
-                        cell.value = '=' + cell.value[2:]
-                        # pylint: disable=C0301
-                        print(f"Updated formula in {ws.title} {cell.coordinate}: '{original}' -> '{cell.value}'")
+    RuleEngine([FormulaSpacesRule()]).run(
+        wb_copy, sheet_names=[ws.title for ws in wb_copy.worksheets])
 
     return wb_copy
+
+class FormulaSpacesRule(SheetRule):
+    """
+    Removes the space after "=" in formulas ("= SUM(A1)" -> "=SUM(A1)") of the
+    walked workbook, within the bounds clean_formula_spaces_in_workbook uses.
+    Cells are changed after each sheet's walk, so other rules in the same run
+    see the original formulas.
+    """
+    rule_cd = "Formula Spaces"
+
+    def __init__(self):
+        self._min_row = self._min_col = 1
+        self._cells: list = []
+
+    def start_sheet(self, visit):
+        self._cells = []
+        used_area = _company_used_area(visit)
+
+        # Compute bounds
+        self._min_row = used_area.empty_rows + 1
+        self._min_col = used_area.empty_columns + 1
+        return used_area.last_used_row, used_area.last_used_column
+
+    def visit_cell(self, visit, row, column, cell):
+        if row >= self._min_row and column >= self._min_col and cell.data_type == 'f' \
+                and isinstance(cell.value, str) and cell.value.startswith("= "):
+            self._cells.append(cell)
+
+    def end_sheet(self, visit):
+        for cell in self._cells:
+            original = cell.value
+            cell.value = '=' + cell.value[2:]
+            # pylint: disable=C0301
+            print(f"Updated formula in {visit.sheet_name} {cell.coordinate}: '{original}' -> '{cell.value}'")
@@ -0,0 +1,612 @@
+"""
+Manifest-only preflight reads of .xlsx/.xlsm files
+
+Several checks only need a workbook's sheet names or a handful of cells:
+
+- find_missing_sheets / validate_tabs_between_spreadsheets: sheet names
+- check_value_in_cell (Rules 7/8): e.g. SelectCompany!B4, Quarterly_Data!G9
+- check_empty_rows / check_column_headers: rows 1-3 of the fOut sheets
+
+`WorkbookManifest` answers these straight from the zip package: sheet names
+from workbook.xml, strings from sharedStrings.xml (read only as far as the
+requested cells need), and cells by streaming a sheet part only up to the
+rows asked for. It offers the small part of openpyxl's Workbook/Worksheet
+interface those checks use, so they accept a manifest in place of a loaded
+workbook and can reject bad submissions before a full parse:
+
+    with WorkbookManifest("company.xlsx") as manifest:
+        find_missing_sheets(wb_template_manifest, manifest)
+        check_value_in_cell(manifest, "SelectCompany", "Company A", "B4")
+        check_empty_rows(manifest, fout_sheet_names)
+
+Values are the ones openpyxl returns with data_only=True: cached results for
+formula cells, numbers as int/float, dates converted through the workbook's
+number formats, shared and inline strings as plain text. Sheet bounds
+(max_row / max_column, used to pad rows) come from each sheet's <dimension>
+element, falling back to a full scan of the sheet when it has none.
+
+`WorkbookManifest.identical_sheets` finds sheets whose parts are the same in
+two packages (zip CRC-32 and size, confirmed by a digest), which
+find_formula_differences / find_shape_differences skip.
+
+`WorkbookManifest.formula_errors` streams the error-typed cells (t="e", e.g.
+#DIV/0!) of every sheet part, in parallel across parts, for find_formula_errors
+(Rule 2). A part is first searched as bytes for a t="e" attribute and only
+parsed, without building a tree, if it has one.
+"""
+import hashlib
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+from xml.etree.ElementTree import iterparse
+from xml.parsers import expat
+
+from openpyxl.cell.text import Text
+from openpyxl.packaging.relationship import get_dependents, get_rels_path
+from openpyxl.packaging.workbook import WorkbookPackage
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils.cell import coordinate_to_tuple, get_column_letter, range_boundaries
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601,
+)
+from openpyxl.xml.functions import fromstring
+
+# pylint: disable=line-too-long
+
+_OFFICE_DOCUMENT_REL = "officeDocument"
+_SHARED_STRINGS_REL = "sharedStrings"
+_STYLES_REL = "styles"
+_CHUNK_SIZE = 1 << 20
+# A t="e" (or t = 'e') attribute; only cells holding an error value carry it
+_ERROR_TYPE = re.compile(rb"""\bt\s*=\s*["']e["']""")
+_ERROR_TYPE_OVERLAP = 16
+
+
+def _local(tag: str) -> str:
+    """Element tag without its namespace (transitional and strict OOXML alike)."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _rel_kind(rel_type: str) -> str:
+    """Last segment of a relationship type URI, e.g. "worksheet"."""
+    return rel_type.rsplit("/", 1)[-1]
+
+
+class ManifestCell(NamedTuple):
+    """
+    A single cell read from a sheet part.
+
+    Attributes:
+        coordinate (str): Cell reference, e.g. "B4".
+        value (Any): Cell value as openpyxl returns it with data_only=True.
+    """
+    coordinate: str
+    value: Any
+
+
+class ManifestSheet:
+    """
+    Read-only view of one worksheet part, streamed from the package on demand.
+
+    Supports sheet["B4"].value, iter_rows(..., values_only=True) and the
+    max_row / max_column bounds, as used by the preflight-capable checks.
+    """
+
+    def __init__(self, manifest: "WorkbookManifest", title: str, part: str):
+        self.parent = manifest
+        self.title = title
+        self.part = part
+        self._bounds: Optional[tuple[int, int]] = None
+
+    def __repr__(self):
+        return f"<ManifestSheet {self.title!r}>"
+
+    @property
+    def max_row(self) -> int:
+        """Last row holding a cell, as openpyxl's Worksheet.max_row."""
+        return self._dimensions()[0]
+
+    @property
+    def max_column(self) -> int:
+        """Last column holding a cell, as openpyxl's Worksheet.max_column."""
+        return self._dimensions()[1]
+
+    def __getitem__(self, coordinate: str) -> ManifestCell:
+        """
+        One cell by reference; cells without content read as None.
+
+        Raises:
+            ValueError: If coordinate is not a single cell reference.
+        """
+        row, column = coordinate_to_tuple(coordinate.upper())
+        for row_idx, cells in self._parsed_rows(max_row=row):
+            if row_idx == row:
+                return ManifestCell(coordinate, cells.get(column))
+        return ManifestCell(coordinate, None)
+
+    def iter_rows(self, min_row: Optional[int] = None, max_row: Optional[int] = None,
+                  min_col: Optional[int] = None, max_col: Optional[int] = None,
+                  values_only: bool = False) -> Iterator[tuple]:
+        """
+        Row value tuples, like Worksheet.iter_rows(values_only=True).
+
+        Rows run from min_row (default 1) to max_row (default the sheet's
+        max_row), each padded with None from min_col (default 1) to max_col
+        (default max_column). The sheet part is only read as far as max_row.
+
+        Raises:
+            NotImplementedError: If values_only is False; manifests hold no cell objects.
+        """
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        if not values_only:
+            raise NotImplementedError("WorkbookManifest sheets only support iter_rows(values_only=True).")
+        # Like openpyxl, a sheet without cells has no rows unless bounds are given
+        if not any([min_row, max_row, min_col, max_col]) and not self._has_cells():
+            return
+        min_row = min_row or 1
+        min_col = min_col or 1
+        max_row = max_row or self.max_row
+        max_col = max_col or self.max_column
+        if min_row > max_row:
+            return
+        columns = range(min_col, max_col + 1)
+
+        expected = min_row
+        for row_idx, cells in self._parsed_rows(max_row=max_row):
+            if row_idx < min_row:
+                continue
+            for _missing in range(expected, row_idx):
+                yield (None,) * len(columns)
+            yield tuple(cells.get(column) for column in columns)
+            expected = row_idx + 1
+        for _missing in range(expected, max_row + 1):
+            yield (None,) * len(columns)
+
+    def _dimensions(self) -> tuple[int, int]:
+        """(max_row, max_column) from <dimension>, or by scanning every cell."""
+        if self._bounds is None:
+            bounds = self._declared_dimensions()
+            if bounds is None:
+                max_row = max_column = 1
+                for row_idx, cells in self._parsed_rows(keep_empty=True):
+                    max_row = max(max_row, row_idx)
+                    max_column = max([max_column, *cells])
+                bounds = (max_row, max_column)
+            self._bounds = bounds
+        return self._bounds
+
+    def _has_cells(self) -> bool:
+        """True once the first <c> element is found."""
+        with self.parent.archive.open(self.part) as source:
+            for _event, element in iterparse(source, events=("start",)):
+                if _local(element.tag) == "c":
+                    return True
+        return False
+
+    def _declared_dimensions(self) -> Optional[tuple[int, int]]:
+        """Bounds from the <dimension ref> element, which precedes <sheetData>."""
+        with self.parent.archive.open(self.part) as source:
+            for _event, element in iterparse(source, events=("start",)):
+                tag = _local(element.tag)
+                if tag == "dimension":
+                    ref = element.get("ref")
+                    if not ref:
+                        return None
+                    try:
+                        _min_col, _min_row, max_col, max_row = range_boundaries(ref.upper())
+                    except ValueError:
+                        return None
+                    if max_row is None or max_col is None:
+                        return None
+                    return max_row, max_col
+                if tag == "sheetData":
+                    return None
+        return None
+
+    def shared_string_indexes(self) -> set[int]:
+        """Indexes into the shared string table referenced by the sheet's cells."""
+        indexes = set()
+        with self.parent.archive.open(self.part) as source:
+            for _event, element in iterparse(source, events=("end",)):
+                tag = _local(element.tag)
+                if tag == "c" and element.get("t") == "s":
+                    for child in element:
+                        if _local(child.tag) == "v" and child.text:
+                            indexes.add(int(child.text))
+                if tag == "row":
+                    element.clear()
+        return indexes
+
+    def iter_errors(self) -> Iterator[tuple[str, str]]:
+        """
+        (coordinate, error) of each cell holding an error value, e.g.
+        ("B4", "#DIV/0!"), in file order: the cells openpyxl reads with
+        data_type "e". The part is streamed in chunks through expat, so memory
+        stays flat however large the sheet, and parts without a t="e"
+        attribute are not parsed at all.
+        """
+        if not self._mentions_error_type():
+            return
+        scanner = _ErrorCellScanner()
+        with self.parent.archive.open(self.part) as source:
+            for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+                scanner.feed(chunk)
+                yield from scanner.errors
+                scanner.errors.clear()
+        scanner.feed(b"", final=True)
+        yield from scanner.errors
+
+    def _mentions_error_type(self) -> bool:
+        """Whether the part's bytes hold a t="e" attribute anywhere, searched chunk by chunk."""
+        tail = b""
+        with self.parent.archive.open(self.part) as source:
+            for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+                if _ERROR_TYPE.search(tail + chunk[:_ERROR_TYPE_OVERLAP]) or _ERROR_TYPE.search(chunk):
+                    return True
+                tail = chunk[-_ERROR_TYPE_OVERLAP:]
+        return False
+
+    def _parsed_rows(self, max_row: Optional[int] = None,
+                     keep_empty: bool = False) -> Iterator[tuple[int, dict[int, Any]]]:
+        """
+        (row index, {column: value}) for each <row>, in file order, up to max_row.
+
+        Cells without a value are left out unless keep_empty is set (they still
+        count towards the sheet's bounds, as in openpyxl).
+        """
+        with self.parent.archive.open(self.part) as source:
+            row_idx = 0
+            for _event, element in iterparse(source, events=("end",)):
+                if _local(element.tag) != "row":
+                    continue
+                row_idx = int(element.get("r", row_idx + 1))
+                if max_row is not None and row_idx > max_row:
+                    return
+                cells = {}
+                column = 0
+                for cell in element:
+                    if _local(cell.tag) != "c":
+                        continue
+                    coordinate = cell.get("r")
+                    column = coordinate_to_tuple(coordinate)[1] if coordinate else column + 1
+                    value = self.parent.cell_value(cell)
+                    if value is not None or keep_empty:
+                        cells[column] = value
+                element.clear()
+                yield row_idx, cells
+
+
+class _ErrorCellScanner:  # pylint: disable=too-few-public-methods
+    """
+    An expat parser collecting the (coordinate, error) of error-typed cells
+    into errors as it is fed. Namespaces are not processed (tags are matched
+    on their local name) and the end and text handlers are only set inside an
+    error cell, so other elements cost one start callback each. Cells without
+    an r attribute take the column after the previous cell.
+    """
+
+    def __init__(self):
+        self.errors: list[tuple[str, str]] = []
+        self._row = 0
+        self._last_ref: Optional[str] = None  # r of the row's last cell that had one
+        self._unreferenced = 0  # cells since _last_ref
+        self._coordinate: Optional[str] = None  # error cell being read
+        self._value: list[str] = []  # text of its <v>
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        """Parse the next bytes of the part."""
+        self._parser.Parse(data, final)
+
+    def _start(self, name: str, attrs: dict) -> None:
+        tag = name.rpartition(":")[2]
+        if tag == "c":
+            ref = attrs.get("r")
+            if ref:
+                self._last_ref, self._unreferenced = ref, 0
+            else:
+                self._unreferenced += 1
+            if attrs.get("t") == "e":
+                self._coordinate = ref or self._unreferenced_coordinate()
+                self._value = []
+                self._parser.EndElementHandler = self._end
+        elif tag == "v" and self._coordinate is not None:
+            self._parser.CharacterDataHandler = self._value.append
+        elif tag == "row":
+            self._row = int(attrs.get("r", self._row + 1))
+            self._last_ref, self._unreferenced = None, 0
+
+    def _end(self, name: str) -> None:
+        tag = name.rpartition(":")[2]
+        if tag == "v":
+            self._parser.CharacterDataHandler = None
+        elif tag == "c":
+            if self._value:
+                self.errors.append((self._coordinate, "".join(self._value)))
+            self._coordinate = None
+            self._parser.EndElementHandler = None
+
+    def _unreferenced_coordinate(self) -> str:
+        column = coordinate_to_tuple(self._last_ref)[1] if self._last_ref else 0
+        return f"{get_column_letter(column + self._unreferenced)}{self._row}"
+
+
+class WorkbookManifest:  # pylint: disable=too-many-instance-attributes
+    """
+    Sheet names and selected cells of an .xlsx/.xlsm package, without loading the workbook.
+
+    Accepts a path, bytes or a binary file object. Offers sheetnames,
+    manifest[sheet_name] and, per sheet, cell lookups and iter_rows with
+    values_only=True. Use as a context manager (or call close()).
+
+    Attributes:
+        archive (zipfile.ZipFile): The open package.
+        sheetnames (list[str]): Sheet names in workbook order, as Workbook.sheetnames.
+        epoch (datetime.datetime): Date epoch (1900 or 1904 system).
+    """
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray)):
+            source = BytesIO(source)
+        self.archive = zipfile.ZipFile(source)  # pylint: disable=consider-using-with
+        self._workbook_part = self._find_workbook_part()
+        package = WorkbookPackage.from_tree(fromstring(self.archive.read(self._workbook_part)))
+        self.epoch = CALENDAR_MAC_1904 if package.properties and package.properties.date1904 else CALENDAR_WINDOWS_1900
+
+        rels = self._workbook_rels()
+        self._sheet_parts = {}
+        for sheet in package.sheets:
+            rel = rels.get(sheet.id)
+            if rel is not None:
+                self._sheet_parts[sheet.name] = rel.target
+        self.sheetnames = list(self._sheet_parts)
+
+        self._shared_strings_part = self._related_part(rels, _SHARED_STRINGS_REL, "xl/sharedStrings.xml")
+        self._styles_part = self._related_part(rels, _STYLES_REL, "xl/styles.xml")
+        self._shared_strings: list[str] = []
+        self._shared_string_reader = None
+        self._date_formats: Optional[tuple[set, set]] = None
+        self._sheets: dict[str, ManifestSheet] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes the underlying zip archive."""
+        self.archive.close()
+
+    def __contains__(self, sheet_name: str) -> bool:
+        return sheet_name in self._sheet_parts
+
+    def __getitem__(self, sheet_name: str) -> ManifestSheet:
+        """
+        The named sheet.
+
+        Raises:
+            KeyError: If the workbook has no such sheet (as Workbook does).
+        """
+        if sheet_name not in self._sheet_parts:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+        if sheet_name not in self._sheets:
+            self._sheets[sheet_name] = ManifestSheet(self, sheet_name, self._sheet_parts[sheet_name])
+        return self._sheets[sheet_name]
+
+    def sheet_part(self, sheet_name: str) -> str:
+        """Zip member name of a sheet's XML part, e.g. "xl/worksheets/sheet1.xml"."""
+        return self[sheet_name].part
+
+    def part_fingerprint(self, part: str) -> tuple[int, int]:
+        """(CRC-32, uncompressed size) of a zip member, from the central directory."""
+        info = self.archive.getinfo(part)
+        return info.CRC, info.file_size
+
+    def part_digest(self, part: str) -> bytes:
+        """BLAKE2b digest of a zip member's uncompressed bytes."""
+        digest = hashlib.blake2b()
+        with self.archive.open(part) as source:
+            for chunk in iter(lambda: source.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.digest()
+
+    def identical_sheets(self, other: "WorkbookManifest", sheet_names) -> set[str]:
+        """
+        Sheets whose content is the same in this package and in other.
+
+        A sheet qualifies when its part has the same CRC-32 and size in both
+        zip central directories (free to read), the same BLAKE2b digest (to
+        rule out a CRC collision), and every shared string it references is
+        the same text in both packages. Such a sheet loads to the same cells,
+        formulas and values in either workbook, apart from styles.
+
+        Args:
+            other (WorkbookManifest): The package to compare against.
+            sheet_names (Iterable[str]): Sheets to consider; names missing from
+                either package are ignored.
+
+        Returns:
+            set[str]: The identical sheets.
+        """
+        candidates = [
+            name for name in sheet_names
+            if name in self and name in other
+            and self.part_fingerprint(self.sheet_part(name)) == other.part_fingerprint(other.sheet_part(name))
+            and self.part_digest(self.sheet_part(name)) == other.part_digest(other.sheet_part(name))
+        ]
+        if not candidates or self._same_parts(other, self._shared_strings_part, other._shared_strings_part):  # pylint: disable=protected-access
+            return set(candidates)
+        return {name for name in candidates if self._same_shared_strings(other, self[name].shared_string_indexes())}
+
+    def formula_errors(self, sheet_names: Optional[Iterable[str]] = None,
+                       max_workers: Optional[int] = None) -> Iterator[tuple[str, str, str]]:
+        """
+        (sheet, coordinate, error) of every error-typed cell, sheet by sheet in
+        workbook order (see ManifestSheet.iter_errors). The sheet parts are
+        scanned in parallel threads; zip reads and inflating overlap, parsing
+        runs one part at a time under the GIL.
+
+        Args:
+            sheet_names (Iterable[str], optional): Sheets to scan, in that
+                order; all by default. Names not in the package are ignored.
+            max_workers (int, optional): Threads scanning parts; None for
+                ThreadPoolExecutor's own default.
+        """
+        names = self.sheetnames if sheet_names is None else [name for name in sheet_names if name in self]
+        sheets = [self[name] for name in names]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            scans = [executor.submit(lambda sheet: list(sheet.iter_errors()), sheet) for sheet in sheets]
+            for name, scan in zip(names, scans):
+                for coordinate, error in scan.result():
+                    yield name, coordinate, error
+
+    def _same_parts(self, other: "WorkbookManifest", part: Optional[str], other_part: Optional[str]) -> bool:
+        """Whether two zip members (or their absence) hold the same bytes."""
+        if part is None or other_part is None:
+            return part is other_part
+        return (self.part_fingerprint(part) == other.part_fingerprint(other_part)
+                and self.part_digest(part) == other.part_digest(other_part))
+
+    def _same_shared_strings(self, other: "WorkbookManifest", indexes) -> bool:
+        """Whether both packages hold the same text at each shared string index."""
+        try:
+            return all(self.shared_string(index) == other.shared_string(index) for index in indexes)
+        except IndexError:
+            return False
+
+    def _find_workbook_part(self) -> str:
+        """Workbook part named by the package relationships (xl/workbook.xml by default)."""
+        try:
+            for rel in get_dependents(self.archive, "_rels/.rels"):
+                if _rel_kind(rel.Type) == _OFFICE_DOCUMENT_REL:
+                    return rel.target
+        except KeyError:
+            pass
+        return "xl/workbook.xml"
+
+    def _workbook_rels(self) -> dict:
+        """Workbook relationships keyed by id."""
+        try:
+            return get_dependents(self.archive, get_rels_path(self._workbook_part)).to_dict()
+        except KeyError:
+            return {}
+
+    def _related_part(self, rels: dict, kind: str, default: str) -> Optional[str]:
+        """Target of the workbook relationship of the given kind, if present in the package."""
+        for rel in rels.values():
+            if _rel_kind(rel.Type) == kind:
+                return rel.target
+        return default if default in self.archive.namelist() else None
+
+    def shared_string(self, index: int) -> str:
+        """
+        Shared string by index, reading sharedStrings.xml only as far as needed.
+
+        Raises:
+            IndexError: If the table has fewer strings.
+        """
+        if index >= len(self._shared_strings) and self._shared_strings_part is not None:
+            if self._shared_string_reader is None:
+                self._shared_string_reader = self._read_shared_strings()
+            for text in self._shared_string_reader:
+                self._shared_strings.append(text)
+                if index < len(self._shared_strings):
+                    break
+        return self._shared_strings[index]
+
+    def _read_shared_strings(self) -> Iterator[str]:
+        """Plain text of each <si>, as openpyxl's read_string_table gives it."""
+        with self.archive.open(self._shared_strings_part) as source:
+            for _event, element in iterparse(source, events=("end",)):
+                if _local(element.tag) == "si":
+                    text = Text.from_tree(_in_main_namespace(element)).content
+                    element.clear()
+                    yield text.replace("x005F_", "")
+
+    def _number_formats(self) -> tuple[set, set]:
+        """Style ids formatted as dates and as timedeltas."""
+        if self._date_formats is None:
+            date_formats, timedelta_formats = set(), set()
+            if self._styles_part is not None:
+                stylesheet = Stylesheet.from_tree(fromstring(self.archive.read(self._styles_part)))
+                if stylesheet.cell_styles:
+                    date_formats = stylesheet.date_formats
+                    timedelta_formats = stylesheet.timedelta_formats
+            self._date_formats = (date_formats, timedelta_formats)
+        return self._date_formats
+
+    def cell_value(self, cell) -> Any:  # pylint: disable=too-many-return-statements
+        """
+        Value of a <c> element, converted as openpyxl does with data_only=True.
+
+        Args:
+            cell (xml.etree.ElementTree.Element): The cell element.
+
+        Returns:
+            Any: str, int, float, bool, datetime/timedelta, error string or None.
+        """
+        data_type = cell.get("t", "n")
+        if data_type == "inlineStr":
+            for child in cell:
+                if _local(child.tag) == "is":
+                    return Text.from_tree(_in_main_namespace(child)).content
+            return None
+
+        value = None
+        for child in cell:
+            if _local(child.tag) == "v":
+                value = child.text or None
+                break
+        if value is None:
+            return None
+
+        if data_type == "n":
+            value = float(value) if "." in value or "E" in value or "e" in value else int(value)
+            style_id = int(cell.get("s", 0) or 0)
+            date_formats, timedelta_formats = self._number_formats() if style_id else (set(), set())
+            if style_id in date_formats:
+                try:
+                    return from_excel(value, self.epoch, timedelta=style_id in timedelta_formats)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if data_type == "s":
+            return self.shared_string(int(value))
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+        # "str" (formula string result) and "e" (error) are kept as text
+        return value
+
+
+def _in_main_namespace(element):
+    """
+    element, re-tagged into the transitional namespace if it uses strict OOXML,
+    so openpyxl's Text parser recognises its children.
+    """
+    if element.tag.startswith("{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"):
+        return element
+    main = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+    for node in element.iter():
+        node.tag = main + _local(node.tag)
+    return element
+
+
+def read_sheet_names(source) -> list[str]:
+    """
+    Sheet names of a workbook, read from workbook.xml only.
+
+    Args:
+        source (str | bytes | BinaryIO): Path, bytes or file object of the .xlsx/.xlsm.
+
+    Returns:
+        list[str]: Sheet names in workbook order.
+    """
+    with WorkbookManifest(source) as manifest:
+        return list(manifest.sheetnames)
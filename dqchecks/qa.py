@@ -22,17 +22,53 @@ Designed to be called from Fabric notebooks, e.g.:
     qa_diff_df = qa.build_qa_diff(..., profile="QD")
     qa_summary_df, qa_company_summary_df, error_counts_df = qa.build_qa_summaries(..., profile="QD")
 
-This module is intentionally pure-pandas (no Fabric / Spark / DB engine).
+or, for large inputs, all four steps split by Organisation_Cd across processes:
+
+    qa_diff_df, qa_summary_df, qa_company_summary_df, error_counts_df = (
+        qa.run_qa_by_organisation(..., profile="QD")
+    )
+
+or, for repeat runs after each ingestion batch, only re-diffing keys that changed
+since the state saved by the previous run:
+
+    qa_diff_df, qa_summary_df, qa_company_summary_df, error_counts_df = (
+        qa.run_qa_incremental(..., state_dir="/lakehouse/qa_state", profile="QD")
+    )
+
+The default path is plain pandas (no Fabric / Spark / DB engine). Polars and
+DuckDB are optional engines: the four steps also take engine="polars", which
+runs their columnar work on Polars and returns the same pandas frames (see
+dqchecks.qa_polars), and parquet inputs too large to load into memory can be
+checked with DuckDB (see dqchecks.qa_duckdb).
 """
 
 from __future__ import annotations
 
+import importlib
+import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable, Optional, Tuple
 
 import os
+import numpy as np
 import pandas as pd
 
+from dqchecks.telemetry import instrumented
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.0 does not infer one format for the whole column
+    guess_datetime_format = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # only needed to write parquet files (streamed diffs, incremental QA state)
+    pa = pq = None
+
 # We intentionally expose orchestration-style functions that take several arguments
 # and have branching logic. Suppress corresponding structural warnings.
 # Also relax line length and superfluous-parens for readability in f-strings.
@@ -508,6 +544,28 @@ def _get_profile_cols(profile: str | None):
 
     return profile_map.get(p, (COMPARE_COLS, KEY_COLS, CONTEXT_COLS))
 
+
+QA_ENGINES: tuple[str, ...] = ("pandas", "polars")
+
+
+def _use_polars(engine: str) -> bool:
+    """
+    True for engine="polars", False for "pandas"; anything else is an error.
+
+    dqchecks.qa_polars (and polars) is only imported once a step asks for it,
+    see _polars_backend.
+    """
+    if engine not in QA_ENGINES:
+        raise ValueError(f"Unsupported engine: {engine!r}. Expected one of {', '.join(QA_ENGINES)}.")
+    return engine == "polars"
+
+
+def _polars_backend():
+    """
+    The dqchecks.qa_polars module (which needs polars and imports this module).
+    """
+    return importlib.import_module("dqchecks.qa_polars")
+
 # --------------------------------------------------------------------------------------
 # HELPER FUNCTIONS (NORMALISATION)
 # --------------------------------------------------------------------------------------
@@ -532,7 +590,7 @@ def _ensure_key_columns(df: pd.DataFrame, key_cols: list[str]) -> pd.DataFrame:
 
     return df
 
-def _add_measure_cd_to_context(context: dict, row: pd.Series) -> dict:
+def _add_measure_cd_to_context(context: dict, row: pd.Series | dict) -> dict:
     """
     Ensure Measure_Cd appears in QA output.
     For QD, Measure_Cd may be represented internally as Measure_Key.
@@ -661,27 +719,70 @@ def _normalise_measure_value(
     unit_series: Optional[pd.Series] = None,
 ) -> pd.Series:
     """
-    Convert measure values to a numeric representation consistent across raw & ingested:
+    Convert measure values to a numeric (float64) representation consistent across raw & ingested:
 
     - Strips '%' symbols.
     - If unit == '%', divide by 100 so '12.5%' -> 0.125.
     - Otherwise, parse numeric as-is.
     """
-    s = value_series.astype(str).str.strip()
-    s_clean = s.str.replace("%", "", regex=False)
-    numeric = pd.to_numeric(s_clean, errors="coerce")
+    numeric = _measure_values_to_float(value_series)
 
     if unit_series is None:
         return numeric
 
-    u = unit_series.astype(str).str.strip()
-    is_pct = (u == "%")
+    # Units take a handful of distinct values: test each once, then scale in one go.
+    codes, uniques = pd.factorize(unit_series.reindex(value_series.index), use_na_sentinel=False)
+    is_pct = np.array([str(u).strip() == "%" for u in uniques], dtype=bool)[codes]
+
+    values = numeric.to_numpy(copy=True)
+    values[is_pct] = values[is_pct] / 100.0
+    return pd.Series(values, index=numeric.index)
+
+
+# Object columns holding only these kinds of values parse the same with or
+# without the str() round trip of the string route.
+_DIRECT_PARSE_INFERRED_TYPES: frozenset[str] = frozenset({"string", "floating", "empty"})
+
+
+def _measure_values_to_float(value_series: pd.Series) -> pd.Series:
+    """
+    float64 of str(value).strip() with '%' removed, for every value.
+
+    float64 / int64 columns are cast directly. Other columns are parsed as they
+    are, and only non-null values that fail to parse (e.g. '12.5%', ' 3 ') take
+    the string clean-up route, which gives the same result for the rest.
+    """
+    if value_series.dtype in ("float64", "int64"):
+        return value_series.astype("float64")
+
+    if value_series.dtype == object and (
+        pd.api.types.infer_dtype(value_series, skipna=True) not in _DIRECT_PARSE_INFERRED_TYPES
+    ):
+        return _measure_value_strings_to_float(value_series)
+
+    numeric = pd.Series(
+        pd.to_numeric(value_series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan),
+        index=value_series.index,
+    )
+
+    retry = numeric.isna() & value_series.notna()
+    if retry.any():
+        numeric[retry] = _measure_value_strings_to_float(value_series[retry])
 
-    numeric_pct = numeric / 100.0
-    numeric = numeric.where(~is_pct, numeric_pct)
     return numeric
 
 
+def _measure_value_strings_to_float(value_series: pd.Series) -> pd.Series:
+    """
+    The string route: str(), strip, drop '%', parse.
+    """
+    s_clean = value_series.astype(str).str.strip().str.replace("%", "", regex=False)
+    return pd.Series(
+        pd.to_numeric(s_clean, errors="coerce").to_numpy(dtype="float64", na_value=np.nan),
+        index=value_series.index,
+    )
+
+
 def _normalise_string(s: pd.Series) -> pd.Series:
     """
     Normalise strings for comparison:
@@ -713,7 +814,60 @@ def _normalise_string(s: pd.Series) -> pd.Series:
 
         return txt.strip().lower()
 
-    return s.fillna("").map(clean)
+    # Clean each distinct value once; descriptions/comments repeat heavily across rows.
+    values = s.fillna("").astype(object)
+    codes, uniques = pd.factorize(values)
+    if s.dtype == object and len(uniques) > 0:
+        # factorize treats 1, 1.0 and True as one value, but their text differs:
+        # tell the values apart by type as well
+        type_codes, _ = pd.factorize(values.map(type))
+        _, first, codes = np.unique(
+            codes.astype(np.int64) * (int(type_codes.max()) + 1) + type_codes,
+            return_index=True,
+            return_inverse=True,
+        )
+        uniques = values.to_numpy()[first]
+    cleaned = np.array([clean(x) for x in uniques], dtype=object)
+    return pd.Series(cleaned[codes], index=s.index, dtype=object)
+
+
+def _normalise_compare_column(
+    df: pd.DataFrame,
+    col: str,
+    suffix: str,
+    profile: str,
+) -> pd.Series:
+    """
+    Normalise one side ("_raw" / "_ingested") of a compare column the same way
+    the column-level comparison in build_qa_diff does:
+
+    - Measure_Value: numeric (QD also applies the '%' unit scaling)
+    - Measure_Decimals: numeric
+    - everything else: _normalise_string
+    """
+    series = df[f"{col}{suffix}"]
+
+    if col == "Measure_Value":
+        unit_col = f"Measure_Unit{suffix}"
+        unit = df[unit_col] if profile == "QD" and unit_col in df.columns else None
+        return _normalise_measure_value(series, unit).astype("float64")
+
+    if col == "Measure_Decimals":
+        return pd.to_numeric(series, errors="coerce").astype("float64")
+
+    return _normalise_string(series)
+
+
+def _row_digest(normalised: dict[str, pd.Series], index: pd.Index) -> pd.Series:
+    """
+    64-bit digest per row over already-normalised compare columns.
+
+    Equal digests on both sides mean the row has no column-level differences
+    (barring a hash collision); differing digests only mean "compare in full".
+    """
+    if not normalised:
+        return pd.Series(0, index=index, dtype="uint64")
+    return pd.util.hash_pandas_object(pd.DataFrame(normalised, index=index), index=False)
 
 
 def _apply_ccp_semantic_renames(df: pd.DataFrame) -> pd.DataFrame:
@@ -763,7 +917,10 @@ def _apply_apr_semantic_renames(df: pd.DataFrame) -> pd.DataFrame:
     return df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
 
 
-def _prepare_qd_semantic_measure_reference(df: pd.DataFrame) -> pd.DataFrame:
+def _prepare_qd_semantic_measure_reference(
+    df: pd.DataFrame,
+    source_col: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Ensure QD semantic data has Legacy_Measure_Reference for Measure_Key building.
 
@@ -771,30 +928,61 @@ def _prepare_qd_semantic_measure_reference(df: pd.DataFrame) -> pd.DataFrame:
     1) Existing Legacy_Measure_Reference if present and meaningful
     2) Legacy_BonCode if present and meaningful
     3) Measure_Cd as fallback for newer QD views
+
+    source_col overrides the choice (see _qd_measure_reference_source).
     """
     df = df.copy()
 
-    if "Legacy_Measure_Reference" in df.columns:
-        ref = df["Legacy_Measure_Reference"].astype(str).str.strip()
-        if ref.ne("").any() and ref.str.upper().ne("NA").any():
-            return df
-
-    if "Legacy_BonCode" in df.columns:
-        legacy = df["Legacy_BonCode"].astype(str).str.strip()
-        if legacy.ne("").any() and legacy.str.upper().ne("NA").any():
-            df["Legacy_Measure_Reference"] = df["Legacy_BonCode"]
-            return df
+    if source_col is None:
+        source_col = _qd_measure_reference_source(
+            {
+                col: _reference_flags(df[col])
+                for col in ("Legacy_Measure_Reference", "Legacy_BonCode")
+                if col in df.columns
+            },
+            df.columns,
+        )
 
-    if "Measure_Cd" in df.columns:
-        df["Legacy_Measure_Reference"] = df["Measure_Cd"]
+    if source_col is not None and source_col != "Legacy_Measure_Reference":
+        df["Legacy_Measure_Reference"] = df[source_col]
 
     return df
 
 
+def _reference_flags(values: pd.Series) -> Tuple[bool, bool]:
+    """
+    (any non-blank value, any value other than 'NA') for a measure reference column.
+
+    Both flags are plain "any" reductions, so flags for chunks of a column can be
+    OR-ed together.
+    """
+    ref = values.astype(str).str.strip()
+    return bool(ref.ne("").any()), bool(ref.str.upper().ne("NA").any())
+
+
+def _qd_measure_reference_source(
+    flags: dict[str, Tuple[bool, bool]],
+    columns: Iterable[str],
+) -> Optional[str]:
+    """
+    Column to use as the QD semantic Legacy_Measure_Reference, given
+    _reference_flags for the candidate columns present.
+    """
+    for col in ("Legacy_Measure_Reference", "Legacy_BonCode"):
+        if col in flags and all(flags[col]):
+            return col
+
+    if "Measure_Cd" in columns:
+        return "Measure_Cd"
+
+    return None
+
+
 # --------------------------------------------------------------------------------------
 # 1) PREPARE DATAFRAMES FOR QA
 # --------------------------------------------------------------------------------------
 
+@instrumented("qa")
 def prepare_qa_frames(
     combined_df: pd.DataFrame,
     ingested_df_flat: pd.DataFrame,
@@ -803,6 +991,7 @@ def prepare_qa_frames(
     semantic_to_flat_map: Optional[dict[str, str]] = None,
     logger_: Optional[logging.Logger] = None,
     profile: str = "QD",
+    engine: str = "pandas",
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Prepare Flat_File and semantic DataFrames for QA.
@@ -830,24 +1019,58 @@ def prepare_qa_frames(
       - Normalises MEX_KEY_COLS only (no Measure_Key / no Legacy_Measure_Reference).
       - Dedupes semantic by latest Insert_Date per MEX_KEY_COLS.
 
+    engine="polars" runs the same steps on Polars (see dqchecks.qa_polars).
+
     Returns
     -------
     (flat_for_qa, sem_for_qa)
     """
     log = logger_ or logger
     p = _profile_name(profile)
-    _compare_cols, key_cols, _context_cols = _get_profile_cols(p)
+
+    if _use_polars(engine):
+        return _polars_backend().prepare_qa_frames(
+            combined_df, ingested_df_flat, target_submission_period, target_org, semantic_to_flat_map, log, p,
+        )
 
     # 1) Prepare semantic + raw copies
+    sem_for_qa = _align_semantic_frame(ingested_df_flat, p, semantic_to_flat_map)
+
+    return _prepare_aligned_qa_frames(
+        combined_df,
+        sem_for_qa,
+        target_submission_period,
+        target_org,
+        log,
+        p,
+    )
+
+
+def _align_semantic_frame(
+    ingested_df_flat: pd.DataFrame,
+    profile: str,
+    semantic_to_flat_map: Optional[dict[str, str]] = None,
+    measure_reference_source: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Step 1 of prepare_qa_frames: rename semantic columns to the Flat_File names.
+
+    This is the only preparation step that looks at the semantic frame as a whole
+    (QD picks its Measure_Key source column from the full frame), so it must run
+    before the data is split into partitions, unless measure_reference_source
+    fixes that choice up front.
+    """
+    p = _profile_name(profile)
+
     if p == "QD":
         col_map = semantic_to_flat_map or SEMANTIC_TO_FLAT_COL_MAP
         sem_for_qa = ingested_df_flat.rename(columns=col_map).copy()
-        sem_for_qa = _prepare_qd_semantic_measure_reference(sem_for_qa)
-    elif p == "CCP":
-        sem_for_qa = _apply_ccp_semantic_renames(ingested_df_flat)
-    elif p == "MEX":
-        sem_for_qa = _apply_mex_semantic_renames(ingested_df_flat)
-    elif p in [
+        return _prepare_qd_semantic_measure_reference(sem_for_qa, measure_reference_source)
+    if p == "CCP":
+        return _apply_ccp_semantic_renames(ingested_df_flat)
+    if p == "MEX":
+        return _apply_mex_semantic_renames(ingested_df_flat)
+    if p in [
         "APR_FINANCE",
         "APR_FINANCE_LEGACY",
         "APR_OUTCOMES",
@@ -858,99 +1081,245 @@ def prepare_qa_frames(
         "APR_COST_ASSESSMENT",
         "APR_RAPID",
     ]:
-        sem_for_qa = _apply_apr_semantic_renames(ingested_df_flat)
-    else:
-        raise ValueError(f"Unsupported profile: {p}")
+        return _apply_apr_semantic_renames(ingested_df_flat)
+    raise ValueError(f"Unsupported profile: {p}")
+
+
+def _prepare_aligned_qa_frames(
+    combined_df: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    target_submission_period: str | list[str],
+    target_org: Optional[str],
+    log: logging.Logger,
+    profile: str,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Steps 2-5 of prepare_qa_frames on an already aligned semantic frame.
+    """
+    flat_for_qa, sem_for_qa = _filter_qa_frames(
+        combined_df,
+        sem_for_qa,
+        target_submission_period,
+        target_org,
+    )
+
+    log.info("Flat_File rows BEFORE key normalisation: %d", len(flat_for_qa))
+    log.info("Semantic rows BEFORE key normalisation: %d", len(sem_for_qa))
+
+    return _normalise_and_dedupe_qa_frames(flat_for_qa, sem_for_qa, log, profile)
 
-    flat_for_qa = combined_df.copy()
 
+def _filter_qa_frames(
+    combined_df: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    target_submission_period: str | list[str],
+    target_org: Optional[str],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Steps 2-3 of prepare_qa_frames: normalise period codes and filter by
+    submission period (and optionally org).
+    """
+    flat_for_qa = _filter_qa_frame(combined_df, target_submission_period, target_org, "Flat_File")
+    sem_for_qa = _filter_qa_frame(sem_for_qa, target_submission_period, target_org, "semantic")
+    return flat_for_qa, sem_for_qa
+
+
+def _filter_qa_frame(
+    df: pd.DataFrame,
+    target_submission_period: str | list[str],
+    target_org: Optional[str],
+    side: str,
+) -> pd.DataFrame:
+    """
+    Steps 2-3 of prepare_qa_frames for one side ("Flat_File" / "semantic").
+    """
     # 2) Normalise period codes BEFORE filtering
-    flat_for_qa = _normalise_period_codes(flat_for_qa)
-    sem_for_qa = _normalise_period_codes(sem_for_qa)
+    df = _normalise_period_codes(df)
 
     # 3) Filter by submission period (and optionally org)
-    if "Submission_Period_Cd" not in flat_for_qa.columns:
-        raise ValueError("Submission_Period_Cd missing from Flat_File input.")
-    if "Submission_Period_Cd" not in sem_for_qa.columns:
-        raise ValueError("Submission_Period_Cd missing from semantic input.")
+    if "Submission_Period_Cd" not in df.columns:
+        raise ValueError(f"Submission_Period_Cd missing from {side} input.")
+
+    periods = df["Submission_Period_Cd"].astype(str).str.strip()
 
     if isinstance(target_submission_period, (list, tuple, set)):
         target_periods = [str(x).strip() for x in target_submission_period]
-
-        flat_for_qa = flat_for_qa[
-            flat_for_qa["Submission_Period_Cd"].astype(str).str.strip().isin(target_periods)
-        ]
-
-        sem_for_qa = sem_for_qa[
-            sem_for_qa["Submission_Period_Cd"].astype(str).str.strip().isin(target_periods)
-        ]
+        df = df[periods.isin(target_periods)]
     else:
         target_period = str(target_submission_period).strip()
+        df = df[periods == target_period]
 
-        flat_for_qa = flat_for_qa[
-            flat_for_qa["Submission_Period_Cd"].astype(str).str.strip() == target_period
-        ]
+    if target_org is not None and "Organisation_Cd" in df.columns:
+        df = df[df["Organisation_Cd"] == target_org]
 
-        sem_for_qa = sem_for_qa[
-            sem_for_qa["Submission_Period_Cd"].astype(str).str.strip() == target_period
-        ]
+    return df
 
-    if target_org is not None:
-        if "Organisation_Cd" in flat_for_qa.columns:
-            flat_for_qa = flat_for_qa[flat_for_qa["Organisation_Cd"] == target_org]
-        if "Organisation_Cd" in sem_for_qa.columns:
-            sem_for_qa = sem_for_qa[sem_for_qa["Organisation_Cd"] == target_org]
 
-    log.info("Flat_File rows BEFORE key normalisation: %d", len(flat_for_qa))
-    log.info("Semantic rows BEFORE key normalisation: %d", len(sem_for_qa))
+def _normalise_and_dedupe_qa_frames(
+    flat_for_qa: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    log: logging.Logger,
+    profile: str,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Steps 4-5 of prepare_qa_frames: normalise keys and keep the latest semantic
+    row per key.
+
+    Both steps are row-wise or grouped by the profile key, so they give the same
+    result on the whole frames or on per-Organisation_Cd partitions, provided
+    _Insert_Date_ts has been parsed up front (to_datetime infers its format from
+    the first value it sees).
+    """
+    p = _profile_name(profile)
+    _compare_cols, key_cols, _context_cols = _get_profile_cols(p)
+
+    flat_for_qa, sem_for_qa = _normalise_qa_keys(flat_for_qa, sem_for_qa, p)
+
+    log.info("Flat_File rows AFTER key normalisation: %d", len(flat_for_qa))
+    log.info("Semantic rows AFTER key normalisation: %d", len(sem_for_qa))
+
+    sem_for_qa = _dedupe_semantic_rows(sem_for_qa, key_cols)
+
+    log.info("Semantic rows AFTER dedupe: %d", len(sem_for_qa))
+
+    return flat_for_qa, sem_for_qa
+
+
+def _normalise_qa_keys(
+    flat_for_qa: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    profile: str,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Step 4 of prepare_qa_frames: add missing optional key columns and normalise keys.
+    """
+    flat_for_qa = _normalise_qa_side_keys(flat_for_qa, profile, "Flat_File")
+    sem_for_qa = _normalise_qa_side_keys(sem_for_qa, profile, "semantic")
+    return flat_for_qa, sem_for_qa
+
+
+def _normalise_qa_side_keys(df: pd.DataFrame, profile: str, side: str) -> pd.DataFrame:
+    """
+    Step 4 of prepare_qa_frames for one side ("Flat_File" / "semantic").
+    """
+    p = _profile_name(profile)
+    _compare_cols, key_cols, _context_cols = _get_profile_cols(p)
 
     # Ensure all expected key columns exist.
     # This keeps backward compatibility with older/minimal test inputs.
-    flat_for_qa = _ensure_key_columns(flat_for_qa, key_cols)
-    sem_for_qa = _ensure_key_columns(sem_for_qa, key_cols)
+    df = _ensure_key_columns(df, key_cols)
 
     # 4) Normalise keys
     if p == "QD":
-        flat_for_qa = _normalise_keys_with_measure(
-            flat_for_qa,
-            measure_col="Measure_Cd",
-        )
+        measure_col = "Measure_Cd" if side == "Flat_File" else "Legacy_Measure_Reference"
+        return _normalise_keys_with_measure(df, measure_col=measure_col)
 
-        sem_for_qa = _normalise_keys_with_measure(
-            sem_for_qa,
-            measure_col="Legacy_Measure_Reference",
-        )
-    else:
-        flat_for_qa = _normalise_key_cols(flat_for_qa, key_cols)
-        sem_for_qa = _normalise_key_cols(sem_for_qa, key_cols)
+    return _normalise_key_cols(df, key_cols)
 
-    log.info("Flat_File rows AFTER key normalisation: %d", len(flat_for_qa))
-    log.info("Semantic rows AFTER key normalisation: %d", len(sem_for_qa))
 
+def _dedupe_semantic_rows(sem_for_qa: pd.DataFrame, key_cols: list[str]) -> pd.DataFrame:
+    """
+    Step 5 of prepare_qa_frames: keep the latest Insert_Date row per key.
+
+    Uses a pre-parsed _Insert_Date_ts column when present. Kept rows stay in
+    input order; on ties (or when no Insert_Date parses) the first row wins.
+    """
     # 5) Dedupe semantic by latest Insert_Date per key
     if "Insert_Date" in sem_for_qa.columns and not sem_for_qa.empty:
-        sem_for_qa["_Insert_Date_ts"] = pd.to_datetime(sem_for_qa["Insert_Date"], errors="coerce")
-        sem_for_qa = sem_for_qa.sort_values(
-            key_cols + ["_Insert_Date_ts"],
-            ascending=[True] * len(key_cols) + [False],
-        )
-        sem_for_qa = sem_for_qa.drop_duplicates(subset=key_cols, keep="first")
-        sem_for_qa = sem_for_qa.drop(columns=["_Insert_Date_ts"])
+        if "_Insert_Date_ts" not in sem_for_qa.columns:
+            sem_for_qa = _parse_insert_dates(sem_for_qa)
+        sem_for_qa = sem_for_qa[_latest_row_mask(sem_for_qa, key_cols)]
 
-    log.info("Semantic rows AFTER dedupe: %d", len(sem_for_qa))
+    return sem_for_qa.drop(columns=["_Insert_Date_ts"], errors="ignore")
 
-    return flat_for_qa, sem_for_qa
+
+def _latest_row_mask(sem_for_qa: pd.DataFrame, key_cols: list[str]) -> np.ndarray:
+    """
+    Boolean mask selecting the row with the greatest _Insert_Date_ts per key.
+
+    Keys are numbered by hashing (groupby().ngroup()) and the latest row is taken
+    with a grouped idxmax, so nothing is sorted and the cost is linear in rows.
+    """
+    group_ids = sem_for_qa.groupby(key_cols, sort=False, dropna=False).ngroup().to_numpy()
+
+    # NaT becomes the smallest int64, so it only wins when a key has no parsed date.
+    timestamps = sem_for_qa["_Insert_Date_ts"].to_numpy(dtype="datetime64[ns]").view("int64")
+    latest = pd.Series(timestamps).groupby(group_ids).idxmax().to_numpy()
+
+    mask = np.zeros(len(sem_for_qa), dtype=bool)
+    mask[latest] = True
+    return mask
+
+
+# Values pd.to_datetime skips when inferring a format from the first element.
+_UNPARSED_DATE_STRINGS: frozenset[str] = frozenset({"", "NaT", "nat", "NAT", "nan", "NaN", "NAN", "now", "today"})
+
+
+def _first_insert_date(insert_dates: pd.Series) -> Optional[object]:
+    """
+    The value pd.to_datetime would infer its format from, or None if there is none.
+    """
+    # Walk in small slices: the first value is almost always the one.
+    for start in range(0, len(insert_dates), 1024):
+        for value in insert_dates.iloc[start:start + 1024].to_numpy(dtype=object):
+            if pd.isna(value) or (isinstance(value, str) and value in _UNPARSED_DATE_STRINGS):
+                continue
+            return value
+    return None
+
+
+def _insert_date_format(first_insert_date: Optional[object]) -> Optional[str]:
+    """
+    The format pd.to_datetime would infer for a column whose first parseable
+    value is first_insert_date (see _first_insert_date), or None.
+
+    pandas guesses a format from the first non-null string and applies it to the
+    whole column, so parsing a column in pieces only matches parsing it whole if
+    the format is fixed up front.
+    """
+    if guess_datetime_format is None or not isinstance(first_insert_date, str):
+        return None
+    return _guess_insert_date_format(first_insert_date)
+
+
+@lru_cache(maxsize=128)
+def _guess_insert_date_format(first_insert_date: str) -> Optional[str]:
+    """
+    guess_datetime_format, cached: each load writes Insert_Date the same way.
+    """
+    return guess_datetime_format(first_insert_date)
+
+
+def _parse_insert_dates(sem_for_qa: pd.DataFrame, insert_date_format: Optional[str] = None) -> pd.DataFrame:
+    """
+    Add the _Insert_Date_ts helper column used by the semantic dedupe.
+
+    Without insert_date_format, the format pandas would infer is worked out once
+    (cached) and passed explicitly.
+    """
+    if insert_date_format is None:
+        insert_date_format = _insert_date_format(_first_insert_date(sem_for_qa["Insert_Date"]))
+
+    sem_for_qa = sem_for_qa.copy()
+    sem_for_qa["_Insert_Date_ts"] = pd.to_datetime(
+        sem_for_qa["Insert_Date"],
+        format=insert_date_format,
+        errors="coerce",
+    )
+    return sem_for_qa
 
 
 # --------------------------------------------------------------------------------------
 # 2) KEY-LEVEL MATCHING
 # --------------------------------------------------------------------------------------
 
+@instrumented("qa")
 def compute_key_overlap(
     flat_for_qa: pd.DataFrame,
     sem_for_qa: pd.DataFrame,
     logger_: Optional[logging.Logger] = None,
     profile: str = "QD",
+    engine: str = "pandas",
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Compute key-level overlap between Flat_File and semantic data.
@@ -959,9 +1328,14 @@ def compute_key_overlap(
     - keys_only_raw
     - keys_only_sem
     - keys_in_both
+
+    engine="polars" matches the keys on Polars (see dqchecks.qa_polars).
     """
     log = logger_ or logger
     p = _profile_name(profile)
+
+    if _use_polars(engine):
+        return _polars_backend().compute_key_overlap(flat_for_qa, sem_for_qa, logger_=log, profile=p)
     _compare_cols, key_cols, _context_cols = _get_profile_cols(p)
 
     raw_keys = flat_for_qa[key_cols].drop_duplicates().copy()
@@ -989,6 +1363,246 @@ def compute_key_overlap(
 # 3) BUILD DIFF TABLE
 # --------------------------------------------------------------------------------------
 
+DEFAULT_DIFF_STREAM_BATCH_SIZE = 50_000
+
+_DIFF_VALUE_COLS: list[str] = ["Error_Type", "Column_Name", "Raw_Value", "Ingested_Value", "Measure_Desc", "Error_Desc"]
+
+
+def _diff_columns(context_cols: list[str]) -> list[str]:
+    """
+    Every column a build_qa_diff record can have, in output order.
+    """
+    cols = list(context_cols)
+    if "Measure_Cd" not in cols:
+        cols.append("Measure_Cd")
+    return cols + _DIFF_VALUE_COLS + ["Batch_Id", "QA_Run_Datetime"]
+
+
+class QADiffTotals:
+    """
+    Exact diff counts and distinct mismatching keys, folded in piece by piece.
+
+    Holds what build_qa_summaries needs from a diff table (see QAAggregates):
+    diff_counts (Organisation_Cd, Error_Type, Column_Name, Error_Count) and
+    mismatch_keys. Pass one to build_qa_diff(diff_totals=...) when capping the
+    diff with max_examples_per_group, then to build_qa_summaries(diff_totals=...)
+    so the summaries still count every difference.
+    """
+
+    def __init__(self):
+        self.diff_counts = pd.DataFrame(columns=_DIFF_GROUP_COLS + ["Error_Count"])
+        # Each key is kept once: a set of the keys seen so far plus the frames of
+        # keys new in each fold, concatenated when mismatch_keys is read
+        self._seen_keys: set[tuple] = set()
+        self._key_frames: list[pd.DataFrame] = []
+
+    @property
+    def mismatch_keys(self) -> pd.DataFrame:
+        """Distinct key tuples with at least one diff row."""
+        if not self._key_frames:
+            return pd.DataFrame()
+        if len(self._key_frames) > 1:
+            self._key_frames = [pd.concat(self._key_frames, ignore_index=True)]
+        return self._key_frames[0]
+
+    def add_diff(self, qa_diff_df: pd.DataFrame, key_cols: list[str]) -> None:
+        """
+        Count the rows of a (partial) diff table.
+        """
+        self._fold(*_aggregate_qa_diff(qa_diff_df, key_cols))
+
+    def add_rows(
+        self,
+        rows: pd.DataFrame,
+        error_type: str,
+        column_name: str,
+        record_key_cols: list[str],
+        key_cols: list[str],
+    ) -> None:
+        """
+        Count the diff records build_qa_diff would build from rows, without building them.
+        """
+        if rows.empty:
+            return
+
+        diff_counts = (
+            rows["Organisation_Cd"]
+            .value_counts(dropna=False, sort=False)
+            .rename_axis("Organisation_Cd")
+            .reset_index(name="Error_Count")
+        )
+        diff_counts.insert(1, "Error_Type", error_type)
+        diff_counts.insert(2, "Column_Name", column_name)
+
+        mismatch_keys = rows.reindex(columns=record_key_cols).drop_duplicates().reindex(columns=key_cols)
+        self._fold(diff_counts, mismatch_keys)
+
+    def _fold(self, diff_counts: pd.DataFrame, mismatch_keys: pd.DataFrame) -> None:
+        if not diff_counts.empty:
+            if self.diff_counts.empty:
+                self.diff_counts = diff_counts
+            else:
+                self.diff_counts = (
+                    pd.concat([self.diff_counts, diff_counts], ignore_index=True)
+                    .groupby(_DIFF_GROUP_COLS, dropna=False, sort=False)["Error_Count"]
+                    .sum()
+                    .reset_index()
+                )
+
+        if not mismatch_keys.empty:
+            # None for every null so that equal keys hash equal (NaN != NaN)
+            hashable = mismatch_keys.astype(object).where(mismatch_keys.notna(), None)
+            is_new = []
+            for key in hashable.itertuples(index=False, name=None):
+                is_new.append(key not in self._seen_keys)
+                self._seen_keys.add(key)
+            if any(is_new):
+                self._key_frames.append(mismatch_keys[is_new].reset_index(drop=True))
+
+
+class QADiffStream(QADiffTotals):  # pylint: disable=too-many-instance-attributes
+    """
+    Receives build_qa_diff records in fixed-size batches instead of one DataFrame.
+
+    Pass an instance as build_qa_diff(diff_stream=...). Every batch_size records
+    become a DataFrame with all diff columns (context columns, Error_Type ...
+    Error_Desc, Batch_Id, QA_Run_Datetime) that is handed to sink: either a
+    callable taking the batch, or the path of a parquet file to write (values
+    stored as strings). Only the counts build_qa_summaries needs are kept (see
+    QADiffTotals), so memory is bounded by batch_size and the number of distinct
+    mismatching keys rather than by the number of diff rows.
+
+    Example:
+
+        with qa.QADiffStream("/lakehouse/Files/qa_diff.parquet") as diff_stream:
+            qa.build_qa_diff(..., diff_stream=diff_stream)
+        qa.build_qa_summaries(..., diff_totals=diff_stream)
+    """
+
+    def __init__(self, sink, batch_size: int = DEFAULT_DIFF_STREAM_BATCH_SIZE):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        super().__init__()
+        self.sink = sink
+        self.batch_size = batch_size
+        self.rows_written = 0
+
+        self._records: list[dict] = []
+        self._columns: list[str] = []
+        self._key_cols: list[str] = []
+        self._batch_id: Optional[str] = None
+        self._qa_run_datetime: Optional[str] = None
+        self._count_batches = True
+        self._parquet_writer = None
+
+    def __enter__(self) -> "QADiffStream":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def start(
+        self,
+        context_cols: list[str],
+        key_cols: list[str],
+        batch_id: str,
+        qa_run_datetime: str,
+        count_batches: bool = True,
+    ) -> None:
+        """
+        Set the columns and run stamps of the batches (called by build_qa_diff).
+
+        count_batches=False when build_qa_diff counts the rows itself (capped diffs).
+        """
+        self._columns = _diff_columns(context_cols)
+        self._key_cols = key_cols
+        self._batch_id = batch_id
+        self._qa_run_datetime = qa_run_datetime
+        self._count_batches = count_batches
+
+    def add(self, record: dict) -> None:
+        """
+        Buffer one diff record, sending a batch once batch_size are buffered.
+        """
+        self._records.append(record)
+        if len(self._records) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Send the buffered records as one batch and fold them into the counts.
+        """
+        if not self._records:
+            return
+
+        batch = pd.DataFrame(self._records).reindex(columns=self._columns)
+        self._records = []
+        batch["Batch_Id"] = self._batch_id
+        batch["QA_Run_Datetime"] = self._qa_run_datetime
+
+        if self._count_batches:
+            self.add_diff(batch, self._key_cols)
+        self.rows_written += len(batch)
+
+        if callable(self.sink):
+            self.sink(batch)
+        else:
+            self._write_parquet(batch)
+
+    def close(self) -> None:
+        """
+        Flush remaining records and finish the parquet file (if writing one).
+        """
+        self.flush()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def _write_parquet(self, batch: pd.DataFrame) -> None:
+        if pq is None:
+            raise ImportError("pyarrow is required to stream QA diffs to a parquet file.")
+
+        schema = pa.schema([(c, pa.string()) for c in self._columns])
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(os.fspath(self.sink), schema)
+
+        # Raw_Value / Ingested_Value mix strings and numbers, which parquet cannot hold in one column.
+        table = pa.Table.from_pandas(batch.astype("string"), schema=schema, preserve_index=False)
+        self._parquet_writer.write_table(table)
+
+
+def _record_key_cols(key_cols: list[str], context_cols: list[str]) -> list[str]:
+    """
+    Key columns that end up in diff records (context columns, plus Measure_Cd which is always added).
+    """
+    return [c for c in key_cols if c in context_cols or c == "Measure_Cd"]
+
+
+def _sample_diff_rows(
+    rows: pd.DataFrame,
+    error_type: str,
+    column_name: str,
+    max_examples_per_group: Optional[int],
+    diff_totals: Optional[QADiffTotals],
+    key_cols: list[str],
+    context_cols: list[str],
+) -> pd.DataFrame:
+    """
+    Rows to build diff records for: all of them, or (when capped) the first
+    max_examples_per_group per Organisation_Cd after counting every row into diff_totals.
+
+    Each (Error_Type, Column_Name) pair comes from a single section of build_qa_diff,
+    so this caps every (Organisation_Cd, Error_Type, Column_Name) group.
+    """
+    if max_examples_per_group is None or rows.empty:
+        return rows
+
+    diff_totals.add_rows(rows, error_type, column_name, _record_key_cols(key_cols, context_cols), key_cols)
+    return rows.groupby("Organisation_Cd", sort=False, dropna=False).head(max_examples_per_group)
+
+
+@instrumented("qa")
 def build_qa_diff(
     flat_for_qa: pd.DataFrame,
     sem_for_qa: pd.DataFrame,
@@ -1005,6 +1619,10 @@ def build_qa_diff(
     target_submission_period: Optional[str] = None,
     logger_: Optional[logging.Logger] = None,
     profile: str = "QD",
+    diff_stream: Optional[QADiffStream] = None,
+    max_examples_per_group: Optional[int] = None,
+    diff_totals: Optional[QADiffTotals] = None,
+    engine: str = "pandas",
 ) -> pd.DataFrame:
     """
     Build the full QA differences DataFrame.
@@ -1014,12 +1632,52 @@ def build_qa_diff(
       - rows only in semantic
       - column-level mismatches for rows in both
       - synthetic "missing company from folder" errors (if inputs provided)
+
+    With diff_stream, records are sent to it in batches as they are produced and
+    an empty DataFrame is returned; pass the same diff_stream to build_qa_summaries.
+
+    With max_examples_per_group, only the first N records of each
+    (Organisation_Cd, Error_Type, Column_Name) are built; every difference is
+    still counted into diff_totals (or diff_stream), which build_qa_summaries
+    then uses for exact counts. diff_totals also collects the counts of an
+    uncapped diff.
+
+    engine="polars" finds the rows that can produce a record on Polars and builds
+    the records from those only (see dqchecks.qa_polars).
     """
     log = logger_ or logger
     p = _profile_name(profile)
     compare_cols, key_cols, context_cols = _get_profile_cols(p)
 
+    if _use_polars(engine):
+        return _polars_backend().build_qa_diff(
+            flat_for_qa, sem_for_qa, keys_only_raw, keys_only_sem, keys_in_both, batch_id, qa_run_datetime,
+            filtered_excel_files, expected_companies, status, process_cd, submission_period_cd,
+            target_submission_period, log, p, diff_stream, max_examples_per_group, diff_totals,
+        )
+
+    if diff_stream is not None and diff_totals is not None:
+        raise ValueError("Pass either diff_stream or diff_totals, not both.")
+    if max_examples_per_group is not None:
+        if max_examples_per_group < 1:
+            raise ValueError("max_examples_per_group must be at least 1.")
+        if diff_stream is None and diff_totals is None:
+            raise ValueError("max_examples_per_group needs diff_totals (or diff_stream) to keep exact counts.")
+
+    totals = diff_stream if diff_stream is not None else diff_totals
+
     diff_records: list[dict] = []
+    if diff_stream is not None:
+        diff_stream.start(
+            context_cols,
+            key_cols,
+            batch_id,
+            qa_run_datetime,
+            count_batches=max_examples_per_group is None,
+        )
+        add_record = diff_stream.add
+    else:
+        add_record = diff_records.append
 
     # ------------------------------------------------------------------
     # 1) Rows present in Flat_File but missing in ingested
@@ -1027,6 +1685,10 @@ def build_qa_diff(
     if not keys_only_raw.empty:
         missing_raw_rows = flat_for_qa.merge(keys_only_raw, on=key_cols, how="inner")
         log.info("Rows present only in Flat_File: %d", len(missing_raw_rows))
+        missing_raw_rows = _sample_diff_rows(
+            missing_raw_rows, "MISSING_IN_INGESTED", "Measure_Value",
+            max_examples_per_group, totals, key_cols, context_cols,
+        )
 
         for _, row in missing_raw_rows.iterrows():
             context = {k: row.get(k) for k in context_cols if k in missing_raw_rows.columns}
@@ -1046,7 +1708,7 @@ def build_qa_diff(
                     f"Flat_File Measure_Value={raw_measure!r}."
                 ),
             })
-            diff_records.append(context)
+            add_record(context)
 
     # ------------------------------------------------------------------
     # 2) Rows present in ingested but missing in Flat_File
@@ -1054,6 +1716,10 @@ def build_qa_diff(
     if not keys_only_sem.empty:
         extra_sem_rows = sem_for_qa.merge(keys_only_sem, on=key_cols, how="inner")
         log.info("Rows present only in Semantic: %d", len(extra_sem_rows))
+        extra_sem_rows = _sample_diff_rows(
+            extra_sem_rows, "EXTRA_IN_INGESTED", "Measure_Value",
+            max_examples_per_group, totals, key_cols, context_cols,
+        )
 
         for _, row in extra_sem_rows.iterrows():
             context = {k: row.get(k) for k in context_cols if k in extra_sem_rows.columns}
@@ -1073,7 +1739,7 @@ def build_qa_diff(
                     f"Semantic Measure_Value={ing_measure!r}."
                 ),
             })
-            diff_records.append(context)
+            add_record(context)
 
     # ------------------------------------------------------------------
     # 3) Rows present in BOTH: column-level comparisons
@@ -1112,51 +1778,31 @@ def build_qa_diff(
 
         common_cols = sorted(set(configured_common_cols).union(dynamic_common_cols))
 
-        def _measure_value_diff_mask_qd(df: pd.DataFrame) -> pd.Series:
-            col_raw = "Measure_Value_raw"
-            col_ing = "Measure_Value_ingested"
-
-            unit_raw = df["Measure_Unit_raw"] if "Measure_Unit_raw" in df.columns else None
-            unit_ing = df["Measure_Unit_ingested"] if "Measure_Unit_ingested" in df.columns else None
-
-            raw_num = _normalise_measure_value(df[col_raw], unit_raw)
-            ing_num = _normalise_measure_value(df[col_ing], unit_ing)
+        # Normalise every compare column once per side, then digest each row.
+        # Only rows whose digests differ need the column-by-column comparison;
+        # on a clean resubmission that is a tiny fraction of `both`.
+        norm_raw = {col: _normalise_compare_column(both, col, "_raw", p) for col in common_cols}
+        norm_ing = {col: _normalise_compare_column(both, col, "_ingested", p) for col in common_cols}
 
-            df[col_raw + "_num_original"] = raw_num
-            df[col_ing + "_num_original"] = ing_num
-
-            both_na = raw_num.isna() & ing_num.isna()
-            equal_values = raw_num == ing_num
-            return ~(both_na | equal_values)
-
-        def _measure_value_diff_mask_ccp(df: pd.DataFrame) -> pd.Series:
-            col_raw = "Measure_Value_raw"
-            col_ing = "Measure_Value_ingested"
-
-            raw_num = pd.to_numeric(df[col_raw].astype(str).str.strip().str.replace("%", "", regex=False), errors="coerce")
-            ing_num = pd.to_numeric(df[col_ing].astype(str).str.strip().str.replace("%", "", regex=False), errors="coerce")
-
-            both_na = raw_num.isna() & ing_num.isna()
-            equal_values = raw_num == ing_num
-            return ~(both_na | equal_values)
+        changed = (
+            _row_digest(norm_raw, both.index).to_numpy()
+            != _row_digest(norm_ing, both.index).to_numpy()
+        )
+        both = both[changed]
+        log.info("Rows present in BOTH with differing row digests: %d", len(both))
 
         for col in common_cols:
             col_raw = f"{col}_raw"
             col_ing = f"{col}_ingested"
 
-            if col == "Measure_Value":
-                mask_diff = _measure_value_diff_mask_qd(both) if p == "QD" else _measure_value_diff_mask_ccp(both)
-                err_type = "MEASURE_VALUE_MISMATCH"
+            left_norm = norm_raw[col][changed]
+            right_norm = norm_ing[col][changed]
 
-            elif col == "Measure_Decimals":
-                raw_num = pd.to_numeric(both[col_raw], errors="coerce")
-                ing_num = pd.to_numeric(both[col_ing], errors="coerce")
-                mask_diff = ~((raw_num.isna() & ing_num.isna()) | (raw_num == ing_num))
-                err_type = "MEASURE_DECIMALS_MISMATCH"
+            if col in ("Measure_Value", "Measure_Decimals"):
+                mask_diff = ~((left_norm.isna() & right_norm.isna()) | (left_norm == right_norm))
+                err_type = "MEASURE_VALUE_MISMATCH" if col == "Measure_Value" else "MEASURE_DECIMALS_MISMATCH"
 
             else:
-                left_norm = _normalise_string(both[col_raw])
-                right_norm = _normalise_string(both[col_ing])
                 mask_diff = left_norm != right_norm
 
                 # Keep QD test expectations intact
@@ -1169,8 +1815,12 @@ def build_qa_diff(
                 else:
                     err_type = f"{col.upper()}_MISMATCH"
 
-            diff_rows = both[mask_diff]
-            for _, row in diff_rows.iterrows():
+            diff_rows = _sample_diff_rows(
+                both[mask_diff], err_type, col,
+                max_examples_per_group, totals, key_cols, context_cols,
+            )
+            # Object-dtype records keep None as None (iterrows would infer str and give NaN)
+            for row in diff_rows.astype(object).to_dict("records"):
                 context = {k: row.get(k) for k in context_cols if k in both.columns}
                 raw_val = row.get(col_raw)
                 ing_val = row.get(col_ing)
@@ -1214,65 +1864,30 @@ def build_qa_diff(
                     "Measure_Desc": measure_desc,
                     "Error_Desc": desc,
                 }
-                diff_records.append(record)
+                add_record(record)
 
     # ------------------------------------------------------------------
     # 4) Companies missing from folder-level files (by filename prefix)
     # ------------------------------------------------------------------
-    if filtered_excel_files is not None and expected_companies is not None:
-        present_orgs_from_files: set[str] = set()
-
-        expected_orgs_upper = {str(org).strip().upper() for org in expected_companies}
-
-        for path in filtered_excel_files:
-            fname = os.path.basename(path).strip().upper()
-
-            for org in expected_orgs_upper:
-                if (
-                    fname == org
-                    or fname.startswith(f"{org} ")
-                    or fname.startswith(f"{org}-")
-                    or fname.startswith(f"{org}_")
-                ):
-                    present_orgs_from_files.add(org)
-                    break
-
-        missing_orgs = sorted(
-            org
-            for org in expected_companies
-            if str(org).strip().upper() not in present_orgs_from_files
-        )
-
-        if missing_orgs:
-            process_str = str(process_cd).upper() if process_cd else None
-            log.warning(
-                "Missing companies from folder for Status=%s, Process_Cd=%s, Submission_Period_Cd=%s: %s",
-                status,
-                process_str,
-                submission_period_cd,
-                ", ".join(missing_orgs),
-            )
-
-            for org in missing_orgs:
-                record = {
-                    "Organisation_Cd": org,
-                    "Submission_Period_Cd": target_submission_period,
-                    "Error_Type": "MISSING_COMPANY_FROM_FOLDER",
-                    "Column_Name": "Organisation_Cd",
-                    "Raw_Value": None,
-                    "Ingested_Value": None,
-                    "Measure_Desc": None,
-                    "Error_Desc": (
-                        "Missing Company From Folder: "
-                        f"Process_Cd={process_str}, Submission_Period_Cd={submission_period_cd}, "
-                        f"Status={status}, Organisation_Cd={org}."
-                    ),
-                }
-
-                for c in context_cols:
-                    record.setdefault(c, None)
+    missing_company_records = _missing_company_records(
+        filtered_excel_files,
+        expected_companies,
+        context_cols,
+        status,
+        process_cd,
+        submission_period_cd,
+        target_submission_period,
+        log,
+    )
+    if max_examples_per_group is not None and missing_company_records:
+        totals.add_diff(pd.DataFrame(missing_company_records), key_cols)
+    for record in missing_company_records:
+        add_record(record)
 
-                diff_records.append(record)
+    if diff_stream is not None:
+        diff_stream.flush()
+        log.info("QA diff rows streamed: %d", diff_stream.rows_written)
+        return pd.DataFrame()
 
     # ------------------------------------------------------------------
     # Build final differences dataframe
@@ -1283,13 +1898,261 @@ def build_qa_diff(
         qa_diff_df["Batch_Id"] = batch_id
         qa_diff_df["QA_Run_Datetime"] = qa_run_datetime
 
+    if diff_totals is not None and max_examples_per_group is None:
+        diff_totals.add_diff(qa_diff_df, key_cols)
+
     return qa_diff_df
 
 
-# --------------------------------------------------------------------------------------
+def _record_period(target_submission_period: str | list[str] | None) -> Optional[str]:
+    """
+    Submission_Period_Cd of the synthetic records of a run filtered on
+    target_submission_period: the period itself when it is a single one, else
+    None (a list of periods cannot go into one record).
+    """
+    return target_submission_period if isinstance(target_submission_period, str) else None
+
+
+def _missing_company_records(
+    filtered_excel_files: Optional[Iterable[str]],
+    expected_companies: Optional[Iterable[str]],
+    context_cols: list[str],
+    status: Optional[str],
+    process_cd: Optional[str],
+    submission_period_cd: Optional[str],
+    target_submission_period: Optional[str],
+    log: logging.Logger,
+) -> list[dict]:
+    """
+    Build synthetic MISSING_COMPANY_FROM_FOLDER records for expected companies
+    with no matching file (by filename prefix) in filtered_excel_files.
+    """
+    records: list[dict] = []
+    if filtered_excel_files is None or expected_companies is None:
+        return records
+
+    present_orgs_from_files: set[str] = set()
+
+    expected_orgs_upper = {str(org).strip().upper() for org in expected_companies}
+
+    for path in filtered_excel_files:
+        fname = os.path.basename(path).strip().upper()
+
+        for org in expected_orgs_upper:
+            if (
+                fname == org
+                or fname.startswith(f"{org} ")
+                or fname.startswith(f"{org}-")
+                or fname.startswith(f"{org}_")
+            ):
+                present_orgs_from_files.add(org)
+                break
+
+    missing_orgs = sorted(
+        org
+        for org in expected_companies
+        if str(org).strip().upper() not in present_orgs_from_files
+    )
+
+    if missing_orgs:
+        process_str = str(process_cd).upper() if process_cd else None
+        log.warning(
+            "Missing companies from folder for Status=%s, Process_Cd=%s, Submission_Period_Cd=%s: %s",
+            status,
+            process_str,
+            submission_period_cd,
+            ", ".join(missing_orgs),
+        )
+
+        for org in missing_orgs:
+            record = {
+                "Organisation_Cd": org,
+                "Submission_Period_Cd": target_submission_period,
+                "Error_Type": "MISSING_COMPANY_FROM_FOLDER",
+                "Column_Name": "Organisation_Cd",
+                "Raw_Value": None,
+                "Ingested_Value": None,
+                "Measure_Desc": None,
+                "Error_Desc": (
+                    "Missing Company From Folder: "
+                    f"Process_Cd={process_str}, Submission_Period_Cd={submission_period_cd}, "
+                    f"Status={status}, Organisation_Cd={org}."
+                ),
+            }
+
+            for c in context_cols:
+                record.setdefault(c, None)
+
+            records.append(record)
+
+    return records
+
+
+# --------------------------------------------------------------------------------------
 # 4) BUILD QA SUMMARY + PER-COMPANY SUMMARY + ERROR COUNTS
 # --------------------------------------------------------------------------------------
 
+
+@dataclass
+class QAAggregates:
+    """
+    Additive building blocks of the QA summaries.
+
+    Aggregates built for disjoint slices of the data (e.g. one per Organisation_Cd)
+    can be merged with combine_qa_aggregates and turned into the usual summary
+    frames with build_qa_summaries_from_aggregates.
+
+    Attributes:
+        total_raw_rows: Rows in flat_for_qa.
+        total_ingested_rows: Rows in sem_for_qa.
+        rows_with_keys_in_both: Rows in keys_in_both.
+        org_counts: Organisation_Cd, Total_Raw_Rows, Total_Ingested_Rows, Rows_With_Keys_In_Both.
+        diff_counts: Organisation_Cd, Error_Type, Column_Name, Error_Count (nulls kept as groups).
+        mismatch_keys: Distinct key tuples with at least one diff row (all profile key columns).
+    """
+    total_raw_rows: int
+    total_ingested_rows: int
+    rows_with_keys_in_both: int
+    org_counts: pd.DataFrame
+    diff_counts: pd.DataFrame
+    mismatch_keys: pd.DataFrame
+
+
+_ORG_COUNT_COLS: list[str] = ["Total_Raw_Rows", "Total_Ingested_Rows", "Rows_With_Keys_In_Both"]
+_DIFF_GROUP_COLS: list[str] = ["Organisation_Cd", "Error_Type", "Column_Name"]
+
+
+def _aggregate_qa_diff(qa_diff_df: pd.DataFrame, key_cols: list[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Reduce a diff table to (diff_counts, mismatch_keys) as held by QAAggregates.
+    """
+    key_cols_for_diff = [c for c in key_cols if c in qa_diff_df.columns]
+
+    if qa_diff_df.empty or not key_cols_for_diff:
+        return (
+            pd.DataFrame(columns=_DIFF_GROUP_COLS + ["Error_Count"]),
+            pd.DataFrame(columns=key_cols),
+        )
+
+    diff_counts = (
+        qa_diff_df.reindex(columns=_DIFF_GROUP_COLS)
+        .groupby(_DIFF_GROUP_COLS, dropna=False, sort=False)
+        .size()
+        .reset_index(name="Error_Count")
+    )
+    mismatch_keys = qa_diff_df[key_cols_for_diff].drop_duplicates().reindex(columns=key_cols)
+
+    return diff_counts, mismatch_keys
+
+
+@instrumented("qa")
+def build_qa_aggregates(
+    flat_for_qa: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    keys_in_both: pd.DataFrame,
+    qa_diff_df: pd.DataFrame,
+    profile: str = "QD",
+    diff_totals: Optional[QADiffTotals] = None,
+) -> QAAggregates:
+    """
+    Reduce the prepared frames, key overlap and diff table to QAAggregates.
+
+    With diff_totals (e.g. a QADiffStream), its counts are used and qa_diff_df is ignored.
+    """
+    p = _profile_name(profile)
+    _compare_cols, key_cols, _context_cols = _get_profile_cols(p)
+
+    # keys_in_both already holds one row per matched key, so counting its
+    # Organisation_Cd values gives the per-company matches without regrouping.
+    if not keys_in_both.empty and "Organisation_Cd" in keys_in_both.columns:
+        keys_in_both_by_org = keys_in_both["Organisation_Cd"].value_counts()
+    else:
+        keys_in_both_by_org = pd.Series(dtype="int64")
+
+    raw_by_org = flat_for_qa["Organisation_Cd"].value_counts()
+    ingested_by_org = sem_for_qa["Organisation_Cd"].value_counts()
+
+    all_orgs = sorted(set(raw_by_org.index).union(ingested_by_org.index))
+    org_counts = pd.DataFrame({"Organisation_Cd": all_orgs})
+    org_counts[_ORG_COUNT_COLS] = (
+        pd.concat([raw_by_org, ingested_by_org, keys_in_both_by_org], axis=1, keys=_ORG_COUNT_COLS)
+        .reindex(all_orgs)
+        .fillna(0)
+        .astype(int)
+        .to_numpy()
+    )
+
+    if diff_totals is not None:
+        diff_counts, mismatch_keys = diff_totals.diff_counts, diff_totals.mismatch_keys.reindex(columns=key_cols)
+    else:
+        diff_counts, mismatch_keys = _aggregate_qa_diff(qa_diff_df, key_cols)
+
+    return QAAggregates(
+        total_raw_rows=len(flat_for_qa),
+        total_ingested_rows=len(sem_for_qa),
+        rows_with_keys_in_both=len(keys_in_both),
+        org_counts=org_counts,
+        diff_counts=diff_counts,
+        mismatch_keys=mismatch_keys,
+    )
+
+
+def combine_qa_aggregates(parts: Iterable[QAAggregates]) -> QAAggregates:
+    """
+    Merge QAAggregates built for disjoint slices of the QA inputs.
+
+    Slices must not share a key (e.g. split by Organisation_Cd); otherwise the
+    same key would be counted once per slice in rows_with_keys_in_both.
+    """
+    parts = list(parts)
+
+    org_frames = [a.org_counts for a in parts if not a.org_counts.empty]
+    if org_frames:
+        org_counts = (
+            pd.concat(org_frames, ignore_index=True)
+            .groupby("Organisation_Cd", sort=True)[_ORG_COUNT_COLS]
+            .sum()
+            .astype(int)
+            .reset_index()
+        )
+    else:
+        org_counts = pd.DataFrame(columns=["Organisation_Cd"] + _ORG_COUNT_COLS)
+
+    diff_frames = [a.diff_counts for a in parts if not a.diff_counts.empty]
+    if diff_frames:
+        diff_counts = (
+            pd.concat(diff_frames, ignore_index=True)
+            .groupby(_DIFF_GROUP_COLS, dropna=False, sort=False)["Error_Count"]
+            .sum()
+            .reset_index()
+        )
+    else:
+        diff_counts = pd.DataFrame(columns=_DIFF_GROUP_COLS + ["Error_Count"])
+
+    key_frames = [a.mismatch_keys for a in parts if not a.mismatch_keys.empty]
+    if key_frames:
+        mismatch_keys = pd.concat(key_frames, ignore_index=True).drop_duplicates()
+    else:
+        mismatch_keys = parts[0].mismatch_keys.iloc[:0] if parts else pd.DataFrame()
+
+    return QAAggregates(
+        total_raw_rows=sum(a.total_raw_rows for a in parts),
+        total_ingested_rows=sum(a.total_ingested_rows for a in parts),
+        rows_with_keys_in_both=sum(a.rows_with_keys_in_both for a in parts),
+        org_counts=org_counts,
+        diff_counts=diff_counts,
+        mismatch_keys=mismatch_keys,
+    )
+
+
+def _join_sorted_distinct(values: pd.Series) -> str:
+    """
+    Comma-separated, sorted distinct non-null values (e.g. Columns_Affected).
+    """
+    return ", ".join(sorted(values.dropna().unique()))
+
+
+@instrumented("qa")
 def build_qa_summaries(
     flat_for_qa: pd.DataFrame,
     sem_for_qa: pd.DataFrame,
@@ -1298,30 +2161,55 @@ def build_qa_summaries(
     batch_id: str,
     qa_run_datetime: str,
     profile: str = "QD",
+    diff_totals: Optional[QADiffTotals] = None,
+    engine: str = "pandas",
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Build:
       - overall QA summary
       - per-company summary
       - error counts by company & error type
+
+    After build_qa_diff(diff_stream=...) or build_qa_diff(diff_totals=...), pass
+    the same object as diff_totals; the counts come from it and qa_diff_df is ignored.
+
+    engine="polars" does the counting on Polars (see dqchecks.qa_polars).
     """
-    p = _profile_name(profile)
-    _compare_cols, key_cols, _context_cols = _get_profile_cols(p)
+    if _use_polars(engine):
+        return _polars_backend().build_qa_summaries(
+            flat_for_qa, sem_for_qa, keys_in_both, qa_diff_df, batch_id, qa_run_datetime, profile, diff_totals,
+        )
 
-    total_raw_rows = len(flat_for_qa)
-    total_ing_rows = len(sem_for_qa)
-    rows_with_keys_in_both = len(keys_in_both)
+    aggregates = build_qa_aggregates(
+        flat_for_qa,
+        sem_for_qa,
+        keys_in_both,
+        qa_diff_df,
+        profile=profile,
+        diff_totals=diff_totals,
+    )
+    return build_qa_summaries_from_aggregates(aggregates, batch_id, qa_run_datetime)
 
-    key_cols_for_diff = [c for c in key_cols if c in qa_diff_df.columns]
 
-    if not qa_diff_df.empty and key_cols_for_diff:
-        keys_with_any_error = qa_diff_df[key_cols_for_diff].drop_duplicates()
-        total_rows_with_mismatches = len(keys_with_any_error)
+def build_qa_summaries_from_aggregates(
+    aggregates: QAAggregates,
+    batch_id: str,
+    qa_run_datetime: str,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Build the build_qa_summaries outputs from (possibly combined) QAAggregates.
+    """
+    diff_counts = aggregates.diff_counts
+    mismatch_keys = aggregates.mismatch_keys
+    rows_with_keys_in_both = aggregates.rows_with_keys_in_both
+
+    if not diff_counts.empty:
+        total_rows_with_mismatches = len(mismatch_keys)
         total_matched_rows = rows_with_keys_in_both - total_rows_with_mismatches
 
-        columns_affected = ", ".join(sorted(qa_diff_df["Column_Name"].dropna().unique()))
-        error_types = ", ".join(sorted(qa_diff_df["Error_Type"].dropna().unique()))
-        total_cell_level_differences = len(qa_diff_df)
+        columns_affected = ", ".join(sorted(diff_counts["Column_Name"].dropna().unique()))
+        error_types = ", ".join(sorted(diff_counts["Error_Type"].dropna().unique()))
+        total_cell_level_differences = int(diff_counts["Error_Count"].sum())
     else:
         total_rows_with_mismatches = 0
         total_matched_rows = rows_with_keys_in_both
@@ -1332,8 +2220,8 @@ def build_qa_summaries(
     qa_summary_df = pd.DataFrame([{
         "Batch_Id": batch_id,
         "QA_Run_Datetime": qa_run_datetime,
-        "Total_Raw_Rows": total_raw_rows,
-        "Total_Ingested_Rows": total_ing_rows,
+        "Total_Raw_Rows": aggregates.total_raw_rows,
+        "Total_Ingested_Rows": aggregates.total_ingested_rows,
         "Rows_With_Keys_In_Both": rows_with_keys_in_both,
         "Total_Matched_Rows": total_matched_rows,
         "Total_Rows_With_Mismatches": total_rows_with_mismatches,
@@ -1343,68 +2231,30 @@ def build_qa_summaries(
     }])
 
     # ----- Per-company summary -----
-    all_orgs = sorted(set(flat_for_qa["Organisation_Cd"].unique()).union(set(sem_for_qa["Organisation_Cd"].unique())))
-    qa_company_summary_df = pd.DataFrame({"Organisation_Cd": all_orgs})
-
-    raw_counts_by_org = flat_for_qa.groupby("Organisation_Cd").size().reset_index(name="Total_Raw_Rows")
-    ing_counts_by_org = sem_for_qa.groupby("Organisation_Cd").size().reset_index(name="Total_Ingested_Rows")
-
-    if not keys_in_both.empty and "Organisation_Cd" in keys_in_both.columns:
-        keys_in_both_by_org = keys_in_both.groupby("Organisation_Cd").size().reset_index(name="Rows_With_Keys_In_Both")
+    if not diff_counts.empty:
+        # One grouped pass over the (already aggregated) diff counts.
+        diff_by_org = diff_counts.groupby("Organisation_Cd").agg(
+            Total_Cell_Level_Differences=("Error_Count", "sum"),
+            Columns_Affected=("Column_Name", _join_sorted_distinct),
+            Error_Types=("Error_Type", _join_sorted_distinct),
+        )
+        diff_by_org.insert(0, "Total_Rows_With_Mismatches", mismatch_keys["Organisation_Cd"].value_counts())
     else:
-        keys_in_both_by_org = pd.DataFrame(columns=["Organisation_Cd", "Rows_With_Keys_In_Both"])
+        diff_by_org = pd.DataFrame(
+            columns=["Total_Rows_With_Mismatches", "Total_Cell_Level_Differences", "Columns_Affected", "Error_Types"],
+            index=pd.Index([], name="Organisation_Cd"),
+        )
 
-    if not qa_diff_df.empty and key_cols_for_diff and "Organisation_Cd" in qa_diff_df.columns:
-        base_for_org = qa_diff_df[key_cols_for_diff].drop_duplicates()
+    qa_company_summary_df = aggregates.org_counts[["Organisation_Cd"] + _ORG_COUNT_COLS].join(diff_by_org, on="Organisation_Cd")
 
-        rows_with_mismatches_by_org = base_for_org.groupby("Organisation_Cd").size().reset_index(name="Total_Rows_With_Mismatches")
-        cell_diff_by_org = qa_diff_df.groupby("Organisation_Cd").size().reset_index(name="Total_Cell_Level_Differences")
+    for col in _ORG_COUNT_COLS + ["Total_Rows_With_Mismatches", "Total_Cell_Level_Differences"]:
+        qa_company_summary_df[col] = pd.to_numeric(qa_company_summary_df[col], errors="coerce").fillna(0).astype(int)
 
-        cols_affected_by_org = (
-            qa_diff_df.groupby("Organisation_Cd")["Column_Name"]
-            .apply(lambda s: ", ".join(sorted(c for c in s.dropna().unique())))
-            .reset_index(name="Columns_Affected")
-        )
-        error_types_by_org = (
-            qa_diff_df.groupby("Organisation_Cd")["Error_Type"]
-            .apply(lambda s: ", ".join(sorted(s.dropna().unique())))
-            .reset_index(name="Error_Types")
-        )
-    else:
-        rows_with_mismatches_by_org = pd.DataFrame(columns=["Organisation_Cd", "Total_Rows_With_Mismatches"])
-        cell_diff_by_org = pd.DataFrame(columns=["Organisation_Cd", "Total_Cell_Level_Differences"])
-        cols_affected_by_org = pd.DataFrame(columns=["Organisation_Cd", "Columns_Affected"])
-        error_types_by_org = pd.DataFrame(columns=["Organisation_Cd", "Error_Types"])
-
-    qa_company_summary_df = (
-        qa_company_summary_df
-        .merge(raw_counts_by_org, on="Organisation_Cd", how="left")
-        .merge(ing_counts_by_org, on="Organisation_Cd", how="left")
-        .merge(keys_in_both_by_org, on="Organisation_Cd", how="left")
-        .merge(rows_with_mismatches_by_org, on="Organisation_Cd", how="left")
-        .merge(cell_diff_by_org, on="Organisation_Cd", how="left")
-        .merge(cols_affected_by_org, on="Organisation_Cd", how="left")
-        .merge(error_types_by_org, on="Organisation_Cd", how="left")
+    qa_company_summary_df["Total_Matched_Rows"] = (
+        qa_company_summary_df["Rows_With_Keys_In_Both"]
+        - qa_company_summary_df["Total_Rows_With_Mismatches"]
     )
 
-    for col in [
-        "Total_Raw_Rows",
-        "Total_Ingested_Rows",
-        "Rows_With_Keys_In_Both",
-        "Total_Rows_With_Mismatches",
-        "Total_Cell_Level_Differences",
-    ]:
-        if col in qa_company_summary_df.columns:
-            qa_company_summary_df[col] = pd.to_numeric(qa_company_summary_df[col], errors="coerce").fillna(0).astype(int)
-
-    if "Rows_With_Keys_In_Both" in qa_company_summary_df.columns and "Total_Rows_With_Mismatches" in qa_company_summary_df.columns:
-        qa_company_summary_df["Total_Matched_Rows"] = (
-            qa_company_summary_df["Rows_With_Keys_In_Both"]
-            - qa_company_summary_df["Total_Rows_With_Mismatches"]
-        )
-    else:
-        qa_company_summary_df["Total_Matched_Rows"] = 0
-
     qa_company_summary_df.insert(0, "Batch_Id", batch_id)
     qa_company_summary_df.insert(1, "QA_Run_Datetime", qa_run_datetime)
 
@@ -1421,22 +2271,610 @@ def build_qa_summaries(
         "Columns_Affected",
         "Error_Types",
     ]
-    qa_company_summary_df = qa_company_summary_df[[c for c in cols_order if c in qa_company_summary_df.columns]]
+    qa_company_summary_df = qa_company_summary_df[cols_order]
 
     # ----- Error counts by company & error type -----
-    if qa_diff_df.empty:
+    if diff_counts.empty:
         error_counts_df = pd.DataFrame(
             columns=["Batch_Id", "QA_Run_Datetime", "Organisation_Cd", "Error_Type", "Error_Count"]
         )
     else:
+        # groupby already returns the groups sorted by Organisation_Cd, Error_Type.
         error_counts_df = (
-            qa_diff_df.groupby(["Organisation_Cd", "Error_Type"])
-            .size()
-            .reset_index(name="Error_Count")
-            .sort_values(["Organisation_Cd", "Error_Type"])
-            .reset_index(drop=True)
+            diff_counts.groupby(["Organisation_Cd", "Error_Type"])["Error_Count"]
+            .sum()
+            .reset_index()
         )
         error_counts_df.insert(0, "Batch_Id", batch_id)
         error_counts_df.insert(1, "QA_Run_Datetime", qa_run_datetime)
 
     return qa_summary_df, qa_company_summary_df, error_counts_df
+
+
+# --------------------------------------------------------------------------------------
+# 5) ORGANISATION-PARTITIONED QA
+# --------------------------------------------------------------------------------------
+
+def _organisation_partition_labels(df: pd.DataFrame, profile: str, side: str) -> pd.Series:
+    """
+    Organisation_Cd as it will look after key normalisation (used to split inputs).
+    """
+    if "Organisation_Cd" not in df.columns:
+        raise ValueError(f"Organisation_Cd missing from {side} input.")
+
+    if profile == "QD":
+        return df["Organisation_Cd"].astype(str).str.strip()
+    return _normalise_key_cols(df[["Organisation_Cd"]], ["Organisation_Cd"])["Organisation_Cd"]
+
+
+def _run_qa_partition(payload: tuple) -> Tuple[pd.DataFrame, QAAggregates, Tuple[list[str], list[str]]]:
+    """
+    Prepare, match, diff and aggregate one Organisation_Cd partition.
+
+    Also returns the columns of the prepared Flat_File and semantic frames.
+    Module-level (and taking a single tuple) so it can be sent to a process pool.
+    """
+    flat_part, sem_part, batch_id, qa_run_datetime, profile = payload
+
+    flat_for_qa, sem_for_qa = _normalise_and_dedupe_qa_frames(flat_part, sem_part, logger, profile)
+    keys_only_raw, keys_only_sem, keys_in_both = compute_key_overlap(flat_for_qa, sem_for_qa, profile=profile)
+    qa_diff_df = build_qa_diff(
+        flat_for_qa,
+        sem_for_qa,
+        keys_only_raw,
+        keys_only_sem,
+        keys_in_both,
+        batch_id,
+        qa_run_datetime,
+        profile=profile,
+    )
+    aggregates = build_qa_aggregates(flat_for_qa, sem_for_qa, keys_in_both, qa_diff_df, profile=profile)
+
+    return qa_diff_df, aggregates, (list(flat_for_qa.columns), list(sem_for_qa.columns))
+
+
+def _serial_diff_columns(
+    error_types: Iterable[str],
+    flat_columns: Iterable[str],
+    sem_columns: Iterable[str],
+    key_cols: list[str],
+    context_cols: list[str],
+) -> list[str]:
+    """
+    Column order of the table build_qa_diff builds from the prepared frames when
+    its records have the given Error_Type values.
+
+    pd.DataFrame(diff_records) orders columns as they first appear in the records,
+    and the records of each section carry different context columns (rows in both
+    lose the context columns present on both sides to the merge suffixes).
+    """
+    flat_columns, sem_columns = set(flat_columns), set(sem_columns)
+
+    def record_columns(present: set) -> list[str]:
+        cols = [c for c in context_cols if c in present]
+        if "Measure_Cd" not in cols:
+            cols.append("Measure_Cd")
+        return cols + _DIFF_VALUE_COLS
+
+    error_types = set(error_types)
+    section_error_types = {"MISSING_IN_INGESTED", "EXTRA_IN_INGESTED", "MISSING_COMPANY_FROM_FOLDER"}
+    sections = [
+        ("MISSING_IN_INGESTED" in error_types, record_columns(flat_columns)),
+        ("EXTRA_IN_INGESTED" in error_types, record_columns(sem_columns)),
+        (
+            bool(error_types - section_error_types),
+            record_columns(set(key_cols) | (flat_columns ^ sem_columns)),
+        ),
+        (
+            "MISSING_COMPANY_FROM_FOLDER" in error_types,
+            ["Organisation_Cd", "Submission_Period_Cd"] + _DIFF_VALUE_COLS + context_cols,
+        ),
+    ]
+    columns = [c for present, cols in sections if present for c in cols]
+    return list(dict.fromkeys(columns + ["Batch_Id", "QA_Run_Datetime"]))
+
+
+def _concat_qa_diff_frames(
+    diff_frames: list[pd.DataFrame],
+    batch_id: str,
+    qa_run_datetime: str,
+    prepared_columns: Optional[Tuple[Iterable[str], Iterable[str], list[str], list[str]]] = None,
+) -> pd.DataFrame:
+    """
+    Concatenate diff tables built separately into one build_qa_diff-style table.
+
+    prepared_columns (Flat_File columns, semantic columns, key_cols, context_cols
+    of the prepared frames) puts the columns in the order build_qa_diff gives them;
+    without it they follow the first frame.
+    """
+    # infer_objects gives the column dtypes pd.DataFrame(diff_records) would have
+    # inferred for the same rows in build_qa_diff.
+    qa_diff_df = pd.concat(diff_frames, ignore_index=True).infer_objects() if diff_frames else pd.DataFrame()
+
+    if not qa_diff_df.empty:
+        # Re-stamp so the run columns stay last, as in build_qa_diff.
+        qa_diff_df = qa_diff_df.drop(columns=["Batch_Id", "QA_Run_Datetime"], errors="ignore")
+        qa_diff_df["Batch_Id"] = batch_id
+        qa_diff_df["QA_Run_Datetime"] = qa_run_datetime
+
+        if prepared_columns is not None:
+            columns = _serial_diff_columns(qa_diff_df["Error_Type"].unique(), *prepared_columns)
+            if set(columns) == set(qa_diff_df.columns):
+                qa_diff_df = qa_diff_df[columns]
+
+    return qa_diff_df
+
+
+@instrumented("qa")
+def run_qa_by_organisation(
+    combined_df: pd.DataFrame,
+    ingested_df_flat: pd.DataFrame,
+    target_submission_period: str | list[str],
+    batch_id: str,
+    qa_run_datetime: str,
+    target_org: Optional[str] = None,
+    semantic_to_flat_map: Optional[dict[str, str]] = None,
+    filtered_excel_files: Optional[Iterable[str]] = None,
+    expected_companies: Optional[Iterable[str]] = None,
+    status: Optional[str] = None,
+    process_cd: Optional[str] = None,
+    submission_period_cd: Optional[str] = None,
+    logger_: Optional[logging.Logger] = None,
+    profile: str = "QD",
+    max_workers: Optional[int] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Run the full QA pipeline split by Organisation_Cd.
+
+    Organisation_Cd is part of every profile key, so each company can be prepared,
+    matched and diffed independently. Partitions run in a process pool
+    (max_workers=1 runs them in-process), their diff tables are concatenated and the
+    summaries are rebuilt from the combined per-partition QAAggregates.
+
+    Returns the same frames as running prepare_qa_frames, compute_key_overlap,
+    build_qa_diff and build_qa_summaries in sequence:
+    (qa_diff_df, qa_summary_df, qa_company_summary_df, error_counts_df).
+    Diff rows are grouped by company rather than by error section.
+    """
+    log = logger_ or logger
+    p = _profile_name(profile)
+    _compare_cols, key_cols, context_cols = _get_profile_cols(p)
+
+    # Steps 1-3 of prepare_qa_frames (and Insert_Date parsing) look at whole columns,
+    # so run them before splitting; the remaining steps run per partition.
+    sem_aligned = _align_semantic_frame(ingested_df_flat, p, semantic_to_flat_map)
+    flat_filtered, sem_filtered = _filter_qa_frames(
+        combined_df,
+        sem_aligned,
+        target_submission_period,
+        target_org,
+    )
+    log.info("Flat_File rows BEFORE key normalisation: %d", len(flat_filtered))
+    log.info("Semantic rows BEFORE key normalisation: %d", len(sem_filtered))
+
+    if "Insert_Date" in sem_filtered.columns and not sem_filtered.empty:
+        sem_filtered = _parse_insert_dates(sem_filtered)
+
+    flat_labels = _organisation_partition_labels(flat_filtered, p, "Flat_File")
+    sem_labels = _organisation_partition_labels(sem_filtered, p, "semantic")
+
+    flat_groups = dict(iter(flat_filtered.groupby(flat_labels, sort=False)))
+    sem_groups = dict(iter(sem_filtered.groupby(sem_labels, sort=False)))
+    orgs = sorted(set(flat_groups).union(sem_groups))
+
+    log.info("Running QA over %d Organisation_Cd partitions", len(orgs))
+
+    payloads = [
+        (
+            flat_groups.get(org, flat_filtered.iloc[:0]),
+            sem_groups.get(org, sem_filtered.iloc[:0]),
+            batch_id,
+            qa_run_datetime,
+            p,
+        )
+        for org in orgs
+    ]
+
+    if max_workers == 1 or len(payloads) <= 1:
+        results = [_run_qa_partition(payload) for payload in payloads]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_run_qa_partition, payloads))
+
+    diff_frames = [diff for diff, _aggregates, _columns in results if not diff.empty]
+    parts = [aggregates for _diff, aggregates, _columns in results]
+    # Every partition is prepared the same way, so they share their columns
+    prepared_columns = (*results[0][2], key_cols, context_cols) if results else None
+
+    missing_records = _missing_company_records(
+        filtered_excel_files,
+        expected_companies,
+        context_cols,
+        status,
+        process_cd,
+        submission_period_cd,
+        _record_period(target_submission_period),
+        log,
+    )
+    if missing_records:
+        missing_df = pd.DataFrame(missing_records)
+        diff_frames.append(missing_df)
+
+        diff_counts, mismatch_keys = _aggregate_qa_diff(missing_df, key_cols)
+        parts.append(QAAggregates(0, 0, 0, pd.DataFrame(), diff_counts, mismatch_keys))
+
+    qa_diff_df = _concat_qa_diff_frames(diff_frames, batch_id, qa_run_datetime, prepared_columns)
+
+    qa_summary_df, qa_company_summary_df, error_counts_df = build_qa_summaries_from_aggregates(
+        combine_qa_aggregates(parts),
+        batch_id,
+        qa_run_datetime,
+    )
+
+    return qa_diff_df, qa_summary_df, qa_company_summary_df, error_counts_df
+
+
+# --------------------------------------------------------------------------------------
+# 6) INCREMENTAL QA
+# --------------------------------------------------------------------------------------
+
+# Bump when the layout of the saved state changes; older state files are then ignored.
+_QA_STATE_VERSION = 2
+_GROUP_STATE_COLS: list[str] = ["Flat_Rows", "Flat_Digest", "Semantic_Rows", "Semantic_Digest"]
+# Per key group, only these are saved: enough to tell which groups changed.
+_SAVED_GROUP_COLS: list[str] = ["Group_Hash"] + _GROUP_STATE_COLS + ["Keys_In_Both", "Batch_Id"]
+
+
+def _qa_state_paths(state_dir: str, profile: str) -> Tuple[str, str, str]:
+    """
+    Locations of the saved incremental QA state for a profile: its metadata
+    (JSON), key groups and diff rows (parquet).
+    """
+    base = os.path.join(state_dir, f"qa_state_{profile}")
+    return f"{base}.json", f"{base}_groups.parquet", f"{base}_diff.parquet"
+
+
+def _qa_group_cols(key_cols: list[str], context_cols: list[str]) -> list[str]:
+    """
+    Key columns copied unchanged into every diff record.
+
+    Keys are tracked in groups sharing these values, so each diff record can be
+    traced back to the group it was built from.
+    """
+    return [c for c in key_cols if c in context_cols]
+
+
+def _hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit hash of each row of df (nulls hash alike).
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _side_group_state(df: pd.DataFrame, group_hash: np.ndarray, side: str) -> pd.DataFrame:
+    """
+    Row count and a digest of all prepared columns per group, for one side ("Flat" / "Semantic").
+    """
+    if df.empty:
+        return pd.DataFrame(
+            {f"{side}_Rows": pd.Series(dtype="int64"), f"{side}_Digest": pd.Series(dtype="uint64")},
+            index=pd.Index([], dtype="uint64", name="Group_Hash"),
+        )
+
+    # Salt each row hash with its position in the group, so the XOR below still
+    # tells duplicated or reordered rows apart.
+    ordinal = pd.Series(group_hash).groupby(group_hash).cumcount().to_numpy()
+    salted = _hash_rows(pd.DataFrame({"digest": _hash_rows(df), "ordinal": ordinal}))
+
+    order = np.argsort(group_hash, kind="stable")
+    sorted_hash = group_hash[order]
+    starts = np.flatnonzero(np.r_[True, sorted_hash[1:] != sorted_hash[:-1]])
+
+    return pd.DataFrame(
+        {
+            f"{side}_Rows": np.diff(np.r_[starts, len(sorted_hash)]),
+            f"{side}_Digest": np.bitwise_xor.reduceat(salted[order], starts),
+        },
+        index=pd.Index(sorted_hash[starts], name="Group_Hash"),
+    )
+
+
+def _group_state(
+    flat_for_qa: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    flat_groups: np.ndarray,
+    sem_groups: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Group_Hash, Flat_Rows, Flat_Digest, Semantic_Rows, Semantic_Digest, Organisation_Cd
+    for every group present on either side.
+    """
+    flat_state = _side_group_state(flat_for_qa, flat_groups, "Flat")
+    sem_state = _side_group_state(sem_for_qa, sem_groups, "Semantic")
+    index = flat_state.index.union(sem_state.index)
+
+    groups = pd.concat(
+        [flat_state.reindex(index, fill_value=0), sem_state.reindex(index, fill_value=0)],
+        axis=1,
+    )
+
+    # Organisation_Cd is a group column, so it is the same for every row of a group.
+    orgs = pd.concat([
+        pd.Series(flat_for_qa["Organisation_Cd"].to_numpy(), index=flat_groups),
+        pd.Series(sem_for_qa["Organisation_Cd"].to_numpy(), index=sem_groups),
+    ])
+    groups["Organisation_Cd"] = orgs[~orgs.index.duplicated()].reindex(index)
+
+    return groups.rename_axis("Group_Hash").reset_index()
+
+
+def _json_state_value(value):
+    """
+    json.dumps default for diff values kept in the QA state: numpy scalars as the
+    Python values they hold; anything else cannot be kept.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} values cannot be kept in the QA state")
+
+
+def _encode_state_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, list[str]]:
+    """
+    df with each object column (Raw_Value / Ingested_Value mix strings, numbers
+    and None, which parquet cannot hold in one column) as JSON text, and the
+    names of those columns.
+    """
+    json_cols = [c for c, dtype in df.dtypes.items() if dtype == object]
+    encoded = df.copy()
+    for c in json_cols:
+        encoded[c] = [json.dumps(value, default=_json_state_value) for value in df[c]]
+    return encoded, json_cols
+
+
+def _decode_state_frame(df: pd.DataFrame, json_cols: list[str]) -> pd.DataFrame:
+    """
+    Inverse of _encode_state_frame.
+    """
+    for c in json_cols:
+        df[c] = pd.Series([json.loads(text) for text in df[c]], index=df.index, dtype=object)
+    return df
+
+
+def _load_qa_state(paths: Tuple[str, str, str], meta: dict, log: logging.Logger) -> Optional[dict]:
+    """
+    Saved incremental QA state ({"groups": ..., "diff": ...}), or None when
+    missing, unreadable or built for different inputs.
+    """
+    meta_path, groups_path, diff_path = paths
+    if not os.path.exists(meta_path):
+        log.info("No saved QA state at %s; diffing all keys.", meta_path)
+        return None
+
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("meta") != meta:
+            log.info("Saved QA state at %s was built for other inputs; diffing all keys.", meta_path)
+            return None
+
+        groups = pd.read_parquet(groups_path)
+        diff = _decode_state_frame(pd.read_parquet(diff_path), saved["json_columns"])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        log.warning("Could not read the saved QA state at %s; diffing all keys: %s", meta_path, e)
+        return None
+
+    return {"groups": groups[_SAVED_GROUP_COLS], "diff": diff}
+
+
+def _save_qa_state(paths: Tuple[str, str, str], meta: dict, groups: pd.DataFrame, diff: pd.DataFrame) -> None:
+    """
+    Write the incremental QA state.
+
+    The metadata file is removed before the parquet files are replaced and written
+    after them, so a partly written state is never read back.
+
+    Raises:
+        TypeError: If a diff value cannot be kept (see _json_state_value); nothing is written then.
+    """
+    meta_path, groups_path, diff_path = paths
+    encoded_diff, json_cols = _encode_state_frame(diff)
+
+    os.makedirs(os.path.dirname(meta_path) or ".", exist_ok=True)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    for frame, path in ((groups[_SAVED_GROUP_COLS], groups_path), (encoded_diff, diff_path)):
+        tmp_path = f"{path}.tmp"
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "json_columns": json_cols}, f)
+    os.replace(tmp_path, meta_path)
+
+
+@instrumented("qa")
+def run_qa_incremental(
+    combined_df: pd.DataFrame,
+    ingested_df_flat: pd.DataFrame,
+    target_submission_period: str | list[str],
+    batch_id: str,
+    qa_run_datetime: str,
+    state_dir: str,
+    target_org: Optional[str] = None,
+    semantic_to_flat_map: Optional[dict[str, str]] = None,
+    filtered_excel_files: Optional[Iterable[str]] = None,
+    expected_companies: Optional[Iterable[str]] = None,
+    status: Optional[str] = None,
+    process_cd: Optional[str] = None,
+    submission_period_cd: Optional[str] = None,
+    logger_: Optional[logging.Logger] = None,
+    profile: str = "QD",
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Run the full QA pipeline, diffing only keys that changed since the previous run.
+
+    Keys are tracked in groups sharing the key columns shown in the diff output.
+    For each group (by the hash of its key values) the state saved under state_dir
+    holds the row counts and a digest of the prepared Flat_File and semantic rows,
+    the number of keys in both and the Batch_Id that last changed it, alongside the
+    diff rows of every group. Per profile it is a JSON metadata file and two parquet
+    files (qa_state_<profile>.json, qa_state_<profile>_groups.parquet,
+    qa_state_<profile>_diff.parquet).
+
+    Both inputs are prepared as usual; only groups whose digests changed, appeared
+    or disappeared go through compute_key_overlap and build_qa_diff. Diff rows of
+    the other groups are taken from the state, and the summaries are rebuilt from
+    the per-group counts. The state is not used when the profile, the
+    target_submission_period/target_org or the prepared columns differ from the
+    run that saved it.
+
+    Returns the same frames as running prepare_qa_frames, compute_key_overlap,
+    build_qa_diff and build_qa_summaries in sequence:
+    (qa_diff_df, qa_summary_df, qa_company_summary_df, error_counts_df).
+    Reused diff rows come before the rows diffed in this run.
+    """
+    log = logger_ or logger
+    p = _profile_name(profile)
+    _compare_cols, key_cols, context_cols = _get_profile_cols(p)
+    group_cols = _qa_group_cols(key_cols, context_cols)
+
+    flat_for_qa, sem_for_qa = prepare_qa_frames(
+        combined_df,
+        ingested_df_flat,
+        target_submission_period,
+        target_org=target_org,
+        semantic_to_flat_map=semantic_to_flat_map,
+        logger_=log,
+        profile=p,
+    )
+
+    flat_groups = _hash_rows(flat_for_qa[group_cols])
+    sem_groups = _hash_rows(sem_for_qa[group_cols])
+    groups = _group_state(flat_for_qa, sem_for_qa, flat_groups, sem_groups)
+
+    # Round-tripped through JSON so it compares equal to the saved copy
+    meta = json.loads(json.dumps({
+        "version": _QA_STATE_VERSION,
+        "profile": p,
+        "target_submission_period": target_submission_period,
+        "target_org": target_org,
+        "flat_columns": {c: str(t) for c, t in flat_for_qa.dtypes.items()},
+        "semantic_columns": {c: str(t) for c, t in sem_for_qa.dtypes.items()},
+    }, default=str))
+    state_paths = _qa_state_paths(state_dir, p)
+    state = _load_qa_state(state_paths, meta, log)
+
+    if state is None:
+        groups["Keys_In_Both"] = 0
+        groups["Batch_Id"] = batch_id
+        unchanged = np.zeros(len(groups), dtype=bool)
+        stored_diff = pd.DataFrame()
+    else:
+        groups = groups.merge(
+            state["groups"],
+            on=["Group_Hash"] + _GROUP_STATE_COLS,
+            how="left",
+            indicator=True,
+        )
+        unchanged = (groups.pop("_merge") == "both").to_numpy()
+        stored_diff = state["diff"]
+
+    changed_hashes = groups.loc[~unchanged, "Group_Hash"].to_numpy()
+    log.info("Key groups changed since the saved QA state: %d of %d", len(changed_hashes), len(groups))
+
+    flat_changed = flat_for_qa[np.isin(flat_groups, changed_hashes)]
+    sem_changed = sem_for_qa[np.isin(sem_groups, changed_hashes)]
+
+    new_diff = pd.DataFrame()
+    keys_in_both_by_group = pd.Series(dtype="int64")
+    if not flat_changed.empty or not sem_changed.empty:
+        keys_only_raw, keys_only_sem, keys_in_both = compute_key_overlap(
+            flat_changed,
+            sem_changed,
+            logger_=log,
+            profile=p,
+        )
+        new_diff = build_qa_diff(
+            flat_changed,
+            sem_changed,
+            keys_only_raw,
+            keys_only_sem,
+            keys_in_both,
+            batch_id,
+            qa_run_datetime,
+            logger_=log,
+            profile=p,
+        )
+        if not keys_in_both.empty:
+            keys_in_both_by_group = pd.Series(_hash_rows(keys_in_both[group_cols])).value_counts()
+
+    groups.loc[~unchanged, "Keys_In_Both"] = groups.loc[~unchanged, "Group_Hash"].map(keys_in_both_by_group).fillna(0)
+    groups["Keys_In_Both"] = groups["Keys_In_Both"].astype("int64")
+    groups.loc[~unchanged, "Batch_Id"] = batch_id
+
+    # Diff rows kept in the state, tagged with their group (run columns are re-stamped on reuse).
+    diff_frames = []
+    if not stored_diff.empty:
+        diff_frames.append(stored_diff[stored_diff["Group_Hash"].isin(groups.loc[unchanged, "Group_Hash"])])
+    if not new_diff.empty:
+        diff_frames.append(
+            new_diff.drop(columns=["Batch_Id", "QA_Run_Datetime"]).assign(Group_Hash=_hash_rows(new_diff[group_cols]))
+        )
+    diff_state = pd.concat(diff_frames, ignore_index=True) if diff_frames else pd.DataFrame(columns=["Group_Hash"])
+
+    diff_frames = [diff_state.drop(columns=["Group_Hash"])] if not diff_state.empty else []
+    missing_records = _missing_company_records(
+        filtered_excel_files,
+        expected_companies,
+        context_cols,
+        status,
+        process_cd,
+        submission_period_cd,
+        _record_period(target_submission_period),
+        log,
+    )
+    if missing_records:
+        diff_frames.append(pd.DataFrame(missing_records))
+
+    qa_diff_df = _concat_qa_diff_frames(
+        diff_frames,
+        batch_id,
+        qa_run_datetime,
+        (flat_for_qa.columns, sem_for_qa.columns, key_cols, context_cols),
+    )
+
+    org_counts = (
+        groups.groupby("Organisation_Cd", sort=True)[["Flat_Rows", "Semantic_Rows", "Keys_In_Both"]]
+        .sum()
+        .astype(int)
+        .set_axis(_ORG_COUNT_COLS, axis=1)
+        .reset_index()
+    )
+    diff_counts, mismatch_keys = _aggregate_qa_diff(qa_diff_df, key_cols)
+    aggregates = QAAggregates(
+        total_raw_rows=int(groups["Flat_Rows"].sum()),
+        total_ingested_rows=int(groups["Semantic_Rows"].sum()),
+        rows_with_keys_in_both=int(groups["Keys_In_Both"].sum()),
+        org_counts=org_counts,
+        diff_counts=diff_counts,
+        mismatch_keys=mismatch_keys,
+    )
+    qa_summary_df, qa_company_summary_df, error_counts_df = build_qa_summaries_from_aggregates(
+        aggregates,
+        batch_id,
+        qa_run_datetime,
+    )
+
+    if diff_state["Group_Hash"].isin(groups["Group_Hash"]).all():
+        try:
+            _save_qa_state(state_paths, meta, groups, diff_state)
+        except TypeError as e:
+            log.warning("QA state at %s not updated: %s", state_paths[0], e)
+    else:
+        # Cannot happen while group columns are copied verbatim into diff records;
+        # keep the previous state rather than saving rows that could never be reused.
+        log.warning("Diff rows could not be matched to key groups; QA state at %s not updated.", state_paths[0])
+
+    return qa_diff_df, qa_summary_df, qa_company_summary_df, error_counts_df
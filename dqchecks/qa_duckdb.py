@@ -0,0 +1,475 @@
+"""
+dqchecks.qa_duckdb
+
+Out-of-core variant of the dqchecks.qa pipeline for parquet inputs, using DuckDB
+as an embedded SQL engine.
+
+The Flat_File and semantic parquet inputs are streamed in record batches. Each
+batch goes through the same row-wise preparation as qa.prepare_qa_frames
+(semantic renames, period filter, key normalisation, Insert_Date parsing) and
+only its normalised keys plus a digest of its compare columns are written to
+DuckDB. The latest-Insert_Date dedupe, key overlap, row counts and the search
+for rows that can produce a difference then run as SQL, so memory use is
+bounded by the batch size and the number of differing rows rather than by the
+size of the semantic history.
+
+Only the rows that can produce a diff record (keys on one side only, or keys in
+both whose digests differ) are read back into pandas and passed to
+qa.build_qa_diff; the summaries are rebuilt from the SQL counts. The returned
+frames are the same as those from reading both inputs with pd.read_parquet and
+running the four qa steps in sequence.
+
+Usage:
+
+    from dqchecks import qa_duckdb
+
+    qa_diff_df, qa_summary_df, qa_company_summary_df, error_counts_df = qa_duckdb.run_qa_parquet(
+        "flat.parquet", "semantic/", target_submission_period="2025Q1",
+        batch_id=batch_id, qa_run_datetime=qa_run_datetime, profile="QD",
+    )
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Iterator, Optional, Tuple
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as pads
+
+from dqchecks.qa import (
+    SEMANTIC_TO_FLAT_COL_MAP,
+    QAAggregates,
+    _aggregate_qa_diff,
+    _align_semantic_frame,
+    _dedupe_semantic_rows,
+    _filter_qa_frame,
+    _first_insert_date,
+    _get_profile_cols,
+    _insert_date_format,
+    _normalise_compare_column,
+    _normalise_qa_side_keys,
+    _parse_insert_dates,
+    _profile_name,
+    _qd_measure_reference_source,
+    _record_period,
+    _reference_flags,
+    _row_digest,
+    build_qa_diff,
+    build_qa_summaries_from_aggregates,
+    compute_key_overlap,
+)
+
+# Mirrors dqchecks.qa: orchestration-style functions with several arguments.
+# pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+# pylint: disable=too-many-statements
+# pylint: disable=line-too-long
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100_000
+
+# build_qa_diff never compares these columns
+_IGNORE_COLS = {"Insert_Date", "Batch_Id", "QA_Run_Datetime"}
+
+
+# --------------------------------------------------------------------------------------
+# PARQUET STREAMING
+# --------------------------------------------------------------------------------------
+
+def _iter_parquet_frames(
+    source: str | list[str],
+    batch_size: int,
+    columns: Optional[list[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a parquet file, file list or directory as pandas frames of at most
+    batch_size rows, converted the same way pd.read_parquet converts them.
+    """
+    dataset = pads.dataset(source, format="parquet")
+    schema = dataset.schema
+    if columns is not None:
+        schema = pa.schema([schema.field(c) for c in columns], metadata=schema.metadata)
+
+    for batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+        if batch.num_rows:
+            yield pa.Table.from_batches([batch], schema=schema).to_pandas()
+
+
+def _empty_frame(source: str | list[str]) -> pd.DataFrame:
+    """Zero-row frame with the columns and dtypes of a parquet input."""
+    return pads.dataset(source, format="parquet").schema.empty_table().to_pandas()
+
+
+# --------------------------------------------------------------------------------------
+# ROW-WISE PREPARATION (per batch)
+# --------------------------------------------------------------------------------------
+
+def _qd_measure_reference_source_for(
+    semantic_parquet: str | list[str],
+    semantic_to_flat_map: Optional[dict[str, str]],
+    batch_size: int,
+) -> Optional[str]:
+    """
+    QD picks its Legacy_Measure_Reference source from the whole semantic frame;
+    decide it with one pass over just the candidate columns.
+    """
+    col_map = semantic_to_flat_map or SEMANTIC_TO_FLAT_COL_MAP
+    renamed = {c: col_map.get(c, c) for c in _empty_frame(semantic_parquet).columns}
+    sources = {
+        c: target
+        for c, target in renamed.items()
+        if target in ("Legacy_Measure_Reference", "Legacy_BonCode")
+    }
+
+    flags = {target: (False, False) for target in sources.values()}
+    if sources:
+        for batch in _iter_parquet_frames(semantic_parquet, batch_size, columns=list(sources)):
+            for col, target in sources.items():
+                non_blank, non_na = _reference_flags(batch[col])
+                flags[target] = (flags[target][0] or non_blank, flags[target][1] or non_na)
+
+    return _qd_measure_reference_source(flags, renamed.values())
+
+
+def _prepare_flat_batch(
+    batch: pd.DataFrame,
+    target_submission_period: str | list[str],
+    target_org: Optional[str],
+    profile: str,
+) -> pd.DataFrame:
+    """prepare_qa_frames steps 2-4 for a Flat_File batch."""
+    flat = _filter_qa_frame(batch, target_submission_period, target_org, "Flat_File")
+    return _normalise_qa_side_keys(flat, profile, "Flat_File")
+
+
+def _prepare_semantic_batch(
+    batch: pd.DataFrame,
+    target_submission_period: str | list[str],
+    target_org: Optional[str],
+    profile: str,
+    semantic_to_flat_map: Optional[dict[str, str]],
+    measure_reference_source: Optional[str],
+) -> pd.DataFrame:
+    """prepare_qa_frames steps 1-4 for a semantic batch (Insert_Date parsed separately)."""
+    sem = _align_semantic_frame(batch, profile, semantic_to_flat_map, measure_reference_source)
+    sem = _filter_qa_frame(sem, target_submission_period, target_org, "semantic")
+    return _normalise_qa_side_keys(sem, profile, "semantic")
+
+
+def _common_compare_cols(
+    flat_columns: Iterable[str],
+    sem_columns: Iterable[str],
+    compare_cols: list[str],
+    key_cols: list[str],
+) -> list[str]:
+    """
+    The columns build_qa_diff compares for rows in both: configured compare
+    columns plus any other non-key column present on both sides.
+    """
+    shared = set(flat_columns).intersection(sem_columns) - set(key_cols) - {"_Insert_Date_ts"}
+    return sorted({c for c in compare_cols if c in shared}.union(shared - _IGNORE_COLS))
+
+
+def _side_digest(df: pd.DataFrame, common_cols: list[str], profile: str) -> np.ndarray:
+    """
+    Per-row digest of one side's compare columns, equal to the digest build_qa_diff
+    computes for that side of a matched row.
+    """
+    if "Measure_Unit" not in common_cols:
+        # build_qa_diff only scales '%' values when both sides carry Measure_Unit
+        df = df.drop(columns=["Measure_Unit"], errors="ignore")
+
+    normalised = {col: _normalise_compare_column(df, col, "", profile) for col in common_cols}
+    return _row_digest(normalised, df.index).to_numpy(dtype="uint64")
+
+
+def _key_table(df: pd.DataFrame, key_cols: list[str], digest: np.ndarray) -> pa.Table:
+    """Arrow table of row id, normalised keys (as text) and digest for one batch."""
+    arrays = {"rid": pa.array(df.index.to_numpy(dtype="int64"))}
+
+    for col in key_cols:
+        values = df[col].astype(object)
+        missing = values.isna()
+        arrays[col] = pa.array(values.astype(str).where(~missing, None), type=pa.string(), from_pandas=True)
+
+    if "_Insert_Date_ts" in df.columns:
+        ts = df["_Insert_Date_ts"]
+        if getattr(ts.dt, "tz", None) is not None:
+            ts = ts.dt.tz_convert(None)
+        arrays["ts"] = pa.array(
+            ts.to_numpy(dtype="datetime64[ns]").view("int64"),
+            mask=ts.isna().to_numpy(),
+            type=pa.int64(),
+        )
+
+    arrays["digest"] = pa.array(digest, type=pa.uint64())
+    return pa.table(arrays)
+
+
+# --------------------------------------------------------------------------------------
+# SQL
+# --------------------------------------------------------------------------------------
+
+def _quote(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+def _keys_match(left: str, right: str, key_cols: list[str]) -> str:
+    """NULL-safe key equality, matching pandas merge semantics for missing keys."""
+    return " AND ".join(f"{left}.{_quote(c)} IS NOT DISTINCT FROM {right}.{_quote(c)}" for c in key_cols)
+
+
+def _create_key_table(con, name: str, key_cols: list[str], with_ts: bool) -> None:
+    cols = ["rid BIGINT"] + [f"{_quote(c)} VARCHAR" for c in key_cols]
+    if with_ts:
+        cols.append("ts BIGINT")
+    cols.append("digest UBIGINT")
+    con.execute(f"CREATE TABLE {name} ({', '.join(cols)})")
+
+
+def _insert_key_table(con, name: str, table: pa.Table) -> None:
+    con.register("_batch_keys", table)
+    try:
+        con.execute(f"INSERT INTO {name} SELECT * FROM _batch_keys")
+    finally:
+        con.unregister("_batch_keys")
+
+
+def _fetch_rids(con, sql: str) -> np.ndarray:
+    rows = con.execute(sql).fetchall()
+    return np.sort(np.fromiter((r[0] for r in rows), dtype="int64", count=len(rows)))
+
+
+def _count_by_org(con, sql: str) -> dict:
+    return dict(con.execute(sql).fetchall())
+
+
+# --------------------------------------------------------------------------------------
+# DRIVER
+# --------------------------------------------------------------------------------------
+
+def run_qa_parquet(
+    flat_parquet: str | list[str],
+    semantic_parquet: str | list[str],
+    target_submission_period: str | list[str],
+    batch_id: str,
+    qa_run_datetime: str,
+    target_org: Optional[str] = None,
+    semantic_to_flat_map: Optional[dict[str, str]] = None,
+    filtered_excel_files: Optional[Iterable[str]] = None,
+    expected_companies: Optional[Iterable[str]] = None,
+    status: Optional[str] = None,
+    process_cd: Optional[str] = None,
+    submission_period_cd: Optional[str] = None,
+    logger_: Optional[logging.Logger] = None,
+    profile: str = "QD",
+    database: str = ":memory:",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Run the full QA pipeline over parquet inputs without loading them into memory.
+
+    flat_parquet / semantic_parquet may be a parquet file, a list of files or a
+    directory. database is passed to duckdb.connect; use a file path to let DuckDB
+    spill its key tables to disk.
+
+    Returns the same frames as running qa.prepare_qa_frames, qa.compute_key_overlap,
+    qa.build_qa_diff and qa.build_qa_summaries on the pd.read_parquet inputs:
+    (qa_diff_df, qa_summary_df, qa_company_summary_df, error_counts_df).
+    """
+    log = logger_ or logger
+    p = _profile_name(profile)
+    compare_cols, key_cols, _context_cols = _get_profile_cols(p)
+
+    measure_reference_source = None
+    if p == "QD":
+        measure_reference_source = _qd_measure_reference_source_for(semantic_parquet, semantic_to_flat_map, batch_size)
+
+    def prepare_sem(batch: pd.DataFrame) -> pd.DataFrame:
+        return _prepare_semantic_batch(
+            batch, target_submission_period, target_org, p, semantic_to_flat_map, measure_reference_source,
+        )
+
+    def prepare_flat(batch: pd.DataFrame) -> pd.DataFrame:
+        return _prepare_flat_batch(batch, target_submission_period, target_org, p)
+
+    # Column layout after preparation decides what build_qa_diff compares.
+    flat_columns = prepare_flat(_empty_frame(flat_parquet)).columns
+    sem_columns = prepare_sem(_empty_frame(semantic_parquet)).columns
+    common_cols = _common_compare_cols(flat_columns, sem_columns, compare_cols, key_cols)
+    dedupe = "Insert_Date" in sem_columns
+
+    con = duckdb.connect(database)
+    try:
+        _create_key_table(con, "flat_keys", key_cols, with_ts=False)
+        _create_key_table(con, "sem_keys", key_cols, with_ts=dedupe)
+
+        # ------------------------------------------------------------------
+        # Pass 1: stream both inputs into the key tables
+        # ------------------------------------------------------------------
+        offset = 0
+        for batch in _iter_parquet_frames(flat_parquet, batch_size):
+            batch.index = pd.RangeIndex(offset, offset + len(batch))
+            offset += len(batch)
+            flat = prepare_flat(batch)
+            _insert_key_table(con, "flat_keys", _key_table(flat, key_cols, _side_digest(flat, common_cols, p)))
+
+        # to_datetime infers one format from the first value of the whole column
+        insert_date_format: Optional[str] = None
+        format_decided = False
+
+        offset = 0
+        for batch in _iter_parquet_frames(semantic_parquet, batch_size):
+            batch.index = pd.RangeIndex(offset, offset + len(batch))
+            offset += len(batch)
+            sem = prepare_sem(batch)
+            if dedupe:
+                if not format_decided:
+                    first = _first_insert_date(sem["Insert_Date"])
+                    if first is not None:
+                        insert_date_format = _insert_date_format(first)
+                        format_decided = True
+                sem = _parse_insert_dates(sem, insert_date_format)
+            _insert_key_table(con, "sem_keys", _key_table(sem, key_cols, _side_digest(sem, common_cols, p)))
+
+        # ------------------------------------------------------------------
+        # Latest Insert_Date per key, key overlap and counts
+        # ------------------------------------------------------------------
+        key_list = ", ".join(_quote(c) for c in key_cols)
+        if dedupe:
+            con.execute(
+                f"""
+                CREATE TABLE sem_latest AS
+                SELECT * EXCLUDE (rn) FROM (
+                    SELECT *, row_number() OVER (
+                        PARTITION BY {key_list} ORDER BY ts DESC NULLS LAST, rid
+                    ) AS rn
+                    FROM sem_keys
+                ) WHERE rn = 1
+                """
+            )
+        else:
+            con.execute("CREATE TABLE sem_latest AS SELECT * FROM sem_keys")
+
+        con.execute(
+            f"""
+            CREATE TABLE keys_in_both AS
+            SELECT f.* FROM (SELECT DISTINCT {key_list} FROM flat_keys) f
+            WHERE EXISTS (SELECT 1 FROM sem_latest s WHERE {_keys_match('f', 's', key_cols)})
+            """
+        )
+
+        org = _quote("Organisation_Cd")
+        raw_by_org = _count_by_org(con, f"SELECT {org}, count(*) FROM flat_keys GROUP BY {org}")
+        ing_by_org = _count_by_org(con, f"SELECT {org}, count(*) FROM sem_latest GROUP BY {org}")
+        both_by_org = _count_by_org(con, f"SELECT {org}, count(*) FROM keys_in_both GROUP BY {org}")
+
+        # Rows that can produce a diff record: key on one side only, or a key in
+        # both where the row's digest differs from a row on the other side.
+        flat_rids = _fetch_rids(
+            con,
+            f"""
+            SELECT f.rid FROM flat_keys f
+            LEFT JOIN (SELECT DISTINCT {key_list}, digest FROM sem_latest) s
+                ON {_keys_match('f', 's', key_cols)}
+            GROUP BY f.rid, f.digest
+            HAVING count(s.digest) = 0 OR bool_or(s.digest <> f.digest)
+            """,
+        )
+        sem_rids = _fetch_rids(
+            con,
+            f"""
+            SELECT s.rid FROM sem_latest s
+            LEFT JOIN (SELECT DISTINCT {key_list}, digest FROM flat_keys) f
+                ON {_keys_match('f', 's', key_cols)}
+            GROUP BY s.rid, s.digest
+            HAVING count(f.digest) = 0 OR bool_or(f.digest <> s.digest)
+            """,
+        )
+    finally:
+        con.close()
+
+    log.info("Flat_File rows AFTER key normalisation: %d", sum(raw_by_org.values()))
+    log.info("Semantic rows AFTER dedupe: %d", sum(ing_by_org.values()))
+    log.info("Unique key combos in BOTH:          %d", sum(both_by_org.values()))
+    log.info("Rows read back for diffing: Flat_File=%d, Semantic=%d", len(flat_rids), len(sem_rids))
+
+    # ------------------------------------------------------------------
+    # Pass 2: read back candidate rows and diff them in pandas
+    # ------------------------------------------------------------------
+    def read_rows(source, rids: np.ndarray, prepare) -> list[pd.DataFrame]:
+        parts, offset = [], 0
+        for batch in _iter_parquet_frames(source, batch_size):
+            batch.index = pd.RangeIndex(offset, offset + len(batch))
+            offset += len(batch)
+            wanted = batch[np.isin(batch.index.to_numpy(), rids)]
+            if not wanted.empty:
+                parts.append(prepare(wanted))
+        return parts
+
+    flat_parts = read_rows(flat_parquet, flat_rids, prepare_flat)
+    sem_parts = read_rows(
+        semantic_parquet,
+        sem_rids,
+        (lambda b: _parse_insert_dates(prepare_sem(b), insert_date_format)) if dedupe else prepare_sem,
+    )
+    flat_for_qa = pd.concat(flat_parts) if flat_parts else prepare_flat(_empty_frame(flat_parquet))
+    sem_for_qa = pd.concat(sem_parts) if sem_parts else prepare_sem(_empty_frame(semantic_parquet))
+
+    # Same row order as the in-memory dedupe (rows are already unique per key)
+    sem_for_qa = _dedupe_semantic_rows(sem_for_qa, key_cols)
+
+    if flat_for_qa.empty and sem_for_qa.empty:
+        # Nothing to diff (pandas cannot merge two empty arrow-backed string frames)
+        keys_only_raw = keys_only_sem = keys_in_both = flat_for_qa[key_cols]
+    else:
+        keys_only_raw, keys_only_sem, keys_in_both = compute_key_overlap(flat_for_qa, sem_for_qa, logger_=log, profile=p)
+    qa_diff_df = build_qa_diff(
+        flat_for_qa,
+        sem_for_qa,
+        keys_only_raw,
+        keys_only_sem,
+        keys_in_both,
+        batch_id,
+        qa_run_datetime,
+        filtered_excel_files=filtered_excel_files,
+        expected_companies=expected_companies,
+        status=status,
+        process_cd=process_cd,
+        submission_period_cd=submission_period_cd,
+        target_submission_period=_record_period(target_submission_period),
+        logger_=log,
+        profile=p,
+    )
+
+    # ------------------------------------------------------------------
+    # Summaries from the SQL counts plus the diff
+    # ------------------------------------------------------------------
+    org_counts = pd.DataFrame({"Organisation_Cd": sorted(set(raw_by_org).union(ing_by_org))})
+    for col, counts in [
+        ("Total_Raw_Rows", raw_by_org),
+        ("Total_Ingested_Rows", ing_by_org),
+        ("Rows_With_Keys_In_Both", both_by_org),
+    ]:
+        org_counts[col] = org_counts["Organisation_Cd"].map(counts).fillna(0).astype(int)
+
+    diff_counts, mismatch_keys = _aggregate_qa_diff(qa_diff_df, key_cols)
+    aggregates = QAAggregates(
+        total_raw_rows=sum(raw_by_org.values()),
+        total_ingested_rows=sum(ing_by_org.values()),
+        rows_with_keys_in_both=sum(both_by_org.values()),
+        org_counts=org_counts,
+        diff_counts=diff_counts,
+        mismatch_keys=mismatch_keys,
+    )
+    qa_summary_df, qa_company_summary_df, error_counts_df = build_qa_summaries_from_aggregates(
+        aggregates,
+        batch_id,
+        qa_run_datetime,
+    )
+
+    return qa_diff_df, qa_summary_df, qa_company_summary_df, error_counts_df
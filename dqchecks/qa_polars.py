@@ -0,0 +1,754 @@
+"""
+dqchecks.qa_polars
+
+Polars backend for the dqchecks.qa pipeline, used by qa.prepare_qa_frames,
+qa.compute_key_overlap, qa.build_qa_diff and qa.build_qa_summaries when they are
+called with engine="polars".
+
+Each step runs the same profile definitions as a lazy Polars query over the
+columns it needs: period and key normalisation, the submission period / org
+filter and the latest-Insert_Date dedupe, the key overlap, the normalised
+comparison of the compare columns and the summary counts. Results come back as
+pandas frames equal to those of engine="pandas" (same rows, order, index labels
+and dtypes):
+
+- prepare_qa_frames and compute_key_overlap pick rows with Polars and return
+  them from the pandas inputs, with the normalised key columns filled in;
+- build_qa_diff uses Polars to find the rows that can produce a diff record and
+  hands only those to the pandas build_qa_diff, so the records (Error_Desc text,
+  raw values) are built by the same code;
+- build_qa_summaries counts with Polars and reuses build_qa_summaries_from_aggregates.
+
+Values reach Polars as strings via pandas astype(str), as the pandas path casts
+them. Where the two engines could disagree, the Polars query errs towards
+"differs" and the pandas build_qa_diff decides: numbers are only compared as
+floats when written plainly (at most 15 digits, no exponent). Key columns that
+hold anything other than strings (which qa.prepare_qa_frames never produces)
+are handled by the pandas path.
+
+Usage:
+
+    from dqchecks import qa
+
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(..., profile="QD", engine="polars")
+    keys_only_raw, keys_only_sem, keys_in_both = qa.compute_key_overlap(..., engine="polars")
+    qa_diff_df = qa.build_qa_diff(..., engine="polars")
+    qa_summary_df, qa_company_summary_df, error_counts_df = (
+        qa.build_qa_summaries(..., engine="polars")
+    )
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from dqchecks.qa import (
+    _DIFF_GROUP_COLS,
+    _ORG_COUNT_COLS,
+    QAAggregates,
+    QADiffStream,
+    KEY_COLS,
+    QADiffTotals,
+    _aggregate_qa_diff,
+    _align_semantic_frame,
+    _ensure_key_columns,
+    _get_profile_cols,
+    _normalise_string,
+    _parse_insert_dates,
+    _profile_name,
+    build_qa_aggregates as _pandas_build_qa_aggregates,
+    build_qa_diff as _pandas_build_qa_diff,
+    build_qa_summaries_from_aggregates,
+    compute_key_overlap as _pandas_compute_key_overlap,
+    prepare_qa_frames as _pandas_prepare_qa_frames,
+)
+
+# Mirrors dqchecks.qa: orchestration-style functions with several arguments.
+# pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+# pylint: disable=line-too-long
+
+logger = logging.getLogger(__name__)
+
+_PERIOD_COLS: tuple[str, ...] = ("Submission_Period_Cd", "Observation_Period_Cd")
+
+# QD key columns normalised by qa._normalise_keys_with_measure (and Measure_Key).
+_QD_NORMALISED_KEY_COLS: frozenset[str] = frozenset(KEY_COLS) - {"Filename"}
+
+# build_qa_diff never compares these columns
+_IGNORE_COLS = {"Insert_Date", "Batch_Id", "QA_Run_Datetime"}
+
+# What Python's str.strip() removes; Polars strips a narrower set by default.
+_WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680"
+    "\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a"
+    "\u2028\u2029\u202f\u205f\u3000"
+)
+
+# qa._normalise_string replacements, in the order it applies them.
+_TEXT_REPLACEMENTS: tuple[tuple[str, str], ...] = (
+    ("\u200b", ""),
+    (r"\u200b", ""),
+    ("\u2010", "-"),
+    ("\u2011", "-"),
+    ("\u2012", "-"),
+    ("\u2013", "-"),
+    ("\u2014", "-"),
+    ("\u2212", "-"),
+)
+
+# Numbers both engines parse to the same float: plain decimals with at most
+# _MAX_PLAIN_DIGITS digits (which need no more than one rounding).
+_PLAIN_NUMBER = r"^[+-]?(\d+(\.\d*)?|\.\d+)$"
+_MAX_PLAIN_DIGITS = 15
+
+
+# --------------------------------------------------------------------------------------
+# PANDAS -> POLARS
+# --------------------------------------------------------------------------------------
+
+def _string_values(series: pd.Series) -> pl.Series:
+    """
+    A pandas column as Polars strings, cast with astype(str) as dqchecks.qa does (nulls stay null).
+    """
+    return pl.from_pandas(series.astype(str))
+
+
+def _holds_strings(series: pd.Series) -> bool:
+    """
+    True when every non-null value is a str, so comparing str() forms compares the values.
+    """
+    if series.dtype == object:
+        return pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+    return isinstance(series.dtype, pd.StringDtype)
+
+
+def _string_columns(frames: Iterable[pd.DataFrame], cols: Iterable[str]) -> bool:
+    """
+    True when the given columns (where present) hold only strings in every frame.
+    """
+    cols = list(cols)
+    return all(_holds_strings(df[c]) for df in frames for c in cols if c in df.columns)
+
+
+def _key_frame(df: pd.DataFrame, key_cols: list[str]) -> pl.DataFrame:
+    return pl.DataFrame([_string_values(df[c]).alias(c) for c in key_cols])
+
+
+def _strip(expr: pl.Expr) -> pl.Expr:
+    return expr.str.strip_chars(_WHITESPACE)
+
+
+def _blank_to_na(expr: pl.Expr) -> pl.Expr:
+    return pl.when(expr == "").then(pl.lit("NA")).otherwise(expr)
+
+
+def _period(expr: pl.Expr) -> pl.Expr:
+    """
+    qa._normalise_period_codes: strip, drop a trailing '.0'.
+    """
+    return _strip(expr).str.replace(r"\.0$", "")
+
+
+def _normalised_text(values: pl.Series) -> pl.Expr:
+    """
+    qa._normalise_string as an expression on the column named like values.
+
+    Only the replacements whose text occurs in values are applied; most
+    columns need none of them.
+    """
+    def occurs(text: str) -> bool:
+        return bool(values.str.contains(text, literal=True).any())
+
+    replacements: list[tuple[str, str]] = []
+    capital_sigma = False
+    if values.str.contains_any([old for old, _new in _TEXT_REPLACEMENTS] + ["\u03a3"]).any():
+        # Removing U+200B can form a literal "\\u200b", so then every replacement runs.
+        replacements = [(old, new) for old, new in _TEXT_REPLACEMENTS if occurs("\u200b") or occurs(old)]
+        capital_sigma = occurs("\u03a3")
+
+    expr = pl.col(values.name).fill_null("")
+    for old, new in replacements:
+        expr = expr.str.replace_all(old, new, literal=True)
+    expr = _strip(expr)
+    if capital_sigma:
+        # str.lower() maps every capital sigma to a medial sigma; Polars uses the final form at word ends.
+        expr = expr.str.replace_all("\u03a3", "\u03c3", literal=True)
+    return expr.str.to_lowercase()
+
+
+# --------------------------------------------------------------------------------------
+# 1) PREPARE DATAFRAMES FOR QA
+# --------------------------------------------------------------------------------------
+
+def _normalised_key_exprs(
+    columns: Iterable[str],
+    key_cols: list[str],
+    profile: str,
+    measure_col: Optional[str],
+) -> dict[str, pl.Expr]:
+    """
+    Output column -> expression for every column prepare_qa_frames rewrites
+    (period codes, then the profile's key normalisation on top).
+    """
+    columns = set(columns)
+    exprs: dict[str, pl.Expr] = {c: _period(pl.col(c)) for c in _PERIOD_COLS if c in columns}
+
+    if profile == "QD":
+        if "Organisation_Cd" in columns:
+            exprs["Organisation_Cd"] = _strip(pl.col("Organisation_Cd"))
+        if "Region_Cd" in columns:
+            exprs["Region_Cd"] = _blank_to_na(_strip(pl.col("Region_Cd")))
+        for c in _PERIOD_COLS:
+            if c in columns:
+                exprs[c] = _period(exprs[c])
+        for c in ("Observation_Coverage_Cd", "Observation_Cd"):
+            if c in columns:
+                exprs[c] = _blank_to_na(_strip(pl.col(c).fill_null("NA")))
+        exprs["Measure_Key"] = _strip(pl.col(measure_col))
+        return exprs
+
+    for c in key_cols:
+        if c in columns:
+            base = exprs.get(c, pl.col(c))
+            exprs[c] = _blank_to_na(_strip(base.fill_null("NA")).str.replace(r"\.0$", ""))
+    return exprs
+
+
+def _prepare_side(
+    df: pd.DataFrame,
+    target_submission_period: str | list[str],
+    target_org: Optional[str],
+    profile: str,
+    side: str,
+) -> Tuple[pd.DataFrame, pl.DataFrame]:
+    """
+    Steps 2-4 of prepare_qa_frames for one side ("Flat_File" / "semantic") as one
+    Polars query: normalise period codes, filter by submission period (and
+    optionally org) and normalise the keys.
+
+    Returns the kept pandas rows with their normalised columns, and the profile
+    key columns of those rows as a Polars frame (for the dedupe).
+    """
+    _compare_cols, key_cols, _context_cols = _get_profile_cols(profile)
+
+    if "Submission_Period_Cd" not in df.columns:
+        raise ValueError(f"Submission_Period_Cd missing from {side} input.")
+
+    measure_col = None
+    if profile == "QD":
+        measure_col = "Measure_Cd" if side == "Flat_File" else "Legacy_Measure_Reference"
+        if measure_col not in df.columns:
+            raise ValueError(f"{measure_col} not found when building Measure_Key.")
+
+    exprs = _normalised_key_exprs(df.columns, key_cols, profile, measure_col)
+    source_cols = [
+        c for c in df.columns
+        if c in exprs or c in key_cols or c == measure_col or c == "Organisation_Cd"
+    ]
+    source = pl.DataFrame([_string_values(df[c]).alias(c) for c in source_cols])
+
+    periods = _strip(_period(pl.col("Submission_Period_Cd")))
+    if isinstance(target_submission_period, (list, tuple, set)):
+        keep = periods.is_in([str(x).strip() for x in target_submission_period])
+    else:
+        keep = periods == str(target_submission_period).strip()
+
+    if target_org is not None and "Organisation_Cd" in df.columns:
+        if isinstance(target_org, str) and _holds_strings(df["Organisation_Cd"]):
+            keep = keep & (pl.col("Organisation_Cd") == target_org)
+        else:
+            source = source.with_columns(pl.Series("_org_match", (df["Organisation_Cd"] == target_org).to_numpy()))
+            keep = keep & pl.col("_org_match")
+
+    # Key columns the profile leaves as they are (QD Filename) are grouped on as given.
+    key_exprs = [
+        pl.col(c) if c in source_cols else pl.lit("NA").alias(c)
+        for c in key_cols
+        if c not in exprs
+    ]
+    result = (
+        source.lazy()
+        .with_row_index("_row")
+        .filter(keep)
+        .select("_row", *[expr.alias(c) for c, expr in exprs.items()], *key_exprs)
+        .collect()
+    )
+
+    out = df.iloc[result["_row"].to_numpy()]
+    for c in exprs:
+        if c in df.columns:
+            out[c] = result[c].to_pandas().set_axis(out.index)
+    out = _ensure_key_columns(out, key_cols)
+    if "Measure_Key" in exprs and "Measure_Key" not in df.columns:
+        out["Measure_Key"] = result["Measure_Key"].to_pandas().set_axis(out.index)
+
+    return out, result.select(key_cols)
+
+
+def _latest_row_positions(keys: pl.DataFrame, insert_ts: pd.Series) -> np.ndarray:
+    """
+    Positions (ascending) of the row with the greatest Insert_Date per key, the
+    first one on ties, as qa._latest_row_mask picks them.
+    """
+    # NaT becomes the smallest int64, so it only wins when a key has no parsed date.
+    timestamps = insert_ts.to_numpy(dtype="datetime64[ns]").view("int64")
+    return (
+        keys.with_columns(pl.Series("_ts", timestamps))
+        .lazy()
+        .with_row_index("_pos")
+        .group_by(keys.columns)
+        .agg(pl.col("_pos").get(pl.col("_ts").arg_max()))
+        .select(pl.col("_pos").sort())
+        .collect()["_pos"]
+        .to_numpy()
+    )
+
+
+def prepare_qa_frames(
+    combined_df: pd.DataFrame,
+    ingested_df_flat: pd.DataFrame,
+    target_submission_period: str | list[str],
+    target_org: Optional[str] = None,
+    semantic_to_flat_map: Optional[dict[str, str]] = None,
+    logger_: Optional[logging.Logger] = None,
+    profile: str = "QD",
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    qa.prepare_qa_frames on Polars; returns the same (flat_for_qa, sem_for_qa).
+    """
+    log = logger_ or logger
+    p = _profile_name(profile)
+    _compare_cols, key_cols, _context_cols = _get_profile_cols(p)
+
+    # 1) Prepare semantic + raw copies (column renames only)
+    sem_for_qa = _align_semantic_frame(ingested_df_flat, p, semantic_to_flat_map)
+
+    # Un-normalised key columns are grouped on their str() form here.
+    raw_key_cols = [c for c in key_cols if p == "QD" and c not in _QD_NORMALISED_KEY_COLS]
+    if not _string_columns([combined_df, sem_for_qa], raw_key_cols):
+        log.info("Key columns hold non-string values; preparing QA frames with pandas.")
+        return _pandas_prepare_qa_frames(
+            combined_df, ingested_df_flat, target_submission_period, target_org,
+            semantic_to_flat_map, logger_=log, profile=p,
+        )
+
+    # 2-4) Normalise period codes, filter, normalise keys
+    flat_for_qa, _flat_keys = _prepare_side(combined_df, target_submission_period, target_org, p, "Flat_File")
+    sem_for_qa, sem_keys = _prepare_side(sem_for_qa, target_submission_period, target_org, p, "semantic")
+
+    log.info("Flat_File rows BEFORE key normalisation: %d", len(flat_for_qa))
+    log.info("Semantic rows BEFORE key normalisation: %d", len(sem_for_qa))
+    log.info("Flat_File rows AFTER key normalisation: %d", len(flat_for_qa))
+    log.info("Semantic rows AFTER key normalisation: %d", len(sem_for_qa))
+
+    # 5) Dedupe semantic by latest Insert_Date per key
+    if "Insert_Date" in sem_for_qa.columns and not sem_for_qa.empty:
+        insert_ts = _parse_insert_dates(sem_for_qa[["Insert_Date"]])["_Insert_Date_ts"]
+        sem_for_qa = sem_for_qa.iloc[_latest_row_positions(sem_keys, insert_ts)]
+
+    log.info("Semantic rows AFTER dedupe: %d", len(sem_for_qa))
+
+    return flat_for_qa, sem_for_qa
+
+
+# --------------------------------------------------------------------------------------
+# 2) KEY-LEVEL MATCHING
+# --------------------------------------------------------------------------------------
+
+def compute_key_overlap(
+    flat_for_qa: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    logger_: Optional[logging.Logger] = None,
+    profile: str = "QD",
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    qa.compute_key_overlap on Polars; returns the same
+    (keys_only_raw, keys_only_sem, keys_in_both), labelled by their position in
+    the sorted key union as the pandas outer merge labels them.
+    """
+    log = logger_ or logger
+    p = _profile_name(profile)
+    _compare_cols, key_cols, _context_cols = _get_profile_cols(p)
+
+    if not _string_columns([flat_for_qa, sem_for_qa], key_cols):
+        log.info("Key columns hold non-string values; computing key overlap with pandas.")
+        return _pandas_compute_key_overlap(flat_for_qa, sem_for_qa, logger_=log, profile=p)
+
+    def first_rows(df: pd.DataFrame) -> pl.LazyFrame:
+        return (
+            _key_frame(df, key_cols)
+            .lazy()
+            .with_row_index("_pos")
+            .group_by(key_cols)
+            .agg(pl.col("_pos").min())
+        )
+
+    keys = (
+        first_rows(flat_for_qa)
+        .join(first_rows(sem_for_qa), on=key_cols, how="full", nulls_equal=True, coalesce=True, suffix="_sem")
+        .sort(key_cols, nulls_last=True)
+        .with_row_index("_label")
+        .collect()
+    )
+
+    only_raw = keys.filter(pl.col("_pos_sem").is_null())
+    only_sem = keys.filter(pl.col("_pos").is_null())
+    in_both = keys.filter(pl.col("_pos").is_not_null() & pl.col("_pos_sem").is_not_null())
+
+    log.info(
+        "Key merge value_counts:\n%s",
+        pd.Series(
+            {"left_only": len(only_raw), "right_only": len(only_sem), "both": len(in_both)},
+            name="count",
+        ).rename_axis("_merge").sort_values(ascending=False, kind="stable").to_string(),
+    )
+
+    def key_rows(df: pd.DataFrame, found: pl.DataFrame, pos_col: str) -> pd.DataFrame:
+        rows = df[key_cols].iloc[found[pos_col].to_numpy()]
+        return rows.set_axis(pd.Index(found["_label"].to_numpy(), dtype="int64"))
+
+    keys_only_raw = key_rows(flat_for_qa, only_raw, "_pos")
+    keys_only_sem = key_rows(sem_for_qa, only_sem, "_pos_sem")
+    keys_in_both = key_rows(flat_for_qa, in_both, "_pos")
+
+    log.info("Unique key combos only in Flat_File: %d", len(keys_only_raw))
+    log.info("Unique key combos only in Semantic:  %d", len(keys_only_sem))
+    log.info("Unique key combos in BOTH:          %d", len(keys_in_both))
+
+    return keys_only_raw, keys_only_sem, keys_in_both
+
+
+# --------------------------------------------------------------------------------------
+# 3) BUILD DIFF TABLE
+# --------------------------------------------------------------------------------------
+
+def _compare_cols_in_merge(
+    flat_for_qa: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    key_cols: list[str],
+    compare_cols: list[str],
+) -> Optional[list[str]]:
+    """
+    The columns build_qa_diff compares, i.e. those with both a "_raw" and an
+    "_ingested" column after its merge of the two sides, sorted.
+
+    None when an input column is itself named like a suffixed column, which
+    would make the merge names ambiguous.
+    """
+    left_cols = [c for c in flat_for_qa.columns if c not in key_cols]
+    right_cols = [c for c in sem_for_qa.columns if c not in key_cols]
+    overlap = set(left_cols) & set(right_cols)
+
+    if any(c.endswith(("_raw", "_ingested")) for c in left_cols + right_cols):
+        return None
+
+    common_cols = {c for c in compare_cols if c in overlap}
+    common_cols |= {c for c in overlap if c not in _IGNORE_COLS}
+    return sorted(common_cols)
+
+
+def _number_exprs(
+    series: pd.Series,
+    col: str,
+    strip_percent: bool,
+    percent: Optional[pl.Expr],
+) -> Tuple[pl.Series, list[pl.Expr]]:
+    """
+    One side of a numeric compare column (Measure_Value / Measure_Decimals): the
+    source values, and expressions for {col}_num (float, null when missing),
+    {col}_unk (True where {col}_num cannot be trusted to match pandas) and
+    {col}_txt (text that parses alike in pandas wherever it is equal, else null).
+
+    Measure_Value is parsed as str(value).strip() without '%' and scaled by 1/100
+    where percent is True, as qa._normalise_measure_value does; Measure_Decimals
+    is parsed as it is (pd.to_numeric).
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        values = pl.Series(col, series.to_numpy(dtype="float64", na_value=np.nan), nan_to_null=True)
+        number = pl.col(col)
+        unknown = pl.lit(False)
+        text = pl.lit(None, dtype=pl.String)
+    else:
+        values = _string_values(series).alias(col)
+        clean = _strip(pl.col(col)).str.replace_all("%", "", literal=True) if strip_percent else pl.col(col)
+        plain = (
+            clean.str.contains(_PLAIN_NUMBER)
+            & (clean.str.count_matches(r"\d") <= _MAX_PLAIN_DIGITS)
+        ).fill_null(False)
+        number = pl.when(plain).then(clean.cast(pl.Float64, strict=False))
+        unknown = ~plain & clean.is_not_null() & (clean != "")
+        if _holds_strings(series) and percent is not None:
+            text = pl.concat_str([clean, pl.lit("\x00"), percent.cast(pl.String)])
+        elif _holds_strings(series):
+            text = clean
+        else:
+            # str() of other objects may parse differently from the object itself.
+            text = pl.lit(None, dtype=pl.String)
+
+    if percent is not None:
+        number = pl.when(percent).then(number / 100.0).otherwise(number)
+    return values, [number.alias(f"{col}_num"), unknown.alias(f"{col}_unk"), text.alias(f"{col}_txt")]
+
+
+def _side_compare_frame(
+    df: pd.DataFrame,
+    key_cols: list[str],
+    common_cols: list[str],
+    use_unit: bool,
+) -> pl.LazyFrame:
+    """
+    Key columns plus the normalised values of the compare columns of one side,
+    as qa._normalise_compare_column computes them.
+    """
+    columns = [_string_values(df[c]).alias(c) for c in key_cols]
+    exprs: list[pl.Expr] = []
+
+    percent = None
+    if use_unit:
+        columns.append(_string_values(df["Measure_Unit"]).alias("_unit"))
+        percent = (_strip(pl.col("_unit")) == "%").fill_null(False)
+
+    for col in common_cols:
+        series = df[col]
+        if col in ("Measure_Value", "Measure_Decimals"):
+            values, number_exprs = _number_exprs(
+                series,
+                col,
+                strip_percent=col == "Measure_Value",
+                percent=percent if col == "Measure_Value" else None,
+            )
+            columns.append(values)
+            exprs.extend(number_exprs)
+        elif _holds_strings(series):
+            values = _string_values(series).alias(col)
+            columns.append(values)
+            exprs.append(_normalised_text(values).alias(col))
+        else:
+            # Mixed values: qa._normalise_string itself gives the exact text.
+            columns.append(pl.Series(col, _normalise_string(series).to_numpy(), dtype=pl.String))
+
+    frame = pl.DataFrame(columns).lazy()
+    return frame.with_columns(exprs) if exprs else frame
+
+
+def _differs(col: str) -> pl.Expr:
+    """
+    True where the joined "raw" and "_ing" values of a compare column may differ.
+    """
+    if col not in ("Measure_Value", "Measure_Decimals"):
+        return pl.col(col) != pl.col(f"{col}_ing")
+
+    raw_text, ing_text = pl.col(f"{col}_txt"), pl.col(f"{col}_txt_ing")
+    return (
+        pl.when(~pl.col(f"{col}_unk") & ~pl.col(f"{col}_unk_ing"))
+        .then(pl.col(f"{col}_num").ne_missing(pl.col(f"{col}_num_ing")))
+        .otherwise(~(raw_text.is_not_null() & ing_text.is_not_null() & (raw_text == ing_text)).fill_null(True))
+    )
+
+
+def _changed_key_positions(
+    flat_for_qa: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    keys_in_both: pd.DataFrame,
+    key_cols: list[str],
+    common_cols: list[str],
+    profile: str,
+) -> np.ndarray:
+    """
+    Positions (ascending) of the keys_in_both rows with at least one pair of
+    Flat_File / semantic rows whose compare columns may differ.
+    """
+    if keys_in_both.empty or not common_cols:
+        return np.array([], dtype="int64")
+
+    use_unit = profile == "QD" and "Measure_Unit" in flat_for_qa.columns and "Measure_Unit" in sem_for_qa.columns
+    keys = _key_frame(keys_in_both, key_cols).lazy().with_row_index("_kpos")
+    distinct_keys = keys.select(key_cols).unique()
+
+    def side(df: pd.DataFrame) -> pl.LazyFrame:
+        return _side_compare_frame(df, key_cols, common_cols, use_unit).join(
+            distinct_keys, on=key_cols, how="semi", nulls_equal=True,
+        )
+
+    changed = (
+        side(flat_for_qa)
+        .join(side(sem_for_qa), on=key_cols, how="inner", nulls_equal=True, suffix="_ing")
+        .filter(pl.any_horizontal([_differs(col) for col in common_cols]))
+        .select(key_cols)
+        .unique()
+    )
+    return (
+        keys.join(changed, on=key_cols, how="semi", nulls_equal=True)
+        .select(pl.col("_kpos").sort())
+        .collect()["_kpos"]
+        .to_numpy()
+    )
+
+
+def _rows_with_keys(df: pd.DataFrame, key_frames: list[pd.DataFrame], key_cols: list[str]) -> np.ndarray:
+    """
+    Positions (ascending) of the rows of df whose key appears in any of key_frames.
+    """
+    wanted = pl.concat([_key_frame(keys, key_cols) for keys in key_frames]).lazy().unique()
+    return (
+        _key_frame(df, key_cols)
+        .lazy()
+        .with_row_index("_pos")
+        .join(wanted, on=key_cols, how="semi", nulls_equal=True)
+        .select(pl.col("_pos").sort())
+        .collect()["_pos"]
+        .to_numpy()
+    )
+
+
+def build_qa_diff(
+    flat_for_qa: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    keys_only_raw: pd.DataFrame,
+    keys_only_sem: pd.DataFrame,
+    keys_in_both: pd.DataFrame,
+    batch_id: str,
+    qa_run_datetime: str,
+    filtered_excel_files: Optional[Iterable[str]] = None,
+    expected_companies: Optional[Iterable[str]] = None,
+    status: Optional[str] = None,
+    process_cd: Optional[str] = None,
+    submission_period_cd: Optional[str] = None,
+    target_submission_period: Optional[str] = None,
+    logger_: Optional[logging.Logger] = None,
+    profile: str = "QD",
+    diff_stream: Optional[QADiffStream] = None,
+    max_examples_per_group: Optional[int] = None,
+    diff_totals: Optional[QADiffTotals] = None,
+) -> pd.DataFrame:
+    """
+    qa.build_qa_diff with the row matching on Polars; returns the same diff table.
+
+    Polars finds the rows that can produce a record: those with a key on one
+    side only, and those with a key in both where a compare column may differ.
+    Only these rows (and the keys_in_both rows they belong to) are passed to the
+    pandas build_qa_diff, which builds the records as usual.
+    """
+    log = logger_ or logger
+    p = _profile_name(profile)
+    compare_cols, key_cols, _context_cols = _get_profile_cols(p)
+
+    key_frames = [flat_for_qa, sem_for_qa, keys_only_raw, keys_only_sem, keys_in_both]
+    common_cols = _compare_cols_in_merge(flat_for_qa, sem_for_qa, key_cols, compare_cols)
+
+    if common_cols is not None and _string_columns(key_frames, key_cols):
+        changed_keys = keys_in_both.iloc[
+            _changed_key_positions(flat_for_qa, sem_for_qa, keys_in_both, key_cols, common_cols, p)
+        ]
+        log.info("Keys in BOTH with possible column-level differences: %d", len(changed_keys))
+
+        flat_for_qa = flat_for_qa.iloc[_rows_with_keys(flat_for_qa, [keys_only_raw, changed_keys], key_cols)]
+        sem_for_qa = sem_for_qa.iloc[_rows_with_keys(sem_for_qa, [keys_only_sem, changed_keys], key_cols)]
+        keys_in_both = changed_keys
+    else:
+        log.info("Key columns hold non-string values (or column names clash with merge suffixes); building QA diff with pandas.")
+
+    return _pandas_build_qa_diff(
+        flat_for_qa, sem_for_qa, keys_only_raw, keys_only_sem, keys_in_both, batch_id, qa_run_datetime,
+        filtered_excel_files, expected_companies, status, process_cd, submission_period_cd,
+        target_submission_period, log, p, diff_stream, max_examples_per_group, diff_totals,
+    )
+
+
+# --------------------------------------------------------------------------------------
+# 4) BUILD QA SUMMARY + PER-COMPANY SUMMARY + ERROR COUNTS
+# --------------------------------------------------------------------------------------
+
+def _org_counts(flat_for_qa: pd.DataFrame, sem_for_qa: pd.DataFrame, keys_in_both: pd.DataFrame) -> pd.DataFrame:
+    """
+    QAAggregates.org_counts: rows per Organisation_Cd in each input, in one Polars query.
+    """
+    def counts(df: pd.DataFrame, name: str) -> pl.LazyFrame:
+        orgs = _string_values(df["Organisation_Cd"]) if "Organisation_Cd" in df.columns else pl.Series([], dtype=pl.String)
+        return (
+            pl.DataFrame([orgs.alias("Organisation_Cd")])
+            .lazy()
+            .drop_nulls()
+            .group_by("Organisation_Cd")
+            .agg(pl.len().cast(pl.Int64).alias(name))
+        )
+
+    raw, ingested, both = [
+        counts(df, name) for df, name in zip([flat_for_qa, sem_for_qa, keys_in_both], _ORG_COUNT_COLS)
+    ]
+    joined = (
+        raw.join(ingested, on="Organisation_Cd", how="full", coalesce=True)
+        .join(both, on="Organisation_Cd", how="left")
+        .with_columns(pl.col(_ORG_COUNT_COLS).fill_null(0))
+        .sort("Organisation_Cd")
+        .collect()
+    )
+
+    org_counts = pd.DataFrame({"Organisation_Cd": joined["Organisation_Cd"].to_list()})
+    org_counts[_ORG_COUNT_COLS] = joined.select(_ORG_COUNT_COLS).to_numpy().astype(int)
+    return org_counts
+
+
+def _diff_aggregates(qa_diff_df: pd.DataFrame, key_cols: list[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    qa._aggregate_qa_diff on Polars: (diff_counts, mismatch_keys).
+    """
+    key_cols_for_diff = [c for c in key_cols if c in qa_diff_df.columns]
+    group_cols = [c for c in _DIFF_GROUP_COLS if c in qa_diff_df.columns]
+
+    if qa_diff_df.empty or not key_cols_for_diff or not _string_columns([qa_diff_df], group_cols + key_cols_for_diff):
+        return _aggregate_qa_diff(qa_diff_df, key_cols)
+
+    diff = pl.DataFrame([
+        _string_values(qa_diff_df[c]).alias(c) if c in qa_diff_df.columns else pl.Series(c, [None] * len(qa_diff_df), dtype=pl.String)
+        for c in dict.fromkeys(_DIFF_GROUP_COLS + key_cols_for_diff)
+    ]).lazy()
+
+    diff_counts, mismatch_keys = pl.collect_all([
+        diff.group_by(_DIFF_GROUP_COLS, maintain_order=True).agg(pl.len().cast(pl.Int64).alias("Error_Count")),
+        diff.select(key_cols_for_diff).unique(maintain_order=True),
+    ])
+    return diff_counts.to_pandas(), mismatch_keys.to_pandas().reindex(columns=key_cols)
+
+
+def build_qa_summaries(
+    flat_for_qa: pd.DataFrame,
+    sem_for_qa: pd.DataFrame,
+    keys_in_both: pd.DataFrame,
+    qa_diff_df: pd.DataFrame,
+    batch_id: str,
+    qa_run_datetime: str,
+    profile: str = "QD",
+    diff_totals: Optional[QADiffTotals] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    qa.build_qa_summaries with the counting on Polars; returns the same three frames.
+    """
+    p = _profile_name(profile)
+    _compare_cols, key_cols, _context_cols = _get_profile_cols(p)
+
+    if not _string_columns([flat_for_qa, sem_for_qa, keys_in_both], ["Organisation_Cd"]):
+        aggregates = _pandas_build_qa_aggregates(
+            flat_for_qa, sem_for_qa, keys_in_both, qa_diff_df, profile=p, diff_totals=diff_totals,
+        )
+        return build_qa_summaries_from_aggregates(aggregates, batch_id, qa_run_datetime)
+
+    if diff_totals is not None:
+        diff_counts, mismatch_keys = diff_totals.diff_counts, diff_totals.mismatch_keys.reindex(columns=key_cols)
+    else:
+        diff_counts, mismatch_keys = _diff_aggregates(qa_diff_df, key_cols)
+
+    aggregates = QAAggregates(
+        total_raw_rows=len(flat_for_qa),
+        total_ingested_rows=len(sem_for_qa),
+        rows_with_keys_in_both=len(keys_in_both),
+        org_counts=_org_counts(flat_for_qa, sem_for_qa, keys_in_both),
+        diff_counts=diff_counts,
+        mismatch_keys=mismatch_keys,
+    )
+    return build_qa_summaries_from_aggregates(aggregates, batch_id, qa_run_datetime)
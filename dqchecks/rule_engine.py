@@ -0,0 +1,271 @@
+"""
+Single-traversal rule engine for the panacea checks
+
+Each panacea rule used to walk the sheets on its own. Here rules register
+callbacks instead, and RuleEngine walks each company sheet once (with its
+template counterpart, if any) and dispatches to every rule:
+
+- SheetRule.start_sheet(visit): once per sheet, before its cells. Per-sheet
+  work goes here; return the (max_row, max_column) of cells the rule wants,
+  or None to be left out of the cell walk.
+- SheetRule.visit_cell(visit, row, column, cell): each cell the company
+  sheet holds within the rule's bounds, in row-major order.
+- SheetRule.visit_row(visit, row, cells): each row holding such cells, after
+  its cells, with the (column, cell) pairs in it.
+- SheetRule.end_sheet(visit): once per sheet, after its cells.
+
+Only the cells a sheet holds are walked (openpyxl's cell map), so empty cells
+are neither visited nor created. Values shared between rules, such as a
+sheet's used area, are computed once per sheet through SheetVisit.cached;
+pass the same sheet_caches dict to several runs over the same workbooks to
+share them across runs too.
+
+    from dqchecks.panacea import (
+        FormulaDifferenceRule, FormulaErrorRule, ShapeRule, TemplateProfile)
+
+    rules = [FormulaDifferenceRule(TemplateProfile(wb_template)), FormulaErrorRule(), ShapeRule()]
+    RuleEngine(rules).run(wb_company, wb_template)
+    formula_differences_df, formula_errors_df, shape_df = (rule.result() for rule in rules)
+
+The find_* functions in panacea run the same rules one at a time.
+
+While a dqchecks.telemetry.Telemetry is active, each rule's time in its hooks
+and the cells dispatched to it are recorded per sheet, under its rule_cd.
+"""
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from openpyxl import Workbook
+from openpyxl.worksheet.worksheet import Worksheet
+
+from dqchecks.telemetry import Telemetry, active_telemetry
+
+
+class SheetVisit:  # pylint: disable=too-few-public-methods
+    """
+    A company sheet (and its template counterpart) being walked by RuleEngine.
+
+    Attributes:
+        sheet_name (str): Name of the sheet.
+        company_sheet (Worksheet): The company sheet.
+        template_sheet (Worksheet | None): The template sheet of the same name,
+            None if there is no template or it has no such sheet.
+        cache (dict, optional): Values already computed for this sheet, filled
+            in by cached.
+    """
+
+    def __init__(self, sheet_name: str, company_sheet: Worksheet,
+                 template_sheet: Optional[Worksheet] = None,
+                 cache: Optional[Dict[str, Any]] = None):
+        self.sheet_name = sheet_name
+        self.company_sheet = company_sheet
+        self.template_sheet = template_sheet
+        self._cache: Dict[str, Any] = {} if cache is None else cache
+
+    def cached(self, key: str, compute: Callable[[], Any]) -> Any:
+        """compute(), evaluated once per sheet and shared between rules under key."""
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+
+class SheetRule:
+    """
+    A rule run by RuleEngine. Override the hooks the rule needs; the engine
+    only dispatches cells and rows to rules that override visit_cell / visit_row.
+
+    Attributes:
+        rule_cd (str | None): Rule_Cd of the rule's events, labelling its
+            telemetry; the class name if None.
+    """
+    rule_cd: Optional[str] = None
+
+    def start(self) -> None:
+        """Called before the first sheet."""
+
+    def start_sheet(self, visit: SheetVisit) -> Optional[Tuple[int, int]]:
+        """
+        Called once per sheet before its cells.
+
+        Returns:
+            tuple | None: (max_row, max_column) bounding the cells to visit,
+            or None to skip this sheet's cells.
+        """
+
+    def visit_cell(self, visit: SheetVisit, row: int, column: int, cell) -> None:
+        """Called for each held cell within the bounds, in row-major order."""
+
+    def visit_row(self, visit: SheetVisit, row: int, cells: List[tuple]) -> None:
+        """Called after the cells of each row, with its (column, cell) pairs within the bounds."""
+
+    def end_sheet(self, visit: SheetVisit) -> None:
+        """Called once per sheet after its cells."""
+
+    def finish(self) -> None:
+        """Called after the last sheet."""
+
+
+class RuleEngine:  # pylint: disable=too-few-public-methods
+    """
+    Runs SheetRules over a company workbook in a single walk of each sheet.
+
+    Attributes:
+        rules (list[SheetRule]): The rules, in dispatch order.
+    """
+
+    def __init__(self, rules):
+        self.rules: List[SheetRule] = list(rules)
+        if not all(isinstance(rule, SheetRule) for rule in self.rules):
+            raise TypeError("Every rule must be an instance of SheetRule.")
+
+    def run(self, wb_company: Workbook, wb_template: Optional[Workbook] = None,
+            sheet_names: Optional[List[str]] = None,
+            sheet_caches: Optional[Dict[str, dict]] = None) -> "RuleEngine":
+        """
+        Walk the company workbook's sheets (all, or sheet_names in that order)
+        and dispatch to every rule.
+
+        Args:
+            wb_company (Workbook): The workbook whose cells are walked.
+            wb_template (Workbook, optional): Template whose sheets are paired
+                with the company sheets by name.
+            sheet_names (list[str], optional): Sheets to walk; names missing
+                from the company workbook are ignored.
+            sheet_caches (dict, optional): Sheet name -> SheetVisit.cached
+                values, shared with (and filled in for) other runs over the
+                same workbooks.
+
+        Returns:
+            RuleEngine: self, to read the rules' results from.
+        """
+        if not isinstance(wb_company, Workbook):
+            raise TypeError("wb_company must be an instance of openpyxl Workbook.")
+        if wb_template is not None and not isinstance(wb_template, Workbook):
+            raise TypeError("wb_template must be an instance of openpyxl Workbook.")
+
+        names = wb_company.sheetnames if sheet_names is None else [
+            name for name in sheet_names if name in wb_company.sheetnames]
+        template_names = set(wb_template.sheetnames) if wb_template is not None else set()
+        if sheet_caches is None:
+            sheet_caches = {}
+        telemetry = active_telemetry()
+
+        for rule in self.rules:
+            rule.start()
+        for name in names:
+            visit = SheetVisit(
+                name, wb_company[name], wb_template[name] if name in template_names else None,
+                sheet_caches.setdefault(name, {}))
+            if telemetry is None:
+                self._run_sheet(visit)
+            else:
+                self._run_sheet_timed(visit, telemetry)
+        for rule in self.rules:
+            rule.finish()
+        return self
+
+    def _run_sheet(self, visit: SheetVisit) -> None:
+        bounds = []
+        for rule in self.rules:
+            rule_bounds = rule.start_sheet(visit)
+            if rule_bounds is not None:
+                bounds.append((rule, rule_bounds[0], rule_bounds[1]))
+        if bounds:
+            _walk(visit, bounds)
+        for rule in self.rules:
+            rule.end_sheet(visit)
+
+    def _run_sheet_timed(self, visit: SheetVisit, telemetry: Telemetry) -> None:
+        """_run_sheet, recording each rule's time and cells for the sheet."""
+        timers = {id(rule): _TimedRule(rule) for rule in self.rules}
+        with telemetry.memory() as window:
+            bounds = []
+            for rule in self.rules:
+                rule_bounds = timers[id(rule)].call(rule.start_sheet, visit)
+                if rule_bounds is not None:
+                    bounds.append((rule, rule_bounds[0], rule_bounds[1]))
+            if bounds:
+                _walk(visit, bounds, timers)
+            for rule in self.rules:
+                timers[id(rule)].call(rule.end_sheet, visit)
+        # The rules share the sheet's walk, so they share its peak memory
+        for rule in self.rules:
+            timer = timers[id(rule)]
+            telemetry.record("panacea", rule.rule_cd or type(rule).__name__, visit.sheet_name,
+                             seconds=timer.seconds, cells=timer.cells, peak=window.peak)
+
+
+class _TimedRule:
+    """Stands in for a rule in the walk, timing its hooks and counting its cells."""
+
+    def __init__(self, rule: SheetRule):
+        self.rule = rule
+        self.seconds = 0.0
+        self.cells = 0
+        self._counts_rows = not _overrides(rule, "visit_cell")
+
+    def call(self, hook: Callable, *args):
+        """hook(*args), timed."""
+        start = time.perf_counter()
+        try:
+            return hook(*args)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def visit_cell(self, visit: SheetVisit, row: int, column: int, cell) -> None:
+        """Timed SheetRule.visit_cell."""
+        self.cells += 1
+        self.call(self.rule.visit_cell, visit, row, column, cell)
+
+    def visit_row(self, visit: SheetVisit, row: int, cells: List[tuple]) -> None:
+        """Timed SheetRule.visit_row."""
+        if self._counts_rows:
+            self.cells += len(cells)
+        self.call(self.rule.visit_row, visit, row, cells)
+
+
+def _overrides(rule: SheetRule, hook: str) -> bool:
+    return getattr(type(rule), hook) is not getattr(SheetRule, hook)
+
+
+def _walk(visit: SheetVisit, bounds: List[tuple], timers: Optional[dict] = None) -> None:
+    """
+    One row-major pass over the cells the company sheet holds, dispatched by
+    bounds (to the rules' _TimedRule from timers, if given).
+    """
+    cell_rules = [b for b in bounds if _overrides(b[0], "visit_cell")]
+    row_rules = [b for b in bounds if _overrides(b[0], "visit_row")]
+    if not cell_rules and not row_rules:
+        return
+    if timers is not None:
+        cell_rules = [(timers[id(rule)], *rest) for rule, *rest in cell_rules]
+        row_rules = [(timers[id(rule)], *rest) for rule, *rest in row_rules]
+    last_row = max(b[1] for b in bounds)
+    # Chartsheets hold no cells
+    cells = getattr(visit.company_sheet, "_cells", {})
+
+    row_cells, current_row = [], None
+    for row, column in sorted(cells):
+        if row > last_row:
+            break
+        if row != current_row:
+            _end_row(visit, row_rules, current_row, row_cells)
+            row_cells, current_row = [], row
+        cell = cells[(row, column)]
+        for rule, max_row, max_column in cell_rules:
+            if row <= max_row and column <= max_column:
+                rule.visit_cell(visit, row, column, cell)
+        if row_rules:
+            row_cells.append((column, cell))
+    _end_row(visit, row_rules, current_row, row_cells)
+
+
+def _end_row(visit: SheetVisit, row_rules: List[tuple], row: Optional[int],
+             row_cells: list) -> None:
+    if row is None:
+        return
+    for rule, max_row, max_column in row_rules:
+        if row <= max_row:
+            cells = [(column, cell) for column, cell in row_cells if column <= max_column]
+            if cells:
+                rule.visit_row(visit, row, cells)
@@ -0,0 +1,367 @@
+"""
+Artifact-aware scheduler for the panacea rules
+
+The panacea rules share expensive intermediate artifacts: the workbooks loaded
+with and without data_only, the template's formula block hashes, the used area
+of each sheet and the sheets identical in both packages. RuleScheduler runs a
+declared set of nodes as a DAG instead of leaving the caller to orchestrate
+them by hand:
+
+- an artifact is computed once, from the artifacts it names as inputs, and
+  handed to every node that needs it;
+- a rule is a node returning an event DataFrame;
+- nodes run in a thread pool as soon as their inputs are ready, so independent
+  ones (e.g. loading the four workbooks) overlap.
+
+openpyxl creates cells when a sheet is read through ws.cell(), so a workbook is
+not safe to read from two threads at once. Artifacts declared exclusive=True
+(the workbooks) are used by one node at a time; nodes that only share other
+artifacts run concurrently.
+
+    scheduler = panacea_scheduler("template.xlsx", "company.xlsx",
+                                  pk_sheet_pattern="^fOut_", pk_header_column_name="Reference")
+    scheduler.add_artifact(
+        "fout_frame", lambda wb: process_fout_sheets(wb, context, config), ["wb_company_values"])
+    result = scheduler.run()
+    result.events    # every rule's events, in the order the rules were declared
+    result.timings   # one row per node: Node, Kind, Inputs, Start_Seconds, Seconds
+    result.artifacts["fout_frame"]
+"""
+import logging
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from dqchecks.panacea import (
+    FormulaDifferenceRule,
+    FormulaErrorRule,
+    ShapeRule,
+    TemplateProfile,
+    find_missing_sheets,
+    find_pk_errors,
+    identical_sheets,
+)
+from dqchecks.preflight import read_sheet_names
+from dqchecks.rule_engine import RuleEngine, SheetRule
+from dqchecks.telemetry import emitted
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT = "artifact"
+RULE = "rule"
+
+
+class ScheduleNode(NamedTuple):
+    """
+    A node of a RuleScheduler DAG.
+
+    Attributes:
+        name (str): Unique name, used by other nodes to name it as an input.
+        kind (str): ARTIFACT or RULE.
+        func (Callable): Called with the values of inputs, in order.
+        inputs (tuple[str, ...]): Names of the artifacts the node needs.
+        exclusive (bool): Whether nodes using this artifact must run one at a time.
+    """
+    name: str
+    kind: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...]
+    exclusive: bool
+
+
+class ScheduleResult(NamedTuple):
+    """
+    What RuleScheduler.run returns.
+
+    Attributes:
+        events (pd.DataFrame): The rules' event frames, concatenated in the
+            order the rules were declared.
+        timings (pd.DataFrame): One row per node run, in the order they
+            finished: Node, Kind, Inputs, Start_Seconds (from the start of the
+            run) and Seconds.
+        artifacts (dict): Artifact name -> value, for the artifacts computed.
+    """
+    events: pd.DataFrame
+    timings: pd.DataFrame
+    artifacts: Dict[str, Any]
+
+
+class RuleScheduler:
+    """
+    Runs rules and the artifacts they depend on as a DAG in a thread pool.
+
+    Args:
+        max_workers (int, optional): Size of the worker pool. Defaults to
+            ThreadPoolExecutor's own default.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self.nodes: Dict[str, ScheduleNode] = {}
+
+    def add_artifact(self, name: str, func: Callable[..., Any], inputs: Iterable[str] = (),
+                     exclusive: bool = False) -> "RuleScheduler":
+        """
+        Declare an artifact: func(*input values), computed once per run.
+
+        Args:
+            name (str): Name of the artifact.
+            func (Callable): Computes the artifact from its inputs.
+            inputs (Iterable[str]): Names of the artifacts func takes.
+            exclusive (bool): Only let one node at a time use the artifact,
+                for values that are not safe to share between threads.
+
+        Returns:
+            RuleScheduler: self, to chain declarations.
+
+        Raises:
+            ValueError: If a node of that name is already declared.
+        """
+        return self._add(ScheduleNode(name, ARTIFACT, func, tuple(inputs), exclusive))
+
+    def add_rule(self, name: str, func: Callable[..., pd.DataFrame],
+                 inputs: Iterable[str] = ()) -> "RuleScheduler":
+        """
+        Declare a rule: func(*input values) returns its events as a DataFrame.
+
+        Returns:
+            RuleScheduler: self, to chain declarations.
+
+        Raises:
+            ValueError: If a node of that name is already declared.
+        """
+        return self._add(ScheduleNode(name, RULE, func, tuple(inputs), False))
+
+    def _add(self, node: ScheduleNode) -> "RuleScheduler":
+        if node.name in self.nodes:
+            raise ValueError(f"Node '{node.name}' is already declared.")
+        self.nodes[node.name] = node
+        return self
+
+    def plan(self, rules: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        The nodes needed to run rules (all of them by default), in a valid
+        execution order.
+
+        Raises:
+            ValueError: If a rule is unknown, a node names an undeclared or
+                non-artifact input, or the inputs form a cycle.
+        """
+        rule_names = [name for name, node in self.nodes.items() if node.kind == RULE] \
+            if rules is None else list(rules)
+        for name in rule_names:
+            if name not in self.nodes or self.nodes[name].kind != RULE:
+                raise ValueError(f"Unknown rule '{name}'.")
+
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: Tuple[str, ...]):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "active":
+                raise ValueError(f"Cycle between nodes: {' -> '.join(path + (name,))}.")
+            state[name] = "active"
+            for input_name in self.nodes[name].inputs:
+                if input_name not in self.nodes or self.nodes[input_name].kind != ARTIFACT:
+                    raise ValueError(
+                        f"Node '{name}' needs '{input_name}', which is not a declared artifact.")
+                visit(input_name, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for name in rule_names:
+            visit(name, ())
+        return order
+
+    def run(self, rules: Optional[Iterable[str]] = None) -> ScheduleResult:
+        """
+        Compute the artifacts rules need (each once) and run the rules, every
+        node starting as soon as its inputs are ready and its exclusive inputs
+        are free.
+
+        Args:
+            rules (Iterable[str], optional): Rules to run; all by default.
+
+        Returns:
+            ScheduleResult: The combined events, per-node timings and artifacts.
+
+        Raises:
+            ValueError: As plan().
+            TypeError: If a rule does not return a DataFrame.
+            Exception: The first exception raised by a node; nodes already
+                running are waited for, no further nodes are started.
+        """
+        # pylint: disable=too-many-locals
+        order = self.plan(rules)
+        waiting = {name: set(self.nodes[name].inputs) for name in order}
+        dependents: Dict[str, List[str]] = {name: [] for name in order}
+        for name in order:
+            for input_name in set(self.nodes[name].inputs):
+                dependents[input_name].append(name)
+
+        values: Dict[str, Any] = {}
+        timings: List[dict] = []
+        ready = [name for name in order if not waiting[name]]
+        busy: set = set()
+        running: Dict[Any, str] = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while ready or running:
+                for name in list(ready):
+                    locks = self._locks(name)
+                    if locks & busy:
+                        continue
+                    busy |= locks
+                    ready.remove(name)
+                    node = self.nodes[name]
+                    running[executor.submit(
+                        _timed, node.func, [values[i] for i in node.inputs], started)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    busy -= self._locks(name)
+                    if future.exception() is not None:
+                        # Let the running nodes finish, start no more
+                        wait(running)
+                        raise future.exception()
+                    value, start, seconds = future.result()
+                    node = self.nodes[name]
+                    if node.kind == RULE and not isinstance(value, pd.DataFrame):
+                        wait(running)
+                        raise TypeError(f"Rule '{name}' must return a pandas DataFrame.")
+                    values[name] = value
+                    timings.append({
+                        "Node": name,
+                        "Kind": node.kind,
+                        "Inputs": ", ".join(node.inputs),
+                        "Start_Seconds": start,
+                        "Seconds": seconds,
+                    })
+                    for dependent in dependents[name]:
+                        waiting[dependent].discard(name)
+                        if not waiting[dependent]:
+                            ready.append(dependent)
+
+        return self._result(order, values, timings)
+
+    def _result(self, order: List[str], values: Dict[str, Any],
+                timings: List[dict]) -> ScheduleResult:
+        frames = [values[name] for name in order
+                  if self.nodes[name].kind == RULE and not values[name].empty]
+        return ScheduleResult(
+            events=pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(),
+            timings=pd.DataFrame(
+                timings, columns=["Node", "Kind", "Inputs", "Start_Seconds", "Seconds"]),
+            artifacts={name: value for name, value in values.items()
+                       if self.nodes[name].kind == ARTIFACT},
+        )
+
+    def _locks(self, name: str) -> set:
+        """The exclusive artifacts a node uses."""
+        return {input_name for input_name in self.nodes[name].inputs
+                if self.nodes[input_name].exclusive}
+
+
+def _timed(func: Callable[..., Any], args: list, started: float) -> Tuple[Any, float, float]:
+    """func(*args), with its start (relative to started) and duration in seconds."""
+    start = time.perf_counter()
+    value = func(*args)
+    end = time.perf_counter()
+    return value, start - started, end - start
+
+
+def _package(source):
+    """A fresh reader of a package given as a path or bytes, so threads never share one."""
+    return BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _identical_package_sheets(template_source, company_source) -> set:
+    """Sheets identical in both packages; empty when either cannot be read."""
+    try:
+        names = read_sheet_names(_package(template_source))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        logger.warning("Could not read the template's sheet names, comparing every sheet: %s", e)
+        return set()
+    return identical_sheets(_package(template_source), _package(company_source), names)
+
+
+def _run_sheet_rule(rule: SheetRule, wb_company, wb_template=None, sheet_caches=None):
+    """A SheetRule's result after one RuleEngine run."""
+    RuleEngine([rule]).run(wb_company, wb_template, sheet_caches=sheet_caches)
+    return emitted("panacea", rule.rule_cd, rule.result())
+
+
+def panacea_scheduler(
+        template_source,
+        company_source,
+        pk_sheet_pattern: Optional[str] = None,
+        pk_header_column_name: Optional[str] = None,
+        max_workers: Optional[int] = None) -> RuleScheduler:
+    """
+    A RuleScheduler declaring the README's template-based panacea rules over
+    a template and a company package.
+
+    Artifacts: wb_template, wb_template_values, wb_company, wb_company_values
+    (the packages loaded with data_only False/True, exclusive), template_profile
+    (TemplateProfile of wb_template), identical_sheets (sheets the formula and
+    shape rules can skip) and sheet_caches (used areas shared by those rules).
+
+    Rules: formula_differences (Rule 1), formula_errors (Rule 2),
+    missing_sheets (Rule 3), shape_differences (Rule 4) and, given
+    pk_sheet_pattern and pk_header_column_name, pk_errors (Rules 5/6).
+
+    Args:
+        template_source (str | bytes): Path or bytes of the template package.
+        company_source (str | bytes): Path or bytes of the company package.
+        pk_sheet_pattern (str, optional): Regex of the sheets to check keys in.
+        pk_header_column_name (str, optional): Header of the key column.
+        max_workers (int, optional): Size of the worker pool.
+
+    Returns:
+        RuleScheduler: The scheduler, ready to run or to extend with more nodes.
+    """
+    def loader(source, data_only):
+        return lambda: load_workbook(_package(source), data_only=data_only)
+
+    scheduler = RuleScheduler(max_workers)
+    scheduler.add_artifact("wb_template", loader(template_source, False), exclusive=True)
+    scheduler.add_artifact("wb_template_values", loader(template_source, True), exclusive=True)
+    scheduler.add_artifact("wb_company", loader(company_source, False), exclusive=True)
+    scheduler.add_artifact("wb_company_values", loader(company_source, True), exclusive=True)
+    scheduler.add_artifact("template_profile", TemplateProfile, ["wb_template"])
+    scheduler.add_artifact(
+        "identical_sheets",
+        lambda: _identical_package_sheets(template_source, company_source))
+    scheduler.add_artifact("sheet_caches", lambda wb_template, wb_company: {},
+                           ["wb_template", "wb_company"])
+
+    scheduler.add_rule(
+        "formula_differences",
+        lambda wb_template, wb_company, profile, identical, caches: _run_sheet_rule(
+            FormulaDifferenceRule(profile, identical), wb_company, wb_template, caches),
+        ["wb_template", "wb_company", "template_profile", "identical_sheets", "sheet_caches"])
+    scheduler.add_rule(
+        "formula_errors",
+        lambda wb: _run_sheet_rule(FormulaErrorRule(), wb),
+        ["wb_company_values"])
+    scheduler.add_rule(
+        "missing_sheets", find_missing_sheets, ["wb_template_values", "wb_company_values"])
+    scheduler.add_rule(
+        "shape_differences",
+        lambda wb_template, wb_company, identical, caches: _run_sheet_rule(
+            ShapeRule(identical), wb_company, wb_template, caches),
+        ["wb_template", "wb_company", "identical_sheets", "sheet_caches"])
+    if pk_sheet_pattern is not None and pk_header_column_name is not None:
+        scheduler.add_rule(
+            "pk_errors",
+            lambda wb: find_pk_errors(wb, pk_sheet_pattern, pk_header_column_name),
+            ["wb_company_values"])
+    return scheduler
@@ -0,0 +1,295 @@
+"""
+Opt-in performance telemetry for panacea, transforms and qa
+
+Records, per component, step and sheet, the wall time, cells visited, rows
+emitted and (optionally) peak traced memory of the checks run while a
+Telemetry is active:
+
+    from dqchecks.telemetry import Telemetry
+
+    with Telemetry(trace_memory=True) as telemetry:
+        formula_differences_df = find_formula_differences(wb_template, wb_company)
+        fout_df = process_fout_sheets(wb_company_values, context, config)
+        qa_diff_df = qa.build_qa_diff(...)
+    telemetry_df = telemetry.to_dataframe()
+    telemetry.write("/lakehouse/events/telemetry.parquet")
+
+What is recorded:
+
+- panacea: each SheetRule run by RuleEngine, per sheet (labelled by the rule's
+  rule_cd), with the cells dispatched to it; rows emitted per sheet by the
+  find_* functions; Rule 3 and check_value_in_cell (Rules 7/8) per call.
+- transforms: process_fout_sheets, per sheet: reading it (cells read) and
+  reshaping it (rows emitted).
+- qa: each public step per call, with the cells of the input frames and the
+  rows of the frames returned. Steps run in worker processes
+  (run_qa_by_organisation) are only seen as the driver's one call.
+
+Rows with the same component, step and sheet are summed (Calls counts them);
+Peak_Memory_Bytes is the largest peak above the memory in use when the step
+started. tracemalloc is process-wide and cannot tell threads apart, so a step
+that ran while an instrumented step was running on another thread (e.g. rules
+run in parallel by scheduler.RuleScheduler) records no peak. Tracing also slows
+the checks down: leave trace_memory off unless memory is what is being sized,
+and size it with the rules run one at a time.
+
+When no Telemetry is active the instrumented code only checks for one, so
+instrumentation costs next to nothing.
+"""
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+TELEMETRY_COLUMNS = [
+    "Component", "Step", "Sheet_Cd", "Calls", "Seconds",
+    "Cells_Visited", "Rows_Emitted", "Peak_Memory_Bytes",
+]
+
+_ACTIVE: Optional["Telemetry"] = None
+
+
+class StepCounters:  # pylint: disable=too-few-public-methods
+    """
+    Counters of a step being recorded; the instrumented code sets them.
+
+    Attributes:
+        cells (int): Cells visited.
+        rows (int): Rows emitted.
+    """
+    __slots__ = ("cells", "rows")
+
+    def __init__(self):
+        self.cells = 0
+        self.rows = 0
+
+
+class MemoryWindow:  # pylint: disable=too-few-public-methods
+    """
+    Peak traced memory of a block, above the memory in use when it started.
+
+    Attributes:
+        peak (int | None): Set when the block ends; None if memory is not traced
+            or a block was measured on another thread at the same time.
+    """
+    __slots__ = ("start", "highest", "peak", "shared")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.highest = start
+        self.peak: Optional[int] = None
+        self.shared = False
+
+
+class Telemetry:
+    """
+    Collects step records while active (as a context manager).
+
+    Args:
+        trace_memory (bool): Trace memory allocations with tracemalloc to
+            record peaks. Defaults to False.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self._records: Dict[Tuple[str, str, str], list] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Memory windows being measured, per thread ident (guarded by _lock)
+        self._windows: Dict[int, list] = {}
+        self._previous: Optional[Telemetry] = None
+        self._started_tracing = False
+
+    def __enter__(self) -> "Telemetry":
+        global _ACTIVE  # pylint: disable=global-statement
+        self._previous, _ACTIVE = _ACTIVE, self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _ACTIVE  # pylint: disable=global-statement
+        _ACTIVE = self._previous
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def record(self, component: str, step: str, sheet: str = "", *, calls: int = 1,
+               seconds: float = 0.0, cells: int = 0, rows: int = 0,
+               peak: Optional[int] = None) -> None:
+        """Add to the record of (component, step, sheet)."""
+        # pylint: disable=too-many-arguments
+        with self._lock:
+            record = self._records.setdefault((component, step, sheet), [0, 0.0, 0, 0, None])
+            record[0] += calls
+            record[1] += seconds
+            record[2] += cells
+            record[3] += rows
+            if peak is not None:
+                record[4] = peak if record[4] is None else max(record[4], peak)
+
+    def emitted(self, component: str, step: str, events: pd.DataFrame) -> None:
+        """Count the rows of an event frame as emitted by step, per Sheet_Cd."""
+        if events.empty or "Sheet_Cd" not in events.columns:
+            return
+        for sheet, rows in events["Sheet_Cd"].fillna("").value_counts(sort=False).items():
+            self.record(component, step, str(sheet), calls=0, rows=int(rows))
+
+    @contextmanager
+    def memory(self) -> Iterator[MemoryWindow]:
+        """Measure the peak traced memory of a block (peak stays None when not tracing)."""
+        if not tracemalloc.is_tracing():
+            yield MemoryWindow(0)
+            return
+        thread = threading.get_ident()
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            window = MemoryWindow(current)
+            for ident, windows in self._windows.items():
+                for outer in windows:
+                    if ident == thread:
+                        # reset_peak is global: fold the peak so far into the enclosing windows
+                        outer.highest = max(outer.highest, peak)
+                    else:
+                        # Peaks of windows open on two threads cannot be told apart
+                        outer.shared = window.shared = True
+            tracemalloc.reset_peak()
+            self._windows.setdefault(thread, []).append(window)
+        try:
+            yield window
+        finally:
+            with self._lock:
+                stack = self._windows[thread]
+                stack.pop()
+                if not stack:
+                    del self._windows[thread]
+                window.highest = max(window.highest, tracemalloc.get_traced_memory()[1])
+            window.peak = None if window.shared else window.highest - window.start
+
+    @contextmanager
+    def step(self, component: str, step: str, sheet: str = "") -> Iterator[StepCounters]:
+        """Record the wall time and peak memory of a block, with the counters it sets."""
+        counters = StepCounters()
+        with self.memory() as window:
+            start = time.perf_counter()
+            try:
+                yield counters
+            finally:
+                seconds = time.perf_counter() - start
+        self.record(component, step, sheet, seconds=seconds, cells=counters.cells,
+                    rows=counters.rows, peak=window.peak)
+
+    def running_steps(self) -> set:
+        """(component, step) of the instrumented calls in progress on this thread."""
+        if not hasattr(self._local, "running"):
+            self._local.running = set()
+        return self._local.running
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """The records, one row per component, step and sheet, in first-seen order."""
+        with self._lock:
+            rows = [[*key, *record] for key, record in self._records.items()]
+        df = pd.DataFrame(rows, columns=TELEMETRY_COLUMNS)
+        df["Peak_Memory_Bytes"] = df["Peak_Memory_Bytes"].astype("Int64")
+        return df
+
+    def write(self, path: str) -> pd.DataFrame:
+        """
+        Write the records next to the validation events: parquet for a .parquet
+        path, CSV otherwise.
+
+        Returns:
+            pd.DataFrame: The records written.
+        """
+        df = self.to_dataframe()
+        if path.endswith(".parquet"):
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        return df
+
+
+class _NullStep:  # pylint: disable=too-few-public-methods
+    """Stands in for a step when no Telemetry is active; its counters are ignored."""
+    cells = 0
+    rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+_NULL_STEP = _NullStep()
+
+
+def active_telemetry() -> Optional[Telemetry]:
+    """The Telemetry collecting records, None when telemetry is off."""
+    return _ACTIVE
+
+
+def telemetry_step(component: str, step: str, sheet: str = ""):
+    """Telemetry.step of the active Telemetry, or a no-op context when there is none."""
+    telemetry = _ACTIVE
+    if telemetry is None:
+        return _NULL_STEP
+    return telemetry.step(component, step, sheet)
+
+
+def emitted(component: str, step: str, events: pd.DataFrame) -> pd.DataFrame:
+    """Telemetry.emitted on the active Telemetry, if any; returns events."""
+    telemetry = _ACTIVE
+    if telemetry is not None:
+        telemetry.emitted(component, step, events)
+    return events
+
+
+def _frame_sizes(values) -> Tuple[int, int]:
+    """(cells, rows) of the DataFrames among values (and tuples of them)."""
+    cells = rows = 0
+    for value in values:
+        if isinstance(value, pd.DataFrame):
+            cells += value.size
+            rows += len(value)
+        elif isinstance(value, tuple):
+            nested = _frame_sizes(value)
+            cells += nested[0]
+            rows += nested[1]
+    return cells, rows
+
+
+def instrumented(component: str, step: Optional[str] = None) -> Callable:
+    """
+    Decorator recording each call of a function that takes and returns
+    DataFrames: cells of the DataFrame arguments, rows of those returned.
+    Calls made while the same step is already being recorded on the thread
+    (e.g. an engine delegating to the pandas path) are not counted twice.
+    """
+    def decorator(func: Callable) -> Callable:
+        name = step or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            telemetry = _ACTIVE
+            if telemetry is None:
+                return func(*args, **kwargs)
+            running = telemetry.running_steps()
+            if (component, name) in running:
+                return func(*args, **kwargs)
+            running.add((component, name))
+            try:
+                with telemetry.step(component, name) as counters:
+                    counters.cells = _frame_sizes((*args, *kwargs.values()))[0]
+                    result = func(*args, **kwargs)
+                    counters.rows = _frame_sizes((result,))[1]
+                return result
+            finally:
+                running.discard((component, name))
+        return wrapper
+    return decorator
@@ -0,0 +1,94 @@
+"""
+Tests for the synthetic workbook generator and the benchmark runner
+"""
+# pylint: disable=C0301
+from io import BytesIO
+
+import pytest
+from openpyxl import load_workbook
+
+from dqchecks import panacea
+from dqchecks.benchmarks import (
+    SyntheticSpec,
+    append_history,
+    compare_with_previous,
+    generate_company,
+    load_history,
+    run_benchmarks,
+    synthetic_packages,
+)
+from dqchecks.benchmarks.__main__ import main
+from dqchecks.benchmarks.runner import RESULT_COLUMNS
+
+TINY = {"tiny": SyntheticSpec(flat_sheets=2, rows_per_sheet=12, observation_periods=3,
+                              calc_rows=20, calc_columns=5, error_rate=0.1)}
+
+
+def test_synthetic_packages_hold_a_discrepancy_for_each_rule():
+    """The company file differs from the template in what Rules 1-6 check, and is reproducible"""
+    spec = TINY["tiny"]
+    template, company = synthetic_packages(spec)
+    wb_template, wb_company = load_workbook(BytesIO(template)), load_workbook(BytesIO(company))
+    wb_company_values = load_workbook(BytesIO(company), data_only=True)
+
+    assert wb_template.sheetnames == [
+        "SelectCompany", "fOut_1", "F_Outputs 1", "Calc_1", "Guidance_1"]
+    assert wb_template["F_Outputs 1"]["F2"].value == "2020-21"
+    assert len(panacea.find_formula_differences(wb_template, wb_company)) > 0
+    assert len(panacea.find_formula_errors(wb_company_values)) > 0
+    assert panacea.find_missing_sheets(wb_template, wb_company)["Sheet_Cd"].tolist() == ["Guidance_1"]
+    assert panacea.find_shape_differences(wb_template, wb_company)["Sheet_Cd"].tolist() == ["fOut_1"]
+    assert set(panacea.find_pk_errors(wb_company_values, "^fOut_|^F_Outputs", "Reference")["Rule_Cd"]) == {
+        "Rule 5: Boncode Repetition", "Rule 6: Missing Boncode Check"}
+    assert panacea.check_value_in_cell(wb_company_values, "SelectCompany", "Synthetic Water", "B4")["status"] == "Ok"
+    # the same spec always gives the same submission
+    assert [[cell.value for cell in row] for row in generate_company(spec)["Calc_1"].iter_rows()] == \
+        [[cell.value for cell in row] for row in wb_company["Calc_1"].iter_rows()]
+
+
+def test_run_benchmarks_times_every_check():
+    """Each benchmark gets a row with its timings and output size"""
+    results = run_benchmarks(["tiny"], repeat=2, size_tiers=TINY)
+
+    assert results.columns.tolist() == RESULT_COLUMNS
+    assert results["Benchmark"].tolist() == [
+        "load_workbooks", "Rule 1: find_formula_differences", "Rule 2: find_formula_errors",
+        "Rule 2: find_formula_errors (streamed)", "Rule 3: find_missing_sheets", "Rule 4: find_shape_differences",
+        "Rules 5/6: find_pk_errors", "Rules 7/8: check_value_in_cell",
+        "process_fout_sheets", "qa_pipeline"]
+    assert (results["Best_Seconds"] <= results["Mean_Seconds"]).all()
+    assert (results["Repeat"] == 2).all()
+    rows = dict(zip(results["Benchmark"], results["Rows"]))
+    assert rows["process_fout_sheets"] == 2 * 12 * 3
+    assert rows["qa_pipeline"] > 0
+    assert rows["Rule 2: find_formula_errors (streamed)"] == rows["Rule 2: find_formula_errors"]
+
+    with pytest.raises(ValueError, match="Unknown tiers"):
+        run_benchmarks(["huge"], size_tiers=TINY)
+
+
+def test_history_flags_regressions(tmp_path):
+    """Runs are appended to the JSON history and compared with the one before"""
+    path = str(tmp_path / "history.json")
+    results = run_benchmarks(["tiny"], size_tiers=TINY)
+    assert compare_with_previous(load_history(path)).empty
+
+    append_history(path, results, label="before")
+    slower = results.assign(Best_Seconds=results["Best_Seconds"] * 2)
+    slower.loc[0, "Best_Seconds"] = results.loc[0, "Best_Seconds"]
+    append_history(path, slower, label="after")
+
+    history = load_history(path)
+    assert [run["label"] for run in history] == ["before", "after"]
+    comparison = compare_with_previous(history, threshold=1.5)
+    assert comparison["Regression"].tolist() == [False] + [True] * (len(results) - 1)
+    assert comparison["Ratio"].iloc[1] == pytest.approx(2)
+
+
+def test_command_line_appends_to_history(tmp_path, capsys):
+    """python -m dqchecks.benchmarks runs the tiers and records them"""
+    path = str(tmp_path / "history.json")
+    assert main(["--tiers", "small", "--history", path, "--label", "cli"]) == 0
+
+    assert "Rule 1: find_formula_differences" in capsys.readouterr().out
+    assert load_history(path)[0]["label"] == "cli"
@@ -1,9 +1,17 @@
 """
 Tests for compare_formulas function from panacea
 """
+# pylint: disable=C0301
 import pytest
 from openpyxl import Workbook
-from dqchecks.panacea import compare_formulas
+from openpyxl.worksheet.formula import ArrayFormula
+from dqchecks import panacea
+from dqchecks.panacea import (
+    build_formula_grid,
+    compare_formulas,
+    find_formula_differences,
+    TemplateProfile,
+    to_relative_r1c1)
 
 @pytest.fixture
 def sheet_with_formulas():
@@ -128,3 +136,109 @@ def test_compare_formulas_different_dimensions(sheet_with_formulas, sheet_empty)
     assert result["description"] == "Sheets have different dimensions: " +\
         "'Sheet1' in template has 2 rows & 3 columns, 'Sheet1' in company has 1 rows & 1 columns."
     assert not result["errors"]
+
+def _model_sheet(rows=600, columns=40):
+    """A large model sheet: inputs in column A, formulas everywhere else."""
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = "Model"
+    for row in range(1, rows + 1):
+        sheet.cell(row=row, column=1, value=row)
+        for col in range(2, columns + 1):
+            sheet.cell(row=row, column=col, value=f"=A{row}*{col}")
+    return wb, sheet
+
+def test_compare_formulas_descends_only_into_edited_blocks(monkeypatch):
+    """A few edits are found, in sheet order, by comparing only the blocks holding them"""
+    _, template = _model_sheet()
+    _, company = _model_sheet()
+    company["C500"] = "=A500*99"
+    company["AD7"] = 5
+    company["B7"] = ArrayFormula("B7", "=SUM(A1:A7)")
+
+    visited = []
+    original = panacea._formula_difference  # pylint: disable=W0212
+    monkeypatch.setattr(panacea, "_formula_difference",
+                        lambda *args: visited.append(args[2:]) or original(*args))
+
+    result = compare_formulas(template, company)
+
+    assert list(result["errors"]) == ["B7", "AD7", "C500"]
+    assert result["errors"]["AD7"] == [
+        "Template: Model!AD7 (Formula: =A7*30) != Model!AD7 (Value: 5) :Company"]
+    assert result["errors"]["B7"] == [
+        "Template: Model!B7 (=A7*2) != Model!B7 (=SUM(A1:A7)) :Company"]
+    # the tiles around row 7 (columns A-P and Q-AF) and around C500
+    assert len(visited) == 3 * panacea.FORMULA_BLOCK_ROWS * panacea.FORMULA_BLOCK_COLUMNS
+
+def test_compare_formulas_ignores_values_and_cells_outside_the_used_area():
+    """Value-only edits are not formula differences; both grids hash the same"""
+    _, template = _model_sheet(rows=70, columns=20)
+    _, company = _model_sheet(rows=70, columns=20)
+    company["A3"] = 1000
+
+    assert build_formula_grid(template) == build_formula_grid(company)
+    assert compare_formulas(template, company)["status"] == "Ok"
+
+def test_find_formula_differences_reuses_the_template_profile():
+    """A TemplateProfile hashes each template sheet once across company workbooks"""
+    wb_template, _ = _model_sheet(rows=70, columns=20)
+    profile = TemplateProfile(wb_template)
+    results = []
+    for edit in ("=A9*100", "=A9*2"):
+        wb_company, company = _model_sheet(rows=70, columns=20)
+        company["B9"] = edit
+        results.append(find_formula_differences(wb_template, wb_company, template_profile=profile))
+
+    assert results[0]["Cell_Cd"].to_list() == ["B9"]
+    assert results[1].empty
+    assert list(profile._formula_grids) == ["Model"]  # pylint: disable=W0212
+
+    with pytest.raises(ValueError, match="profile of wb_template"):
+        find_formula_differences(wb_company, wb_company, template_profile=profile)
+
+@pytest.mark.parametrize("formula, row, column, expected", [
+    ("=A10*$B$2", 10, 4, "=RC[-3]*R2C2"),
+    ("=SUM(A1:A9)+LOG10(B12)", 10, 4, "=SUM(R[-9]C[-3]:R[-1]C[-3])+LOG10(R[2]C[-2])"),
+    ("=\"A1\"&'Sheet A1'!C3&Sheet1!$D4", 1, 1, "=\"A1\"&'Sheet A1'!R[2]C[2]&Sheet1!R[3]C4"),
+    ("=XFE1+ZZZ9+1E5+A1", 1, 1, "=XFE1+ZZZ9+1E5+RC"),
+])
+def test_to_relative_r1c1(formula, row, column, expected):
+    """A1 references become relative R1C1; strings, names and numbers are kept"""
+    assert to_relative_r1c1(formula, row, column) == expected
+
+def _shifted_model_sheets():
+    """Template and company model sheets whose fixed reference moved, plus two lone edits."""
+    wb_template, template = _model_sheet(rows=200, columns=6)
+    wb_company, company = _model_sheet(rows=200, columns=6)
+    for row in range(1, 201):
+        # filled down and right from D1
+        for letter, source in (("D", "A"), ("E", "B")):
+            template[f"{letter}{row}"] = f"={source}{row}*$Z$500"
+            company[f"{letter}{row}"] = f"={source}{row}*$Z$501"
+    company["B50"] = 7
+    company["C120"] = "=A120*4"
+    return wb_template, template, wb_company, company
+
+def test_compare_formulas_collapses_ranges():
+    """The same relative discrepancy in neighbouring cells is reported once, as a range"""
+    _, template, _, company = _shifted_model_sheets()
+
+    result = compare_formulas(template, company, collapse_ranges=True)
+
+    assert result["errors"] == {
+        "D1:E200": ["Template: Model!D1:E200 (=RC[-3]*R500C26) != Model!D1:E200 (=RC[-3]*R501C26) :Company"],
+        "B50": ["Template: Model!B50 (Formula: =A50*2) != Model!B50 (Value: 7) :Company"],
+        "C120": ["Template: Model!C120 (=A120*3) != Model!C120 (=A120*4) :Company"],
+    }
+    assert len(compare_formulas(template, company)["errors"]) == 402
+
+def test_find_formula_differences_collapses_ranges_by_default():
+    """find_formula_differences emits one event per range unless asked for cells"""
+    wb_template, _, wb_company, _ = _shifted_model_sheets()
+
+    ranges_df = find_formula_differences(wb_template, wb_company)
+    cells_df = find_formula_differences(wb_template, wb_company, collapse_ranges=False)
+
+    assert ranges_df["Cell_Cd"].to_list() == ["D1:E200", "B50", "C120"]
+    assert len(cells_df) == 402
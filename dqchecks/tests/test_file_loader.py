@@ -3,10 +3,16 @@ Testing the FileLoader from file_loader.py file
 """
 from datetime import datetime, timezone
 from unittest.mock import patch
+import glob
+import hashlib
 import logging
 import os
+import zlib
 import pytest
-from dqchecks.file_loader import FileLoader
+from dqchecks.file_loader import (  # pylint: disable=W0212
+    _hash_file,
+    DirectoryIndex, FileLoader, FileLoadError, FilenameIndex, FilenameMetadata, HashCache,
+)
 
 def create_file(path, content="test", mtime=None):
     """Helper to create dummy files with contents and mod time"""
@@ -406,3 +412,265 @@ def test_load_template_with_multiple_extensions(tmp_path):
 
     assert metadata.path == str(template_path)
     assert metadata.filename.endswith(".xlsm")
+
+def test_find_files_matches_recursive_glob(tmp_path):
+    """The directory index finds the same files as glob("**/*ext", recursive=True)."""
+    nested = tmp_path / "a" / "Process_Cd=abc"
+    hidden = tmp_path / ".hidden"
+    nested.mkdir(parents=True)
+    hidden.mkdir()
+    for path in [
+        tmp_path / "top.xlsx",
+        tmp_path / "upper.XLSX",
+        tmp_path / ".dotfile.xlsx",
+        tmp_path / "notes.txt",
+        nested / "deep.xlsm",
+        hidden / "skipped.xlsx",
+    ]:
+        create_file(path)
+
+    loader = FileLoader(source_data_path=str(tmp_path), load_template=True,
+                        directory_index=DirectoryIndex())
+    expected = sorted({
+        match
+        for ext in loader.file_extensions
+        for match in glob.glob(os.path.join(str(tmp_path), "**", f"*{ext}"), recursive=True)
+    })
+
+    assert loader.find_files(str(tmp_path)) == expected
+    assert loader.find_files(str(tmp_path / "missing")) == []
+
+def test_directory_index_is_shared_and_refreshes_changed_directories(tmp_path):
+    """Unchanged directories are not listed again; a new file in one directory is picked up."""
+    sub_dir = tmp_path / "sub"
+    sub_dir.mkdir()
+    create_file(tmp_path / "a.xlsx")
+    create_file(sub_dir / "b.xlsx")
+    index = DirectoryIndex()
+    first = FileLoader(source_data_path=str(tmp_path), load_template=True, directory_index=index)
+    second = FileLoader(source_data_path=str(tmp_path), load_template=True, directory_index=index)
+
+    first.find_files(str(tmp_path))
+    with patch("dqchecks.file_loader.os.scandir", wraps=os.scandir) as scandir:
+        assert len(second.find_files(str(tmp_path))) == 2
+        assert scandir.call_count == 0
+
+        new_file = sub_dir / "c.xlsx"
+        create_file(new_file)
+        os.utime(sub_dir, ns=(0, os.stat(sub_dir).st_mtime_ns + 1_000_000))
+        assert str(new_file) in second.find_files(str(tmp_path))
+        assert scandir.call_count == 1
+
+    index.invalidate(str(tmp_path))
+    with patch("dqchecks.file_loader.os.scandir", wraps=os.scandir) as scandir:
+        second.find_files(str(tmp_path))
+        assert scandir.call_count == 2
+
+def test_file_stats_come_from_the_index(tmp_path, caplog):
+    """log_file_stats reuses the stats seen while listing; load_file_info stats the file."""
+    mtime = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    file_path = tmp_path / "org1.xlsx"
+    create_file(file_path, content="x" * 2048, mtime=mtime)
+    loader = FileLoader(source_data_path=str(tmp_path), load_template=True,
+                        directory_index=DirectoryIndex(), hash_cache=HashCache())
+    files = loader.find_files(str(tmp_path))
+
+    with patch("dqchecks.file_loader.os.stat", wraps=os.stat) as stat:
+        with caplog.at_level(logging.INFO):
+            loader.log_file_stats(files, label="Indexed Files")
+        assert stat.call_count == 0
+
+        filename, last_modified, md5_hash = loader.load_file_info(files[0])
+        # Once for last_modified, once for the hash cache lookup
+        assert stat.call_count == 2
+
+    assert "Could not get file stats" not in caplog.text
+    assert filename == "org1.xlsx"
+    assert last_modified == datetime.fromtimestamp(mtime.timestamp())
+    assert md5_hash is not None
+
+def test_load_file_info_sees_a_file_rewritten_in_place(tmp_path):
+    """Rewriting a file leaves its directory's mtime alone; last_modified still follows the file."""
+    old_mtime = datetime(2020, 9, 13, 12, 26, 40, tzinfo=timezone.utc)
+    new_mtime = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    file_path = tmp_path / "org1.xlsx"
+    create_file(file_path, content="old", mtime=old_mtime)
+    loader = FileLoader(source_data_path=str(tmp_path), load_template=True,
+                        directory_index=DirectoryIndex(), hash_cache=HashCache())
+    files = loader.find_files(str(tmp_path))
+    _, _, old_hash = loader.load_file_info(files[0])
+
+    dir_mtime_ns = os.stat(tmp_path).st_mtime_ns
+    create_file(file_path, content="new", mtime=new_mtime)
+    os.utime(tmp_path, ns=(dir_mtime_ns, dir_mtime_ns))
+    assert loader.find_files(str(tmp_path)) == files
+
+    _, last_modified, new_hash = loader.load_file_info(files[0])
+    assert last_modified == datetime.fromtimestamp(new_mtime.timestamp())
+    assert new_hash != old_hash
+
+def test_filename_metadata_parses_fields():
+    """Path components and file names are parsed into per-key values."""
+    # pylint: disable=C0301
+    path = "/lake/Process_Cd=apr_finance/ORG1_process_cd=apr_finance_submission_period_cd=2026-27_status=files_error_fix.xlsx"
+    record = FilenameMetadata.parse(path)
+
+    assert record.name == "org1_process_cd=apr_finance_submission_period_cd=2026-27_status=files_error_fix.xlsx"
+    assert record.values["process_cd"][0] == "apr_finance"
+    assert record.values["submission_period_cd"] == ("2026-27_status=files_error_fix.xlsx",)
+    assert record.values["status"] == ("files_error_fix.xlsx",)
+    assert record.values["process_stage_cd"] == ()
+
+def test_filename_index_matches_substring_filters():
+    """Index lookups return what match_all_conditions would, in input order."""
+    files = [
+        "/lake/Status=complete/org1_process_cd=abc_submission_period_cd=202501.xlsx",
+        "/lake/org1_process_cd=abcdef_submission_period_cd=202501_v2.xlsx",
+        "/lake/org2_sub_process_cd=abc_status=complete.xlsx",
+        "/lake/org2_process_cd=def_status=draft.xlsx",
+    ]
+    index = FilenameIndex(files)
+    loader = FileLoader(source_data_path="/lake", load_template=True)
+
+    for conditions in [
+        {"process_cd": "abc"},
+        {"process_cd": "ABC", "status": "complete"},
+        {"submission_period_cd": "202501", "process_cd": "abcd"},
+        {"status": ""},
+        {"process_cd": "abc_submission"},
+        {"process_cd": "def", "status": "complete"},
+    ]:
+        expected = [f for f in files if loader.match_all_conditions(f, conditions)]
+        assert index.paths(index.matching(conditions)) == expected
+
+    assert index.paths(index.with_name_prefix("ORG2")) == files[2:]
+    assert index.paths(index.with_name_containing("process_cd=abc")) == files[:3]
+
+def test_match_files_by_organisation_matches_single_loader_runs(tmp_path):
+    """One batch lookup gives each organisation the files its own loader would find."""
+    # pylint: disable=C0301
+    templates_dir = tmp_path / "Files" / "templates"
+    data_dir = tmp_path / "Files" / "data collections"
+    templates_dir.mkdir(parents=True)
+    data_dir.mkdir(parents=True)
+    create_file(templates_dir / "process_cd=abc_submission_period_cd=202501.xlsx")
+    for org in ["org1", "org2", "org3"]:
+        create_file(data_dir / f"{org}_process_cd=abc_submission_period_cd=202501_status=complete.xlsx")
+    create_file(data_dir / "org1_process_cd=abc_submission_period_cd=202501_status=draft.xlsx")
+
+    filters = {"process_cd": "abc", "submission_period_cd": "202501", "status": "complete"}
+    batch = FileLoader(str(tmp_path), load_template=False,
+                       directory_index=DirectoryIndex(), **filters)
+    matched = batch.match_files_by_organisation(["ORG1", "org2", "org9"])
+
+    assert set(matched) == {"org1", "org2", "org9"}
+    for org in ["org1", "org2"]:
+        metadata = FileLoader(str(tmp_path), load_template=False,
+                              organisation_cd=org, **filters).run()
+        assert matched[org] == ([metadata.template_path], [metadata.path])
+    assert matched["org9"][1] == []
+
+def test_calculate_md5_uses_the_hash_cache(tmp_path):
+    """Unchanged files are not read again; a changed size or mtime is hashed afresh."""
+    file_path = tmp_path / "org1.xlsx"
+    create_file(file_path, content="first")
+    loader = FileLoader(source_data_path=str(tmp_path), load_template=True, hash_cache=HashCache())
+
+    first = loader.calculate_md5(str(file_path))
+    with patch("dqchecks.file_loader._hash_file") as hash_file:
+        assert loader.calculate_md5(str(file_path)) == first
+        assert hash_file.call_count == 0
+
+    create_file(file_path, content="second, longer")
+    assert loader.calculate_md5(str(file_path)) == hashlib.md5(b"second, longer").hexdigest()
+
+def test_hash_cache_persists_between_loaders(tmp_path):
+    """A cache saved to disk serves the next loader, MD5 and CRC32 alike."""
+    file_path = tmp_path / "org1.xlsx"
+    create_file(file_path, content="template content")
+    cache_path = str(tmp_path / "hashes.json")
+
+    first = FileLoader(str(tmp_path), load_template=True,
+                       hash_cache=HashCache(cache_path), fast_hash=True)
+    md5_hash = first.calculate_md5(str(file_path))
+
+    second = FileLoader(str(tmp_path), load_template=True, hash_cache=HashCache(cache_path))
+    with patch("dqchecks.file_loader._hash_file") as hash_file:
+        assert second.calculate_md5(str(file_path)) == md5_hash
+        assert second.calculate_crc32(str(file_path)) == f"{zlib.crc32(b'template content'):08x}"
+        assert hash_file.call_count == 0
+
+def test_calculate_md5s_hashes_files_concurrently(tmp_path, caplog):
+    """The batch method returns one hash per path, None for unreadable files."""
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"org{i}.xlsx"
+        create_file(path, content=f"content {i}" * 1000)
+        paths.append(str(path))
+    missing = str(tmp_path / "missing.xlsx")
+    loader = FileLoader(source_data_path=str(tmp_path), load_template=True, hash_cache=HashCache())
+
+    with caplog.at_level(logging.WARNING):
+        result = loader.calculate_md5s(paths + [missing, paths[0]], max_workers=3, chunk_size=1024)
+
+    assert list(result) == paths + [missing]
+    for i, path in enumerate(paths):
+        assert result[path] == hashlib.md5(f"content {i}".encode() * 1000).hexdigest()
+    assert result[missing] is None
+    assert "Could not calculate MD5" in caplog.text
+
+def _make_batch_tree(tmp_path):
+    """One shared template and bronze files for three organisations, org3 with two."""
+    # pylint: disable=C0301
+    templates_dir = tmp_path / "Files" / "templates"
+    data_dir = tmp_path / "Files" / "data collections"
+    templates_dir.mkdir(parents=True)
+    data_dir.mkdir(parents=True)
+    create_file(templates_dir / "process_cd=abc_submission_period_cd=202501.xlsx")
+    for org in ["org1", "org2", "org3"]:
+        create_file(data_dir / f"{org}_process_cd=abc_submission_period_cd=202501_status=complete.xlsx",
+                    content=org)
+    create_file(data_dir / "org3_process_cd=abc_submission_period_cd=202501_status=complete_v2.xlsx")
+    return {"process_cd": "abc", "submission_period_cd": "202501", "status": "complete"}
+
+def test_run_batch_matches_run_per_organisation(tmp_path):
+    """run_batch returns what run() returns for each organisation, hashing the template once."""
+    filters = _make_batch_tree(tmp_path)
+    loader = FileLoader(str(tmp_path), load_template=False, hash_cache=HashCache(), **filters)
+
+    with patch("dqchecks.file_loader._hash_file", wraps=_hash_file) as hash_file:
+        results = loader.run_batch(["ORG1", "org2"])
+        assert hash_file.call_count == 2
+
+    for org in ["org1", "org2"]:
+        expected = FileLoader(str(tmp_path), load_template=False,
+                              organisation_cd=org, **filters).run()
+        assert results[org] == expected
+
+    template_loader = FileLoader(str(tmp_path), load_template=True,
+                                 hash_cache=HashCache(), **filters)
+    with patch("dqchecks.file_loader._hash_file", wraps=_hash_file) as hash_file:
+        templates = template_loader.run_batch(["org1", "org2"])
+        assert hash_file.call_count == 1
+    assert templates["org1"] == templates["org2"]
+
+def test_run_batch_reports_errors_per_organisation(tmp_path):
+    """Strict-count violations and missing files become FileLoadError entries."""
+    filters = _make_batch_tree(tmp_path)
+    loader = FileLoader(str(tmp_path), load_template=False, **filters)
+
+    results = loader.run_batch(["org1", "org3", "org9"])
+
+    assert results["org1"].filename.startswith("org1_")
+    too_many = results["org3"]
+    assert isinstance(too_many, FileLoadError)
+    assert too_many.error_type == "ValueError"
+    assert "Expected exactly 1 bronze file(s) for [org3], found 2." in too_many.message
+    assert len(too_many.files) == 2
+    assert results["org9"] == FileLoadError(
+        organisation_cd="org9",
+        error_type="FileNotFoundError",
+        message="No matching bronze files found.",
+    )
+    with pytest.raises(ValueError, match=r"for \[org3\], found 2"):
+        FileLoader(str(tmp_path), load_template=False, organisation_cd="org3", **filters).run()
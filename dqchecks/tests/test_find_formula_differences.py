@@ -3,13 +3,15 @@ Tests for find_formula_differences functions
 found in the panacea.py file
 """
 import sys
+from io import BytesIO
 import pytest
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.worksheet.formula import ArrayFormula
 from dqchecks.panacea import (
     create_dataframe_formula_differences,
     find_formula_differences,
-    FormulaDifferencesContext)
+    FormulaDifferencesContext,
+    SheetSkipCounter)
 
 def test_create_dataframe_formula_differences_valid():
     """Test valid input and expected DataFrame creation"""
@@ -301,3 +303,64 @@ def test_find_formula_differences_no_arrayformula_class(monkeypatch):
     assert not result_df.empty
     assert "=SUM(B1:B2)" in result_df["Error_Desc"].iloc[0]
     assert "=SUM(B1:B3)" in result_df["Error_Desc"].iloc[0]
+
+
+def _saved(wb):
+    """Workbook saved to bytes, and reloaded from them."""
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue(), load_workbook(BytesIO(buffer.getvalue()))
+
+def _calc_and_data_workbook(data_formula, calc_label="Label"):
+    """A 'Calc' sheet of formulas (saved first) and a 'Data' sheet with one formula."""
+    wb = Workbook()
+    calc = wb.active
+    calc.title = "Calc"
+    calc["A1"] = calc_label
+    for row in range(2, 30):
+        calc[f"A{row}"] = row
+        calc[f"B{row}"] = f"=A{row}*2"
+    data = wb.create_sheet("Data")
+    data["A1"] = 1
+    data["B1"] = data_formula
+    return _saved(wb)
+
+def test_find_formula_differences_skips_identical_sheet_parts():
+    """Sheets whose parts match in both packages are skipped with the same result"""
+    template_bytes, wb_template = _calc_and_data_workbook("=A1+1")
+    company_bytes, wb_company = _calc_and_data_workbook("=A1+2")
+    counter = SheetSkipCounter()
+
+    result_df = find_formula_differences(
+        wb_template, wb_company, template_bytes, company_bytes, skip_counter=counter)
+    full_df = find_formula_differences(wb_template, wb_company)
+
+    assert counter.compared == 2
+    assert counter.skipped == 1
+    assert counter.skipped_sheets == ["Calc"]
+    assert result_df.drop(columns="Event_Id").equals(full_df.drop(columns="Event_Id"))
+    assert result_df["Cell_Cd"].to_list() == ["B1"]
+
+def test_find_formula_differences_compares_sheets_with_different_strings():
+    """An identical sheet part whose shared strings differ is still compared"""
+    template_bytes, wb_template = _calc_and_data_workbook("=A1+1", calc_label="Label")
+    company_bytes, wb_company = _calc_and_data_workbook("=A1+1", calc_label="Other")
+    counter = SheetSkipCounter()
+
+    result_df = find_formula_differences(
+        wb_template, wb_company, template_bytes, company_bytes, skip_counter=counter)
+
+    assert result_df.empty
+    assert counter.skipped_sheets == ["Data"]
+
+def test_find_formula_differences_unreadable_source_compares_every_sheet():
+    """A source that is not a zip package falls back to the full comparison"""
+    template_bytes, wb_template = _calc_and_data_workbook("=A1+1")
+    _, wb_company = _calc_and_data_workbook("=A1+1")
+    counter = SheetSkipCounter()
+
+    result_df = find_formula_differences(
+        wb_template, wb_company, template_bytes, b"not a workbook", skip_counter=counter)
+
+    assert result_df.empty
+    assert (counter.compared, counter.skipped) == (2, 0)
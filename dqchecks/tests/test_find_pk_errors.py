@@ -276,3 +276,74 @@ def test_find_pk_errors_with_empty_sheet():
 
     # Assert that the DataFrame is empty, as there are no actual data rows to check
     assert df.empty
+
+def test_composite_key_nulls_and_duplicates():
+    """A composite key is null if any part is, and duplicated only as a whole"""
+    sheet_data = {
+        'Sheet1': [
+            ['Row 1', None, None],
+            ['Row 2', 'Reference', 'Model'],
+            ['Row 3', None, None],
+            ['Row 4', 'BON1', 'M1'],
+            ['Row 5', 'BON1', 'M2'],
+            ['Row 6', 'BON2', None],
+            ['Row 7', 'BON1', 'M1'],
+            ['Row 8', 'BON1', 'M2'],
+            ['Row 9', 'BON1', 'M1'],
+        ]
+    }
+    workbook = create_test_workbook(sheet_data)
+
+    result = check_pk_for_nulls_and_duplicates(
+        workbook,
+        sheet_name_pattern=".*",
+        header_column_name=["Reference", "Model"])
+
+    assert result["errors"]["Sheet1"] == {
+        "null_rows": [6],
+        "duplicate_rows": {("BON1", "M1"): [4, 7, 9], ("BON1", "M2"): [5, 8]},
+    }
+
+    df = find_pk_errors(
+        workbook, sheet_name_pattern=".*", header_column_name=["Reference", "Model"])
+    assert df['Error_Desc'].tolist() == [
+        "Rows 6 have missing values in [Reference, Model].",
+        "Duplicate [Reference, Model] value 'BON1, M1' found in rows 4, 7, 9.",
+        "Duplicate [Reference, Model] value 'BON1, M2' found in rows 5, 8.",
+    ]
+
+def test_composite_key_missing_column_skips_sheet():
+    """Sheets without every key column are not checked"""
+    workbook = create_test_workbook({
+        'Sheet1': [
+            ['Row 1', None],
+            ['Row 2', 'Reference'],
+            ['Row 3', None],
+            ['Row 4', None],
+        ]
+    })
+
+    result = check_pk_for_nulls_and_duplicates(
+        workbook,
+        sheet_name_pattern=".*",
+        header_column_name=["Reference", "Model"])
+
+    assert result["status"] == "Ok"
+
+def test_find_pk_errors_large_sheet():
+    """Duplicates are grouped in order of their repeat, with every row"""
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append([])
+    worksheet.append(['Acronym', 'Reference'])
+    worksheet.append([])
+    for i in range(20_000):
+        worksheet.append(['X', f"BON{i % 19_990}" if i % 7_000 else None])
+
+    df = find_pk_errors(workbook, sheet_name_pattern=".*", header_column_name="Reference")
+
+    assert df.shape[0] == 10
+    assert df['Error_Desc'].iloc[0] == "Rows 4, 7004, 14004 have missing values in [Reference]."
+    assert df['Error_Desc'].iloc[1] == "Duplicate [Reference] value 'BON1' found in rows 5, 19995."
+    assert df['Error_Desc'].iloc[-1] == \
+        "Duplicate [Reference] value 'BON9' found in rows 13, 20003."
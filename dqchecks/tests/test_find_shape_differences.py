@@ -2,13 +2,15 @@
 Test function related to find_shape_differences
 function in panacea.py file
 """
+from io import BytesIO
 import pytest
 import pandas as pd
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from dqchecks.panacea import (
     create_dataframe_structure_discrepancies,
     find_shape_differences,
     get_used_area,
+    SheetSkipCounter,
     StructureDiscrepancyContext,
     UsedArea)
 
@@ -476,3 +478,36 @@ def test_binary_search_result_for_columns(sample_sheet):
 
     # The last used column should be column 2 (B column has data in B1, B2, and B5)
     assert used_area.last_used_column == 2
+
+def _saved_fout_workbook(extra_rows):
+    """fOut_, Empty and Data sheets, as saved bytes and the workbook reloaded from them."""
+    wb = Workbook()
+    fout = wb.active
+    fout.title = "fOut_Main"
+    fout.append(["Title"])
+    fout.append(["Measure", "Value", "Unit"])
+    fout.append(["M1", 1, "nr"])
+    wb.create_sheet("Empty")
+    data = wb.create_sheet("Data")
+    for row in range(extra_rows):
+        data.append([row, row + 1])
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue(), load_workbook(BytesIO(buffer.getvalue()))
+
+def test_find_shape_differences_skips_identical_sheet_parts():
+    """Identical sheets skip the scan but keep their Empty Sheet errors"""
+    template_bytes, wb_template = _saved_fout_workbook(3)
+    company_bytes, wb_company = _saved_fout_workbook(5)
+    counter = SheetSkipCounter()
+
+    result_df = find_shape_differences(
+        wb_template, wb_company, template_bytes, company_bytes, skip_counter=counter)
+    full_df = find_shape_differences(wb_template, wb_company)
+
+    assert sorted(counter.skipped_sheets) == ["Empty", "fOut_Main"]
+    assert counter.compared == 3
+    sort_cols = ["Sheet_Cd", "Error_Desc"]
+    assert (result_df.drop(columns="Event_Id").sort_values(sort_cols).reset_index(drop=True)
+            .equals(full_df.drop(columns="Event_Id").sort_values(sort_cols).reset_index(drop=True)))
+    assert set(result_df["Sheet_Cd"]) == {"Data"}
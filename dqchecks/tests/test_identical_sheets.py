@@ -0,0 +1,34 @@
+"""
+Test function related to identical_sheets
+function in panacea.py file
+"""
+from io import BytesIO
+from openpyxl import Workbook
+from dqchecks.panacea import identical_sheets
+
+def _package(values: dict) -> bytes:
+    """Saved workbook with one sheet per entry, A1 holding its value."""
+    wb = Workbook()
+    wb.remove(wb.active)
+    for sheet_name, value in values.items():
+        wb.create_sheet(sheet_name)["A1"] = value
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+def test_identical_sheets_finds_sheets_with_identical_parts():
+    """Only the sheets whose parts are the same in both packages are returned"""
+    template = _package({"Same": 1, "Changed": 2})
+    company = _package({"Same": 1, "Changed": 3})
+
+    assert identical_sheets(BytesIO(template), BytesIO(company), ["Same", "Changed"]) == {"Same"}
+
+def test_identical_sheets_without_a_source():
+    """A missing package means no sheet can be skipped"""
+    assert identical_sheets(None, BytesIO(_package({"Same": 1})), ["Same"]) == set()
+
+def test_identical_sheets_with_an_unreadable_source():
+    """A package that cannot be read falls back to comparing every sheet"""
+    template = _package({"Same": 1})
+
+    assert identical_sheets(BytesIO(template), BytesIO(b"not a zip"), ["Same"]) == set()
@@ -0,0 +1,240 @@
+"""Tests for dqchecks.preflight (reading sheet names and cells without loading workbooks)."""
+# pylint: disable=line-too-long
+
+import datetime
+import zipfile
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from dqchecks.exceptions import ColumnHeaderValidationError, EmptyRowsPatternCheckError
+from dqchecks.panacea import (
+    check_formula_errors, check_value_in_cell, find_formula_errors, find_missing_sheets,
+)
+from dqchecks.preflight import WorkbookManifest, read_sheet_names
+from dqchecks.transforms import check_column_headers, check_empty_rows
+
+HEADER = ["Acronym", "Reference", "Item description", "Unit", "Model"]
+
+
+def _workbook_bytes(wb: Workbook) -> bytes:
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _make_company_workbook() -> bytes:
+    """A small company submission with typed values and two fOut sheets (one malformed)."""
+    wb = Workbook()
+    wb.active.title = "SelectCompany"
+    wb["SelectCompany"]["B4"] = "Company A"
+    wb["SelectCompany"]["C7"] = 12.5
+    quarterly = wb.create_sheet("Quarterly_Data")
+    quarterly["G9"] = datetime.datetime(2025, 3, 31)
+    quarterly["G10"] = True
+    quarterly["G11"] = 7
+    quarterly["H12"] = "=G11*2"
+
+    good = wb.create_sheet("fOut_Good")
+    good["B1"] = "ignored"
+    good["C1"] = "ignored"
+    good.append(HEADER + ["2024-25"])
+    for i in range(5):
+        good.append(["ABC", f"REF{i}", "desc", "nr", "m", i])
+    good.delete_rows(3)
+    good.insert_rows(3)
+
+    bad = wb.create_sheet("fOut_Bad")
+    bad["A1"] = "not empty"
+    bad.append(["Reference", "Acronym", "Item description", "Unit", "Model"])
+    bad.append(["under header"])
+    wb.create_sheet("Dict_Lookups")
+    return _workbook_bytes(wb)
+
+
+def test_manifest_matches_openpyxl_values():
+    """Sheet names and every row tuple match a data_only openpyxl load."""
+    content = _make_company_workbook()
+    wb = load_workbook(BytesIO(content), data_only=True)
+
+    with WorkbookManifest(content) as manifest:
+        assert manifest.sheetnames == wb.sheetnames
+        for name in wb.sheetnames:
+            sheet, expected = manifest[name], wb[name]
+            assert (sheet.max_row, sheet.max_column) == (expected.max_row, expected.max_column)
+            assert list(sheet.iter_rows(values_only=True)) == list(expected.iter_rows(values_only=True))
+            assert list(sheet.iter_rows(min_row=2, max_row=3, min_col=2, values_only=True)) == list(
+                expected.iter_rows(min_row=2, max_row=3, min_col=2, values_only=True))
+
+        assert manifest["Quarterly_Data"]["G9"].value == datetime.datetime(2025, 3, 31)
+        assert manifest["Quarterly_Data"]["Z99"].value is None
+        with pytest.raises(KeyError):
+            _ = manifest["Missing"]
+
+    assert read_sheet_names(BytesIO(content)) == wb.sheetnames
+
+
+def test_checks_accept_a_manifest():
+    """The preflight-capable checks give the same answers on a manifest as on the workbook."""
+    content = _make_company_workbook()
+    template = Workbook()
+    template.active.title = "SelectCompany"
+    for name in ["Quarterly_Data", "fOut_Good", "fOut_Bad", "fOut_Extra"]:
+        template.create_sheet(name)
+    wb = load_workbook(BytesIO(content), data_only=True)
+
+    with WorkbookManifest(content) as manifest, \
+            WorkbookManifest(_workbook_bytes(template)) as template_manifest:
+        missing = find_missing_sheets(template_manifest, manifest)
+        assert missing.drop(columns="Event_Id").equals(
+            find_missing_sheets(template, wb).drop(columns="Event_Id"))
+        assert list(missing["Sheet_Cd"]) == ["fOut_Extra"]
+
+        for sheet_name, value, cell in [
+            ("SelectCompany", "Company A", "B4"),
+            ("SelectCompany", "Company B", "B4"),
+            ("Quarterly_Data", True, "G10"),
+            ("Quarterly_Data", 7, "G11"),
+            ("Missing", "x", "A1"),
+        ]:
+            assert check_value_in_cell(manifest, sheet_name, value, cell) == \
+                check_value_in_cell(wb, sheet_name, value, cell)
+
+        assert check_empty_rows(manifest, ["fOut_Good"])
+        assert check_column_headers(manifest, ["fOut_Good"])
+        with pytest.raises(EmptyRowsPatternCheckError) as error:
+            check_empty_rows(manifest, ["fOut_Good", "fOut_Bad"])
+        assert error.value.under_header_issues == ["fOut_Bad"]
+        assert error.value.top_row_issues == ["fOut_Bad"]
+        with pytest.raises(ColumnHeaderValidationError):
+            check_column_headers(manifest, ["fOut_Bad"])
+
+
+# A hand-written package: inline and rich-text strings, formula string results,
+# error values, a date style, rows without "r" attributes and no <dimension>.
+_PARTS = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/data.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<workbookPr date1904="1"/>'
+        '<sheets><sheet name="Data &amp; Notes" sheetId="1" r:id="rId7"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId7" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/data.xml"/>'
+        '<Relationship Id="rId8" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+        '<Relationship Id="rId9" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/sharedStrings.xml": (
+        '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<si><t>plain</t></si>'
+        '<si><r><t>rich </t></r><r><rPr><b/></rPr><t>text</t></r><rPh sb="0" eb="1"><t>x</t></rPh></si>'
+        '<si><t xml:space="preserve"> padded </t></si>'
+        '</sst>'
+    ),
+    "xl/styles.xml": (
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font/></fonts><fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+    "xl/worksheets/data.xml": (
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        '<row><c t="s"><v>0</v></c><c t="s"><v>1</v></c><c t="inlineStr"><is><t>inline</t></is></c></row>'
+        '<row><c t="str"><f>A1</f><v>plain</v></c><c t="e"><v>#REF!</v></c><c s="1"><v>45000</v></c></row>'
+        '<row r="5"><c r="B5" t="b"><v>0</v></c><c r="D5"><v>1.5E3</v></c><c r="E5" t="s"><v>2</v></c></row>'
+        '<row r="6"><c r="F6" s="1"/></row>'
+        '</sheetData></worksheet>'
+    ),
+}
+
+
+def test_manifest_handles_hand_written_parts():
+    """Less common cell encodings read the same as through openpyxl."""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, xml in _PARTS.items():
+            archive.writestr(name, xml)
+    content = buffer.getvalue()
+    wb = load_workbook(BytesIO(content), data_only=True)
+
+    with WorkbookManifest(content) as manifest:
+        assert manifest.sheetnames == ["Data & Notes"] == wb.sheetnames
+        sheet = manifest["Data & Notes"]
+        assert (sheet.max_row, sheet.max_column) == (6, 6)
+        assert list(sheet.iter_rows(values_only=True)) == \
+            list(wb["Data & Notes"].iter_rows(values_only=True))
+        assert sheet["C2"].value == wb["Data & Notes"]["C2"].value
+        assert manifest.sheet_part("Data & Notes") == "xl/worksheets/data.xml"
+        with pytest.raises(NotImplementedError):
+            next(sheet.iter_rows())
+        assert list(sheet.iter_errors()) == [("B2", "#REF!")]
+        assert check_formula_errors(sheet) == check_formula_errors(wb["Data & Notes"])
+
+
+def test_formula_errors_streamed_match_loaded_workbook():
+    """find_formula_errors on a manifest gives the rows of the data_only workbook."""
+    wb = Workbook()
+    wb.active.title = "Clean"
+    wb["Clean"]["A1"] = "t=\"e\" in text only"
+    calc = wb.create_sheet("Calc")
+    calc["A1"] = 1
+    calc["B2"] = "#DIV/0!"
+    calc["C2"] = "#N/A"
+    calc["D3"] = "#DIV/0!"
+    inputs = wb.create_sheet("Inputs")
+    inputs.append(["Input", 1])
+    inputs.append(["#REF!", 2])
+    content = _workbook_bytes(wb)
+    loaded = load_workbook(BytesIO(content), data_only=True)
+
+    with WorkbookManifest(content) as manifest:
+        assert list(manifest.formula_errors(max_workers=2)) == [
+            ("Calc", "B2", "#DIV/0!"), ("Calc", "C2", "#N/A"), ("Calc", "D3", "#DIV/0!"),
+            ("Inputs", "A2", "#REF!"),
+        ]
+        assert list(manifest.formula_errors(["Inputs", "Missing"])) == [("Inputs", "A2", "#REF!")]
+        assert check_formula_errors(manifest["Calc"]) == check_formula_errors(loaded["Calc"])
+        streamed = find_formula_errors(manifest)
+
+    expected = find_formula_errors(loaded)
+    assert streamed.drop(columns="Event_Id").equals(expected.drop(columns="Event_Id"))
+
+
+def test_formula_errors_of_prefixed_parts():
+    """Error cells are found under a namespace prefix, with cached formula results and without r."""
+    parts = dict(_PARTS)
+    parts["xl/worksheets/data.xml"] = (
+        '<x:worksheet xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><x:sheetData>'
+        '<x:row r="3"><x:c r="B3" t="e"><x:f>1/0</x:f><x:v>#DIV/0!</x:v></x:c><x:c t="e"><x:v>#NAME?</x:v></x:c>'
+        '<x:c t="e"/><x:c t="str"><x:v>#N/A</x:v></x:c></x:row>'
+        '</x:sheetData></x:worksheet>'
+    )
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, xml in parts.items():
+            archive.writestr(name, xml)
+
+    with WorkbookManifest(buffer.getvalue()) as manifest:
+        assert list(manifest["Data & Notes"].iter_errors()) == [("B3", "#DIV/0!"), ("C3", "#NAME?")]
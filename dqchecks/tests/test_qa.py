@@ -4,6 +4,7 @@
 
 
 from datetime import datetime
+import logging
 import pandas as pd
 import pytest
 
@@ -1127,6 +1128,25 @@ def test_normalise_measure_value_without_unit_series():
     assert pd.isna(result.iloc[3])
 
 
+def test_normalise_measure_value_numeric_and_mixed_columns_match_string_route():
+    """Numeric columns and partly-clean strings give the same floats as str/strip/'%' parsing."""
+    units = pd.Series(["%", " % ", "nr", None], index=[10, 11, 12, 13])
+
+    floats = pd.Series([12.5, 50.0, 3.0, float("nan")], index=units.index)
+    ints = pd.Series([25, 50, 3, 7], index=units.index)
+    strings = pd.Series(["12.5%", " 50 ", "3", None], index=units.index)
+    mixed = pd.Series([12.5, "50%", " 3", None], index=units.index, dtype=object)
+
+    for series in (floats, strings, mixed):
+        result = qa._normalise_measure_value(series, units)
+        assert result.dtype == "float64"
+        assert result.index.equals(units.index)
+        assert result.iloc[:3].tolist() == [0.125, 0.5, 3.0]
+        assert pd.isna(result.iloc[3])
+
+    assert qa._normalise_measure_value(ints, units).tolist() == [0.25, 0.5, 3.0, 7.0]
+
+
 def test_build_qa_diff_uses_fallback_measure_desc_on_exception(monkeypatch):
     """Force the Measure_Desc selection to go through the defensive except branch."""
     combined_df = pd.DataFrame(
@@ -1198,3 +1218,633 @@ def test_build_qa_diff_uses_fallback_measure_desc_on_exception(monkeypatch):
 
     # If the fallback branch ran, Measure_Desc should still be "BOOM" rather than exploding.
     assert "BOOM" in qa_diff_df["Measure_Desc"].unique()
+
+
+def test_build_qa_diff_row_digest_prefilter_only_reports_changed_rows():
+    """Rows whose normalised compare columns match on both sides are skipped by the digest prefilter."""
+    combined_df = pd.DataFrame(
+        [
+            {
+                "Organisation_Cd": "ORG1",
+                "Region_Cd": "",
+                "Submission_Period_Cd": "2025Q1",
+                "Observation_Period_Cd": "202501",
+                "Measure_Cd": f"M{i}",
+                "Measure_Desc": f"Desc – {i}",
+                "Measure_Unit": "%",
+                "Measure_Decimals": "2",
+                "Measure_Value": f"{i}%",
+                "Sheet_Cd": "Sheet1",
+            }
+            for i in range(50)
+        ]
+    )
+    ingested_df_flat = pd.DataFrame(
+        [
+            {
+                "Organisation_Cd": "ORG1",
+                "Region_Cd": "",
+                "Submission_Period_Cd": "2025Q1",
+                "Observation_Period_Cd": "202501",
+                "Legacy_Measure_Reference": f"M{i}",
+                "Measure_Name": f" desc - {i}",
+                "Unit": "%",
+                "Decimal_Point": 2,
+                # M7 is the only real difference
+                "Measure_Value": i + 1 if i == 7 else i,
+                "Sheet_Cd": "Sheet1",
+            }
+            for i in range(50)
+        ]
+    )
+
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(
+        combined_df=combined_df,
+        ingested_df_flat=ingested_df_flat,
+        target_submission_period="2025Q1",
+    )
+    keys_only_raw, keys_only_sem, keys_in_both = qa.compute_key_overlap(
+        flat_for_qa=flat_for_qa,
+        sem_for_qa=sem_for_qa,
+    )
+
+    qa_diff_df = qa.build_qa_diff(
+        flat_for_qa=flat_for_qa,
+        sem_for_qa=sem_for_qa,
+        keys_only_raw=keys_only_raw,
+        keys_only_sem=keys_only_sem,
+        keys_in_both=keys_in_both,
+        batch_id="BATCH_DIGEST",
+        qa_run_datetime="2025-01-01T00:00:00",
+    )
+
+    assert len(qa_diff_df) == 1
+    row = qa_diff_df.iloc[0]
+    assert row["Measure_Key"] == "M7"
+    assert row["Error_Type"] == "MEASURE_VALUE_MISMATCH"
+
+
+def test_prepare_qa_frames_keeps_latest_insert_date_per_key_in_input_order():
+    """Latest Insert_Date wins per key; ties and unparseable dates keep the first row; order is kept."""
+    combined_df, ingested_df_flat = _make_basic_input_frames_with_missing_and_extra()
+    base = ingested_df_flat[ingested_df_flat["Submission_Period_Cd"] == "2025Q1"]
+
+    loads = []
+    for measure, value, insert_date in [
+        ("M4", "1", "2025-01-03 08:00:00"),
+        ("M2", "1", "2025-01-01 08:00:00"),
+        ("M2", "2", "2025-01-02 08:00:00"),  # latest M2
+        ("M1", "1", "2025-01-02 08:00:00"),  # tie with the next row -> first wins
+        ("M1", "2", "2025-01-02 08:00:00"),
+        ("M4", "2", "not a date"),
+    ]:
+        row = base[base["Legacy_Measure_Reference"] == measure].iloc[0].copy()
+        row["Measure_Value"] = value
+        row["Insert_Date"] = insert_date
+        loads.append(row)
+    ingested_with_history = pd.DataFrame(loads).reset_index(drop=True)
+
+    _flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_with_history, "2025Q1")
+
+    assert sem_for_qa["Measure_Key"].tolist() == ["M4", "M2", "M1"]
+    assert sem_for_qa["Measure_Value"].tolist() == ["1", "2", "1"]
+    assert "_Insert_Date_ts" not in sem_for_qa.columns
+
+
+def _make_multi_org_input_frames():
+    """
+    Helper to build the basic missing/extra/mismatch frames for three companies,
+    including an untrimmed Organisation_Cd on the Flat_File side.
+    """
+    combined_df, ingested_df_flat = _make_basic_input_frames_with_missing_and_extra()
+
+    combined_parts, ingested_parts = [], []
+    for org in ["ORG1", " ORG2", "ORG3"]:
+        combined_parts.append(combined_df.assign(Organisation_Cd=org))
+        ingested_parts.append(ingested_df_flat.assign(Organisation_Cd=org.strip()))
+
+    # ORG3 only has semantic rows
+    combined_parts.pop()
+
+    return (
+        pd.concat(combined_parts, ignore_index=True),
+        pd.concat(ingested_parts, ignore_index=True),
+    )
+
+
+def _run_serial_qa(combined_df, ingested_df_flat, **folder_kwargs):
+    """Run the four QA steps in sequence, as the notebooks do."""
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(
+        combined_df=combined_df,
+        ingested_df_flat=ingested_df_flat,
+        target_submission_period="2025Q1",
+    )
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    qa_diff_df = qa.build_qa_diff(
+        flat_for_qa,
+        sem_for_qa,
+        *keys,
+        batch_id="BATCH_ORG",
+        qa_run_datetime="2025-01-01T00:00:00",
+        target_submission_period="2025Q1",
+        **folder_kwargs,
+    )
+    summaries = qa.build_qa_summaries(
+        flat_for_qa,
+        sem_for_qa,
+        keys[2],
+        qa_diff_df,
+        batch_id="BATCH_ORG",
+        qa_run_datetime="2025-01-01T00:00:00",
+    )
+    return (qa_diff_df, *summaries)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_qa_by_organisation_matches_serial_pipeline(max_workers):
+    """Partitioned QA returns the same diff rows and identical summaries as the serial pipeline."""
+    combined_df, ingested_df_flat = _make_multi_org_input_frames()
+    folder_kwargs = {
+        "filtered_excel_files": ["/lake/ORG1 QD.xlsx", "/lake/ORG2_QD.xlsx"],
+        "expected_companies": ["ORG1", "ORG2", "ORG4"],
+        "status": "complete",
+        "process_cd": "qd",
+        "submission_period_cd": "2025Q1",
+    }
+
+    expected = _run_serial_qa(combined_df, ingested_df_flat, **folder_kwargs)
+    result = qa.run_qa_by_organisation(
+        combined_df,
+        ingested_df_flat,
+        target_submission_period="2025Q1",
+        batch_id="BATCH_ORG",
+        qa_run_datetime="2025-01-01T00:00:00",
+        max_workers=max_workers,
+        **folder_kwargs,
+    )
+
+    expected_diff, result_diff = expected[0], result[0]
+    assert list(result_diff.columns) == list(expected_diff.columns)
+    sort_cols = ["Organisation_Cd", "Measure_Key", "Error_Type", "Column_Name"]
+    pd.testing.assert_frame_equal(
+        result_diff.sort_values(sort_cols).reset_index(drop=True),
+        expected_diff.sort_values(sort_cols).reset_index(drop=True),
+    )
+    assert set(result_diff["Error_Type"]) == {
+        "MISSING_IN_INGESTED",
+        "EXTRA_IN_INGESTED",
+        "MEASURE_VALUE_MISMATCH",
+        "MISSING_COMPANY_FROM_FOLDER",
+    }
+
+    for expected_df, result_df in zip(expected[1:], result[1:]):
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+
+def test_run_qa_by_organisation_keeps_the_serial_column_order():
+    """A first company with only value mismatches does not move Sheet_Cd to the end of the diff."""
+    row = {"Region_Cd": "", "Submission_Period_Cd": "2025Q1", "Observation_Period_Cd": "202501", "Sheet_Cd": "Sheet1"}
+    combined_df = pd.DataFrame([
+        {**row, "Organisation_Cd": org, "Measure_Cd": measure, "Measure_Desc": "D", "Measure_Unit": "nr",
+         "Measure_Decimals": "0", "Measure_Value": "1", "Cell_Cd": "A1"}
+        for org, measure in [("ORG1", "M1"), ("ORG2", "M1"), ("ORG2", "M2")]
+    ])
+    # ORG1 only differs in value; ORG2 also has a row missing from the semantic data
+    ingested_df_flat = pd.DataFrame([
+        {**row, "Organisation_Cd": org, "Legacy_Measure_Reference": measure, "Measure_Name": "D", "Unit": "nr",
+         "Decimal_Point": "0", "Measure_Value": "2"}
+        for org, measure in [("ORG1", "M1"), ("ORG2", "M1")]
+    ])
+
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_df_flat, "2025Q1")
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    expected = qa.build_qa_diff(flat_for_qa, sem_for_qa, *keys, batch_id="B", qa_run_datetime="T")
+    qa_diff_df, *_summaries = qa.run_qa_by_organisation(
+        combined_df, ingested_df_flat, "2025Q1", "B", "T", max_workers=1,
+    )
+
+    assert list(expected.columns).index("Sheet_Cd") < list(expected.columns).index("Error_Type")
+    assert list(qa_diff_df.columns) == list(expected.columns)
+
+
+def test_combine_qa_aggregates_matches_whole_frame_summaries():
+    """Summaries rebuilt from per-company aggregates equal those built on the whole frames."""
+    combined_df, ingested_df_flat = _make_multi_org_input_frames()
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_df_flat, "2025Q1")
+    keys_only_raw, keys_only_sem, keys_in_both = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    qa_diff_df = qa.build_qa_diff(
+        flat_for_qa, sem_for_qa, keys_only_raw, keys_only_sem, keys_in_both,
+        batch_id="B", qa_run_datetime="T",
+    )
+
+    parts = [
+        qa.build_qa_aggregates(
+            flat_for_qa[flat_for_qa["Organisation_Cd"] == org],
+            sem_for_qa[sem_for_qa["Organisation_Cd"] == org],
+            keys_in_both[keys_in_both["Organisation_Cd"] == org],
+            qa_diff_df[qa_diff_df["Organisation_Cd"] == org],
+        )
+        for org in ["ORG1", "ORG2", "ORG3"]
+    ]
+    combined = qa.combine_qa_aggregates(parts)
+
+    assert combined.total_raw_rows == len(flat_for_qa)
+    assert combined.rows_with_keys_in_both == len(keys_in_both)
+
+    expected = qa.build_qa_summaries(flat_for_qa, sem_for_qa, keys_in_both, qa_diff_df, "B", "T")
+    result = qa.build_qa_summaries_from_aggregates(combined, "B", "T")
+    for expected_df, result_df in zip(expected, result):
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+
+def test_run_qa_incremental_only_rediffs_changed_keys(tmp_path, monkeypatch):
+    """Repeat runs reuse saved diff rows and still match the serial pipeline."""
+    combined_df, ingested_df_flat = _make_multi_org_input_frames()
+    folder_kwargs = {
+        "filtered_excel_files": ["/lake/ORG1 QD.xlsx", "/lake/ORG2_QD.xlsx"],
+        "expected_companies": ["ORG1", "ORG2", "ORG4"],
+        "status": "complete",
+        "process_cd": "qd",
+        "submission_period_cd": "2025Q1",
+    }
+
+    diffed_rows = []
+    build_qa_diff = qa.build_qa_diff
+
+    def counting_build_qa_diff(flat_for_qa, sem_for_qa, *args, **kwargs):
+        diffed_rows.append(len(flat_for_qa) + len(sem_for_qa))
+        return build_qa_diff(flat_for_qa, sem_for_qa, *args, **kwargs)
+
+    def run_incremental(combined, ingested):
+        diffed_rows.clear()
+        with monkeypatch.context() as m:
+            m.setattr(qa, "build_qa_diff", counting_build_qa_diff)
+            return qa.run_qa_incremental(
+                combined,
+                ingested,
+                target_submission_period="2025Q1",
+                batch_id="BATCH_ORG",
+                qa_run_datetime="2025-01-01T00:00:00",
+                state_dir=str(tmp_path),
+                **folder_kwargs,
+            )
+
+    def assert_matches_serial(result, combined, ingested):
+        expected = _run_serial_qa(combined, ingested, **folder_kwargs)
+        sort_cols = ["Organisation_Cd", "Measure_Key", "Error_Type", "Column_Name"]
+        assert list(result[0].columns) == list(expected[0].columns)
+        pd.testing.assert_frame_equal(
+            result[0].sort_values(sort_cols).reset_index(drop=True),
+            expected[0].sort_values(sort_cols).reset_index(drop=True),
+        )
+        for expected_df, result_df in zip(expected[1:], result[1:]):
+            pd.testing.assert_frame_equal(result_df, expected_df)
+
+    # First run: no saved state, every key is diffed
+    assert_matches_serial(run_incremental(combined_df, ingested_df_flat), combined_df, ingested_df_flat)
+    assert diffed_rows and diffed_rows[0] > 0
+    assert (tmp_path / "qa_state_QD.json").exists()
+    assert (tmp_path / "qa_state_QD_groups.parquet").exists()
+    assert (tmp_path / "qa_state_QD_diff.parquet").exists()
+
+    # Same inputs again: nothing to diff
+    assert_matches_serial(run_incremental(combined_df, ingested_df_flat), combined_df, ingested_df_flat)
+    assert not diffed_rows
+
+    # One ORG2 value changes: only that key is diffed
+    changed = ingested_df_flat.copy()
+    row = changed.index[(changed["Organisation_Cd"] == "ORG2") & (changed["Legacy_Measure_Reference"] == "M1")][0]
+    changed.loc[row, "Measure_Value"] = "11"
+    assert_matches_serial(run_incremental(combined_df, changed), combined_df, changed)
+    assert diffed_rows == [2]
+
+    # Dropping a company makes its keys disappear without re-diffing anything else
+    without_org1 = combined_df[combined_df["Organisation_Cd"] != "ORG1"]
+    assert_matches_serial(run_incremental(without_org1, changed), without_org1, changed)
+    assert len(diffed_rows) == 1 and diffed_rows[0] < len(without_org1) + len(changed)
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 1000])
+def test_build_qa_diff_streams_batches_and_summaries_use_streamed_counts(batch_size):
+    """Streamed batches hold the in-memory diff rows; summaries from the stream are identical."""
+    combined_df, ingested_df_flat = _make_multi_org_input_frames()
+    folder_kwargs = {
+        "filtered_excel_files": ["/lake/ORG1 QD.xlsx"],
+        "expected_companies": ["ORG1", "ORG4"],
+        "status": "complete",
+        "process_cd": "qd",
+        "submission_period_cd": "2025Q1",
+    }
+    expected = _run_serial_qa(combined_df, ingested_df_flat, **folder_kwargs)
+
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_df_flat, "2025Q1")
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    batches = []
+    diff_stream = qa.QADiffStream(batches.append, batch_size=batch_size)
+
+    streamed = qa.build_qa_diff(
+        flat_for_qa,
+        sem_for_qa,
+        *keys,
+        batch_id="BATCH_ORG",
+        qa_run_datetime="2025-01-01T00:00:00",
+        target_submission_period="2025Q1",
+        diff_stream=diff_stream,
+        **folder_kwargs,
+    )
+    assert streamed.empty
+    assert all(len(batch) <= batch_size for batch in batches)
+    assert all((batch["Batch_Id"] == "BATCH_ORG").all() for batch in batches)
+    assert diff_stream.rows_written == len(expected[0])
+
+    result_diff = pd.concat(batches, ignore_index=True).infer_objects()
+    pd.testing.assert_frame_equal(result_diff[list(expected[0].columns)], expected[0])
+
+    summaries = qa.build_qa_summaries(
+        flat_for_qa,
+        sem_for_qa,
+        keys[2],
+        streamed,
+        batch_id="BATCH_ORG",
+        qa_run_datetime="2025-01-01T00:00:00",
+        diff_totals=diff_stream,
+    )
+    for expected_df, result_df in zip(expected[1:], summaries):
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+
+def test_qa_diff_stream_writes_parquet_file(tmp_path):
+    """A path sink collects every batch into one parquet file."""
+    combined_df, ingested_df_flat = _make_multi_org_input_frames()
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_df_flat, "2025Q1")
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    expected = qa.build_qa_diff(flat_for_qa, sem_for_qa, *keys, batch_id="B", qa_run_datetime="T")
+
+    path = tmp_path / "qa_diff.parquet"
+    with qa.QADiffStream(path, batch_size=2) as diff_stream:
+        qa.build_qa_diff(flat_for_qa, sem_for_qa, *keys, batch_id="B", qa_run_datetime="T", diff_stream=diff_stream)
+
+    written = pd.read_parquet(path)
+    assert len(written) == len(expected)
+    assert written["Error_Type"].tolist() == expected["Error_Type"].tolist()
+    assert written["Raw_Value"].isna().tolist() == expected["Raw_Value"].isna().tolist()
+    assert written["Raw_Value"].dropna().tolist() == [str(v) for v in expected["Raw_Value"].dropna()]
+    assert set(written["Batch_Id"]) == {"B"}
+
+
+def test_qa_diff_stream_rejects_empty_batches():
+    """batch_size must be positive."""
+    with pytest.raises(ValueError, match="batch_size"):
+        qa.QADiffStream(lambda batch: None, batch_size=0)
+
+
+def test_qa_diff_totals_keeps_each_mismatch_key_once():
+    """Keys repeated within and across folds (null keys included) are kept once, in first-seen order."""
+    diff_totals = qa.QADiffTotals()
+    assert diff_totals.mismatch_keys.empty
+
+    for org, reference in [("ORG1", "R1"), ("ORG1", "R1"), ("ORG2", None), ("ORG1", "R1"), ("ORG2", None)]:
+        rows = pd.DataFrame({"Organisation_Cd": [org], "Reference": [reference]})
+        diff_totals.add_rows(rows, "Value mismatch", "Measure_Value", ["Organisation_Cd", "Reference"],
+                             ["Organisation_Cd", "Reference"])
+
+    pd.testing.assert_frame_equal(
+        diff_totals.mismatch_keys,
+        pd.DataFrame({"Organisation_Cd": ["ORG1", "ORG2"], "Reference": ["R1", None]}, dtype=object),
+        check_dtype=False,
+    )
+    assert diff_totals.diff_counts.set_index("Organisation_Cd")["Error_Count"].to_dict() == {"ORG1": 3, "ORG2": 2}
+
+
+def test_build_qa_diff_caps_examples_per_group_with_exact_summaries():
+    """Only the first N records per (company, error type, column) are built; summaries stay exact."""
+    combined_df, ingested_df_flat = _make_multi_org_input_frames()
+    # Every Flat_File row becomes a value mismatch
+    ingested_df_flat = ingested_df_flat.assign(Measure_Value="999")
+    folder_kwargs = {
+        "filtered_excel_files": ["/lake/ORG1 QD.xlsx"],
+        "expected_companies": ["ORG1", "ORG4"],
+        "status": "complete",
+        "process_cd": "qd",
+        "submission_period_cd": "2025Q1",
+    }
+    expected = _run_serial_qa(combined_df, ingested_df_flat, **folder_kwargs)
+
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_df_flat, "2025Q1")
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    diff_totals = qa.QADiffTotals()
+    capped = qa.build_qa_diff(
+        flat_for_qa,
+        sem_for_qa,
+        *keys,
+        batch_id="BATCH_ORG",
+        qa_run_datetime="2025-01-01T00:00:00",
+        target_submission_period="2025Q1",
+        max_examples_per_group=1,
+        diff_totals=diff_totals,
+        **folder_kwargs,
+    )
+
+    group_cols = ["Organisation_Cd", "Error_Type", "Column_Name"]
+    assert len(capped) < len(expected[0])
+    pd.testing.assert_frame_equal(
+        capped,
+        expected[0].groupby(group_cols, sort=False).head(1).reset_index(drop=True),
+    )
+
+    summaries = qa.build_qa_summaries(
+        flat_for_qa,
+        sem_for_qa,
+        keys[2],
+        capped,
+        batch_id="BATCH_ORG",
+        qa_run_datetime="2025-01-01T00:00:00",
+        diff_totals=diff_totals,
+    )
+    for expected_df, result_df in zip(expected[1:], summaries):
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+
+def test_build_qa_diff_max_examples_requires_totals():
+    """Capping without somewhere to keep exact counts is rejected."""
+    combined_df, ingested_df_flat = _make_basic_input_frames_with_missing_and_extra()
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_df_flat, "2025Q1")
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+
+    with pytest.raises(ValueError, match="diff_totals"):
+        qa.build_qa_diff(flat_for_qa, sem_for_qa, *keys, batch_id="B", qa_run_datetime="T", max_examples_per_group=5)
+    with pytest.raises(ValueError, match="at least 1"):
+        qa.build_qa_diff(
+            flat_for_qa, sem_for_qa, *keys, batch_id="B", qa_run_datetime="T",
+            max_examples_per_group=0, diff_totals=qa.QADiffTotals(),
+        )
+
+
+def test_run_qa_by_organisation_with_a_list_of_periods_and_expected_companies():
+    """A list target_submission_period leaves Submission_Period_Cd of missing-company rows empty."""
+    combined_df, ingested_df_flat = _make_multi_org_input_frames()
+
+    qa_diff_df, *_summaries = qa.run_qa_by_organisation(
+        combined_df,
+        ingested_df_flat,
+        target_submission_period=["2025Q1"],
+        batch_id="BATCH_ORG",
+        qa_run_datetime="2025-01-01T00:00:00",
+        filtered_excel_files=["/lake/ORG1 QD.xlsx"],
+        expected_companies=["ORG1", "ORG4"],
+        max_workers=1,
+    )
+
+    missing = qa_diff_df[qa_diff_df["Error_Type"] == "MISSING_COMPANY_FROM_FOLDER"]
+    assert missing["Organisation_Cd"].tolist() == ["ORG4"]
+    assert missing["Submission_Period_Cd"].isna().all()
+
+
+def test_run_qa_incremental_with_a_list_of_periods_and_expected_companies(tmp_path):
+    """A list target_submission_period leaves Submission_Period_Cd of missing-company rows empty."""
+    combined_df, ingested_df_flat = _make_multi_org_input_frames()
+
+    qa_diff_df, *_summaries = qa.run_qa_incremental(
+        combined_df,
+        ingested_df_flat,
+        target_submission_period=["2025Q1"],
+        batch_id="BATCH_ORG",
+        qa_run_datetime="2025-01-01T00:00:00",
+        state_dir=str(tmp_path),
+        filtered_excel_files=["/lake/ORG1 QD.xlsx"],
+        expected_companies=["ORG1", "ORG4"],
+    )
+
+    missing = qa_diff_df[qa_diff_df["Error_Type"] == "MISSING_COMPANY_FROM_FOLDER"]
+    assert missing["Organisation_Cd"].tolist() == ["ORG4"]
+    assert missing["Submission_Period_Cd"].isna().all()
+
+
+def test_build_qa_diff_keeps_none_values_in_mismatch_records():
+    """A missing value on one side is reported as None, not NaN, in all-text rows."""
+    row = {
+        "Organisation_Cd": "ORG1",
+        "Region_Cd": "",
+        "Submission_Period_Cd": "2025Q1",
+        "Observation_Period_Cd": "202501",
+        "Sheet_Cd": "Sheet1",
+    }
+    combined_df = pd.DataFrame([{
+        **row, "Measure_Cd": "M1", "Measure_Desc": "Value", "Measure_Unit": "nr",
+        "Measure_Decimals": "0", "Measure_Value": "12345678901234567",
+    }])
+    ingested_df_flat = pd.DataFrame([{
+        **row, "Legacy_Measure_Reference": "M1", "Measure_Name": "Value", "Unit": "nr",
+        "Decimal_Point": "0", "Measure_Value": None,
+    }])
+
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_df_flat, "2025Q1")
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    qa_diff_df = qa.build_qa_diff(flat_for_qa, sem_for_qa, *keys, batch_id="B", qa_run_datetime="T")
+
+    mismatch = qa_diff_df[qa_diff_df["Error_Type"] == "MEASURE_VALUE_MISMATCH"].iloc[0]
+    assert mismatch["Ingested_Value"] is None
+    assert mismatch["Error_Desc"].endswith("Flat_File='12345678901234567', Ingested=None.")
+
+
+def test_build_qa_diff_reports_a_missing_description_as_none():
+    """A missing semantic Measure_Name gives Ingested_Value None and "Ingested=None." (not NaN)."""
+    row = {
+        "Organisation_Cd": "ORG1",
+        "Region_Cd": "",
+        "Submission_Period_Cd": "2025Q1",
+        "Observation_Period_Cd": "202501",
+        "Sheet_Cd": "Sheet1",
+    }
+    combined_df = pd.DataFrame([{
+        **row, "Measure_Cd": "M1", "Measure_Desc": "Value", "Measure_Unit": "nr",
+        "Measure_Decimals": "0", "Measure_Value": "1",
+    }])
+    ingested_df_flat = pd.DataFrame([{
+        **row, "Legacy_Measure_Reference": "M1", "Measure_Name": None, "Unit": "nr",
+        "Decimal_Point": "0", "Measure_Value": "1",
+    }])
+
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_df_flat, "2025Q1")
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    qa_diff_df = qa.build_qa_diff(flat_for_qa, sem_for_qa, *keys, batch_id="B", qa_run_datetime="T")
+
+    assert qa_diff_df["Error_Type"].tolist() == ["DESCRIPTION_MISMATCH"]
+    mismatch = qa_diff_df.iloc[0]
+    assert mismatch["Raw_Value"] == "Value"
+    assert mismatch["Ingested_Value"] is None
+    assert mismatch["Measure_Desc"] == "Value"
+    assert mismatch["Error_Desc"].endswith("Flat_File='Value', Ingested=None.")
+
+
+def test_build_qa_diff_tells_apart_mixed_type_text_values():
+    """1, 1.0 and True in one object column normalise to '1', '1.0' and 'true', whatever the row order."""
+    assert qa._normalise_string(pd.Series([1, 1.0, True, "x", None], dtype=object)).tolist() == [
+        "1", "1.0", "true", "x", ""
+    ]
+
+    row = {
+        "Organisation_Cd": "ORG1",
+        "Region_Cd": "",
+        "Submission_Period_Cd": "2025Q1",
+        "Observation_Period_Cd": "202501",
+        "Sheet_Cd": "Sheet1",
+    }
+    raw_comments = [1, 1.0, True, True]
+    ingested_comments = [1, 1, True, 1.0]
+    combined_df = pd.DataFrame([
+        {**row, "Measure_Cd": f"M{i}", "Measure_Desc": "Value", "Measure_Unit": "nr",
+         "Measure_Decimals": "0", "Measure_Value": "1", "Comment": comment}
+        for i, comment in enumerate(raw_comments)
+    ])
+    ingested_df_flat = pd.DataFrame([
+        {**row, "Legacy_Measure_Reference": f"M{i}", "Measure_Name": "Value", "Unit": "nr",
+         "Decimal_Point": "0", "Measure_Value": "1", "Measure_Comment": comment}
+        for i, comment in enumerate(ingested_comments)
+    ])
+
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined_df, ingested_df_flat, "2025Q1")
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    qa_diff_df = qa.build_qa_diff(flat_for_qa, sem_for_qa, *keys, batch_id="B", qa_run_datetime="T")
+
+    assert qa_diff_df["Error_Type"].tolist() == ["COMMENT_MISMATCH", "COMMENT_MISMATCH"]
+    assert qa_diff_df["Measure_Cd"].tolist() == ["M1", "M3"]
+
+
+def test_run_qa_incremental_reuses_mixed_type_values_exactly(tmp_path):
+    """Diff values mixing numbers, strings and None come back from the parquet state unchanged."""
+    row = {
+        "Organisation_Cd": "ORG1",
+        "Region_Cd": "",
+        "Submission_Period_Cd": "2025Q1",
+        "Observation_Period_Cd": "202501",
+        "Sheet_Cd": "Sheet1",
+    }
+    combined_df = pd.DataFrame([
+        {**row, "Measure_Cd": f"M{i}", "Measure_Desc": "D", "Measure_Unit": "nr",
+         "Measure_Decimals": "0", "Measure_Value": value}
+        for i, value in enumerate([5, 2.5, "abc", None])
+    ], dtype=object)
+    ingested_df_flat = pd.DataFrame([{
+        **row, "Legacy_Measure_Reference": "M9", "Measure_Name": "D", "Unit": "nr",
+        "Decimal_Point": "0", "Measure_Value": "1",
+    }])
+
+    first, *_ = qa.run_qa_incremental(combined_df, ingested_df_flat, "2025Q1", "B", "T", state_dir=str(tmp_path))
+    reused, *_ = qa.run_qa_incremental(combined_df, ingested_df_flat, "2025Q1", "B", "T", state_dir=str(tmp_path))
+
+    pd.testing.assert_frame_equal(reused, first)
+    assert [type(v) for v in reused["Raw_Value"].dropna()] == [int, float, str]
+
+
+def test_run_qa_incremental_ignores_an_unreadable_state(tmp_path, caplog):
+    """A damaged state file is reported and every key diffed again."""
+    combined_df, ingested_df_flat = _make_multi_org_input_frames()
+    expected, *_ = qa.run_qa_incremental(combined_df, ingested_df_flat, "2025Q1", "B", "T", state_dir=str(tmp_path))
+
+    (tmp_path / "qa_state_QD_diff.parquet").write_bytes(b"not parquet")
+    with caplog.at_level(logging.WARNING):
+        result, *_ = qa.run_qa_incremental(combined_df, ingested_df_flat, "2025Q1", "B", "T", state_dir=str(tmp_path))
+
+    assert "Could not read the saved QA state" in caplog.text
+    pd.testing.assert_frame_equal(result, expected)
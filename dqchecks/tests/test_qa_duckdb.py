@@ -0,0 +1,159 @@
+"""Tests for dqchecks.qa_duckdb (out-of-core QA over parquet inputs)."""
+
+import pandas as pd
+import pytest
+
+from dqchecks import qa, qa_duckdb
+
+
+def _make_qd_parquet_inputs(tmp_path):
+    """
+    Write QD Flat_File / semantic parquet inputs for two companies covering
+    matches, value mismatches, keys on one side only, untrimmed codes and
+    repeated semantic loads with mixed Insert_Date formats.
+    """
+    flat_rows, sem_rows = [], []
+    for org in ["ORG1", "ORG2"]:
+        for i in range(12):
+            flat_rows.append({
+                "Measure_Cd": f"M{i}",
+                "Organisation_Cd": f" {org}" if i == 3 else org,
+                "Region_Cd": "",
+                "Submission_Period_Cd": "2025Q1" if i != 11 else "2024Q4",
+                "Observation_Period_Cd": "202501",
+                "Measure_Desc": f"Desc – {i}",
+                "Measure_Value": f"{i}%",
+                "Measure_Unit": "%",
+                "Measure_Decimals": "2",
+                "Sheet_Cd": "Sheet1",
+            })
+
+        for i in range(1, 12):
+            # Older load first; M5 changes value in the latest load
+            sem_rows.append({
+                "Organisation_Cd": org,
+                "Region_Cd": "",
+                "Submission_Period_Cd": "2025Q1.0",
+                "Observation_Period_Cd": "202501",
+                "Legacy_Measure_Reference": f"M{i}",
+                "Measure_Name": f"desc - {i}",
+                "Unit": "%",
+                "Decimal_Point": "2",
+                "Measure_Value": str(i + 100),
+                "Sheet_Cd": "Sheet1",
+                "Insert_Date": "2025-01-01 09:00:00",
+            })
+            sem_rows.append({
+                "Organisation_Cd": org,
+                "Region_Cd": "",
+                "Submission_Period_Cd": "2025Q1",
+                "Observation_Period_Cd": "202501",
+                "Legacy_Measure_Reference": f"M{i}" if i != 10 else "M99",
+                "Measure_Name": f"desc - {i}",
+                "Unit": "%",
+                "Decimal_Point": "3" if i == 7 else "2",
+                "Measure_Value": str(i + 1 if i == 5 else i),
+                "Sheet_Cd": "Sheet1",
+                "Insert_Date": "2025-02-01 10:00:00",
+            })
+
+    flat_path = tmp_path / "flat.parquet"
+    sem_path = tmp_path / "semantic.parquet"
+    pd.DataFrame(flat_rows).to_parquet(flat_path)
+    pd.DataFrame(sem_rows).to_parquet(sem_path)
+    return str(flat_path), str(sem_path)
+
+
+def _run_in_memory(flat_path, sem_path, **kwargs):
+    """Reference: read both inputs with pandas and run the qa steps in sequence."""
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(
+        pd.read_parquet(flat_path), pd.read_parquet(sem_path), "2025Q1",
+    )
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa)
+    qa_diff_df = qa.build_qa_diff(
+        flat_for_qa, sem_for_qa, *keys,
+        batch_id="BATCH_SQL",
+        qa_run_datetime="2025-01-01T00:00:00",
+        target_submission_period="2025Q1",
+        **kwargs,
+    )
+    summaries = qa.build_qa_summaries(
+        flat_for_qa, sem_for_qa, keys[2], qa_diff_df, "BATCH_SQL", "2025-01-01T00:00:00",
+    )
+    return (qa_diff_df, *summaries)
+
+
+@pytest.mark.parametrize("batch_size", [5, qa_duckdb.DEFAULT_BATCH_SIZE])
+def test_run_qa_parquet_matches_in_memory_pipeline(tmp_path, batch_size):
+    """The DuckDB backend returns the same frames as the in-memory pipeline, for any batch size."""
+    flat_path, sem_path = _make_qd_parquet_inputs(tmp_path)
+    folder_kwargs = {
+        "filtered_excel_files": ["/lake/ORG1 QD.xlsx", "/lake/ORG2 QD.xlsx"],
+        "expected_companies": ["ORG1", "ORG2", "ORG3"],
+        "status": "complete",
+        "process_cd": "qd",
+        "submission_period_cd": "2025Q1",
+    }
+
+    expected = _run_in_memory(flat_path, sem_path, **folder_kwargs)
+    result = qa_duckdb.run_qa_parquet(
+        flat_path,
+        sem_path,
+        target_submission_period="2025Q1",
+        batch_id="BATCH_SQL",
+        qa_run_datetime="2025-01-01T00:00:00",
+        database=str(tmp_path / "qa.duckdb"),
+        batch_size=batch_size,
+        **folder_kwargs,
+    )
+
+    for expected_df, result_df in zip(expected, result):
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    assert set(result[0]["Error_Type"]) == {
+        "MISSING_IN_INGESTED",
+        "EXTRA_IN_INGESTED",
+        "MEASURE_VALUE_MISMATCH",
+        "MEASURE_DECIMALS_MISMATCH",
+        "MISSING_COMPANY_FROM_FOLDER",
+    }
+
+
+def test_run_qa_parquet_without_differences_returns_empty_diff(tmp_path):
+    """Identical inputs give an empty diff and all keys counted as matched."""
+    flat_path, _sem_path = _make_qd_parquet_inputs(tmp_path)
+    flat = pd.read_parquet(flat_path)
+    semantic = flat.rename(columns={
+        "Measure_Cd": "Legacy_Measure_Reference",
+        "Measure_Desc": "Measure_Name",
+        "Measure_Unit": "Unit",
+        "Measure_Decimals": "Decimal_Point",
+    })
+    sem_path = tmp_path / "same.parquet"
+    semantic.to_parquet(sem_path)
+
+    qa_diff_df, qa_summary_df, _company, error_counts_df = qa_duckdb.run_qa_parquet(
+        flat_path, str(sem_path), "2025Q1", "BATCH_SQL", "2025-01-01T00:00:00", batch_size=4,
+    )
+
+    assert qa_diff_df.empty
+    assert error_counts_df.empty
+    summary = qa_summary_df.iloc[0]
+    assert summary["Total_Raw_Rows"] == 22
+    assert summary["Rows_With_Keys_In_Both"] == 22
+    assert summary["Total_Matched_Rows"] == 22
+
+
+def test_run_qa_parquet_with_a_list_of_periods_and_expected_companies(tmp_path):
+    """A list target_submission_period leaves Submission_Period_Cd of missing-company rows empty."""
+    flat_path, sem_path = _make_qd_parquet_inputs(tmp_path)
+
+    qa_diff_df, *_summaries = qa_duckdb.run_qa_parquet(
+        flat_path, sem_path, ["2025Q1"], "BATCH_SQL", "2025-01-01T00:00:00",
+        filtered_excel_files=["/lake/ORG1 QD.xlsx"],
+        expected_companies=["ORG1", "ORG3"],
+    )
+
+    missing = qa_diff_df[qa_diff_df["Error_Type"] == "MISSING_COMPANY_FROM_FOLDER"]
+    assert missing["Organisation_Cd"].tolist() == ["ORG3"]
+    assert missing["Submission_Period_Cd"].isna().all()
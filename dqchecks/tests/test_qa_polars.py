@@ -0,0 +1,190 @@
+"""Parity tests for dqchecks.qa engine="polars" against the pandas path."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dqchecks import qa
+
+BATCH_ID = "BATCH_POLARS"
+QA_RUN_DATETIME = "2025-01-01T00:00:00"
+
+# Values that normalise alike, differ, or only look alike (and must stay apart).
+MEASURE_VALUES = ["1", "1.0", " 1 ", "1%", "100%", "0.01", "N/A", "", None, np.nan, 1, 0.01,
+                  "1e0", "12.5 %", "-0", "12345678901234567", "inf", True, "+1", ".5", "5."]
+TEXTS = ["Desc", "desc", " DESC ", "De\u2013sc", "De-sc",
+         "\u039f\u0394\u039f\u03a3", "\u03bf\u03b4\u03bf\u03c2", "\u03bf\u03b4\u03bf\u03c3",
+         "a\u200bb", "ab", "a\\u200bb", None, 1, "1", "x\x1c", "x"]
+DECIMALS = [2, "2", " 2", "2.0", 2.0, None, "two", 3]
+UNITS = ["%", " % ", "nr", None]
+
+
+def _pick(values, i, salt):
+    return values[(i * 7 + salt * 3 + i // 5) % len(values)]
+
+
+def _make_qd_frames():
+    """
+    QD Flat_File / semantic inputs mixing clean matches, near-misses of every
+    normalisation, untrimmed codes, null keys and repeated semantic loads.
+    """
+    flat_rows, sem_rows = [], []
+    for i in range(160):
+        org = ["ORG1", "ORG2", " ORG1", None][i % 4]
+        key = {
+            "Organisation_Cd": org,
+            "Region_Cd": ["", "R1", None, " R1 "][i % 3],
+            "Submission_Period_Cd": ["2025Q1", "2025Q1.0", " 2025Q1 ", "2025Q2"][i % 7 % 4],
+            "Observation_Period_Cd": ["202501", "202501.0"][i % 2],
+            "Observation_Cd": [None, "", "O1"][i % 5 % 3],
+        }
+        measure = f"M{i % 45}"
+        if i % 6:
+            flat_rows.append({
+                **key,
+                "Measure_Cd": measure if i % 9 else f" {measure}",
+                "Measure_Desc": _pick(TEXTS, i, 1),
+                "Measure_Unit": _pick(UNITS, i, 2),
+                "Measure_Decimals": _pick(DECIMALS, i, 3),
+                "Measure_Value": _pick(MEASURE_VALUES, i, 4),
+                "Comment": _pick(TEXTS, i, 5),
+                "Sheet_Cd": "Sheet1",
+            })
+        if i % 7:
+            for load in range(1 + i % 2):
+                sem_rows.append({
+                    **key,
+                    "Organisation_Cd": (org or "").strip() or None,
+                    "Legacy_Measure_Reference": measure,
+                    "Measure_Name": _pick(TEXTS, i + load, 6),
+                    "Unit": _pick(UNITS, i, 2),
+                    "Decimal_Point": _pick(DECIMALS, i + load, 7),
+                    "Measure_Value": _pick(MEASURE_VALUES, i + load, 8),
+                    "Measure_Comment": _pick(TEXTS, i, 5),
+                    "Sheet_Cd": "Sheet1",
+                    "Insert_Date": ["2025-01-01", "2025-02-01", None][(i + load) % 3],
+                })
+    return pd.DataFrame(flat_rows), pd.DataFrame(sem_rows)
+
+
+def _make_apr_frames():
+    """APR_RAPID inputs: every key column present, numeric and text measure values."""
+    flat_rows, sem_rows = [], []
+    for i in range(120):
+        base = {c: "NA" for c in qa.APR_RAPID_KEY_COLS}
+        base.update({
+            "Organisation_Cd": ["ORG1", "ORG2", "ORG3"][i % 3],
+            "Observation_Period_Cd": ["2024-25", "2023-24"][i % 2],
+            "Submission_Period_Cd": ["2025", "2025.0"][i % 4 // 3],
+            "Measure_Cd": f"B{i % 50}",
+            "Bulk_Supply_Cd": ["X", "Y", None, ""][i % 4],
+        })
+        value = round((i % 11) - 5.5, 2)
+        if i % 8:
+            flat_rows.append({
+                **base,
+                "Measure_Value": str(value),
+                "Comment": [None, "x", " X "][i % 3],
+            })
+        if i % 9:
+            sem_rows.append({
+                **base,
+                "measure_value": [str(value), value, str(value + 1)][i % 3],
+                "Audit_Comment": [None, "x"][i % 2],
+                "Insert_Date": ["2025-01-01", "2025-03-01"][i % 2],
+            })
+    return pd.DataFrame(flat_rows), pd.DataFrame(sem_rows)
+
+
+CASES = {
+    "QD": (_make_qd_frames, "QD", ["2025Q1"]),
+    "APR_RAPID": (_make_apr_frames, "APR_RAPID", "2025"),
+}
+
+
+def _run(engine, case, target_org=None, **diff_kwargs):
+    """All four qa steps for one engine; returns every frame they produce."""
+    make_frames, profile, period = CASES[case]
+    combined, ingested = make_frames()
+
+    flat_for_qa, sem_for_qa = qa.prepare_qa_frames(
+        combined, ingested, period, target_org=target_org, profile=profile, engine=engine,
+    )
+    keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa, profile=profile, engine=engine)
+    qa_diff_df = qa.build_qa_diff(
+        flat_for_qa, sem_for_qa, *keys, BATCH_ID, QA_RUN_DATETIME,
+        filtered_excel_files=["/lake/ORG1 QA.xlsx"],
+        expected_companies=["ORG1", "ORG9"],
+        target_submission_period="2025Q1",
+        profile=profile,
+        engine=engine,
+        **diff_kwargs,
+    )
+    summaries = qa.build_qa_summaries(
+        flat_for_qa, sem_for_qa, keys[2], qa_diff_df, BATCH_ID, QA_RUN_DATETIME,
+        profile=profile, diff_totals=diff_kwargs.get("diff_totals"), engine=engine,
+    )
+    return [flat_for_qa, sem_for_qa, *keys, qa_diff_df, *summaries]
+
+
+def _assert_frames_equal(result, expected):
+    assert len(result) == len(expected)
+    for result_df, expected_df in zip(result, expected):
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+@pytest.mark.parametrize("target_org", [None, "ORG1"])
+def test_polars_engine_matches_pandas(case, target_org):
+    """Every step returns the same frames (rows, order, index, dtypes) on both engines."""
+    expected = _run("pandas", case, target_org)
+    result = _run("polars", case, target_org)
+
+    _assert_frames_equal(result, expected)
+    assert len(expected[5]) > 0
+
+
+def test_polars_engine_matches_pandas_with_capped_examples():
+    """max_examples_per_group and diff_totals behave the same on the Polars engine."""
+    expected = _run("pandas", "QD", max_examples_per_group=2, diff_totals=qa.QADiffTotals())
+    result = _run("polars", "QD", max_examples_per_group=2, diff_totals=qa.QADiffTotals())
+
+    _assert_frames_equal(result, expected)
+
+
+def test_polars_engine_streams_the_same_records():
+    """Streamed diff batches hold the same records on both engines."""
+    batches = {"pandas": [], "polars": []}
+    for engine, received in batches.items():
+        with qa.QADiffStream(received.append, batch_size=7) as diff_stream:
+            _run(engine, "QD", diff_stream=diff_stream)
+
+    pd.testing.assert_frame_equal(
+        pd.concat(batches["polars"], ignore_index=True),
+        pd.concat(batches["pandas"], ignore_index=True),
+    )
+
+
+def test_polars_engine_with_non_string_keys_matches_pandas():
+    """Key columns holding numbers (left as they are by QD) are handled by the pandas path."""
+    combined, ingested = _make_qd_frames()
+    combined["Filename"] = [i % 3 for i in range(len(combined))]
+    ingested["Filename"] = [i % 3 for i in range(len(ingested))]
+
+    results = {}
+    for engine in ("pandas", "polars"):
+        flat_for_qa, sem_for_qa = qa.prepare_qa_frames(combined, ingested, "2025Q1", engine=engine)
+        keys = qa.compute_key_overlap(flat_for_qa, sem_for_qa, engine=engine)
+        qa_diff_df = qa.build_qa_diff(
+            flat_for_qa, sem_for_qa, *keys, BATCH_ID, QA_RUN_DATETIME, engine=engine,
+        )
+        results[engine] = [flat_for_qa, sem_for_qa, *keys, qa_diff_df]
+
+    _assert_frames_equal(results["polars"], results["pandas"])
+
+
+def test_unknown_engine_raises():
+    """Engines other than pandas and polars are rejected up front."""
+    combined, ingested = _make_qd_frames()
+    with pytest.raises(ValueError, match="Unsupported engine"):
+        qa.prepare_qa_frames(combined, ingested, "2025Q1", engine="spark")
@@ -0,0 +1,136 @@
+"""
+Tests for the single-traversal rule engine and the panacea rules built on it
+"""
+import pytest
+from openpyxl import Workbook
+from dqchecks import panacea
+from dqchecks.rule_engine import RuleEngine, SheetRule
+from dqchecks.panacea import (
+    FormulaDifferenceRule,
+    FormulaErrorRule,
+    PrimaryKeyRule,
+    ShapeRule,
+    TemplateProfile,
+    check_pk_for_nulls_and_duplicates,
+    find_formula_differences,
+    find_formula_errors,
+    find_shape_differences)
+
+
+class RecordingRule(SheetRule):
+    """Records every hook call."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.calls = []
+
+    def start_sheet(self, visit):
+        self.calls.append(("start_sheet", visit.sheet_name, visit.template_sheet is not None))
+        return self.bounds
+
+    def visit_cell(self, visit, row, column, cell):
+        self.calls.append(("cell", row, column, cell.value))
+
+    def visit_row(self, visit, row, cells):
+        self.calls.append(("row", row, [column for column, _ in cells]))
+
+    def end_sheet(self, visit):
+        self.calls.append(("end_sheet", visit.sheet_name))
+
+
+def _workbooks():
+    """Template and company workbooks with formula, error, shape and key differences."""
+    wb_template, wb_company = Workbook(), Workbook()
+    for wb, formula in ((wb_template, "=A3*2"), (wb_company, "=A3*3")):
+        fout = wb.active
+        fout.title = "fOut_Main"
+        fout.append(["Title"])
+        fout.append(["Reference", "Value", "Double"])
+        for row in range(3, 9):
+            fout.append([f"BON{row % 5}", row, formula.replace("3", str(row), 1)])
+        calc = wb.create_sheet("Calc")
+        calc["A1"] = 1
+        calc["B1"] = "=A1/0"
+    wb_company["Calc"]["B1"].data_type = "e"
+    wb_company["Calc"]["B1"].value = "#DIV/0!"
+    wb_company["fOut_Main"]["D2"] = "Extra"
+    wb_company.create_sheet("Notes")["A1"] = "Company only"
+    return wb_template, wb_company
+
+
+def _events(df):
+    return df.drop(columns="Event_Id").to_dict("records")
+
+
+def test_engine_walks_held_cells_in_row_major_order_within_bounds():
+    """Cells are dispatched row by row within each rule's bounds, and none are created"""
+    wb = Workbook()
+    sheet = wb.active
+    sheet["C2"] = "c2"
+    sheet["A2"] = "a2"
+    sheet["B1"] = "b1"
+    sheet["A9"] = "a9"
+    rule = RecordingRule((2, 2))
+
+    RuleEngine([rule]).run(wb)
+
+    assert rule.calls == [
+        ("start_sheet", "Sheet", False),
+        ("cell", 1, 2, "b1"), ("row", 1, [2]),
+        ("cell", 2, 1, "a2"), ("row", 2, [1]),
+        ("end_sheet", "Sheet"),
+    ]
+    assert len(sheet._cells) == 4  # pylint: disable=W0212
+
+
+def test_engine_rejects_non_rules():
+    """Rules must derive from SheetRule"""
+    with pytest.raises(TypeError, match="SheetRule"):
+        RuleEngine([object()])
+
+
+def test_rules_in_one_run_match_the_find_functions(monkeypatch):
+    """One walk over the company workbook gives what each find_* function gives"""
+    wb_template, wb_company = _workbooks()
+    expected = [
+        find_formula_differences(wb_template, wb_company),
+        find_formula_errors(wb_company),
+        find_shape_differences(wb_template, wb_company),
+    ]
+    expected_pk = check_pk_for_nulls_and_duplicates(wb_company, "^fOut_", "Reference")
+    assert [len(df) for df in expected] == [1, 1, 2]
+
+    used_areas = []
+    original = panacea.get_used_area
+    monkeypatch.setattr(panacea, "get_used_area",
+                        lambda sheet: used_areas.append(sheet.title) or original(sheet))
+    rules = [FormulaDifferenceRule(TemplateProfile(wb_template)), FormulaErrorRule(),
+             ShapeRule(), PrimaryKeyRule("^fOut_", "Reference")]
+    RuleEngine(rules).run(wb_company, wb_template)
+
+    for rule, expected_df in zip(rules, expected):
+        assert _events(rule.result()) == _events(expected_df)
+    assert rules[3].result() == expected_pk
+    assert expected_pk["errors"]["fOut_Main"]["duplicate_rows"] == {"BON3": [3, 8]}
+    # each company and template sheet's used area is worked out once
+    assert sorted(used_areas) == ["Calc", "Calc", "Notes", "fOut_Main", "fOut_Main"]
+
+
+def test_sheet_caches_are_shared_across_runs(monkeypatch):
+    """Runs given the same sheet_caches work out each used area once between them"""
+    wb_template, wb_company = _workbooks()
+    expected = find_shape_differences(wb_template, wb_company)
+
+    used_areas = []
+    original = panacea.get_used_area
+    monkeypatch.setattr(panacea, "get_used_area",
+                        lambda sheet: used_areas.append(sheet.title) or original(sheet))
+    sheet_caches = {}
+    RuleEngine([FormulaDifferenceRule(TemplateProfile(wb_template))]).run(
+        wb_company, wb_template, sheet_caches=sheet_caches)
+    shape_rule = ShapeRule()
+    RuleEngine([shape_rule]).run(wb_company, wb_template, sheet_caches=sheet_caches)
+
+    assert _events(shape_rule.result()) == _events(expected)
+    assert sorted(used_areas) == ["Calc", "Calc", "fOut_Main", "fOut_Main"]
+    assert set(sheet_caches) == {"fOut_Main", "Calc", "Notes"}
@@ -0,0 +1,166 @@
+"""
+Tests for the artifact-aware rule scheduler
+"""
+import threading
+import time
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from dqchecks import scheduler as scheduler_module
+from dqchecks.panacea import (
+    find_formula_differences,
+    find_formula_errors,
+    find_missing_sheets,
+    find_pk_errors,
+    find_shape_differences)
+from dqchecks.scheduler import RuleScheduler, panacea_scheduler
+
+
+def _package(wb: Workbook) -> bytes:
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _packages():
+    """Template and company packages with a difference for each rule."""
+    wb_template, wb_company = Workbook(), Workbook()
+    for wb, formula in ((wb_template, "=A{row}*2"), (wb_company, "=A{row}*3")):
+        fout = wb.active
+        fout.title = "fOut_Main"
+        fout.append(["Title"])
+        fout.append(["Reference", "Value"])
+        for row in range(3, 9):
+            fout.append([f"BON{row % 5}", row])
+        calc = wb.create_sheet("Calc")
+        for row in range(1, 5):
+            calc.append([row, formula.format(row=row)])
+        same = wb.create_sheet("Same")
+        same["A1"] = "unchanged"
+        same["B2"] = "=A1"
+    wb_template.create_sheet("Lookups")["A1"] = 1
+    wb_company["fOut_Main"]["C2"] = "Extra"
+    return _package(wb_template), _package(wb_company)
+
+
+def _events(df):
+    return sorted(df.drop(columns="Event_Id").astype(str).to_dict("records"), key=str)
+
+
+def test_panacea_scheduler_matches_the_find_functions(monkeypatch):
+    """The combined events are the README rules' events, each workbook loaded once"""
+    template, company = _packages()
+    wb_template, wb_company = load_workbook(BytesIO(template)), load_workbook(BytesIO(company))
+    wb_template_values = load_workbook(BytesIO(template), data_only=True)
+    wb_company_values = load_workbook(BytesIO(company), data_only=True)
+    expected = pd.concat([
+        find_formula_differences(wb_template, wb_company),
+        find_formula_errors(wb_company_values),
+        find_missing_sheets(wb_template_values, wb_company_values),
+        find_shape_differences(wb_template, wb_company),
+        find_pk_errors(wb_company_values, "^fOut_", "Reference"),
+    ], ignore_index=True)
+
+    loads = []
+    original = scheduler_module.load_workbook
+    monkeypatch.setattr(scheduler_module, "load_workbook",
+                        lambda source, data_only: loads.append(data_only) or original(
+                            source, data_only=data_only))
+
+    result = panacea_scheduler(template, company, "^fOut_", "Reference", max_workers=4).run()
+
+    assert _events(result.events) == _events(expected)
+    assert set(result.events["Rule_Cd"]) == {
+        "Rule 1: Formula Difference", "Rule 3: Missing Sheets",
+        "Rule 4: Structural Discrepancy", "Rule 5: Boncode Repetition"}
+    assert sorted(loads) == [False, False, True, True]
+    assert result.artifacts["identical_sheets"] == {"Same"}
+    assert sorted(result.timings["Node"]) == sorted([
+        "wb_template", "wb_template_values", "wb_company", "wb_company_values",
+        "template_profile", "identical_sheets", "sheet_caches", "formula_differences",
+        "formula_errors", "missing_sheets", "shape_differences", "pk_errors"])
+    assert (result.timings["Seconds"] >= 0).all()
+
+
+def test_scheduler_runs_independent_nodes_concurrently_and_exclusive_ones_alone():
+    """Rules sharing a plain artifact overlap; rules sharing an exclusive one do not"""
+    barrier = threading.Barrier(2, timeout=5)
+    active, overlaps, lock = [0], [], threading.Lock()
+
+    def concurrent_rule(_):
+        barrier.wait()
+        return pd.DataFrame()
+
+    def exclusive_rule(_):
+        with lock:
+            active[0] += 1
+            overlaps.append(active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return pd.DataFrame({"Rule_Cd": ["exclusive"]})
+
+    scheduler = RuleScheduler(max_workers=4)
+    scheduler.add_artifact("shared", lambda: "value")
+    scheduler.add_artifact("workbook", lambda shared: shared, ["shared"], exclusive=True)
+    for name in ("a", "b"):
+        scheduler.add_rule(f"concurrent_{name}", concurrent_rule, ["shared"])
+        scheduler.add_rule(f"exclusive_{name}", exclusive_rule, ["workbook"])
+    calls = []
+    scheduler.add_artifact("unused", lambda: calls.append("unused"))
+
+    result = scheduler.run()
+
+    assert max(overlaps) == 1
+    assert result.events["Rule_Cd"].tolist() == ["exclusive", "exclusive"]
+    assert not calls
+    assert set(result.artifacts) == {"shared", "workbook"}
+    assert result.timings.columns.tolist() == ["Node", "Kind", "Inputs", "Start_Seconds", "Seconds"]
+
+
+def test_scheduler_runs_only_the_requested_rules():
+    """run(rules) computes just the artifacts those rules need"""
+    scheduler = RuleScheduler()
+    scheduler.add_artifact("x", lambda: 1).add_artifact("y", lambda x: x + 1, ["x"])
+    scheduler.add_rule("uses_x", lambda x: pd.DataFrame({"v": [x]}), ["x"])
+    scheduler.add_rule("uses_y", lambda y: pd.DataFrame({"v": [y]}), ["y"])
+
+    result = scheduler.run(["uses_x"])
+
+    assert result.events["v"].tolist() == [1]
+    assert result.artifacts == {"x": 1}
+    assert scheduler.plan() == ["x", "uses_x", "y", "uses_y"]
+
+
+def test_scheduler_rejects_bad_graphs():
+    """Duplicate names, unknown inputs or rules, and cycles are reported"""
+    scheduler = RuleScheduler()
+    scheduler.add_artifact("a", lambda b: b, ["b"])
+    scheduler.add_artifact("b", lambda a: a, ["a"])
+    scheduler.add_rule("rule", lambda a: pd.DataFrame(), ["a"])
+    scheduler.add_rule("broken", lambda missing: pd.DataFrame(), ["missing"])
+
+    with pytest.raises(ValueError, match="already declared"):
+        scheduler.add_rule("a", pd.DataFrame)
+    with pytest.raises(ValueError, match="Cycle between nodes: rule -> a -> b -> a"):
+        scheduler.run(["rule"])
+    with pytest.raises(ValueError, match="not a declared artifact"):
+        scheduler.run(["broken"])
+    with pytest.raises(ValueError, match="Unknown rule 'a'"):
+        scheduler.run(["a"])
+
+
+def test_scheduler_raises_node_errors():
+    """A failing node, or a rule returning something else than a DataFrame, stops the run"""
+    scheduler = RuleScheduler()
+    scheduler.add_artifact("boom", lambda: 1 / 0)
+    scheduler.add_rule("rule", lambda boom: pd.DataFrame(), ["boom"])
+    scheduler.add_rule("not_a_frame", lambda: "events")
+
+    with pytest.raises(ZeroDivisionError):
+        scheduler.run(["rule"])
+    with pytest.raises(TypeError, match="must return a pandas DataFrame"):
+        scheduler.run(["not_a_frame"])
@@ -2,12 +2,13 @@
 Testing utils.py file
 """
 
+import os
 from datetime import datetime
 from unittest import mock
 import pytest
 from pyspark.sql import SparkSession
 
-from dqchecks.utils import simple_hdfs_ls
+from dqchecks.utils import HadoopFileSystem, HdfsLister, LocalFileSystem, simple_hdfs_ls
 
 # Mocking the SparkSession and HDFS interaction
 @pytest.fixture
@@ -139,3 +140,63 @@ def test_incorrect_timestamp_format(mock_spark):
     # Call the function and check that it can handle invalid timestamps gracefully
     result = simple_hdfs_ls("hdfs://example/path/to/")
     assert result == [{"name": "hdfs://example/path/to/file2", "last_modified": "not_a_timestamp"}]
+
+def test_batched_listing_uses_joined_strings():
+    """Paths and times come from two joined strings when the JVM returns them."""
+    jvm_mock = mock.Mock()
+    fs_mock = mock.Mock()
+    spark = mock.Mock()
+    # pylint: disable=W0212
+    spark.sparkContext._jvm = jvm_mock
+    jvm_mock.org.apache.hadoop.fs.FileSystem.get.return_value = fs_mock
+    # Plain strings: any per-file getPath()/getModificationTime() call would fail
+    fs_mock.globStatus.return_value = ["status1", "status2", "status1"]
+    jvm_mock.org.apache.commons.lang3.StringUtils.join.side_effect = [
+        "hdfs://x/a.xlsx\nhdfs://x/b.xlsx\nhdfs://x/a.xlsx",
+        "FileStatus{path=hdfs://x/a.xlsx; modification_time=1637170140000; owner=o}\n"
+        "FileStatus{path=hdfs://x/b.xlsx; modification_time=1637170141000; owner=o}\n"
+        "FileStatus{path=hdfs://x/a.xlsx; modification_time=1637170140000; owner=o}",
+    ]
+
+    lister = HdfsLister(HadoopFileSystem(spark), ttl_seconds=0)
+
+    assert lister.ls("hdfs://x/*.xlsx") == [
+        {"name": "hdfs://x/a.xlsx", "last_modified": datetime.fromtimestamp(1637170140)},
+        {"name": "hdfs://x/b.xlsx", "last_modified": datetime.fromtimestamp(1637170141)},
+    ]
+
+def test_lister_reuses_filesystem_and_caches_for_ttl(tmp_path):
+    """One filesystem serves every call; results are cached until the TTL runs out."""
+    for name in ["org1.xlsx", "org2.xlsx", "notes.txt"]:
+        (tmp_path / name).write_text(name, encoding="utf8")
+    now = [0.0]
+    filesystem = LocalFileSystem()
+    lister = HdfsLister(filesystem, ttl_seconds=30, clock=lambda: now[0])
+    pattern = str(tmp_path / "*.xlsx")
+
+    with mock.patch.object(filesystem, "glob_status", wraps=filesystem.glob_status) as glob_status:
+        first = lister.ls(pattern)
+        (tmp_path / "org3.xlsx").write_text("new", encoding="utf8")
+        now[0] = 29.0
+        assert lister.ls(pattern) == first
+        now[0] = 31.0
+        refreshed = lister.ls(pattern)
+
+    assert glob_status.call_count == 2
+    assert [os.path.basename(f["name"]) for f in first] == ["org1.xlsx", "org2.xlsx"]
+    assert [os.path.basename(f["name"]) for f in refreshed] == [
+        "org1.xlsx", "org2.xlsx", "org3.xlsx"]
+    assert isinstance(refreshed[0]["last_modified"], datetime)
+
+def test_simple_hdfs_ls_with_local_lister(tmp_path):
+    """simple_hdfs_ls accepts a lister, e.g. one over the local filesystem."""
+    (tmp_path / "org1.xlsx").write_text("x", encoding="utf8")
+    lister = HdfsLister(LocalFileSystem(), ttl_seconds=0)
+
+    result = simple_hdfs_ls(str(tmp_path / "*.xlsx"), lister=lister)
+
+    assert result == [{
+        "name": str(tmp_path / "org1.xlsx"),
+        "last_modified": datetime.fromtimestamp(
+            os.stat(tmp_path / "org1.xlsx").st_mtime_ns // 1_000_000 / 1000.0),
+    }]
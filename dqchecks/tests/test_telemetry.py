@@ -0,0 +1,162 @@
+"""
+Tests for the opt-in performance telemetry
+"""
+import threading
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+from openpyxl import Workbook
+
+from dqchecks import qa
+from dqchecks.panacea import (
+    find_formula_differences,
+    find_formula_errors,
+    find_missing_sheets,
+    find_pk_errors,
+    find_shape_differences)
+from dqchecks.telemetry import TELEMETRY_COLUMNS, Telemetry, active_telemetry
+from dqchecks.transforms import FoutProcessConfig, ProcessingContext, process_fout_sheets
+
+
+def _workbooks():
+    """Template and company workbooks with formula, shape and key differences."""
+    wb_template, wb_company = Workbook(), Workbook()
+    for wb, factor in ((wb_template, 2), (wb_company, 3)):
+        fout = wb.active
+        fout.title = "fOut_Main"
+        fout.append(["Title"])
+        fout.append(["Reference", "Value"])
+        for row, reference in enumerate(["BON3", "BON4", "BON0", "BON1", "BON2", "BON3"], start=3):
+            fout.append([reference, row])
+        calc = wb.create_sheet("Calc")
+        for row in range(1, 5):
+            calc.append([row, f"=A{row}*{factor}"])
+    wb_template.create_sheet("Lookups")
+    wb_company["fOut_Main"]["C2"] = "Extra"
+    return wb_template, wb_company
+
+
+def _record(df, step, sheet):
+    rows = df[(df["Step"] == step) & (df["Sheet_Cd"] == sheet)]
+    assert len(rows) == 1
+    return rows.iloc[0]
+
+
+def test_panacea_rules_are_recorded_per_rule_and_sheet():
+    """Each rule's time, cells and emitted rows are recorded per sheet"""
+    wb_template, wb_company = _workbooks()
+    with Telemetry() as telemetry:
+        assert active_telemetry() is telemetry
+        differences = find_formula_differences(wb_template, wb_company)
+        shapes = find_shape_differences(wb_template, wb_company)
+        find_formula_errors(wb_company)
+        pk_errors = find_pk_errors(wb_company, "^fOut_", "Reference")
+        find_missing_sheets(wb_template, wb_company)
+    assert active_telemetry() is None
+
+    df = telemetry.to_dataframe()
+    assert df.columns.tolist() == TELEMETRY_COLUMNS
+    assert set(df["Component"]) == {"panacea"}
+
+    calc = _record(df, "Rule 1: Formula Difference", "Calc")
+    assert calc["Calls"] == 1
+    assert calc["Cells_Visited"] == 8
+    assert calc["Rows_Emitted"] == len(differences) == 1
+    assert calc["Seconds"] > 0
+    assert pd.isna(calc["Peak_Memory_Bytes"])
+    assert _record(df, "Rule 4: Structural Discrepancy", "fOut_Main")["Rows_Emitted"] == len(shapes)
+    assert _record(df, "Rule 2: Formula Error Check", "fOut_Main")["Cells_Visited"] >= 16
+    assert _record(df, "Rules 5/6: Boncode Repetition / Missing Boncode Check",
+                   "fOut_Main")["Rows_Emitted"] == len(pk_errors) == 1
+    assert _record(df, "Rule 3: Missing Sheets", "")["Rows_Emitted"] == 1
+
+
+def test_transforms_and_qa_steps_are_recorded():
+    """process_fout_sheets is recorded per sheet; qa steps once per call, whatever the engine"""
+    wb = Workbook()
+    sheet = wb.create_sheet("fOut_Sheet1")
+    sheet.append([""] * 6)
+    sheet.append(["Acronym", "Reference", "Item description", "Unit", "Model", "2020-21"])
+    sheet.append([""] * 6)
+    for i in range(3):
+        sheet.append(["a", f"R{i}", "a", "a", "a", i])
+    context = ProcessingContext(
+        org_cd="ORG001", submission_period_cd="2025Q1", process_cd="PROCESS01",
+        process_stage_cd="STAGE01", filename="myfile", Batch_Id="someid",
+        file_hash_md5="hash", template_version="1.0",
+        last_modified=datetime(2025, 3, 3), status="complete")
+    config = FoutProcessConfig(
+        observation_patterns=[r'^\s*2[0-9]{3}-[1-9][0-9]\s*$'], fout_patterns=["^fOut_"])
+    frame = pd.DataFrame({column: ["A", "B"] for column in qa.KEY_COLS})
+
+    with Telemetry() as telemetry:
+        result = process_fout_sheets(wb, context, config)
+        qa.compute_key_overlap(frame, frame, profile="QD", engine="polars")
+        qa.compute_key_overlap(frame, frame, profile="QD")
+
+    df = telemetry.to_dataframe()
+    assert _record(df, "read_sheet", "fOut_Sheet1")["Cells_Visited"] > 0
+    assert _record(df, "process_sheet", "fOut_Sheet1")["Rows_Emitted"] == len(result)
+    assert _record(df, "validate_sheets", "")["Calls"] == 1
+    overlap = _record(df, "compute_key_overlap", "")
+    assert overlap["Component"] == "qa"
+    assert overlap["Calls"] == 2
+    assert overlap["Cells_Visited"] == 2 * 2 * frame.size
+
+
+def test_trace_memory_records_no_peak_for_steps_overlapping_on_other_threads():
+    """A peak cannot be attributed while steps run on two threads, so none is recorded"""
+    both_started = threading.Barrier(2)
+
+    def run(telemetry, step):
+        with telemetry.step("custom", step):
+            both_started.wait()
+            block = bytearray(1_000_000)
+            both_started.wait()
+        del block
+
+    with Telemetry(trace_memory=True) as telemetry:
+        threads = [threading.Thread(target=run, args=(telemetry, f"thread{i}")) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with telemetry.step("custom", "alone"):
+            block = bytearray(1_000_000)
+        del block
+
+    df = telemetry.to_dataframe()
+    assert pd.isna(_record(df, "thread0", "")["Peak_Memory_Bytes"])
+    assert pd.isna(_record(df, "thread1", "")["Peak_Memory_Bytes"])
+    assert _record(df, "alone", "")["Peak_Memory_Bytes"] >= 1_000_000
+
+
+def test_trace_memory_records_peaks_and_stops_tracing(tmp_path):
+    """Peaks are recorded while tracing, and the records written as parquet or CSV"""
+    with Telemetry(trace_memory=True) as telemetry:
+        with telemetry.step("custom", "outer") as counters:
+            with telemetry.step("custom", "inner"):
+                block = bytearray(2_000_000)
+            del block
+            counters.rows = 3
+    assert not tracemalloc.is_tracing()
+
+    df = telemetry.to_dataframe()
+    outer, inner = _record(df, "outer", ""), _record(df, "inner", "")
+    assert inner["Peak_Memory_Bytes"] >= 2_000_000
+    assert outer["Peak_Memory_Bytes"] >= inner["Peak_Memory_Bytes"]
+    assert outer["Rows_Emitted"] == 3
+
+    telemetry.write(str(tmp_path / "telemetry.parquet"))
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "telemetry.parquet"), df)
+    telemetry.write(str(tmp_path / "telemetry.csv"))
+    assert pd.read_csv(tmp_path / "telemetry.csv")["Step"].tolist() == ["inner", "outer"]
+
+
+def test_nothing_is_recorded_when_inactive():
+    """Without an active Telemetry, checks run as usual and no records are kept"""
+    wb_template, wb_company = _workbooks()
+    telemetry = Telemetry()
+    find_formula_differences(wb_template, wb_company)
+    assert telemetry.to_dataframe().empty
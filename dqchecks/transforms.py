@@ -13,6 +13,8 @@ from collections import namedtuple
 from openpyxl.workbook.workbook import Workbook
 from openpyxl.utils import get_column_letter
 import pandas as pd
+from dqchecks.preflight import WorkbookManifest
+from dqchecks.telemetry import telemetry_step
 from dqchecks.exceptions import (
     EmptyRowsPatternCheckError,
     ColumnHeaderValidationError,)
@@ -160,7 +162,13 @@ def read_sheets_data(wb: Workbook, fout_sheets: list, skip_rows: int = 2):
     - First data row is Excel row `skip_rows + 1`
     - Sets __Excel_Row as the DataFrame index
     """
-    return [process_sheet(wb[sheetname], sheetname, skip_rows) for sheetname in fout_sheets]
+    df_list = []
+    for sheetname in fout_sheets:
+        with telemetry_step("transforms", "read_sheet", sheetname) as counters:
+            df = process_sheet(wb[sheetname], sheetname, skip_rows)
+            counters.cells = df.size
+        df_list.append(df)
+    return df_list
 
 
 def process_sheet(ws, sheetname, skip_rows):
@@ -291,6 +299,8 @@ def check_empty_rows(wb: Workbook, sheet_names: list[str]):
 
     If any sheet fails either check, a custom EmptyRowsPatternCheckError is raised, indicating which sheets failed.
 
+    wb may be a dqchecks.preflight.WorkbookManifest, which reads only rows 1-3 of each sheet part.
+
     Parameters:
         wb (Workbook): An openpyxl Workbook instance containing the sheets to check.
         sheet_names (list[str]): A list of worksheet names to validate.
@@ -303,7 +313,7 @@ def check_empty_rows(wb: Workbook, sheet_names: list[str]):
         ValueError: If 'sheet_names' is empty or contains names not found in the workbook.
         EmptyRowsPatternCheckError: If any sheet contains non-empty values in the checked rows.
     """
-    if not isinstance(wb, Workbook):
+    if not isinstance(wb, (Workbook, WorkbookManifest)):
         raise TypeError("Expected an openpyxl Workbook instance for 'wb'.")
     if not isinstance(sheet_names, list) or not all(isinstance(name, str) for name in sheet_names):
         raise TypeError("Expected 'sheet_names' to be a list of strings.")
@@ -348,6 +358,8 @@ def check_column_headers(wb: Workbook, sheet_names: list[str]):
     """
     Validates that each sheet has the required columns in the correct order starting from row 2.
 
+    wb may be a dqchecks.preflight.WorkbookManifest, which reads only rows 1-2 of each sheet part.
+
     Args:
         wb (Workbook): The openpyxl workbook object.
         sheet_names (list[str]): List of sheet names to check.
@@ -360,7 +372,7 @@ def check_column_headers(wb: Workbook, sheet_names: list[str]):
     Returns:
         True: If all sheets pass the header validation.
     """
-    if not isinstance(wb, Workbook):
+    if not isinstance(wb, (Workbook, WorkbookManifest)):
         raise TypeError("Expected an openpyxl Workbook instance for 'wb'.")
     if not isinstance(sheet_names, list) or not all(isinstance(name, str) for name in sheet_names):
         raise TypeError("Expected 'sheet_names' to be a list of strings.")
@@ -792,8 +804,9 @@ def process_fout_sheets(
 
     # Optional validations on the workbook structure
     if config.run_validations:
-        assert check_empty_rows(wb, fout_sheets)
-        assert check_column_headers(wb, fout_sheets)
+        with telemetry_step("transforms", "validate_sheets"):
+            assert check_empty_rows(wb, fout_sheets)
+            assert check_column_headers(wb, fout_sheets)
 
     # Read and clean the raw sheet data
     df_list = read_sheets_data(wb, fout_sheets, skip_rows=config.skip_rows)
@@ -807,16 +820,18 @@ def process_fout_sheets(
     )
 
     processed_dfs = []
-    for df in df_list:
-        # Reshape + compute Cell_Cd (done inside process_df)
-        if config.reshape:
-            df = process_df(df, context, config.observation_patterns)
-        else:
-            # Extract Excel column letters from first row and remove that row
-            df, _col_letter_map = extract_column_letters_from_top_row(df)
-
-        # Finalize types / names / order
-        processed_df = finalize_dataframe(df, context, column_rename_map)
+    for sheetname, df in zip(fout_sheets, df_list):
+        with telemetry_step("transforms", "process_sheet", sheetname) as counters:
+            # Reshape + compute Cell_Cd (done inside process_df)
+            if config.reshape:
+                df = process_df(df, context, config.observation_patterns)
+            else:
+                # Extract Excel column letters from first row and remove that row
+                df, _col_letter_map = extract_column_letters_from_top_row(df)
+
+            # Finalize types / names / order
+            processed_df = finalize_dataframe(df, context, column_rename_map)
+            counters.rows = len(processed_df)
         processed_dfs.append(processed_df)
 
     # Union everything
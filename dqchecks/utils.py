@@ -2,10 +2,195 @@
 Collection of helper functions
 """
 import datetime
+import glob
+import os
+import re
+import threading
+import time
 from pyspark.sql import SparkSession
 import pandas as pd
 
-def simple_hdfs_ls(path: str) -> list:
+# FileStatus.toString() field holding the modification time in milliseconds
+_MODIFICATION_TIME = re.compile(r"modification_time=(\d+)")
+
+
+class HadoopFileSystem:
+    # pylint: disable=R0903
+    """
+    Hadoop FileSystem reached through the Spark JVM, looked up once and reused.
+
+    The SparkSession, JVM view and FileSystem handle are resolved on first use.
+    Listing results are fetched in batches: all paths come back in one py4j call
+    (and all modification times in another) instead of three calls per file,
+    falling back to per-file calls if the batched strings cannot be parsed.
+    """
+
+    def __init__(self, spark: SparkSession | None = None):
+        self._spark = spark
+        self._jvm = None
+        self._fs = None
+        self._lock = threading.Lock()
+
+    def _filesystem(self):
+        """The JVM view and FileSystem handle, created on first use."""
+        with self._lock:
+            if self._fs is None:
+                spark = self._spark or SparkSession.builder.appName("spark_entry_job").getOrCreate()  # pylint: disable=no-member
+                # pylint: disable=W0212
+                jvm = spark.sparkContext._jvm
+                fs_root = jvm.java.net.URI.create("")
+                # pylint: disable=W0212
+                conf = spark.sparkContext._jsc.hadoopConfiguration()
+                self._fs = jvm.org.apache.hadoop.fs.FileSystem.get(fs_root, conf)
+                self._jvm = jvm
+            return self._jvm, self._fs
+
+    def glob_status(self, path: str) -> list[tuple[str, object]]:
+        """
+        Files matching a glob, with their modification times.
+
+        Args:
+            path (str): HDFS path or glob pattern.
+
+        Returns:
+            list[tuple[str, object]]: (path, modification time in milliseconds) pairs.
+        """
+        jvm, fs = self._filesystem()
+        status_list = fs.globStatus(jvm.org.apache.hadoop.fs.Path(path))
+        if status_list is None:
+            return []
+        batched = self._batched(jvm, status_list)
+        if batched is not None:
+            return batched
+        return [
+            (status.getPath().toString(), status.getModificationTime())
+            for status in status_list
+        ]
+
+    @staticmethod
+    def _batched(jvm, status_list):
+        """All paths and times from two joined strings, or None if they do not line up."""
+        count = len(status_list)
+        if not count:
+            return []
+        join = jvm.org.apache.commons.lang3.StringUtils.join
+        paths = join(jvm.org.apache.hadoop.fs.FileUtil.stat2Paths(status_list), "\n")
+        statuses = join(status_list, "\n")
+        if not isinstance(paths, str) or not isinstance(statuses, str):
+            return None
+        paths = paths.split("\n")
+        # Last match per line, so a path that itself holds "modification_time=" is not read
+        times = [_MODIFICATION_TIME.findall(line) for line in statuses.split("\n")]
+        if len(paths) != count or len(times) != count or not all(times):
+            return None
+        return [(path, int(found[-1])) for path, found in zip(paths, times)]
+
+
+class LocalFileSystem:
+    # pylint: disable=R0903
+    """
+    Pure-Python stand-in for HadoopFileSystem over the local filesystem.
+
+    Used to test and benchmark HdfsLister without a cluster.
+    """
+
+    def glob_status(self, path: str) -> list[tuple[str, object]]:
+        """
+        Files matching a glob, with their modification times.
+
+        Args:
+            path (str): Local path or glob pattern.
+
+        Returns:
+            list[tuple[str, object]]: (path, modification time in milliseconds) pairs,
+                sorted by path like Hadoop's globStatus.
+        """
+        found = []
+        for match in sorted(glob.glob(path)):
+            try:
+                found.append((match, os.stat(match).st_mtime_ns // 1_000_000))
+            except OSError:
+                continue
+        return found
+
+
+class HdfsLister:
+    """
+    Reusable lister returning simple_hdfs_ls records, with a glob result cache.
+
+    Holds one filesystem (HadoopFileSystem by default) for all calls, so the
+    Spark session and FileSystem handle are looked up once. Results are cached
+    per path for ttl_seconds (0 disables the cache).
+
+    Example:
+        >>> lister = HdfsLister(ttl_seconds=300)
+        >>> for org in organisations:
+                files = lister.ls(f"Files/data collections/{org}*.xlsx")
+    """
+
+    def __init__(self, filesystem=None, ttl_seconds: float = 60.0, clock=time.monotonic):
+        self.filesystem = filesystem if filesystem is not None else HadoopFileSystem()
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._cache: dict[str, tuple[float, list[tuple[str, object]]]] = {}
+        self._lock = threading.Lock()
+
+    def ls(self, path: str) -> list:
+        """
+        List files matching path with their last modification time.
+
+        Args:
+            path (str): Path or glob pattern.
+
+        Returns:
+            list: Dictionaries with 'name' and 'last_modified', as simple_hdfs_ls returns.
+        """
+        entries = self._cached(path)
+        if entries is None:
+            entries = _dedupe_entries(self.filesystem.glob_status(path))
+            if self.ttl_seconds > 0:
+                with self._lock:
+                    self._cache[path] = (self._clock() + self.ttl_seconds, entries)
+        return [{"name": name, "last_modified": last_modified} for name, last_modified in entries]
+
+    def clear_cache(self):
+        """Forgets every cached listing."""
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, path):
+        """The cached entries for path, if still within their TTL."""
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is None:
+                return None
+            if cached[0] <= self._clock():
+                del self._cache[path]
+                return None
+            return cached[1]
+
+
+def _dedupe_entries(statuses) -> list[tuple[str, object]]:
+    """(path, last_modified) pairs with times converted and repeats dropped, in order."""
+    entries = []
+    seen = set()
+    for file_path, last_modified_time in statuses:
+        # Convert last modified time from milliseconds to a readable format
+        if isinstance(last_modified_time, (float, int)):
+            last_modified_datetime = datetime.datetime.fromtimestamp(
+                last_modified_time / 1000.0
+            )
+        else:
+            last_modified_datetime = last_modified_time
+
+        entry = (file_path, last_modified_datetime)
+        if entry not in seen:
+            seen.add(entry)
+            entries.append(entry)
+    return entries
+
+
+def simple_hdfs_ls(path: str, lister: HdfsLister | None = None) -> list:
     """
     List files in an HDFS directory and retrieve their last modification time.
 
@@ -13,8 +198,12 @@ def simple_hdfs_ls(path: str) -> list:
     specified directory, along with their last modification timestamp. The function uses PySpark's 
     SparkSession to connect to the HDFS and retrieve file metadata.
 
+    For repeated listings, create one HdfsLister and pass it in (or call its ls()),
+    so the FileSystem handle and cached results are reused between calls.
+
     Args:
         path (str): The HDFS path to the directory whose files are to be listed.
+        lister (HdfsLister | None): Lister to use. Defaults to a new, uncached one.
 
     Returns:
         list: A list of dictionaries where each dictionary contains the file path ('name') and 
@@ -26,37 +215,9 @@ def simple_hdfs_ls(path: str) -> list:
         >>> for file in file_info:
                 print(f"File: {file['name']}, Last Modified: {file['last_modified']}")
     """
-    spark = SparkSession.builder.appName("spark_entry_job").getOrCreate()  # pylint: disable=no-member
-    # pylint: disable=W0212
-    jvm = spark.sparkContext._jvm
-    fs_root = jvm.java.net.URI.create("")
-    # pylint: disable=W0212
-    conf = spark.sparkContext._jsc.hadoopConfiguration()
-    fs = jvm.org.apache.hadoop.fs.FileSystem.get(fs_root, conf)
-
-    path_glob = jvm.org.apache.hadoop.fs.Path(path)
-    status_list = fs.globStatus(path_glob)
-
-    # Generate a list of tuples with the file path and last modification time
-    file_info = []
-    for status in status_list:
-        file_path = status.getPath().toString()
-        last_modified_time = status.getModificationTime()  # Get last modified time in milliseconds
-
-        # Convert last modified time from milliseconds to a readable format
-        if isinstance(last_modified_time, (float, int)):
-            last_modified_datetime = datetime.datetime.fromtimestamp(
-                last_modified_time / 1000.0
-            )
-        else:
-            last_modified_datetime = last_modified_time
-
-        new_val = {"name": file_path, "last_modified": last_modified_datetime}
-
-        if new_val not in file_info:
-            file_info.append(new_val)
-
-    return file_info
+    if lister is None:
+        lister = HdfsLister(ttl_seconds=0)
+    return lister.ls(path)
 
 def create_validation_event_row_dataframe(**kwargs):
     """